@@ -0,0 +1,406 @@
+"""Kraken - core.build_cache module.
+
+Classes:
+BuildCache -- On-disk cache of constructed components.
+
+"""
+
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import tempfile
+
+from kraken.core import getVersion
+from kraken.core.kraken_system import ks
+from kraken.core.configs.config import Config
+from kraken.helpers.utility_methods import prepareToSave
+
+
+class BuildCache(object):
+    """On-disk cache of the components constructed when loading rigs.
+
+    A component constructed from the same rig build data, with the same class
+    and config, gives the same objects, attributes, transforms, constraints,
+    connections and operators. Constructed components are stored pickled in
+    files named after a hash of the Kraken version and core sources, their
+    class, the source of the modules of the class, the config and the data,
+    and are loaded from them on the next loads instead of being constructed
+    again.
+
+    The objects are pickled, the cache is only used with the 'python' math
+    backend. Unpickling runs code, so the cache directory is created readable
+    and writable by its owner only, and cache files are only loaded from a
+    directory owned by the current user that other users can't access.
+
+    The least recently used files are removed when the cache grows past its
+    maximum size.
+
+    Args:
+        cachePath (str): Directory of the cache files, defaults to the
+            KRAKEN_BUILD_CACHE environment variable or to a directory in the
+            cache directory of the user.
+        maxSize (int): Maximum size of the cache files in bytes, defaults to
+            defaultMaxSize.
+
+    """
+
+    # Increment when the pickled objects change in an incompatible way.
+    version = 1
+
+    # Maximum size of the cache files in bytes.
+    defaultMaxSize = 512 * 1024 * 1024
+
+    # Hash of the sources of the Kraken core package, computed once.
+    _coreSourceHash = None
+
+    def __init__(self, cachePath=None, maxSize=None):
+        super(BuildCache, self).__init__()
+
+        if cachePath is None:
+            cachePath = os.environ.get('KRAKEN_BUILD_CACHE', self.getDefaultCachePath())
+
+        if maxSize is None:
+            maxSize = self.defaultMaxSize
+
+        self._cachePath = cachePath
+        self._maxSize = maxSize
+        self._sourceHashes = {}
+
+
+    @classmethod
+    def getDefaultCachePath(cls):
+        """Returns the default directory of the cache files, in the cache
+        directory of the current user.
+
+        Returns:
+            str: The directory.
+
+        """
+
+        if os.name == 'nt':
+            userCachePath = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+        else:
+            userCachePath = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+
+        return os.path.join(userCachePath, 'kraken', 'build_cache')
+
+
+    def getCachePath(self):
+        """Returns the directory of the cache files.
+
+        Returns:
+            str: The directory.
+
+        """
+
+        return self._cachePath
+
+
+    def getMaxSize(self):
+        """Returns the maximum size of the cache files.
+
+        Returns:
+            int: The size in bytes.
+
+        """
+
+        return self._maxSize
+
+
+    def isEnabled(self):
+        """Returns whether components can be cached with the current math
+        backend.
+
+        Returns:
+            bool: True if the 'python' math backend is used.
+
+        """
+
+        return ks.getMathBackend() == 'python'
+
+
+    def isCachePathSecure(self):
+        """Returns whether the cache directory can be trusted, files other
+        users can write to are never unpickled.
+
+        Returns:
+            bool: True if the directory exists, is owned by the current user
+                and only its owner can access it.
+
+        """
+
+        try:
+            stat = os.stat(self._cachePath)
+        except OSError:
+            return False
+
+        # Windows has no owner and mode bits, the default directory is in the
+        # local application data of the user.
+        if not hasattr(os, 'getuid'):
+            return True
+
+        return stat.st_uid == os.getuid() and stat.st_mode & 0o077 == 0
+
+
+    # =============
+    # Hash Methods
+    # =============
+    @classmethod
+    def getCoreSourceHash(cls):
+        """Returns a hash of the source of the modules of the Kraken core
+        package, the objects the components are constructed from.
+
+        Returns:
+            str: The hex digest of the sources.
+
+        """
+
+        if BuildCache._coreSourceHash is None:
+            corePath = os.path.dirname(os.path.abspath(__file__))
+
+            md5 = hashlib.md5()
+            for dirPath, dirNames, fileNames in os.walk(corePath):
+                dirNames.sort()
+                for fileName in sorted(fileNames):
+                    if not fileName.endswith('.py'):
+                        continue
+
+                    filePath = os.path.join(dirPath, fileName)
+                    md5.update(os.path.relpath(filePath, corePath).replace(os.sep, '/'))
+                    with open(filePath, 'rb') as sourceFile:
+                        md5.update(hashlib.md5(sourceFile.read()).hexdigest())
+
+            BuildCache._coreSourceHash = md5.hexdigest()
+
+        return BuildCache._coreSourceHash
+
+
+    def getSourceHash(self, componentClass):
+        """Returns a hash of the source of the modules defining the class of a
+        component and its base classes.
+
+        Args:
+            componentClass (type): The class of the component.
+
+        Returns:
+            str: The hex digest of the sources.
+
+        """
+
+        md5 = hashlib.md5()
+        for cls in inspect.getmro(componentClass):
+            if cls is object:
+                continue
+
+            moduleName = cls.__module__
+            if moduleName not in self._sourceHashes:
+                try:
+                    with open(inspect.getsourcefile(cls)) as sourceFile:
+                        self._sourceHashes[moduleName] = hashlib.md5(sourceFile.read()).hexdigest()
+                except (IOError, TypeError):
+                    self._sourceHashes[moduleName] = moduleName
+
+            md5.update(self._sourceHashes[moduleName])
+
+        return md5.hexdigest()
+
+
+    def getConfigHash(self, config):
+        """Returns a hash of the settings of a config.
+
+        Args:
+            config (Config): The config.
+
+        Returns:
+            str: The hex digest of the config.
+
+        """
+
+        return config.getHash()
+
+
+    def getComponentHash(self, componentData, config=None):
+        """Returns the key of a component in the cache.
+
+        Args:
+            componentData (dict): The rig build data of the component.
+            config (Config): The config the component is constructed with,
+                the current config if None.
+
+        Returns:
+            str: The hex digest of the component.
+
+        """
+
+        if config is None:
+            config = Config.getInstance()
+
+        # trim off the class name to get the module path.
+        modulePath = '.'.join(componentData['class'].split('.')[:-1])
+        if modulePath != "":
+            importlib.import_module(modulePath)
+
+        componentClass = ks.getComponentClass(componentData['class'])
+
+        keyData = {
+            'version': self.version,
+            'kraken': getVersion(),
+            'core': self.getCoreSourceHash(),
+            'class': componentData['class'],
+            'source': self.getSourceHash(componentClass),
+            'config': self.getConfigHash(config),
+            'data': componentData
+        }
+
+        return hashlib.md5(json.dumps(prepareToSave(keyData), sort_keys=True)).hexdigest()
+
+
+    # ==============
+    # Cache Methods
+    # ==============
+    def getFilePath(self, componentHash):
+        """Returns the path of the cache file of a component.
+
+        Args:
+            componentHash (str): The key of the component.
+
+        Returns:
+            str: The file path.
+
+        """
+
+        return os.path.join(self._cachePath, componentHash + '.pkl')
+
+
+    def load(self, componentHash):
+        """Loads a constructed component from the cache.
+
+        Args:
+            componentHash (str): The key of the component.
+
+        Returns:
+            str: The pickled component, None if it isn't cached or the cache
+                directory can't be trusted.
+
+        """
+
+        if not self.isCachePathSecure():
+            return None
+
+        filePath = self.getFilePath(componentHash)
+        if not os.path.exists(filePath):
+            return None
+
+        with open(filePath, 'rb') as cacheFile:
+            if hasattr(os, 'getuid') and os.fstat(cacheFile.fileno()).st_uid != os.getuid():
+                return None
+
+            payload = cacheFile.read()
+
+        # Mark the file as recently used, it is pruned last.
+        os.utime(filePath, None)
+
+        return payload
+
+
+    def save(self, componentHash, payload):
+        """Saves a constructed component to the cache.
+
+        The file is written next to its final path and renamed, so concurrent
+        builds never read a partial file. The cache directory is created
+        accessible to its owner only, and pruned to its maximum size.
+
+        Args:
+            componentHash (str): The key of the component.
+            payload (str): The pickled component.
+
+        Returns:
+            bool: True if successful, False if the cache directory can't be
+                trusted.
+
+        """
+
+        if not os.path.isdir(self._cachePath):
+            os.makedirs(self._cachePath, 0o700)
+            os.chmod(self._cachePath, 0o700)
+
+        if not self.isCachePathSecure():
+            return False
+
+        filePath = self.getFilePath(componentHash)
+        fileHandle, tempPath = tempfile.mkstemp(dir=self._cachePath, suffix='.tmp')
+        with os.fdopen(fileHandle, 'wb') as cacheFile:
+            cacheFile.write(payload)
+
+        if os.path.exists(filePath):
+            os.remove(filePath)
+
+        os.rename(tempPath, filePath)
+
+        self.prune()
+
+        return True
+
+
+    def prune(self):
+        """Removes the least recently used cached components until the cache
+        files fit in the maximum size.
+
+        Returns:
+            int: The number of removed files.
+
+        """
+
+        if not os.path.isdir(self._cachePath):
+            return 0
+
+        cacheFiles = []
+        totalSize = 0
+        for fileName in os.listdir(self._cachePath):
+            if not fileName.endswith('.pkl'):
+                continue
+
+            filePath = os.path.join(self._cachePath, fileName)
+            try:
+                stat = os.stat(filePath)
+            except OSError:
+                continue
+
+            cacheFiles.append((stat.st_mtime, filePath, stat.st_size))
+            totalSize += stat.st_size
+
+        removed = 0
+        for mtime, filePath, size in sorted(cacheFiles):
+            if totalSize <= self._maxSize:
+                break
+
+            # Concurrent builds can prune the same files.
+            try:
+                os.remove(filePath)
+            except OSError:
+                continue
+
+            totalSize -= size
+            removed += 1
+
+        return removed
+
+
+    def clear(self):
+        """Removes the cached components.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        if not os.path.isdir(self._cachePath):
+            return True
+
+        for fileName in os.listdir(self._cachePath):
+            if fileName.endswith(('.pkl', '.tmp')):
+                os.remove(os.path.join(self._cachePath, fileName))
+
+        return True
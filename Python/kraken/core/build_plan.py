@@ -0,0 +1,276 @@
+"""Kraken - core.build_plan module.
+
+Classes:
+BuildPlan -- Flattened list of the work needed to build a hierarchy.
+
+"""
+
+import copy
+
+from kraken.core.type_registry import TypeDispatcher
+
+
+class BuildPlan(object):
+    """Flattened description of the work needed to build a hierarchy.
+
+    The hierarchy is traversed once and the items to build are gathered in
+    ordered work lists, one per build phase. The phases are executed in order
+    by the Builder:
+
+    - objects: scene items with the name of their build method, None for
+      items that aren't built (components).
+    - attributes: attributes to connect.
+    - inputConnections: component inputs with the name of their build method.
+    - operators: operators with the name of their build method.
+    - constraints: constraints with the name of their build method.
+
+    The items of each phase are ordered as in a depth first traversal of the
+    hierarchy. A plan can be inspected, and executed several times, before
+    anything is built in the DCC.
+
+    Args:
+        kSceneItem (object): The root of the hierarchy to build.
+
+    """
+
+    # Build methods resolved once per class from the type hierarchy.
+    # Important Note: The order of these entries is important.
+    # New classes should be added above the classes they are derrived from.
+    # No new types should be added below SceneItem here.
+    hierarchyDispatcher = TypeDispatcher([
+        ('Container', 'buildContainer'),
+        ('Layer', 'buildLayer'),
+        ('Component', None),
+        ('ComponentGroup', 'buildGroup'),
+        ('HierarchyGroup', 'buildHierarchyGroup'),
+        ('CtrlSpace', 'buildGroup'),
+        ('Transform', 'buildGroup'),
+        ('Locator', 'buildLocator'),
+        ('Joint', 'buildJoint'),
+        ('Control', 'buildControl'),
+        ('Curve', 'buildCurve'),
+        ('SceneItem', 'buildLocator')
+    ])
+
+    constraintDispatcher = TypeDispatcher([
+        ('OrientationConstraint', 'buildOrientationConstraint'),
+        ('PoseConstraint', 'buildPoseConstraint'),
+        ('PositionConstraint', 'buildPositionConstraint'),
+        ('ScaleConstraint', 'buildScaleConstraint')
+    ])
+
+    operatorDispatcher = TypeDispatcher([
+        ('KLOperator', 'buildKLOperator'),
+        ('CanvasOperator', 'buildCanvasOperator')
+    ])
+
+    phases = ['objects', 'attributes', 'inputConnections', 'operators', 'constraints']
+
+    def __init__(self, kSceneItem):
+        super(BuildPlan, self).__init__()
+
+        self._root = kSceneItem
+        self._objects = []
+        self._attributes = []
+        self._inputConnections = []
+        self._operators = []
+        self._constraints = []
+
+        self._gather(kSceneItem)
+
+
+    # ===============
+    # Gather Methods
+    # ===============
+    def _gather(self, kSceneItem):
+        """Traverses the hierarchy and fills the work lists.
+
+        Args:
+            kSceneItem (object): The root of the hierarchy.
+
+        """
+
+        stack = [kSceneItem]
+        while len(stack) > 0:
+            kObject = stack.pop()
+
+            buildMethodName = self.hierarchyDispatcher.resolve(type(kObject), default=False)
+            if buildMethodName is False:
+                raise NotImplementedError(kObject.getName() + ' has an unsupported type: ' + str(type(kObject)))
+
+            self._objects.append((kObject, buildMethodName))
+
+            for i in xrange(kObject.getNumAttributeGroups()):
+                attributeGroup = kObject.getAttributeGroupByIndex(i)
+                for y in xrange(attributeGroup.getNumAttributes()):
+                    self._attributes.append(attributeGroup.getAttributeByIndex(y))
+
+            if kObject.isTypeOf('Component'):
+                self._gatherComponent(kObject)
+
+            for i in xrange(kObject.getNumConstraints()):
+                constraint = kObject.getConstraintByIndex(i)
+                buildMethodName = self.constraintDispatcher.resolve(type(constraint))
+                if buildMethodName is None:
+                    raise NotImplementedError(constraint.getName() + ' has an unsupported type: ' + str(type(constraint)))
+
+                self._constraints.append((constraint, buildMethodName))
+
+            stack.extend(reversed(kObject.getChildren()))
+
+
+    def _gatherComponent(self, component):
+        """Gathers the input connections and operators of a component.
+
+        Args:
+            component (Component): The component.
+
+        """
+
+        for i in xrange(component.getNumInputs()):
+            componentInput = component.getInputByIndex(i)
+            if componentInput.getTarget() is None or componentInput.getConnection() is None:
+                continue
+
+            if componentInput.getDataType().startswith('Xfo'):
+                self._inputConnections.append((componentInput, 'buildXfoConnection'))
+
+            elif componentInput.getDataType().startswith(('Boolean', 'Float', 'Integer', 'String')):
+                self._inputConnections.append((componentInput, 'buildAttributeConnection'))
+
+        for i in xrange(component.getNumOperators()):
+            operator = component.getOperatorByIndex(i)
+
+            buildMethodName = self.operatorDispatcher.resolve(type(operator))
+            if buildMethodName is None:
+                raise NotImplementedError(operator.getName() + ' has an unsupported type: ' + str(type(operator)))
+
+            self._operators.append((operator, buildMethodName))
+
+
+    # =================
+    # Work List Methods
+    # =================
+    def getRoot(self):
+        """Returns the root of the hierarchy the plan was gathered from.
+
+        Returns:
+            object: The root scene item.
+
+        """
+
+        return self._root
+
+
+    def getObjects(self):
+        """Returns the scene items to build.
+
+        Returns:
+            list: (kObject, buildMethodName) tuples, buildMethodName is None
+                for the items that aren't built.
+
+        """
+
+        return self._objects
+
+
+    def getAttributes(self):
+        """Returns the attributes to connect.
+
+        Returns:
+            list: The attributes.
+
+        """
+
+        return self._attributes
+
+
+    def getInputConnections(self):
+        """Returns the component inputs to connect.
+
+        Returns:
+            list: (componentInput, buildMethodName) tuples.
+
+        """
+
+        return self._inputConnections
+
+
+    def getOperators(self):
+        """Returns the operators to build.
+
+        Returns:
+            list: (operator, buildMethodName) tuples.
+
+        """
+
+        return self._operators
+
+
+    def getConstraints(self):
+        """Returns the constraints to build.
+
+        Returns:
+            list: (constraint, buildMethodName) tuples.
+
+        """
+
+        return self._constraints
+
+
+    def getComponentPlan(self, components, inputComponents=None):
+        """Returns a plan restricted to the items of the supplied components,
+        used to rebuild some components of a rig that was already built.
+
+        Args:
+            components (list): Components of which the objects, attributes,
+                input connections, operators and constraints are kept.
+            inputComponents (list): Components of which only the input
+                connections are kept.
+
+        Returns:
+            BuildPlan: The restricted plan, with the same root.
+
+        """
+
+        componentIds = set([id(x) for x in components])
+        inputComponentIds = set([id(x) for x in inputComponents or []]) | componentIds
+
+        def isOwned(kObject):
+            if kObject.isTypeOf('Component'):
+                return id(kObject) in componentIds
+
+            return id(kObject.getComponent()) in componentIds
+
+        plan = copy.copy(self)
+        plan._objects = [x for x in self._objects if isOwned(x[0])]
+        plan._attributes = [x for x in self._attributes if isOwned(x.getParent().getParent())]
+        plan._inputConnections = [x for x in self._inputConnections if id(x[0].getParent()) in inputComponentIds]
+        plan._operators = [x for x in self._operators if id(x[0].getParent()) in componentIds]
+        plan._constraints = [x for x in self._constraints if isOwned(x[0].getParent())]
+
+        return plan
+
+
+    def getDescription(self):
+        """Returns a description of the plan for inspection.
+
+        Returns:
+            dict: The paths of the items of each phase, with their build method.
+
+        """
+
+        def describe(item):
+            if isinstance(item, tuple):
+                if item[1] is None:
+                    return item[0].getPath()
+
+                return item[0].getPath() + ':' + item[1]
+
+            return item.getPath()
+
+        description = {}
+        for phase in self.phases:
+            description[phase] = [describe(x) for x in getattr(self, '_' + phase)]
+
+        return description
@@ -9,7 +9,10 @@ Builder -- Base builder object to build objects in DCC.
 from kraken.core.kraken_system import KrakenSystem
 from kraken.core.configs.config import Config
 from kraken.core.profiler import Profiler
+from kraken.core.build_plan import BuildPlan
+from kraken.core.dcc_item_cache import DCCItemCache
 
+from kraken.core.objects.object_3d import resolveBuildNames
 from kraken.core.objects.components.component import Component
 from kraken.core.objects.constraints.pose_constraint import PoseConstraint
 
@@ -18,7 +21,6 @@ class Builder(object):
     """Builder object for building objects in DCC's. Sub-class per DCC in a
     plugin."""
 
-
     def __init__(self, debugMode = False):
         super(Builder, self).__init__()
         self._buildElements = []
@@ -35,6 +37,9 @@ class Builder(object):
         """Registers a pairing between the kraken scene item and the dcc scene item
         for querying later.
 
+        The dcc scene item is also recorded in the DCCItemCache, where
+        synchronizers look it up.
+
         Args:
             kSceneItem (object): kraken scene item that you want to pair.
             dccSceneItem (object): dcc scene item that you want to pair.
@@ -51,6 +56,9 @@ class Builder(object):
 
         self._buildElements.append(pairing)
 
+        if dccSceneItem is not None:
+            DCCItemCache.getInstance().setDCCItem(kSceneItem, dccSceneItem)
+
         return True
 
 
@@ -72,6 +80,76 @@ class Builder(object):
         return None
 
 
+    # =================
+    # Teardown Methods
+    # =================
+    def deleteDCCSceneItem(self, dccSceneItem):
+        """Deletes a DCC scene item that was built by this builder.
+
+        Args:
+            dccSceneItem (object): DCC scene item to delete.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        # Implemented in DCC Plugins.
+
+        return True
+
+
+    def deleteBuildElements(self, kSceneItems):
+        """Deletes the DCC scene items built for the supplied kraken scene items
+        and removes their pairings, so they can be built again.
+
+        The DCC scene items are deleted in the reverse order they were built
+        in, children before their parents and constraints before the objects
+        they constrain.
+
+        Args:
+            kSceneItems (list): kraken scene items to delete the DCC scene
+                items of.
+
+        Returns:
+            list: The DCC scene items that were deleted.
+
+        """
+
+        kSceneItemIds = set([id(x) for x in kSceneItems])
+
+        dccItemCache = DCCItemCache.getInstance()
+        for kSceneItem in kSceneItems:
+            dccItemCache.removeDCCItem(kSceneItem)
+
+        deleted = []
+        deletedIds = set()
+        buildElements = []
+        for builtElement in reversed(self._buildElements):
+            dccSceneItem = builtElement['tgt']
+
+            # The constraints of component inputs are paired with the input
+            # and with the constraint that was created to build it.
+            if id(dccSceneItem) in deletedIds:
+                continue
+
+            if id(builtElement['src']) not in kSceneItemIds:
+                buildElements.append(builtElement)
+                continue
+
+            if dccSceneItem is None:
+                continue
+
+            self.deleteDCCSceneItem(dccSceneItem)
+            deleted.append(dccSceneItem)
+            deletedIds.add(id(dccSceneItem))
+
+        buildElements.reverse()
+        self._buildElements = buildElements
+
+        return deleted
+
+
     # ========================
     # SceneItem Build Methods
     # ========================
@@ -486,210 +564,195 @@ class Builder(object):
 
         """
 
+        return self.buildPlanObjects(BuildPlan(kObject))
 
-        dccSceneItem = None
 
-        buildName = kObject.getBuildName()
+    def buildConstraints(self, kObject):
+        """Builds constraints for the supplied kObject.
 
-        if self._debugMode:
-            print "building:" + kObject.getPath() + " as:" + buildName
+        Args:
+            kObject (object): kraken object to create constraints for.
 
-        # Build Object
-        if kObject.isTypeOf("Container"):
-            dccSceneItem = self.buildContainer(kObject, buildName)
+        Returns:
+            bool: True if successful.
 
-        elif kObject.isTypeOf("Layer"):
-            dccSceneItem = self.buildLayer(kObject, buildName)
+        """
 
-        elif kObject.isTypeOf("Component"):
-            pass
+        return self.buildPlanConstraints(BuildPlan(kObject))
 
-        elif kObject.isTypeOf("ComponentGroup"):
-            dccSceneItem = self.buildGroup(kObject, buildName)
-            component = kObject
 
-        elif kObject.isTypeOf("HierarchyGroup"):
-            dccSceneItem = self.buildHierarchyGroup(kObject, buildName)
+    def buildInputConnections(self, kObject):
+        """Builds the connections between the component inputs of each
+        component.
 
-        elif kObject.isTypeOf("CtrlSpace"):
-            dccSceneItem = self.buildGroup(kObject, buildName)
+        Only input connections are built otherwise duplicate constraints / expressions
+        would be created.
 
-        elif kObject.isTypeOf("Transform"):
-            dccSceneItem = self.buildGroup(kObject, buildName)
+        Args:
+            kObject (object): kraken object to create connections for.
 
-        elif kObject.isTypeOf("Locator"):
-            dccSceneItem = self.buildLocator(kObject, buildName)
+        Returns:
+            bool: True if successful.
 
-        elif kObject.isTypeOf("Joint"):
-            dccSceneItem = self.buildJoint(kObject, buildName)
+        """
 
-        elif kObject.isTypeOf("Control"):
-            dccSceneItem = self.buildControl(kObject, buildName)
+        return self.buildPlanInputConnections(BuildPlan(kObject))
 
-        elif kObject.isTypeOf("Curve"):
-            dccSceneItem = self.buildCurve(kObject, buildName)
 
-        # Important Note: The order of these tests is important.
-        # New classes should be added above the classes they are derrived from.
-        # No new types should be added below SceneItem here.
-        elif kObject.isTypeOf("SceneItem"):
-            dccSceneItem = self.buildLocator(kObject, buildName)
+    def buildAttrConnections(self, kObject):
+        """Builds the connections between the component inputs and outputs of each
+        component.
 
-        else:
-            raise NotImplementedError(kObject.getName() + ' has an unsupported type: ' + str(type(kObject)))
+        Args:
+            kObject (object): kraken object to create connections for.
 
-        if dccSceneItem is not None:
-            self.buildAttributes(kObject)
-            self.setTransform(kObject)
-            self.lockParameters(kObject)
-            self.setVisibility(kObject)
-            self.setObjectColor(kObject)
+        Returns:
+            bool: True if successful.
 
-        # Build children
-        for i in xrange(kObject.getNumChildren()):
-            child = kObject.getChildByIndex(i)
-            self.buildHierarchy(child, component)
+        """
 
-        return dccSceneItem
+        return self.buildPlanAttrConnections(BuildPlan(kObject))
 
 
-    def buildConstraints(self, kObject):
-        """Builds constraints for the supplied kObject.
+    def buildOperators(self, kObject):
+        """Build operators in the hierarchy.
 
         Args:
-            kObject (object): kraken object to create constraints for.
+            kObject (object): kraken object to create operators for.
 
         Returns:
             bool: True if successful.
 
         """
 
-        dccSceneItem = None
-        for i in xrange(kObject.getNumConstraints()):
+        return self.buildPlanOperators(BuildPlan(kObject))
 
-            constraint = kObject.getConstraintByIndex(i)
 
-            # Build Object
-            if constraint.isTypeOf("OrientationConstraint"):
-                dccSceneItem = self.buildOrientationConstraint(constraint)
-
-            elif constraint.isTypeOf("PoseConstraint"):
-                dccSceneItem = self.buildPoseConstraint(constraint)
-
-            elif constraint.isTypeOf("PositionConstraint"):
-                dccSceneItem = self.buildPositionConstraint(constraint)
+    # ===================
+    # Build Plan Methods
+    # ===================
+    def createBuildPlan(self, kSceneItem):
+        """Creates the build plan of the supplied kSceneItem.
 
-            elif constraint.isTypeOf("ScaleConstraint"):
-                dccSceneItem = self.buildScaleConstraint(constraint)
+        The plan can be inspected, and passed to build() to skip the traversal
+        of the hierarchy when the same rig is built several times.
 
-            else:
-                raise NotImplementedError(constraint.getName() + ' has an unsupported type: ' + str(type(constraint)))
+        Args:
+            kSceneItem (object): kraken kSceneItem object to build.
 
-        # Build children
-        for i in xrange(kObject.getNumChildren()):
-            child = kObject.getChildByIndex(i)
-            self.buildConstraints(child)
+        Returns:
+            BuildPlan: The build plan.
 
-        return True
+        """
 
+        return BuildPlan(kSceneItem)
 
-    def buildInputConnections(self, kObject):
-        """Builds the connections between the component inputs of each
-        component.
 
-        Only input connections are built otherwise duplicate constraints / expressions
-        would be created.
+    def buildPlanObjects(self, buildPlan):
+        """Builds the scene items of the supplied build plan.
 
         Args:
-            kObject (object): kraken object to create connections for.
+            buildPlan (BuildPlan): The build plan.
 
         Returns:
-            bool: True if successful.
+            object: DCC object that was created for the root of the plan.
 
         """
 
-        if kObject.isTypeOf('Component'):
+        rootDCCSceneItem = None
+        root = buildPlan.getRoot()
+        resolveBuildNames(root)
+
+        for kObject, buildMethodName in buildPlan.getObjects():
+            buildName = kObject.getBuildName()
 
-            # Build input connections
-            for i in xrange(kObject.getNumInputs()):
+            if self._debugMode:
+                print "building:" + kObject.getPath() + " as:" + buildName
 
-                componentInput = kObject.getInputByIndex(i)
-                if componentInput.getTarget() is None or componentInput.getConnection() is None:
-                    continue
+            if buildMethodName is None:
+                continue
 
-                if self._debugMode:
-                    print "buildConnection:" + componentInput.getName()
+            dccSceneItem = getattr(self, buildMethodName)(kObject, buildName)
+            if dccSceneItem is not None:
+                self.buildAttributes(kObject)
+                self.setTransform(kObject)
+                self.lockParameters(kObject)
+                self.setVisibility(kObject)
+                self.setObjectColor(kObject)
 
-                if componentInput.getDataType().startswith('Xfo'):
-                    self.buildXfoConnection(componentInput)
+            if kObject is root:
+                rootDCCSceneItem = dccSceneItem
 
-                elif componentInput.getDataType().startswith(('Boolean', 'Float', 'Integer', 'String')):
-                    self.buildAttributeConnection(componentInput)
+        return rootDCCSceneItem
 
-        # Build connections for children.
-        for i in xrange(kObject.getNumChildren()):
-            child = kObject.getChildByIndex(i)
-            self.buildInputConnections(child)
+
+    def buildPlanAttrConnections(self, buildPlan):
+        """Connects the attributes of the supplied build plan.
+
+        Args:
+            buildPlan (BuildPlan): The build plan.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        for attribute in buildPlan.getAttributes():
+            self.connectAttribute(attribute)
 
         return True
 
 
-    def buildAttrConnections(self, kObject):
-        """Builds the connections between the component inputs and outputs of each
-        component.
+    def buildPlanInputConnections(self, buildPlan):
+        """Builds the component input connections of the supplied build plan.
 
         Args:
-            kObject (object): kraken object to create connections for.
+            buildPlan (BuildPlan): The build plan.
 
         Returns:
             bool: True if successful.
 
         """
 
-        # Build input connections
-        for i in xrange(kObject.getNumAttributeGroups()):
-            attributeGroup = kObject.getAttributeGroupByIndex(i)
+        for componentInput, buildMethodName in buildPlan.getInputConnections():
+            if self._debugMode:
+                print "buildConnection:" + componentInput.getName()
 
-            for y in xrange(attributeGroup.getNumAttributes()):
-                attribute = attributeGroup.getAttributeByIndex(y)
-                self.connectAttribute(attribute)
-
-        # Build connections for children.
-        for i in xrange(kObject.getNumChildren()):
-            child = kObject.getChildByIndex(i)
-            self.buildAttrConnections(child)
+            getattr(self, buildMethodName)(componentInput)
 
         return True
 
 
-    def buildOperators(self, kObject):
-        """Build operators in the hierarchy.
+    def buildPlanOperators(self, buildPlan):
+        """Builds the operators of the supplied build plan.
 
         Args:
-            kObject (object): kraken object to create operators for.
+            buildPlan (BuildPlan): The build plan.
 
         Returns:
             bool: True if successful.
 
         """
 
-        if kObject.isTypeOf('Component'):
+        for operator, buildMethodName in buildPlan.getOperators():
+            getattr(self, buildMethodName)(operator)
+
+        return True
+
 
-            # Build operators
-            for i in xrange(kObject.getNumOperators()):
-                operator = kObject.getOperatorByIndex(i)
+    def buildPlanConstraints(self, buildPlan):
+        """Builds the constraints of the supplied build plan.
 
-                if operator.isTypeOf('KLOperator'):
-                    self.buildKLOperator(operator)
-                elif operator.isTypeOf('CanvasOperator'):
-                    self.buildCanvasOperator(operator)
-                else:
-                    raise NotImplementedError(operator.getName() + ' has an unsupported type: ' + str(type(operator)))
+        Args:
+            buildPlan (BuildPlan): The build plan.
 
-        # Build connections for children.
-        for i in xrange(kObject.getNumChildren()):
-            child = kObject.getChildByIndex(i)
-            self.buildOperators(child)
+        Returns:
+            bool: True if successful.
+
+        """
+
+        for constraint, buildMethodName in buildPlan.getConstraints():
+            getattr(self, buildMethodName)(constraint)
 
         return True
 
@@ -861,31 +924,37 @@ class Builder(object):
         return True
 
 
-    def _build(self, kSceneItem):
+    def _build(self, kSceneItem, buildPlan=None):
         """Protected build method.
 
         Args:
             kSceneItem (object): kraken kSceneItem object to build.
+            buildPlan (BuildPlan): plan of the kSceneItem, created if None.
 
         Returns:
             bool: True if successful.
 
         """
 
-        self.buildHierarchy(kSceneItem, component=None)
-        self.buildAttrConnections(kSceneItem)
-        self.buildInputConnections(kSceneItem)
-        self.buildOperators(kSceneItem)
-        self.buildConstraints(kSceneItem)
+        if buildPlan is None:
+            buildPlan = self.createBuildPlan(kSceneItem)
+
+        self.buildPlanObjects(buildPlan)
+        self.buildPlanAttrConnections(buildPlan)
+        self.buildPlanInputConnections(buildPlan)
+        self.buildPlanOperators(buildPlan)
+        self.buildPlanConstraints(buildPlan)
 
         return True
 
 
-    def build(self, kSceneItem):
+    def build(self, kSceneItem, buildPlan=None):
         """Builds the supplied kSceneItem into a DCC representation.
 
         Args:
             kSceneItem (object): kraken kSceneItem object to build.
+            buildPlan (BuildPlan): plan created by createBuildPlan() for the
+                kSceneItem, created if None.
 
         Returns:
             object: The DCC scene item of the kSceneItem that was passed to the builder.
@@ -896,7 +965,7 @@ class Builder(object):
 
         try:
             self._preBuild(kSceneItem)
-            self._build(kSceneItem)
+            self._build(kSceneItem, buildPlan=buildPlan)
 
         finally:
             self._postBuild()
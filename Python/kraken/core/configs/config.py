@@ -1,16 +1,72 @@
 """Kraken - base config module.
 
 Classes:
+FrozenDict -- Dictionary that can't be modified.
 Config -- Base config object used to configure builders.
 
 """
 
+import hashlib
+import json
+import weakref
+
+
+class FrozenDict(dict):
+    """Dictionary that can't be modified, used for the data shared by the
+    instances of a config class."""
+
+    def _readOnly(self, *args, **kwargs):
+        raise TypeError("Config data can't be modified, override the init methods of the config instead.")
+
+    __setitem__ = _readOnly
+    __delitem__ = _readOnly
+    clear = _readOnly
+    pop = _readOnly
+    popitem = _readOnly
+    setdefault = _readOnly
+    update = _readOnly
+
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freezeData(data):
+    """Returns a copy of the supplied data that can't be modified, dicts being
+    converted to FrozenDicts and lists to tuples.
+
+    Args:
+        data (object): The data to freeze.
+
+    Returns:
+        object: The frozen data.
+
+    """
+
+    if isinstance(data, dict):
+        return FrozenDict([(key, freezeData(value)) for key, value in data.iteritems()])
+
+    if isinstance(data, (list, tuple)):
+        return tuple([freezeData(x) for x in data])
+
+    return data
+
 
 class Config(object):
-    """Base Configuration for Kraken builders."""
+    """Base Configuration for Kraken builders.
+
+    The colors, color map, name template and control shapes of a config class
+    are initialized once, frozen, and shared by all the instances of the
+    class, so making a config current again or after a build is cheap. Each
+    config is identified by a hash of its content, see getHash().
+
+    """
 
     __instance = None
 
+    # Frozen data of each config class.
+    __classData = weakref.WeakKeyDictionary()
+
     def __init__(self):
         super(Config, self).__init__()
 
@@ -20,11 +76,46 @@ class Config(object):
 
         Config.__instance = self
 
+        classData = Config.__classData.get(type(self))
+        if classData is None:
+            classData = self._initClassData()
+            Config.__classData[type(self)] = classData
+
         self._explicitNaming = False
-        self._colors = self.initColors()
-        self._colorMap = self.initColorMap()
-        self._nameTemplate = self.initNameTemplate()
-        self._controlShapes = self.initControlShapes()
+        self._colors = classData['colors']
+        self._colorMap = classData['colorMap']
+        self._nameTemplate = classData['nameTemplate']
+        self._controlShapes = classData['controlShapes']
+        self._controlShapeLibrary = classData['controlShapeLibrary']
+        self._classHash = classData['hash']
+        self._hash = None
+
+
+    def _initClassData(self):
+        """Initializes the data shared by the instances of the config class.
+
+        Returns:
+            dict: The frozen colors, color map, name template and control
+                shapes, the control shape library and the hash of the data.
+
+        """
+
+        from kraken.core.objects.curve_shape import CurveShapeLibrary
+
+        classData = {
+            'colors': freezeData(self.initColors()),
+            'colorMap': freezeData(self.initColorMap()),
+            'nameTemplate': freezeData(self.initNameTemplate()),
+            'controlShapes': freezeData(self.initControlShapes())
+        }
+
+        classData['controlShapeLibrary'] = CurveShapeLibrary(classData['controlShapes'])
+
+        hashData = dict(classData, controlShapeLibrary=None,
+                        configClass=type(self).__module__ + '.' + type(self).__name__)
+        classData['hash'] = hashlib.md5(json.dumps(hashData, sort_keys=True)).hexdigest()
+
+        return classData
 
 
     # ==============
@@ -498,6 +589,38 @@ class Config(object):
         return self._controlShapes
 
 
+    def getControlShapeLibrary(self):
+        """Returns the library of the shared shapes of the control shapes.
+
+        Returns:
+            CurveShapeLibrary: The control shape library.
+
+        """
+
+        return self._controlShapeLibrary
+
+
+    # =============
+    # Hash Methods
+    # =============
+    def getHash(self):
+        """Returns the hash identifying the config, computed from its class,
+        data and explicit naming setting.
+
+        Caches of data depending on the config, such as build names, can be
+        keyed on it.
+
+        Returns:
+            str: The hex digest of the config.
+
+        """
+
+        if self._hash is None:
+            self._hash = hashlib.md5(self._classHash + ':' + str(self._explicitNaming)).hexdigest()
+
+        return self._hash
+
+
     # =========================
     # Explicity Naming Methods
     # =========================
@@ -524,6 +647,7 @@ class Config(object):
         """
 
         self._explicitNaming = value
+        self._hash = None
 
         return True
 
@@ -561,6 +685,8 @@ class Config(object):
         Config.__instance = None
         Config.__instance = cls()
 
+        return Config.__instance
+
 
     @classmethod
     def clearInstance(cls):
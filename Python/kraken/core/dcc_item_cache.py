@@ -0,0 +1,115 @@
+"""Kraken - core.dcc_item_cache module.
+
+Classes:
+DCCItemCache -- Handles of the DCC items built for Kraken objects.
+
+"""
+
+import weakref
+
+
+class DCCItemCache(object):
+    """Singleton holding the handles of the DCC items built for Kraken objects.
+
+    Builders record the DCC item of each scene item they build, and
+    synchronizers look the items up here instead of resolving the path of each
+    object in the DCC. The handles are held until the Kraken objects are
+    garbage collected; synchronizers check that a handle is still valid before
+    using it and resolve the item again from its path when it isn't.
+
+    """
+
+    __instance = None
+
+    def __init__(self):
+        super(DCCItemCache, self).__init__()
+
+        self._dccItems = weakref.WeakKeyDictionary()
+
+
+    def getDCCItem(self, kSceneItem):
+        """Returns the handle of the DCC item of a Kraken scene item.
+
+        Args:
+            kSceneItem (object): The Kraken scene item.
+
+        Returns:
+            object: The DCC item, None if none is recorded.
+
+        """
+
+        return self._dccItems.get(kSceneItem)
+
+
+    def setDCCItem(self, kSceneItem, dccItem):
+        """Records the handle of the DCC item of a Kraken scene item.
+
+        Args:
+            kSceneItem (object): The Kraken scene item.
+            dccItem (object): The DCC item, None to remove the record.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        if dccItem is None:
+            return self.removeDCCItem(kSceneItem)
+
+        self._dccItems[kSceneItem] = dccItem
+
+        return True
+
+
+    def removeDCCItem(self, kSceneItem):
+        """Removes the handle of the DCC item of a Kraken scene item.
+
+        Args:
+            kSceneItem (object): The Kraken scene item.
+
+        Returns:
+            bool: True if a handle was removed.
+
+        """
+
+        if kSceneItem not in self._dccItems:
+            return False
+
+        del self._dccItems[kSceneItem]
+
+        return True
+
+
+    def clear(self):
+        """Removes all the handles.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        self._dccItems.clear()
+
+        return True
+
+
+    def __len__(self):
+        return len(self._dccItems)
+
+
+    # ==================
+    # Instance Methods
+    # ==================
+    @classmethod
+    def getInstance(cls):
+        """This class method returns the singleton instance of the DCCItemCache.
+
+        Returns:
+            object: The singleton instance.
+
+        """
+
+        if cls.__instance is None:
+            cls.__instance = DCCItemCache()
+
+        return cls.__instance
@@ -0,0 +1,405 @@
+"""Kraken - core.evaluation_graph module.
+
+Classes:
+EvaluationGraph -- Dependency graph of the constraints, operators and input
+connections of a hierarchy.
+
+"""
+
+import heapq
+
+from kraken.core.build_plan import BuildPlan
+from kraken.core.profiler import Profiler
+from kraken.core.objects.scene_item import SceneItem
+
+
+class EvaluationGraph(object):
+    """Dependency graph used to evaluate a hierarchy in a single pass.
+
+    The nodes of the graph are the component input connections, operators and
+    constraints of the hierarchy. Each node reads and writes objects:
+
+    - component inputs read the target of their connection and write their
+      own target.
+    - operators read their inputs and write their outputs.
+    - constraints read their constrainers and write their constrainee.
+
+    A node depends on every node writing an object it reads. The nodes are
+    scheduled in topological order, nodes that don't depend on each other
+    keeping the order they were gathered in. Evaluating the graph evaluates
+    each node once, so the pose resolves across component boundaries.
+
+    Scene items marked dirty, by setting their xfo or value, are tracked so
+    evaluateDirty only re-evaluates the nodes downstream of them.
+
+    Args:
+        kSceneItem (object): The root of the hierarchy to evaluate.
+
+    """
+
+    def __init__(self, kSceneItem):
+        super(EvaluationGraph, self).__init__()
+
+        self._root = kSceneItem
+        self._items = {}
+        self._nodes = []
+        self._nodeIndices = {}
+        self._dependencies = []
+        self._dependents = []
+        self._readers = {}
+        self._schedule = None
+        self._schedulePositions = None
+        self._cycle = None
+
+        self._gather(kSceneItem)
+        self._sort()
+
+
+    # ===============
+    # Gather Methods
+    # ===============
+    def _gather(self, kSceneItem):
+        """Gathers the nodes of the hierarchy and their dependencies.
+
+        Args:
+            kSceneItem (object): The root of the hierarchy.
+
+        """
+
+        buildPlan = BuildPlan(kSceneItem)
+
+        for kObject, buildMethodName in buildPlan.getObjects():
+            self._items[id(kObject)] = kObject
+
+        for attribute in buildPlan.getAttributes():
+            self._items[id(attribute)] = attribute
+
+        for componentInput, buildMethodName in buildPlan.getInputConnections():
+            self._nodes.append(componentInput)
+
+        for operator, buildMethodName in buildPlan.getOperators():
+            self._nodes.append(operator)
+
+        for constraint, buildMethodName in buildPlan.getConstraints():
+            self._nodes.append(constraint)
+
+        reads = []
+        writers = {}
+        for i, node in enumerate(self._nodes):
+            self._nodeIndices[id(node)] = i
+
+            nodeReads, nodeWrites = self._getReadsAndWrites(node)
+            reads.append(nodeReads)
+
+            for kObject in nodeReads:
+                self._readers.setdefault(id(kObject), []).append(i)
+
+            for kObject in nodeWrites:
+                writers.setdefault(id(kObject), []).append(i)
+
+        for i, nodeReads in enumerate(reads):
+            dependencies = set()
+            for kObject in nodeReads:
+                dependencies.update(writers.get(id(kObject), ()))
+
+            dependencies.discard(i)
+            self._dependencies.append(sorted(dependencies))
+
+
+    def _getReadsAndWrites(self, node):
+        """Returns the objects a node reads and writes.
+
+        Args:
+            node (object): Component input, operator or constraint.
+
+        Returns:
+            tuple: The list of objects read and the list of objects written.
+
+        """
+
+        if node.isTypeOf('Constraint'):
+            reads = node.getConstrainers()
+            writes = [node.getConstrainee()]
+
+        elif node.isTypeOf('Operator'):
+            reads = self._flatten(node.inputs.values())
+            writes = self._flatten(node.outputs.values())
+
+        else:
+            reads = [node.getConnectionTarget()]
+            writes = [node.getTarget()]
+
+        return [x for x in reads if x is not None], [x for x in writes if x is not None]
+
+
+    def _flatten(self, values):
+        """Flattens the values of operator ports, array ports being lists.
+
+        Args:
+            values (list): The port values.
+
+        Returns:
+            list: The objects connected to the ports.
+
+        """
+
+        result = []
+        for value in values:
+            if isinstance(value, list):
+                result.extend(value)
+            else:
+                result.append(value)
+
+        return result
+
+
+    def _sort(self):
+        """Computes the schedule, or the first cycle found when the nodes can't
+        be ordered."""
+
+        dependents = [[] for x in self._nodes]
+        pending = []
+        for i, dependencies in enumerate(self._dependencies):
+            pending.append(len(dependencies))
+            for dependency in dependencies:
+                dependents[dependency].append(i)
+
+        self._dependents = dependents
+
+        # Ready nodes are taken in gather order.
+        ready = [index for index, count in enumerate(pending) if count == 0]
+        heapq.heapify(ready)
+
+        schedule = []
+        while len(ready) > 0:
+            i = heapq.heappop(ready)
+            schedule.append(i)
+
+            for dependent in dependents[i]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    heapq.heappush(ready, dependent)
+
+        if len(schedule) == len(self._nodes):
+            self._schedule = [self._nodes[index] for index in schedule]
+            self._schedulePositions = [0] * len(schedule)
+            for position, i in enumerate(schedule):
+                self._schedulePositions[i] = position
+
+            return
+
+        # Every node left has a dependency left, walk the dependencies back
+        # until a node is visited twice.
+        i = min(x for x, count in enumerate(pending) if count > 0)
+        visited = []
+        while i not in visited:
+            visited.append(i)
+            i = [x for x in self._dependencies[i] if pending[x] > 0][0]
+
+        cycle = visited[visited.index(i):]
+        cycle.reverse()
+        self._cycle = [self._nodes[x] for x in cycle]
+
+
+    # =================
+    # Schedule Methods
+    # =================
+    def getRoot(self):
+        """Returns the root of the hierarchy the graph was gathered from.
+
+        Returns:
+            object: The root scene item.
+
+        """
+
+        return self._root
+
+
+    def getNodes(self):
+        """Returns the nodes of the graph in gather order.
+
+        Returns:
+            list: The component inputs, operators and constraints.
+
+        """
+
+        return self._nodes
+
+
+    def getDependencies(self, node):
+        """Returns the nodes a node depends on.
+
+        Args:
+            node (object): Node of the graph.
+
+        Returns:
+            list: The nodes to evaluate before the given node.
+
+        """
+
+        i = self._nodeIndices.get(id(node))
+        if i is None:
+            raise Exception("Node '" + node.getPath() + "' is not in the evaluation graph.")
+
+        return [self._nodes[x] for x in self._dependencies[i]]
+
+
+    def hasCycle(self):
+        """Returns whether the graph has a cycle.
+
+        Returns:
+            bool: True if the nodes can't be ordered.
+
+        """
+
+        return self._cycle is not None
+
+
+    def getCycle(self):
+        """Returns the nodes of the cycle found in the graph.
+
+        Returns:
+            list: The nodes of the cycle in evaluation order, None if the graph
+                has no cycle.
+
+        """
+
+        return self._cycle
+
+
+    def getSchedule(self):
+        """Returns the nodes in the order they are evaluated.
+
+        Returns:
+            list: The component inputs, operators and constraints.
+
+        """
+
+        if self._cycle is not None:
+            cyclePaths = [x.getPath() for x in self._cycle]
+            raise Exception("Cycle found in evaluation graph: " +
+                            " -> ".join(cyclePaths + cyclePaths[:1]))
+
+        return self._schedule
+
+
+    def getDescription(self):
+        """Returns a description of the schedule for inspection.
+
+        Returns:
+            list: The paths of the nodes in evaluation order, with the paths of
+                the nodes they depend on.
+
+        """
+
+        description = []
+        for node in self.getSchedule():
+            description.append((node.getPath(), [x.getPath() for x in self.getDependencies(node)]))
+
+        return description
+
+
+    # ==============
+    # Dirty Methods
+    # ==============
+    def getDirtyItems(self):
+        """Returns the items of the hierarchy marked dirty.
+
+        Returns:
+            list: The dirty objects and attributes.
+
+        """
+
+        items = self._items
+
+        return [x for x in SceneItem._dirtyItems.values() if items.get(id(x)) is x]
+
+
+    def getDirtySchedule(self):
+        """Returns the nodes downstream of the dirty items, in the order they
+        are evaluated.
+
+        Returns:
+            list: The component inputs, operators and constraints to evaluate.
+
+        """
+
+        self.getSchedule()
+
+        stack = []
+        for item in self.getDirtyItems():
+            stack.extend(self._readers.get(id(item), ()))
+
+        affected = set()
+        while len(stack) > 0:
+            i = stack.pop()
+            if i in affected:
+                continue
+
+            affected.add(i)
+            stack.extend(self._dependents[i])
+
+        return [self._nodes[index] for index in sorted(affected, key=self._schedulePositions.__getitem__)]
+
+
+    def clearDirty(self):
+        """Clears the dirty marks of the items of the hierarchy.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        dirtyItems = SceneItem._dirtyItems
+        for item in self.getDirtyItems():
+            del dirtyItems[id(item)]
+
+        return True
+
+
+    # ===================
+    # Evaluation Methods
+    # ===================
+    def evaluate(self):
+        """Evaluates each node of the graph once, in schedule order.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        schedule = self.getSchedule()
+
+        Profiler.getInstance().push("evaluate:" + self._root.getName())
+
+        for node in schedule:
+            node.evaluate()
+
+        self.clearDirty()
+
+        Profiler.getInstance().pop()
+
+        return True
+
+
+    def evaluateDirty(self):
+        """Evaluates the nodes downstream of the dirty items once, in
+        schedule order, and clears the dirty marks.
+
+        Returns:
+            list: The nodes that were evaluated.
+
+        """
+
+        schedule = self.getDirtySchedule()
+
+        Profiler.getInstance().push("evaluateDirty:" + self._root.getName())
+
+        for node in schedule:
+            node.evaluate()
+
+        self.clearDirty()
+
+        Profiler.getInstance().pop()
+
+        return schedule
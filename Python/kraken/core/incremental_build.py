@@ -0,0 +1,375 @@
+"""Kraken - core.incremental_build module.
+
+Classes:
+IncrementalBuild -- Rebuilds the components of a rig that changed since its previous build.
+
+"""
+
+import hashlib
+import json
+
+from kraken.core.configs.config import Config
+from kraken.core.build_plan import BuildPlan
+from kraken.core.objects.rig import Rig
+from kraken.core.profiler import Profiler
+from kraken.helpers.utility_methods import prepareToSave
+
+
+class IncrementalBuild(object):
+    """Keeps a built rig and rebuilds only the components that changed when the
+    rig is built again.
+
+    The rig build data of each component and the connections to its inputs
+    are hashed at each build. Components whose data changed are torn down in
+    the DCC, reconstructed and built again through the same builder. The
+    components that are connected to them, or whose connections changed, only
+    get their input connections rebuilt. The first build is a full build, as
+    are the builds of a rig with another name or with another config.
+
+    Args:
+        builder (Builder): The builder the rig is built with, it must be used
+            for the builds of this rig only.
+        buildCache (BuildCache): Cache the components are loaded from.
+
+    """
+
+    def __init__(self, builder, buildCache=None):
+        super(IncrementalBuild, self).__init__()
+
+        self._builder = builder
+        self._buildCache = buildCache
+        self._rig = None
+        self._configHash = None
+        self._componentHashes = {}
+
+
+    def getBuilder(self):
+        """Returns the builder the rig is built with.
+
+        Returns:
+            Builder: The builder.
+
+        """
+
+        return self._builder
+
+
+    def getRig(self):
+        """Returns the rig of the last build.
+
+        Returns:
+            Rig: The rig, None if it wasn't built yet.
+
+        """
+
+        return self._rig
+
+
+    # ===============
+    # Hash Methods
+    # ===============
+    @classmethod
+    def getComponentKey(cls, componentData):
+        """Returns the decorated name of the component of the supplied data.
+
+        Args:
+            componentData (dict): Rig build data of the component.
+
+        Returns:
+            str: The decorated name, None if the data has no name.
+
+        """
+
+        if 'name' not in componentData:
+            return None
+
+        return componentData['name'] + ':' + componentData.get('location', 'M')
+
+
+    @classmethod
+    def hashData(cls, data):
+        """Returns a hash of the supplied JSON data.
+
+        Args:
+            data (dict): The data to hash, it can contain math types.
+
+        Returns:
+            str: The hex digest of the data.
+
+        """
+
+        return hashlib.md5(json.dumps(prepareToSave(data), sort_keys=True)).hexdigest()
+
+
+    def getComponentHashes(self, rigBuildData):
+        """Returns the hashes of the components of the supplied rig build data.
+
+        Args:
+            rigBuildData (dict): The rig build data.
+
+        Returns:
+            dict: The hash of the data and the hash of the input connections
+                of each component, by decorated name. None if a component has
+                no name.
+
+        """
+
+        connectionsByTarget = {}
+        for connectionData in rigBuildData.get('connections', []):
+            targetKey = connectionData['target'].split('.')[0]
+            connectionsByTarget.setdefault(targetKey, []).append(connectionData)
+
+        componentHashes = {}
+        for componentData in rigBuildData.get('components', []):
+            componentKey = self.getComponentKey(componentData)
+            if componentKey is None or componentKey in componentHashes:
+                return None
+
+            connections = sorted(connectionsByTarget.get(componentKey, []), key=lambda x: x['target'])
+            componentHashes[componentKey] = (self.hashData(componentData), self.hashData(connections))
+
+        return componentHashes
+
+
+    # ==============
+    # Build Methods
+    # ==============
+    def build(self, rigBuildData, rigName=None):
+        """Builds the rig of the supplied rig build data, rebuilding only the
+        components that changed since the previous build.
+
+        Args:
+            rigBuildData (dict): The rig build data.
+            rigName (str): Name of the built rig, the name of the rig build
+                data is used if None.
+
+        Returns:
+            dict: The decorated names of the components that were 'rebuilt',
+                'reconnected' and 'removed'.
+
+        """
+
+        if rigName is None:
+            rigName = rigBuildData.get('name', 'rig')
+
+        componentHashes = self.getComponentHashes(rigBuildData)
+        configHash = Config.getInstance().getHash()
+
+        if self._rig is None or componentHashes is None or self._rig.getName() != rigName or \
+                self._configHash != configHash:
+            changes = self._fullBuild(rigBuildData, rigName)
+        else:
+            changes = self._incrementalBuild(rigBuildData, componentHashes)
+
+        self._configHash = configHash
+        self._componentHashes = componentHashes or {}
+
+        return changes
+
+
+    def _fullBuild(self, rigBuildData, rigName):
+        """Builds a new rig from the supplied rig build data.
+
+        Args:
+            rigBuildData (dict): The rig build data.
+            rigName (str): Name of the built rig.
+
+        Returns:
+            dict: The decorated names of the components that were built.
+
+        """
+
+        Profiler.getInstance().push("fullBuild:" + rigName)
+
+        rig = Rig()
+        rig.loadRigDefinition(rigBuildData, buildCache=self._buildCache)
+        rig.setName(rigName)
+
+        self._builder.setConfig(Config.getInstance())
+        self._builder.build(rig)
+        self._rig = rig
+
+        Profiler.getInstance().pop()
+
+        rebuilt = [x.getDecoratedName() for x in rig.getChildrenByType('Component')]
+
+        return {'rebuilt': rebuilt, 'reconnected': [], 'removed': []}
+
+
+    def _incrementalBuild(self, rigBuildData, componentHashes):
+        """Tears down and rebuilds the components of the rig that changed.
+
+        Args:
+            rigBuildData (dict): The rig build data.
+            componentHashes (dict): The hashes of the components of the rig
+                build data.
+
+        Returns:
+            dict: The decorated names of the components that were 'rebuilt',
+                'reconnected' and 'removed'.
+
+        """
+
+        rig = self._rig
+        prevHashes = self._componentHashes
+
+        Profiler.getInstance().push("incrementalBuild:" + rig.getName())
+
+        componentKeys = [self.getComponentKey(x) for x in rigBuildData.get('components', [])]
+
+        rebuilt = []
+        for componentKey in componentKeys:
+            prevHash = prevHashes.get(componentKey)
+            if prevHash is None or prevHash[0] != componentHashes[componentKey][0]:
+                rebuilt.append(componentKey)
+
+        removed = sorted([x for x in prevHashes if x not in componentHashes])
+
+        # Components connected to a rebuilt component get their connections
+        # made again, to the ports of the new component.
+        changedKeys = set(rebuilt) | set(removed)
+        reconnected = set()
+        for connectionData in rigBuildData.get('connections', []):
+            targetKey = connectionData['target'].split('.')[0]
+            if connectionData['source'].split('.')[0] in changedKeys:
+                reconnected.add(targetKey)
+
+        for componentKey, componentHash in componentHashes.iteritems():
+            prevHash = prevHashes.get(componentKey)
+            if prevHash is not None and prevHash[1] != componentHash[1]:
+                reconnected.add(componentKey)
+
+        reconnected = [x for x in componentKeys if x in reconnected and x not in changedKeys]
+
+        if len(changedKeys) == 0 and len(reconnected) == 0:
+            Profiler.getInstance().pop()
+            return {'rebuilt': [], 'reconnected': [], 'removed': []}
+
+        # Tear down the changed components and the input connections of the
+        # reconnected ones.
+        oldComponents = [x for x in [rig.getChildByDecoratedName(y) for y in changedKeys] if x is not None]
+        reconnectedComponents = [rig.getChildByDecoratedName(x) for x in reconnected]
+
+        oldPlan = BuildPlan(rig).getComponentPlan(oldComponents, reconnectedComponents)
+
+        kSceneItems = []
+        for kObject, buildMethodName in oldPlan.getObjects():
+            kSceneItems.append(kObject)
+            for i in xrange(kObject.getNumAttributeGroups()):
+                kSceneItems.append(kObject.getAttributeGroupByIndex(i))
+
+        kSceneItems.extend(oldPlan.getAttributes())
+        kSceneItems.extend([x[0] for x in oldPlan.getInputConnections()])
+        kSceneItems.extend([x[0] for x in oldPlan.getOperators()])
+        kSceneItems.extend([x[0] for x in oldPlan.getConstraints()])
+
+        self._builder.deleteBuildElements(kSceneItems)
+
+        for component in oldComponents + reconnectedComponents:
+            for i in xrange(component.getNumInputs()):
+                componentInput = component.getInputByIndex(i)
+                if componentInput.isConnected():
+                    componentInput.removeConnection()
+
+        # The children the torn down objects are removed from are kept in
+        # order, the rebuilt components are put back in their place.
+        oldComponentIds = set([id(x) for x in oldComponents])
+        parents = []
+        oldChildren = {}
+        removedKeys = {}
+        for kObject, buildMethodName in oldPlan.getObjects():
+            parent = kObject.getParent()
+            if id(parent) in oldComponentIds or id(parent.getComponent()) in oldComponentIds:
+                continue
+
+            if id(parent) not in oldChildren:
+                parents.append(parent)
+                oldChildren[id(parent)] = list(parent.getChildren())
+
+            removedKeys[id(kObject)] = self._getOwnerKey(kObject)
+
+            parent.removeChild(kObject)
+
+        # Reconstruct the changed components and build them with the input
+        # connections of the reconnected ones.
+        rebuiltKeys = set(rebuilt)
+        rig._loadComponents([x for x in rigBuildData.get('components', []) if self.getComponentKey(x) in rebuiltKeys],
+                            buildCache=self._buildCache)
+
+        connectedKeys = rebuiltKeys | set(reconnected)
+        rig._makeConnections([x for x in rigBuildData.get('connections', [])
+                              if x['target'].split('.')[0] in connectedKeys])
+        rig.evaluate()
+
+        for parent in parents:
+            self._restoreChildOrder(parent, oldChildren[id(parent)], removedKeys)
+
+        newComponents = [rig.getChildByDecoratedName(x) for x in rebuilt]
+        reconnectedComponents = [rig.getChildByDecoratedName(x) for x in reconnected]
+
+        self._builder.setConfig(Config.getInstance())
+        self._builder.build(rig, buildPlan=BuildPlan(rig).getComponentPlan(newComponents, reconnectedComponents))
+
+        Profiler.getInstance().pop()
+
+        return {'rebuilt': rebuilt, 'reconnected': reconnected, 'removed': removed}
+
+
+    def _getOwnerKey(self, kObject):
+        """Returns the decorated name of the component owning an object.
+
+        Args:
+            kObject (Object3D): The object, it can be the component itself.
+
+        Returns:
+            str: The decorated name, None if the object has no component.
+
+        """
+
+        if kObject.isTypeOf('Component'):
+            return kObject.getDecoratedName()
+
+        if kObject.getComponent() is None:
+            return None
+
+        return kObject.getComponent().getDecoratedName()
+
+
+    def _restoreChildOrder(self, parent, oldChildren, removedKeys):
+        """Moves the objects of the rebuilt components to the index the torn
+        down ones had in the children of their parent.
+
+        Args:
+            parent (Object3D): The parent of the objects.
+            oldChildren (list): The children of the parent before the tear
+                down.
+            removedKeys (dict): The decorated name of the component of each
+                torn down object, by id.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        oldChildIds = set([id(x) for x in oldChildren])
+
+        newChildren = {}
+        for child in parent.getChildren():
+            if id(child) not in oldChildIds:
+                newChildren.setdefault(self._getOwnerKey(child), []).append(child)
+
+        children = []
+        for child in oldChildren:
+            if id(child) in removedKeys:
+                children.extend(newChildren.pop(removedKeys[id(child)], []))
+            elif child.getParent() is parent:
+                children.append(child)
+
+        childIds = set([id(x) for x in children])
+        children.extend([x for x in parent.getChildren() if id(x) not in childIds])
+
+        for i, child in enumerate(children):
+            if parent.getChildByIndex(i) is not child:
+                parent.moveChild(child, i)
+
+        return True
@@ -0,0 +1,118 @@
+"""Kraken - core.io.json_codec module.
+
+Classes:
+KrakenJSONEncoder -- JSON encoder writing math values in their compact form.
+
+Functions:
+dumps -- Encodes rig data to a JSON string.
+dump -- Writes rig data to a JSON file.
+loads -- Decodes rig data from a JSON string.
+load -- Reads rig data from a JSON file.
+
+"""
+
+import json
+
+from kraken.core.maths import MATH_TYPES, encodeValue, decodeValue
+from kraken.core.maths.math_object import MathObject
+
+
+class KrakenJSONEncoder(json.JSONEncoder):
+    """JSON encoder writing the math values found in the data with
+    encodeValue, in the same pass as the rest of the data.
+
+    The data doesn't need to be prepared with prepareToSave before being
+    encoded, the math values are encoded where the encoder finds them.
+
+    """
+
+    def default(self, obj):
+        if isinstance(obj, MathObject) and obj.__class__.__name__ in MATH_TYPES:
+            return encodeValue(obj)
+
+        return super(KrakenJSONEncoder, self).default(obj)
+
+
+def _decodeObject(jsonData):
+    """Object hook of the JSON decoder, constructs the math values as soon as
+    their data is read.
+
+    Args:
+        jsonData (dict): A decoded JSON object.
+
+    Returns:
+        object: The math value, or the JSON object if it isn't a math value.
+
+    """
+
+    if '__mathObjectClass__' in jsonData:
+        return decodeValue(jsonData)
+
+    return jsonData
+
+
+def dumps(data, indent=None):
+    """Encodes rig data to a JSON string.
+
+    Args:
+        data (object): The data, it can contain math values.
+        indent (int): Indentation of the JSON, the most compact JSON is
+            written if None.
+
+    Returns:
+        str: The JSON string.
+
+    """
+
+    if indent is None:
+        return json.dumps(data, cls=KrakenJSONEncoder, separators=(',', ':'))
+
+    return json.dumps(data, cls=KrakenJSONEncoder, indent=indent)
+
+
+def dump(data, fileObj, indent=None):
+    """Writes rig data to a JSON file.
+
+    Args:
+        data (object): The data, it can contain math values.
+        fileObj (file): The file to write to.
+        indent (int): Indentation of the JSON, see dumps.
+
+    Returns:
+        bool: True if successful.
+
+    """
+
+    fileObj.write(dumps(data, indent=indent))
+
+    return True
+
+
+def loads(jsonString):
+    """Decodes rig data from a JSON string, constructing the math values in
+    the same pass. Math values written by previous versions of Kraken are
+    decoded too.
+
+    Args:
+        jsonString (str): The JSON string.
+
+    Returns:
+        object: The data.
+
+    """
+
+    return json.loads(jsonString, object_hook=_decodeObject)
+
+
+def load(fileObj):
+    """Reads rig data from a JSON file, see loads.
+
+    Args:
+        fileObj (file): The file to read from.
+
+    Returns:
+        object: The data.
+
+    """
+
+    return loads(fileObj.read())
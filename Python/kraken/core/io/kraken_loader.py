@@ -5,11 +5,13 @@ KrakenLoader - Factory for building SceneItems.
 
 """
 
-from kraken.core.maths import Vec2, Vec3, Vec4, Euler, Quat, Xfo, Mat33, Mat44
+from kraken.core.maths import decodeValue
+from kraken.core.io import json_codec
 
 from kraken.core.objects.scene_item import SceneItem
 from kraken.core.objects.object_3d import Object3D
 from kraken.core.objects.container import Container
+from kraken.core.objects.rig import Rig
 from kraken.core.objects.curve import Curve
 from kraken.core.objects.hierarchy_group import HierarchyGroup
 from kraken.core.objects.joint import Joint
@@ -19,11 +21,14 @@ from kraken.core.objects.control import Control
 
 from kraken.core.objects.attributes.attribute_group import AttributeGroup
 from kraken.core.objects.attributes.bool_attribute import BoolAttribute
+from kraken.core.objects.attributes.color_attribute import ColorAttribute
 from kraken.core.objects.attributes.scalar_attribute import ScalarAttribute
 from kraken.core.objects.attributes.integer_attribute import IntegerAttribute
 from kraken.core.objects.attributes.string_attribute import StringAttribute
 
-from kraken.core.objects.components import *
+from kraken.core.objects.components.component import Component
+from kraken.core.objects.components.component_input import ComponentInput
+from kraken.core.objects.components.component_output import ComponentOutput
 
 from kraken.core.objects.constraints.orientation_constraint import OrientationConstraint
 from kraken.core.objects.constraints.pose_constraint import PoseConstraint
@@ -31,166 +36,220 @@ from kraken.core.objects.constraints.position_constraint import PositionConstrai
 from kraken.core.objects.constraints.scale_constraint import ScaleConstraint
 
 
+# The classes the type registry of the loader is populated from, with their
+# subclasses defined in the Kraken core objects modules.
+_sceneItemClasses = (
+    SceneItem, Object3D, Container, Rig, Curve, HierarchyGroup, Joint, Layer, Locator, Control,
+    AttributeGroup, BoolAttribute, ColorAttribute, ScalarAttribute, IntegerAttribute, StringAttribute,
+    Component, ComponentInput, ComponentOutput,
+    OrientationConstraint, PoseConstraint, PositionConstraint, ScaleConstraint
+)
+
+def _collectTypes(cls, types):
+    """Adds a class and its subclasses defined in the Kraken core objects
+    modules to a type registry.
+
+    Args:
+        cls (type): The class.
+        types (dict): The registry, classes by name.
+
+    """
+
+    if cls.__module__.startswith('kraken.core.objects'):
+        types.setdefault(cls.__name__, cls)
+
+    for subclass in cls.__subclasses__():
+        _collectTypes(subclass, types)
+
+
 class KrakenLoader(object):
-    """Kraken base object type for any 3D object."""
+    """Factory constructing Kraken hierarchies from the JSON data written by
+    the KrakenSaver.
+
+    Items are constructed with the class found in a type registry for the
+    most derived type of their type hierarchy. The registry is populated from
+    the scene item classes of the Kraken core objects modules, and other
+    classes can be added with registerType. Items reference each other by the
+    integer ids given by the saver, or by path in data written by previous
+    versions; references that are not constructed yet are resolved through
+    callbacks once the item is constructed.
+
+    """
 
     def __init__(self):
         super(KrakenLoader, self).__init__()
 
-        # A dictionary of all the built elements during loading.
+        # A dictionary of all the built elements during loading, by id.
         self.builtItems = {}
         # the most recent item build during loading. This item is the parent
         # of subsequently built items.
         self.parentItems = []
         self.callbacks = {}
+        self.pathCallbacks = {}
+        # The root of the hierarchy being constructed, the constructed items
+        # are found by path through its path index.
+        self.rootItem = None
 
+        self._types = {}
+        self._typeCache = {}
+        for cls in _sceneItemClasses:
+            _collectTypes(cls, self._types)
 
-    def getParentItem(self):
-        """Returns the item that was constructed prior to the current item.
+
+    # ==============
+    # Type Methods
+    # ==============
+    def registerType(self, cls, typeName=None):
+        """Registers the class items of a type are constructed with.
+
+        Args:
+            cls (type): The class, constructed with the name of the item.
+            typeName (str): Name of the type, the name of the class if None.
 
         Returns:
-            object: The stored parent item.
+            bool: True if successful.
 
         """
 
-        if len(self.parentItems) < 2:
-            return None
+        if typeName is None:
+            typeName = cls.__name__
 
-        return self.parentItems[-2]
+        self._types[typeName] = cls
+        self._typeCache = {}
+
+        return True
 
 
-    def resolveSceneItem(self, name):
-        """Returns a constructed scene item based on the provided name.
+    def getTypeClass(self, typeHierarchy):
+        """Returns the class of the most derived registered type of a type
+        hierarchy.
 
         Args:
-            name (str): name of the scene item to find.
+            typeHierarchy (list): The type names, most derived first.
 
         Returns:
-            object: The resolved scene item.
+            type: The class, None if no type of the hierarchy is registered.
 
         """
 
-        if name is None:
-            return None
-        if name in self.builtItems:
-            return self.builtItems[name]
+        key = tuple(typeHierarchy)
+        try:
+            return self._typeCache[key]
+        except KeyError:
+            cls = None
+            for typeName in typeHierarchy:
+                cls = self._types.get(typeName)
+                if cls is not None:
+                    break
 
-        raise Exception("SceneItem not found:" + str(name))
+            self._typeCache[key] = cls
 
+            return cls
 
-    def construct(self, jsonData):
-        """Returns a constructed scene item based on the provided json data.
 
-        Args:
-            jsondata (dict): the JSON data to use to decode into a Math value.
+    # ==================
+    # Reference Methods
+    # ==================
+    def getParentItem(self):
+        """Returns the item that was constructed prior to the current item.
 
         Returns:
-            object: The constructed scene item.
+            object: The stored parent item.
 
         """
 
-        if '__typeHierarchy__' not in jsonData or 'name' not in jsonData:
-            raise Exception("Invalid JSON data for constructing scene item:" + str(jsonData));
+        if len(self.parentItems) < 2:
+            return None
 
-        # =========
-        # Controls
-        # =========
-        if "Control" in jsonData['__typeHierarchy__']:
-            item = Control(jsonData['name'])
+        return self.parentItems[-2]
 
-        # ===========
-        # Attributes
-        # ===========
-        elif "AttributeGroup" in jsonData['__typeHierarchy__']:
-            item = AttributeGroup(jsonData['name'])
 
-        elif "BoolAttribute" in jsonData['__typeHierarchy__']:
-            item = BoolAttribute(jsonData['name'])
+    def findByPath(self, path):
+        """Returns a constructed scene item based on its path.
 
-        elif "ScalarAttribute" in jsonData['__typeHierarchy__']:
-            item = ScalarAttribute(jsonData['name'])
+        Args:
+            path (str): Full path of the scene item.
 
-        elif "IntegerAttribute" in jsonData['__typeHierarchy__']:
-            item = IntegerAttribute(jsonData['name'])
+        Returns:
+            object: The scene item, None if it isn't constructed.
 
-        elif "StringAttribute" in jsonData['__typeHierarchy__']:
-            item = StringAttribute(jsonData['name'])
+        """
 
-        elif "ComponentInput" in jsonData['__typeHierarchy__']:
-            item = ComponentInput(jsonData['name'])
+        if self.rootItem is None or not self.rootItem.isTypeOf('Container'):
+            return None
 
-        elif "ComponentOutput" in jsonData['__typeHierarchy__']:
-            item = ComponentOutput(jsonData['name'])
+        return self.rootItem.findByPath(path)
 
-        # ============
-        # Constraints
-        # ============
-        elif "OrientationConstraint" in jsonData['__typeHierarchy__']:
-            item = OrientationConstraint(jsonData['name'])
 
-        elif "PoseConstraint" in jsonData['__typeHierarchy__']:
-            item = PoseConstraint(jsonData['name'])
+    def resolveSceneItem(self, itemId):
+        """Returns a constructed scene item based on the provided id.
 
-        elif "PositionConstraint" in jsonData['__typeHierarchy__']:
-            item = PositionConstraint(jsonData['name'])
+        Args:
+            itemId (int): id of the scene item to find, or its path for data
+                written by previous versions.
+
+        Returns:
+            object: The resolved scene item.
+
+        """
 
-        elif "ScaleConstraint" in jsonData['__typeHierarchy__']:
-            item = ScaleConstraint(jsonData['name'])
+        if itemId is None:
+            return None
+        if isinstance(itemId, basestring):
+            item = self.findByPath(itemId)
+            if item is not None:
+                return item
+        elif itemId in self.builtItems:
+            return self.builtItems[itemId]
 
-        elif "BaseConstraint" in jsonData['__typeHierarchy__']:
-            item = BaseConstraint(jsonData['name'])
+        raise Exception("SceneItem not found:" + str(itemId))
 
 
-        # ==========
-        # Operators
-        # ==========
-        elif "KLOperator" in jsonData['__typeHierarchy__']:
-            item = KLOperator(jsonData['name'])
+    def decodeValue(self, jsonData):
+        """Returns the value of the supplied JSON data, see
+        kraken.core.maths.decodeValue.
 
-        # ============
-        # Scene Items
-        # ============
-        elif "Group" in jsonData['__typeHierarchy__']:
-            item = Group(jsonData['name'])
+        Args:
+            jsonData (object): The JSON data of the value.
 
-        elif "Null" in jsonData['__typeHierarchy__']:
-            item = Null(jsonData['name'])
+        Returns:
+            object: The value.
 
-        elif "Chain" in jsonData['__typeHierarchy__']:
-            item = Chain(jsonData['name'])
+        """
 
-        elif "Joint" in jsonData['__typeHierarchy__']:
-            item = Joint(jsonData['name'])
+        return decodeValue(jsonData)
 
-        elif "Container" in jsonData['__typeHierarchy__']:
-            item = Container(jsonData['name'])
 
-        elif "Curve" in jsonData['__typeHierarchy__']:
-            item = Curve(jsonData['name'])
+    # =====================
+    # Construction Methods
+    # =====================
+    def construct(self, jsonData):
+        """Returns a constructed scene item based on the provided json data.
 
-        elif "HierarchyGroup" in jsonData['__typeHierarchy__']:
-            item = HierarchyGroup(jsonData['name'])
+        Args:
+            jsondata (dict): the JSON data to use to decode into a Math value.
 
-        elif "Joint" in jsonData['__typeHierarchy__']:
-            item = Joint(jsonData['name'])
+        Returns:
+            object: The constructed scene item.
 
-        elif "Layer" in jsonData['__typeHierarchy__']:
-            item = Layer(jsonData['name'])
+        """
 
-        elif "Locator" in jsonData['__typeHierarchy__']:
-            item = Locator(jsonData['name'])
+        if '__typeHierarchy__' not in jsonData or 'name' not in jsonData:
+            raise Exception("Invalid JSON data for constructing scene item:" + str(jsonData));
 
-        elif "SceneItem" in jsonData['__typeHierarchy__']:
-            item = SceneItem(jsonData['name'])
+        cls = self.getTypeClass(jsonData['__typeHierarchy__'])
+        if cls is None:
+            raise Exception("KrakenLoader does not support the given type:" + str(jsonData['__typeHierarchy__']))
 
-        else:
-            raise Exception("KrakenLoader does not support the given type:" + jsonData['__typeHierarchy__'])
+        item = cls(jsonData['name'])
+        if len(self.parentItems) == 0:
+            self.rootItem = item
 
         # Before registering or decoding, set the parent so that the full name contains the entire path.
         if len(self.parentItems) > 0:
             item.setParent(self.parentItems[-1])
 
-        self.registerItem(item)
+        self.registerItem(item, itemId=jsonData.get('__id__'))
         # Store the item as the parent item before decoding the object
         # which in turn decodes the children items.
         self.parentItems.append(item)
@@ -201,41 +260,125 @@ class KrakenLoader(object):
         # to the previous value.
         self.parentItems.pop()
 
+        if len(self.parentItems) == 0:
+            self.resolvePathReferences()
+
         return item
 
 
-    def registerItem(self, item):
+    def constructFromStream(self, source):
+        """Constructs a hierarchy from a stream of records, as written by
+        KrakenSaver.writeStream. Records are decoded and constructed one at a
+        time, so only the constructed items and the pending references are
+        held in memory.
+
+        Args:
+            source (object): A file or any iterable of JSON lines or of
+                decoded records, parents before their children.
+
+        Returns:
+            object: The root item, the first item constructed.
+
+        Raises:
+            Exception: If the parent of a record isn't found.
+
+        """
+
+        root = None
+        for record in source:
+            if not isinstance(record, dict):
+                record = record.strip()
+                if len(record) == 0:
+                    continue
+
+                record = json_codec.loads(record)
+
+            # Only the first record is a root, the other items are
+            # constructed under their parent.
+            parent = None
+            if root is not None:
+                if record.get('parent') is None:
+                    raise Exception("Stream record has no parent:" + str(record.get('name')))
+
+                parent = self.resolveSceneItem(record['parent'])
+
+            self.parentItems = [] if parent is None else [parent]
+            item = self.construct(record)
+            self.parentItems = []
+
+            if parent is not None:
+                parent.addChild(item)
+            else:
+                root = item
+
+        self.resolvePathReferences()
+
+        return root
+
+
+    def registerItem(self, item, itemId=None):
         """Register an item to the loader. If an item is constructed
         automatically, then it can be registered so the loader can provide it
         during resolveSceneItem.
 
         Args:
             item (object): an object constructed during the loading process.
+            itemId (int): id of the item, None for data written by previous
+                versions without ids, whose items are found by path.
 
         """
 
-        if item.getPath() in self.builtItems:
-            # TODO: resolve using a path, instead of the name.
-            # This will require that all items have a parent specified
-            print "Warning. Non unique names used in Kraken:" + item.getPath()
+        if itemId is None:
+            return
+
+        if itemId in self.builtItems:
+            print "Warning. Non unique ids used in Kraken:" + str(itemId)
 
-        self.builtItems[item.getPath()] = item
+        self.builtItems[itemId] = item
 
         # Fire any registered callbacks for this item.
         # This enables the loading of objects already created,
         # but dependent on this object to be completed.
-        if item.getPath() in self.callbacks:
-            for callback in self.callbacks[item.getPath()]:
+        callbacks = self.callbacks.pop(itemId, None)
+        if callbacks is not None:
+            for callback in callbacks:
                 callback(item)
 
 
-    def registerConstructionCallback(self, name, callback):
+    def registerConstructionCallback(self, itemId, callback):
         """Register a callback to be invoked when the requested item is
         constructed."""
 
-        if name in self.builtItems:
-            callback(self.builtItems[name])
+        # References by path are resolved once the hierarchy is constructed.
+        if isinstance(itemId, basestring):
+            callbacks = self.pathCallbacks
+        elif itemId in self.builtItems:
+            callback(self.builtItems[itemId])
+            return
         else:
-            if name not in self.callbacks:
-                self.callbacks[name] = []
-            self.callbacks[name].append(callback)
+            callbacks = self.callbacks
+
+        if itemId not in callbacks:
+            callbacks[itemId] = []
+        callbacks[itemId].append(callback)
+
+
+    def resolvePathReferences(self):
+        """Invokes the callbacks registered for items referenced by path, for
+        the items of the constructed hierarchy. The callbacks of the paths
+        that aren't found stay registered.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        for path in self.pathCallbacks.keys():
+            item = self.findByPath(path)
+            if item is None:
+                continue
+
+            for callback in self.pathCallbacks.pop(path):
+                callback(item)
+
+        return True
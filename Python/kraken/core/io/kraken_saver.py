@@ -5,28 +5,141 @@ KrakenSaver - Helper class for saving Kraken rigs to JSON representations .
 
 """
 
+from kraken.core.io import json_codec
+from kraken.core.maths import MATH_TYPES, encodeValue
 from kraken.core.maths.math_object import MathObject
 
 
 class KrakenSaver(object):
-    """Kraken base object type for any 3D object."""
+    """Helper class encoding Kraken hierarchies to JSON.
+
+    Each encoded item is given an integer id, and the items reference their
+    parent, constrainee and constrainers by id. Hierarchies are encoded
+    either as a single nested JSON structure with encode, or as a stream of
+    records, one item and its attribute groups and constraints per record,
+    with iterRecords and writeStream.
+
+    """
 
     def __init__(self):
         super(KrakenSaver, self).__init__()
 
+        self._itemIds = {}
+        self._items = []
+        self._encodeChildren = True
+
+
+    def getItemId(self, item):
+        """Returns the id of an item, a new id is given to items met for the
+        first time.
+
+        Args:
+            item (object): The item.
+
+        Returns:
+            int: The id of the item, None if the item is None.
+
+        """
+
+        if item is None:
+            return None
+
+        itemId = self._itemIds.get(id(item))
+        if itemId is None:
+            itemId = len(self._items)
+            self._itemIds[id(item)] = itemId
+
+            # Items are held so their Python ids aren't reused.
+            self._items.append(item)
+
+        return itemId
+
+
+    def getEncodeChildren(self):
+        """Returns whether the items encode their children in their JSON data.
+
+        Returns:
+            bool: False when the items are encoded as a stream of records.
+
+        """
+
+        return self._encodeChildren
+
 
     def encodeValue(self, value):
-        """Doc String.
+        """Encodes a value, the math values being written in their compact
+        form.
 
         Args:
-            value (MathObject): The math object to be saved.
+            value (object): The value.
 
         Returns:
-            bool: True if successful.
+            object: The JSON data of the value.
 
         """
 
-        if isinstance(value, MathObject):
-            return value.encodeValue()
+        if isinstance(value, MathObject) and value.__class__.__name__ in MATH_TYPES:
+            return encodeValue(value)
         else:
             return value
+
+
+    def encode(self, item):
+        """Encodes an item and its descendants to a nested JSON structure.
+
+        Args:
+            item (object): The root item.
+
+        Returns:
+            dict: The JSON data.
+
+        """
+
+        self._encodeChildren = True
+
+        return item.jsonEncode(self)
+
+
+    def iterRecords(self, item):
+        """Encodes an item and its descendants to a sequence of records,
+        parents before their children.
+
+        Args:
+            item (object): The root item.
+
+        Returns:
+            generator: The JSON data of each item, without its children.
+
+        """
+
+        self._encodeChildren = False
+        try:
+            stack = [item]
+            while len(stack) > 0:
+                current = stack.pop()
+                yield current.jsonEncode(self)
+                stack.extend(reversed(current.getChildren()))
+        finally:
+            self._encodeChildren = True
+
+
+    def writeStream(self, item, fileObj):
+        """Writes an item and its descendants to a file, one JSON record per
+        line, see KrakenLoader.constructFromStream.
+
+        Args:
+            item (object): The root item.
+            fileObj (file): The file to write to.
+
+        Returns:
+            int: The number of records written.
+
+        """
+
+        count = 0
+        for record in self.iterRecords(item):
+            fileObj.write(json_codec.dumps(record))
+            fileObj.write('\n')
+            count += 1
+
+        return count
@@ -0,0 +1,448 @@
+"""Kraken - core.io.rig_file module.
+
+Classes:
+RigFile -- Binary rig definition file, memory mapped and decoded lazily.
+
+"""
+
+import json
+import mmap
+import os
+import struct
+from array import array
+
+from kraken.core.kraken_system import ks
+from kraken.core.python_backend import SIMPLE_TYPES
+from kraken.core.io import json_codec
+from kraken.core.maths import MATH_TYPES, decodeValue
+from kraken.core.maths.math_object import MathObject
+
+
+BINARY_EXTENSION = '.krb'
+
+MAGIC = 'KRGB'
+VERSION = 1
+
+# Magic, version, flags, and the offset and size in bytes of the index, the
+# component data and the math values.
+HEADER = struct.Struct('<4sHH6I')
+
+
+# Python types of the flat values of each math type.
+_valueTypes = {}
+
+
+def _getValueTypes(typeName):
+    """Returns the Python types of the flat values of a math type, the math
+    values are packed as doubles and the integer members are restored with
+    these.
+
+    Args:
+        typeName (str): Name of the math type.
+
+    Returns:
+        tuple: The type of each flat value.
+
+    """
+
+    valueTypes = _valueTypes.get(typeName)
+    if valueTypes is None:
+        members, size = ks.getRTValLayout(typeName)
+        if len(members) == 0:
+            valueTypes = (SIMPLE_TYPES.get(typeName, float),)
+        else:
+            valueTypes = ()
+            for memberName, memberType in members:
+                valueTypes += _getValueTypes(memberType)
+
+        _valueTypes[typeName] = valueTypes
+
+    return valueTypes
+
+
+class _PackingEncoder(json.JSONEncoder):
+    """JSON encoder packing the flat values of the math values it encodes in
+    one array, the math values are written as their offset in the array."""
+
+    def __init__(self):
+        super(_PackingEncoder, self).__init__(separators=(',', ':'))
+
+        self.values = array('d')
+
+
+    def default(self, obj):
+        if isinstance(obj, MathObject) and obj.__class__.__name__ in MATH_TYPES:
+            typeName = obj.__class__.__name__
+            offset = len(self.values)
+            self.values.extend([float(x) for x in ks.getRTValValues(obj.getRTVal(), typeName)])
+
+            return {'__mathObjectClass__': typeName, '__offset__': offset}
+
+        return super(_PackingEncoder, self).default(obj)
+
+
+class _ComponentDataSequence(object):
+    """Sequence of the component data of a rig file, the data of a component
+    is decoded each time it is accessed and isn't held by the sequence.
+
+    Args:
+        rigFile (object): The rig file.
+
+    """
+
+    def __init__(self, rigFile):
+        super(_ComponentDataSequence, self).__init__()
+
+        self._rigFile = rigFile
+
+
+    def __len__(self):
+        return self._rigFile.getNumComponents()
+
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+
+        if index < 0 or index >= len(self):
+            raise IndexError("Component index out of range:" + str(index))
+
+        return self._rigFile.getComponentData(index)
+
+
+    def __iter__(self):
+        for i in xrange(len(self)):
+            yield self._rigFile.getComponentData(i)
+
+
+class RigFile(object):
+    """Binary rig definition file.
+
+    The file starts with a header locating its three sections. The index
+    holds the name, class, location and graph position of each component,
+    the connections and the other data of the rig, enough to list the
+    components of a rig and lay out its graph. The component data section
+    holds the data of each component, decoded only when the component is
+    requested, and the math value section holds the flat values of the math
+    values of all the components packed as doubles.
+
+    The file is memory mapped while the RigFile is open, and converts without
+    loss to and from the JSON data of .krg files.
+
+    Args:
+        filepath (str): The file path of the rig file.
+
+    """
+
+    def __init__(self, filepath):
+        super(RigFile, self).__init__()
+
+        self._filepath = filepath
+        self._file = open(filepath, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError):
+            self._file.close()
+            raise Exception("Invalid rig file:" + filepath)
+
+        if len(self._mmap) < HEADER.size:
+            self.close()
+            raise Exception("Invalid rig file:" + filepath)
+
+        magic, version, flags, indexOffset, indexSize, dataOffset, dataSize, valuesOffset, valuesSize = \
+            HEADER.unpack_from(self._mmap, 0)
+
+        if magic != MAGIC:
+            self.close()
+            raise Exception("Invalid rig file:" + filepath)
+
+        if version > VERSION:
+            self.close()
+            raise Exception("Unsupported rig file version:" + str(version) + ", file:" + filepath)
+
+        self._dataOffset = dataOffset
+        self._valuesOffset = valuesOffset
+        self._valuesCount = valuesSize / 8
+
+        self._index = json_codec.loads(self._mmap[indexOffset:indexOffset + indexSize])
+
+
+    def __del__(self):
+        self.close()
+
+
+    def getFilePath(self):
+        """Returns the file path of the rig file.
+
+        Returns:
+            str: The file path.
+
+        """
+
+        return self._filepath
+
+
+    def close(self):
+        """Unmaps and closes the file, the component data can't be decoded
+        once the file is closed.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        if getattr(self, '_mmap', None) is not None:
+            self._mmap.close()
+            self._mmap = None
+
+        if getattr(self, '_file', None) is not None:
+            self._file.close()
+            self._file = None
+
+        return True
+
+
+    # ==============
+    # Index Methods
+    # ==============
+    def getName(self):
+        """Returns the name of the rig.
+
+        Returns:
+            str: The name, None if the rig data has no name.
+
+        """
+
+        return self._index['rig'].get('name')
+
+
+    def getNumComponents(self):
+        """Returns the number of components of the rig.
+
+        Returns:
+            int: The number of components.
+
+        """
+
+        return len(self._index['components'])
+
+
+    def getComponentInfo(self, index):
+        """Returns the name, location, class and graph position of a
+        component, read from the index without decoding the component data.
+
+        Args:
+            index (int): Index of the component.
+
+        Returns:
+            dict: The 'name', 'location', 'class' and 'graphPos' of the
+                component, None for the ones its data doesn't have.
+
+        """
+
+        entry = self._index['components'][index]
+
+        return {
+            'name': entry['name'],
+            'location': entry['location'],
+            'class': entry['class'],
+            'graphPos': entry['graphPos']
+        }
+
+
+    def getConnections(self):
+        """Returns the connections of the rig.
+
+        Returns:
+            list: The data of each connection.
+
+        """
+
+        return self._index['rig'].get('connections', [])
+
+
+    def getMetaData(self):
+        """Returns the meta data of the rig.
+
+        Returns:
+            dict: The meta data.
+
+        """
+
+        return self._index['rig'].get('metaData', {})
+
+
+    # ===============
+    # Data Methods
+    # ===============
+    def _decodeObject(self, jsonData):
+        """Object hook decoding the math values of the component data from the
+        math value section.
+
+        Args:
+            jsonData (dict): A decoded JSON object.
+
+        Returns:
+            object: The math value, or the JSON object if it isn't a math value.
+
+        """
+
+        if '__mathObjectClass__' not in jsonData:
+            return jsonData
+
+        if '__offset__' not in jsonData:
+            return decodeValue(jsonData)
+
+        typeName = str(jsonData['__mathObjectClass__'])
+        offset = jsonData['__offset__']
+
+        valueTypes = _getValueTypes(typeName)
+        if offset < 0 or offset + len(valueTypes) > self._valuesCount:
+            raise Exception("Invalid math value offset:" + str(offset) + ", file:" + self._filepath)
+
+        values = struct.unpack_from('<' + str(len(valueTypes)) + 'd', self._mmap, self._valuesOffset + offset * 8)
+        values = [valueType(x) for valueType, x in zip(valueTypes, values)]
+
+        return MATH_TYPES[typeName](ks.constructRTValFromValues(typeName, values))
+
+
+    def getComponentData(self, index):
+        """Decodes the data of a component.
+
+        Args:
+            index (int): Index of the component.
+
+        Returns:
+            dict: The data of the component.
+
+        """
+
+        if self._mmap is None:
+            raise Exception("Rig file is closed:" + self._filepath)
+
+        entry = self._index['components'][index]
+        start = self._dataOffset + entry['offset']
+
+        return json.loads(self._mmap[start:start + entry['size']], object_hook=self._decodeObject)
+
+
+    def getData(self):
+        """Decodes the rig definition, the JSON data it was written from.
+
+        Returns:
+            dict: The rig definition.
+
+        """
+
+        data = dict(self._index['rig'])
+        if self._index['hasComponents'] is True:
+            data['components'] = [self.getComponentData(i) for i in xrange(self.getNumComponents())]
+
+        return data
+
+
+    def getRigDefinition(self):
+        """Returns the rig definition with the components decoded lazily.
+
+        The other data of the rig is read from the index, and the components
+        are a sequence decoding the data of each component when it is
+        accessed, so a rig loading its components in order only holds the
+        data of the one being constructed. The file must stay open while
+        the components are accessed.
+
+        Returns:
+            dict: The rig definition.
+
+        """
+
+        data = dict(self._index['rig'])
+        if self._index['hasComponents'] is True:
+            data['components'] = _ComponentDataSequence(self)
+
+        return data
+
+
+    # ==============
+    # File Methods
+    # ==============
+    @classmethod
+    def isRigFile(cls, filepath):
+        """Returns whether a file is a binary rig file.
+
+        Args:
+            filepath (str): The file path.
+
+        Returns:
+            bool: True if the file starts with the binary rig file header.
+
+        """
+
+        if not os.path.isfile(filepath):
+            return False
+
+        with open(filepath, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+
+
+    @classmethod
+    def write(cls, filepath, data):
+        """Writes a rig definition to a binary rig file.
+
+        Args:
+            filepath (str): The file path of the rig file.
+            data (dict): The rig definition, as written to .krg files.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        encoder = _PackingEncoder()
+
+        components = data.get('components', [])
+        entries = []
+        componentsData = []
+        offset = 0
+        for componentData in components:
+            componentJSON = encoder.encode(componentData)
+            componentsData.append(componentJSON)
+
+            entries.append({
+                'name': componentData.get('name'),
+                'location': componentData.get('location'),
+                'class': componentData.get('class'),
+                'graphPos': componentData.get('graphPos'),
+                'offset': offset,
+                'size': len(componentJSON)
+            })
+
+            offset += len(componentJSON)
+
+        index = json_codec.dumps({
+            'rig': dict([(k, v) for k, v in data.iteritems() if k != 'components']),
+            'hasComponents': 'components' in data,
+            'components': entries
+        })
+
+        componentsJSON = ''.join(componentsData)
+
+        indexOffset = HEADER.size
+        dataOffset = indexOffset + len(index)
+        valuesOffset = dataOffset + len(componentsJSON)
+        padding = (8 - valuesOffset % 8) % 8
+        valuesOffset += padding
+
+        values = encoder.values
+        if struct.pack('=H', 1) != struct.pack('<H', 1):
+            values = array('d', values)
+            values.byteswap()
+
+        with open(filepath, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, indexOffset, len(index), dataOffset, len(componentsJSON),
+                                valuesOffset, len(values) * 8))
+            f.write(index)
+            f.write(componentsJSON)
+            f.write('\0' * padding)
+            values.tofile(f)
+
+        return True
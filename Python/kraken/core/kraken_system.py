@@ -14,18 +14,26 @@ import importlib
 from collections import OrderedDict
 import traceback
 
-import FabricEngine.Core
+try:
+    import FabricEngine.Core
+except ImportError:
+    FabricEngine = None
 
 import kraken
 from kraken.core.profiler import Profiler
+from kraken.core import python_backend
+from kraken.core.type_registry import registerType
 
 krakenSystemModuleDir = os.path.join(os.path.dirname(os.path.realpath(__file__)))
 krakenDir=os.path.abspath(os.path.join(krakenSystemModuleDir, '..', '..', '..'))
 os.environ['KRAKEN_PATH']  = krakenDir
 
 krakenExtsDir = os.path.join(krakenDir, 'Exts')
-if krakenExtsDir not in os.environ['FABRIC_EXTS_PATH']:
-    os.environ['FABRIC_EXTS_PATH'] = krakenExtsDir + ';' + os.environ['FABRIC_EXTS_PATH']
+if 'FABRIC_EXTS_PATH' in os.environ:
+    if krakenExtsDir not in os.environ['FABRIC_EXTS_PATH']:
+        os.environ['FABRIC_EXTS_PATH'] = krakenExtsDir + ';' + os.environ['FABRIC_EXTS_PATH']
+else:
+    os.environ['FABRIC_EXTS_PATH'] = krakenExtsDir
 
 canvasPresetsDir = os.path.join(krakenDir, 'CanvasPresets')
 if 'FABRIC_DFG_PATH' in os.environ:
@@ -50,15 +58,30 @@ class KrakenSystem(object):
         self.registeredTypes = None
         self.loadedExtensions = []
 
+        # KL types and layouts of the RTVal types, cached per type name.
+        self._klTypes = {}
+        self._rtvalLayouts = {}
+
         self.registeredConfigs = OrderedDict()
         self.registeredComponents = OrderedDict()
+        self.registeredSolvers = OrderedDict()
+        self._solverModulesLoaded = None
         # self.moduleImportManager = ModuleImportManager()
 
+        self.mathBackend = None
+        if FabricEngine is None:
+            self.setMathBackend('python')
+        else:
+            self.setMathBackend(os.environ.get('KRAKEN_MATH_BACKEND', 'fabric'))
+
 
     def loadCoreClient(self):
         """Loads the Fabric Engine Core Client"""
 
         if self.client == None:
+            if FabricEngine is None:
+                raise Exception("Fabric Engine Core is not available, only the 'python' math backend can be used.")
+
             Profiler.getInstance().push("loadCoreClient")
 
             try:
@@ -129,6 +152,8 @@ class KrakenSystem(object):
             self.client.loadExtension(extension)
             self.registeredTypes = self.client.RT.types
             self.typeDescs = self.client.RT.getRegisteredTypes()
+            self._klTypes = {}
+            self._rtvalLayouts = {}
             # Cache the loaded extension so that we aviod refreshing the typeDescs cache(costly)
             self.loadedExtensions.append(extension)
             Profiler.getInstance().pop()
@@ -137,6 +162,42 @@ class KrakenSystem(object):
     # RTVal Methods
     # ==============
 
+    def setMathBackend(self, backend):
+        """Sets the backend used to construct the values of the math types.
+
+        With the 'python' backend the math types (Vec3, Quat, Xfo...) are
+        computed in pure Python and don't require Fabric Engine. Values are
+        converted to Fabric RTVals only when passed to KL code. The default
+        backend can be set using the 'KRAKEN_MATH_BACKEND' environment variable.
+
+        Math objects keep the backend they were constructed with, switching
+        backend only affects newly constructed objects.
+
+        Args:
+            backend (str): 'fabric' or 'python'.
+
+        """
+
+        if backend not in ('fabric', 'python'):
+            raise Exception("Invalid math backend:" + str(backend))
+
+        if backend == 'fabric' and FabricEngine is None:
+            raise Exception("Fabric Engine Core is not available, can't use the 'fabric' math backend.")
+
+        self.mathBackend = backend
+
+
+    def getMathBackend(self):
+        """Returns the backend used to construct the values of the math types.
+
+        Returns:
+            str: 'fabric' or 'python'.
+
+        """
+
+        return self.mathBackend
+
+
     def constructRTVal(self, dataType, defaultValue=None):
         """Constructs a new RTVal using the given name and optional devault value.
 
@@ -149,22 +210,22 @@ class KrakenSystem(object):
 
         """
 
-        self.loadCoreClient()
-        klType = getattr(self.registeredTypes, dataType)
+        if self.mathBackend == 'python' and python_backend.isSupportedType(dataType):
+            return python_backend.constructRTVal(dataType, defaultValue)
+
+        klType = self._getKLType(dataType)
 
         if defaultValue is not None:
             if hasattr(defaultValue, '_rtval'):
                 return defaultValue._rtval
 
-            typeDesc = self.typeDescs[dataType]
-            if 'members' in typeDesc:
+            members = self.getRTValLayout(dataType)[0]
+            if len(members) > 0:
                 try:
                     value = klType.create()
                 except:
                     value = klType()
-                for i in range(0, len(typeDesc['members'])):
-                    memberName = typeDesc['members'][i]['name']
-                    memberType = typeDesc['members'][i]['type']
+                for memberName, memberType in members:
                     if memberName in defaultValue:
                         setattr(value, memberName, self.constructRTVal(memberType, getattr(defaultValue, memberName)))
                 return value
@@ -207,6 +268,9 @@ class KrakenSystem(object):
 
         """
 
+        if isinstance(value, python_backend.PyRTVal):
+            return True
+
         return str(type(value)) == "<type 'PyRTValObject'>"
 
 
@@ -221,11 +285,360 @@ class KrakenSystem(object):
 
         """
 
-        if ks.isRTVal(rtval):
+        if isinstance(rtval, python_backend.PyRTVal):
+            return rtval.getTypeName()
+        elif ks.isRTVal(rtval):
             return json.loads(rtval.type("Type").jsonDesc("String").getSimpleType())['name']
         else:
             return "None"
 
+
+    def toFabricRTVal(self, value):
+        """Returns the given RTVal as a Fabric RTVal, converting values
+        constructed by the 'python' math backend.
+
+        Args:
+            value (object): The RTVal to convert.
+
+        Returns:
+            object: The Fabric RTVal.
+
+        """
+
+        if isinstance(value, python_backend.PyArrayRTVal):
+            return self._fabricArrayFromValues(value.elementType, value.getValues())
+
+        if isinstance(value, python_backend.PySimpleRTVal):
+            return self._getKLType(value.getTypeName())(value.getSimpleType())
+
+        if isinstance(value, python_backend.PyRTVal):
+            return self._fabricRTValFromValues(value.getTypeName(), value.getValues(), 0)
+
+        return value
+
+
+    def fromFabricRTVal(self, rtval, dataType):
+        """Returns the given Fabric RTVal as a value of the current math backend.
+
+        Args:
+            rtval (object): The Fabric RTVal to convert.
+            dataType (str): The name of the KL type of the RTVal.
+
+        Returns:
+            object: The converted value.
+
+        """
+
+        if isinstance(rtval, python_backend.PyRTVal):
+            return rtval
+
+        if self.mathBackend != 'python' or not python_backend.isSupportedType(dataType):
+            return rtval
+
+        if dataType.endswith('[]'):
+            return python_backend.PyArrayRTVal(dataType[:-2], self.unpackRTValArray(rtval, dataType[:-2]))
+
+        members, size = self.getRTValLayout(dataType)
+        if len(members) == 0:
+            return python_backend.PySimpleRTVal(dataType, rtval.getSimpleType())
+
+        vals = []
+        self._fabricRTValValues(rtval, dataType, vals)
+
+        return python_backend.STRUCT_TYPES[dataType](vals)
+
+
+    # ====================
+    # RTVal Array Methods
+    # ====================
+
+    def getRTValLayout(self, dataType):
+        """Returns the layout of the given KL type. Layouts are cached per type
+        name.
+
+        Args:
+            dataType (str): The name of the KL type.
+
+        Returns:
+            tuple: The members of the type as (name, type) tuples, empty for
+                simple types, and the number of simple values in the type.
+
+        """
+
+        layout = self._rtvalLayouts.get(dataType)
+        if layout is not None:
+            return layout
+
+        if dataType in python_backend.STRUCT_TYPES:
+            members = tuple(python_backend.STRUCT_TYPES[dataType].members)
+        elif dataType in python_backend.SIMPLE_TYPES:
+            members = ()
+        else:
+            self.loadCoreClient()
+            typeDesc = self.typeDescs[dataType]
+            members = tuple((x['name'], x['type']) for x in typeDesc.get('members', []))
+
+        if len(members) == 0:
+            size = 1
+        else:
+            size = sum(self.getRTValLayout(memberType)[1] for memberName, memberType in members)
+
+        layout = (members, size)
+        self._rtvalLayouts[dataType] = layout
+
+        return layout
+
+
+    def constructRTValArray(self, dataType, values):
+        """Constructs an array RTVal in a single call.
+
+        With the 'python' math backend the values of all the elements are
+        copied into a single buffer. Otherwise the elements are converted
+        to Fabric RTVals using the cached layout of the element type.
+
+        Args:
+            dataType (str): The name of the KL type of the elements.
+            values (list): The elements (math objects or RTVals), or the flat
+                values of all the elements.
+
+        Returns:
+            object: The array RTVal.
+
+        """
+
+        if self.mathBackend == 'python' and python_backend.isSupportedType(dataType + '[]'):
+            return python_backend.PyArrayRTVal(dataType, self._flattenValues(dataType, values))
+
+        if self._isFlat(values):
+            return self._fabricArrayFromValues(dataType, values)
+
+        self.loadCoreClient()
+        rtvalArray = self.rtVal(dataType + 'Array')
+        rtvalArray.resize(len(values))
+        for i in xrange(len(values)):
+            rtvalArray[i] = self._toFabricElement(dataType, values[i])
+
+        return rtvalArray
+
+
+    def unpackRTValArray(self, rtvalArray, dataType):
+        """Returns the flat values of all the elements of an array RTVal.
+
+        Args:
+            rtvalArray (object): The array RTVal.
+            dataType (str): The name of the KL type of the elements.
+
+        Returns:
+            list: The flat values of the elements.
+
+        """
+
+        if isinstance(rtvalArray, python_backend.PyArrayRTVal):
+            return rtvalArray.getValues()
+
+        vals = []
+        for i in xrange(len(rtvalArray)):
+            self._fabricRTValValues(rtvalArray[i], dataType, vals)
+
+        return vals
+
+
+    def constructRTValFromValues(self, dataType, values):
+        """Constructs a new RTVal from its flat values, in the order of the
+        members of its KL type (an Xfo is tr, ori.v, ori.w and sc).
+
+        Args:
+            dataType (str): The name of the KL type.
+            values (list): The flat values.
+
+        Returns:
+            object: The constructed RTVal.
+
+        """
+
+        if self.mathBackend == 'python' and dataType in python_backend.STRUCT_TYPES:
+            return python_backend.STRUCT_TYPES[dataType].create(values)
+
+        return self._fabricRTValFromValues(dataType, values, 0)
+
+
+    def getRTValValues(self, rtval, dataType):
+        """Returns the flat values of an RTVal, see constructRTValFromValues.
+
+        Args:
+            rtval (object): The RTVal.
+            dataType (str): The name of the KL type of the RTVal.
+
+        Returns:
+            list: The flat values.
+
+        """
+
+        if isinstance(rtval, python_backend.PyStructRTVal):
+            return rtval.getValues()
+
+        vals = []
+        self._fabricRTValValues(rtval, dataType, vals)
+
+        return vals
+
+
+    def _getKLType(self, dataType):
+        """Returns the Fabric type of the given KL type name.
+
+        Args:
+            dataType (str): The name of the KL type.
+
+        Returns:
+            object: The Fabric type.
+
+        """
+
+        klType = self._klTypes.get(dataType)
+        if klType is None:
+            self.loadCoreClient()
+            klType = getattr(self.registeredTypes, dataType)
+            self._klTypes[dataType] = klType
+
+        return klType
+
+
+    def _isFlat(self, values):
+        """Returns True if the given values are flat simple values.
+
+        Args:
+            values (list): The values to test.
+
+        Returns:
+            bool: True if the values are flat.
+
+        """
+
+        return len(values) > 0 and isinstance(values[0], (bool, int, long, float))
+
+
+    def _flattenValues(self, dataType, values):
+        """Returns the flat values of the given elements.
+
+        Args:
+            dataType (str): The name of the KL type of the elements.
+            values (list): The elements, or their flat values.
+
+        Returns:
+            list: The flat values.
+
+        """
+
+        if len(values) == 0 or self._isFlat(values):
+            return values
+
+        vals = []
+        for value in values:
+            if hasattr(value, '_rtval'):
+                value = value._rtval
+
+            if isinstance(value, python_backend.PyStructRTVal):
+                vals.extend(value.getValues())
+            else:
+                self._fabricRTValValues(value, dataType, vals)
+
+        return vals
+
+
+    def _toFabricElement(self, dataType, value):
+        """Returns the given element as a Fabric RTVal.
+
+        Args:
+            dataType (str): The name of the KL type of the element.
+            value (object): The element (math object or RTVal).
+
+        Returns:
+            object: The Fabric RTVal.
+
+        """
+
+        if hasattr(value, '_rtval'):
+            value = value._rtval
+
+        if isinstance(value, python_backend.PyStructRTVal):
+            return self._fabricRTValFromValues(dataType, value.getValues(), 0)
+
+        return self.toFabricRTVal(value)
+
+
+    def _fabricArrayFromValues(self, dataType, values):
+        """Constructs a Fabric array RTVal from flat values.
+
+        Args:
+            dataType (str): The name of the KL type of the elements.
+            values (list): The flat values of the elements.
+
+        Returns:
+            object: The Fabric array RTVal.
+
+        """
+
+        self.loadCoreClient()
+        size = self.getRTValLayout(dataType)[1]
+        count = len(values) // size
+
+        rtvalArray = self.rtVal(dataType + 'Array')
+        rtvalArray.resize(count)
+        for i in xrange(count):
+            rtvalArray[i] = self._fabricRTValFromValues(dataType, values, i * size)
+
+        return rtvalArray
+
+
+    def _fabricRTValFromValues(self, dataType, values, offset):
+        """Constructs a Fabric RTVal from flat values.
+
+        Args:
+            dataType (str): The name of the KL type.
+            values (list): The flat values.
+            offset (int): Index of the first value of the RTVal.
+
+        Returns:
+            object: The Fabric RTVal.
+
+        """
+
+        klType = self._getKLType(dataType)
+        members, size = self.getRTValLayout(dataType)
+        if len(members) == 0:
+            return klType(values[offset])
+
+        try:
+            rtval = klType.create()
+        except:
+            rtval = klType()
+
+        for memberName, memberType in members:
+            setattr(rtval, memberName, self._fabricRTValFromValues(memberType, values, offset))
+            offset += self.getRTValLayout(memberType)[1]
+
+        return rtval
+
+
+    def _fabricRTValValues(self, rtval, dataType, vals):
+        """Appends the flat values of a Fabric RTVal to the given list.
+
+        Args:
+            rtval (object): The Fabric RTVal.
+            dataType (str): The name of the KL type of the RTVal.
+            vals (list): The list to append the values to.
+
+        """
+
+        members, size = self.getRTValLayout(dataType)
+        if len(members) == 0:
+            vals.append(rtval.getSimpleType())
+            return
+
+        for memberName, memberType in members:
+            self._fabricRTValValues(getattr(rtval, memberName), memberType, vals)
+
+
     # ==================
     # Config Methods
     # ==================
@@ -292,6 +705,7 @@ class KrakenSystem(object):
             pass
 
         self.registeredComponents[componentClassPath] = componentClass
+        registerType(componentClass)
 
 
     def getComponentClass(self, className):
@@ -428,6 +842,71 @@ class KrakenSystem(object):
                 __importDirRecursive(path)
 
 
+    # ==================
+    # Solver Methods
+    # ==================
+
+    def registerSolver(self, solverClass):
+        """Registers a Python solver class implementing a KL solver, so KL
+        operators can be evaluated without Fabric.
+
+        Args:
+            solverClass (object): The Python class of the solver.
+
+        """
+
+        self.registeredSolvers[solverClass.solverTypeName] = solverClass
+
+
+    def getSolverClass(self, solverTypeName):
+        """Returns the registered Python solver class implementing the given
+        KL solver type.
+
+        Args:
+            solverTypeName (str): The name of the KL solver type.
+
+        Returns:
+            object: The Python solver class.
+
+        """
+
+        if solverTypeName not in self.registeredSolvers:
+            raise Exception("Solver with that type not registered:" + solverTypeName)
+
+        return self.registeredSolvers[solverTypeName]
+
+
+    def getSolverTypeNames(self):
+        """Returns the names of the KL solver types with a registered Python
+        solver class.
+
+        Returns:
+            list: The array of solver type names.
+
+        """
+
+        return self.registeredSolvers.keys()
+
+
+    def loadSolverModules(self):
+        """Imports the Python solvers shipped with Kraken so they are
+        registered. The solvers require NumPy.
+
+        Returns:
+            bool: True if the solvers are available.
+
+        """
+
+        if self._solverModulesLoaded is None:
+            try:
+                importlib.import_module('kraken.core.solvers')
+                self._solverModulesLoaded = True
+            except ImportError:
+                self._solverModulesLoaded = False
+
+        return self._solverModulesLoaded
+
+
     @classmethod
     def getInstance(cls):
         """This class method returns the singleton instance for the KrakenSystem
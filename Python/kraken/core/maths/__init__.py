@@ -10,6 +10,7 @@ from mat33 import Mat33
 from mat44 import Mat44
 from rotation_order import RotationOrder
 from color import Color
+from kraken.core.kraken_system import ks
 
 
 PI = 3.141592653589793
@@ -46,9 +47,51 @@ def Math_degToRad(val):
 
 
 
+# Math types by class name, the name stored in the '__mathObjectClass__' key
+# of their JSON data.
+MATH_TYPES = {
+    'Vec2': Vec2,
+    'Vec3': Vec3,
+    'Vec4': Vec4,
+    'Quat': Quat,
+    'Euler': Euler,
+    'Xfo': Xfo,
+    'Mat33': Mat33,
+    'Mat44': Mat44,
+    'RotationOrder': RotationOrder,
+    'Color': Color
+}
+
+
+def encodeValue(value):
+    """Returns the compact JSON data of a math value, the flat values of the
+    value in a fixed size array (an Xfo is 10 floats).
+
+    Args:
+        value (object): The math value.
+
+    Returns:
+        dict: The JSON data, see decodeValue.
+
+    """
+
+    typeName = value.__class__.__name__
+    if typeName not in MATH_TYPES:
+        raise Exception("Unsupported Math type:" + typeName)
+
+    return {
+        '__mathObjectClass__': typeName,
+        '__values__': ks.getRTValValues(value.getRTVal(), typeName)
+    }
+
+
 def decodeValue(jsonData):
     """Returns a constructed math value based on the provided json data.
 
+    Both the compact data written by encodeValue and the nested data written
+    by MathObject.jsonEncode are supported. Nested members may already have
+    been decoded.
+
     Args:
         jsondata (dict): The JSON data to use to decode into a Math value.
 
@@ -63,31 +106,15 @@ def decodeValue(jsonData):
     if '__mathObjectClass__' not in jsonData:
         raise Exception("Invalid JSON data for constructing value:" + str(jsonData));
 
-    if jsonData['__mathObjectClass__'] == 'Vec2':
-        val = Vec2()
-        val.jsonDecode(jsonData, decodeValue)
-    elif jsonData['__mathObjectClass__'] == 'Vec3':
-        val = Vec3()
-        val.jsonDecode(jsonData, decodeValue)
-    elif jsonData['__mathObjectClass__'] == 'Vec4':
-        val = Vec4()
-        val.jsonDecode(jsonData, decodeValue)
-    elif jsonData['__mathObjectClass__'] == 'Euler':
-        val = Euler()
-        val.jsonDecode(jsonData, decodeValue)
-    elif jsonData['__mathObjectClass__'] == 'Quat':
-        val = Quat()
-        val.jsonDecode(jsonData, decodeValue)
-    elif jsonData['__mathObjectClass__'] == 'Xfo':
-        val = Xfo()
-        val.jsonDecode(jsonData, decodeValue)
-    elif jsonData['__mathObjectClass__'] == 'Mat33':
-        val = Mat33()
-        val.jsonDecode(jsonData, decodeValue)
-    elif jsonData['__mathObjectClass__'] == 'Mat44':
-        val = Mat44()
-        val.jsonDecode(jsonData, decodeValue)
-    else:
-        raise Exception("Unsupported Math type:" + jsonData['__mathObjectClass__'])
+    typeName = jsonData['__mathObjectClass__']
+    mathType = MATH_TYPES.get(typeName)
+    if mathType is None:
+        raise Exception("Unsupported Math type:" + typeName)
+
+    if '__values__' in jsonData:
+        return mathType(ks.constructRTValFromValues(str(typeName), jsonData['__values__']))
+
+    val = mathType()
+    val.jsonDecode(jsonData, decodeValue)
 
     return val
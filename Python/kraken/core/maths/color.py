@@ -204,7 +204,7 @@ class Color(MathObject):
 
         """
 
-        return self._rtval.set('Boolean', other._rtval).getSimpleType()
+        return self._rtval.equal('Boolean', other._rtval).getSimpleType()
 
 
 
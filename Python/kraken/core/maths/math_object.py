@@ -5,7 +5,6 @@ MathObject -- A base class for all math types.
 """
 
 import json
-import FabricEngine.Core
 
 
 class MathObject(object):
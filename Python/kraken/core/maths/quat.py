@@ -231,7 +231,7 @@ class Quat(MathObject):
         return Quat(self._rtval.setFromMat33('Quat', ks.rtVal('Mat33', mat)))
 
 
-    def setFrom2Vectors(sourceDirVec, destDirVec, arbitraryIfAmbiguous=True):
+    def setFrom2Vectors(self, sourceDirVec, destDirVec, arbitraryIfAmbiguous=True):
         """Set the quaternion to the rotation required to rotate the source
         vector to the destination vector.
 
@@ -149,7 +149,7 @@ class Vec2(MathObject):
 
         """
 
-        return self._rtval.set('Boolean', other._rtval).getSimpleType()
+        return self._rtval.equal('Boolean', other._rtval).getSimpleType()
 
 
     def almostEqual(self, other, precision):
@@ -488,7 +488,7 @@ class Vec2(MathObject):
 
         """
 
-        return Vec2(self._rtval.linearInterpolate('Vec2', ks.rtVal('Scalar', t)))
+        return Vec2(self._rtval.linearInterpolate('Vec2', other._rtval, ks.rtVal('Scalar', t)))
 
 
     def distanceToLine(self, lineP0, lineP1):
@@ -180,7 +180,7 @@ class Vec3(MathObject):
 
         """
 
-        return self._rtval.set('Boolean', other._rtval).getSimpleType()
+        return self._rtval.equal('Boolean', other._rtval).getSimpleType()
 
 
     def almostEqual(self, other, precision):
@@ -518,7 +518,7 @@ class Vec3(MathObject):
 
         """
 
-        return Vec3(self._rtval.linearInterpolate('Vec3', ks.rtVal('Scalar', t)))
+        return Vec3(self._rtval.linearInterpolate('Vec3', other._rtval, ks.rtVal('Scalar', t)))
 
 
     def distanceToLine(self, lineP0, lineP1):
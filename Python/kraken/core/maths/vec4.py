@@ -215,7 +215,7 @@ class Vec4(MathObject):
 
         """
 
-        return self._rtval.set('Boolean', other._rtval).getSimpleType()
+        return self._rtval.equal('Boolean', other._rtval).getSimpleType()
 
 
     def almostEqual(self, other, precision):
@@ -552,7 +552,7 @@ class Vec4(MathObject):
 
         """
 
-        return Vec4(self._rtval.linearInterpolate('Vec4', ks.rtVal('Scalar', t)))
+        return Vec4(self._rtval.linearInterpolate('Vec4', other._rtval, ks.rtVal('Scalar', t)))
 
 
     def distanceToLine(self, lineP0, lineP1):
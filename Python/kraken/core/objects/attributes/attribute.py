@@ -54,6 +54,7 @@ class Attribute(SceneItem):
         """
 
         self._value = value
+        self.markDirty()
 
         if self._callback is not None:
             self._callback(value)
@@ -286,14 +287,12 @@ class Attribute(SceneItem):
 
         jsonData = {
             '__typeHierarchy__': classHierarchy,
-            'name': self.name,
+            '__id__': saver.getItemId(self),
+            'name': self.getName(),
             'value': saver.encodeValue(self._value),
-            'parent': None
+            'parent': saver.getItemId(self.getParent())
         }
 
-        if self.getParent() is not None:
-            jsonData['parent'] = self.getParent().getName()
-
         return jsonData
 
 
@@ -309,7 +308,6 @@ class Attribute(SceneItem):
 
         """
 
-        self.name =  jsonData['name']
         self._value =  loader.decodeValue(jsonData['value'])
 
         return True
@@ -25,6 +25,17 @@ class AttributeGroup(SceneItem):
             parent.addAttributeGroup(self)
 
 
+    def _getPathChildren(self):
+        """Returns the items whose paths are built from the path of this item.
+
+        Returns:
+            list: The attributes.
+
+        """
+
+        return list(self._attributes)
+
+
     # ==================
     # Attribute Methods
     # ==================
@@ -177,8 +188,9 @@ class AttributeGroup(SceneItem):
 
         jsonData = {
             '__typeHierarchy__': classHierarchy,
-            'name': self.name,
-            'parent': self.getParent().getName(),
+            '__id__': saver.getItemId(self),
+            'name': self.getName(),
+            'parent': saver.getItemId(self.getParent()),
             'attributes': []
         }
         for attr in self._attributes:
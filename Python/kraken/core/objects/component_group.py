@@ -56,3 +56,32 @@ class ComponentGroup(Object3D):
             return self.getComponent().getNameDecoration()
         else:
             return super(ComponentGroup, self).getNameDecoration()
+
+
+    # ==================
+    # Component Methods
+    # ==================
+    def setComponent(self, component):
+        """Sets the component the group is named after.
+
+        Args:
+            component (Object): The component.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        prevComponent = self.getComponent()
+        if prevComponent is not None and self in prevComponent._componentGroups:
+            prevComponent._componentGroups.remove(self)
+
+        super(ComponentGroup, self).setComponent(component)
+
+        if component is not None and self not in component._componentGroups:
+            component._componentGroups.append(self)
+
+        self.invalidatePaths()
+        self.invalidatePathIndices()
+
+        return True
@@ -8,6 +8,7 @@ Component -- Component representation.
 from kraken.core.configs.config import Config
 from kraken.helpers.utility_methods import mirrorData
 from kraken.core.maths import *
+from kraken.core.objects.scene_item import SceneItem
 from kraken.core.objects.object_3d import Object3D
 from kraken.core.objects.layer import Layer
 from kraken.core.objects.locator import Locator
@@ -27,11 +28,12 @@ class Component(Object3D):
 
     def __init__(self, name, parent=None, location='M'):
         self._location = location
-        super(Component, self).__init__(name, parent)
-        self._color = (154, 205, 50, 255)
+        self._componentGroups = []
         self._inputs = []
         self._outputs = []
         self._operators = []
+        super(Component, self).__init__(name, parent)
+        self._color = (154, 205, 50, 255)
 
         self.setShapeVisibility(False)
 
@@ -59,6 +61,39 @@ class Component(Object3D):
         return ":" + self.getLocation()
 
 
+    def setName(self, name):
+        """Sets the name of the component, and of the component groups named
+        after it.
+
+        Args:
+            name (str): The new name for the component.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        super(Component, self).setName(name)
+
+        for componentGroup in self._componentGroups:
+            componentGroup.invalidatePaths()
+            componentGroup.invalidatePathIndices()
+
+        return True
+
+
+    def _getPathChildren(self):
+        """Returns the items whose paths are built from the path of this item.
+
+        Returns:
+            list: The children, attribute groups, constraints, ports and
+                operators.
+
+        """
+
+        return super(Component, self)._getPathChildren() + self._inputs + self._outputs + self._operators
+
+
     # ==============
     # Color Methods
     # ==============
@@ -335,6 +370,7 @@ class Component(Object3D):
             return False
 
         del self._inputs[index]
+        SceneItem.invalidateDependencies()
 
         return True
 
@@ -592,6 +628,7 @@ class Component(Object3D):
 
         self._operators.append(operator)
         operator.setParent(self)
+        SceneItem.invalidateDependencies()
 
         return True
 
@@ -611,6 +648,7 @@ class Component(Object3D):
             return False
 
         del self._operators[index]
+        SceneItem.invalidateDependencies()
 
         return True
 
@@ -741,6 +779,27 @@ class Component(Object3D):
         return True
 
 
+    # ===================
+    # Evaluation Methods
+    # ===================
+    def isLoadingInRig(self):
+        """Returns whether the component is loaded by its rig. The rig
+        evaluates the constraints and operators of its components once they
+        are all loaded and connected, so components don't evaluate
+        themselves in loadData while their rig is loading.
+
+        Returns:
+            bool: True while the rig of the component is loading components.
+
+        """
+
+        container = self.getContainer()
+        if container is None or not container.isTypeOf('Rig'):
+            return False
+
+        return container.isLoadingComponents()
+
+
     # =============
     # Data Methods
     # =============
@@ -97,6 +97,7 @@ class ComponentInputPort(SceneItem):
         self._connection = connectionObj
 
         connectionObj._addConnection(self)
+        SceneItem.invalidateDependencies()
 
         return True
 
@@ -112,6 +113,7 @@ class ComponentInputPort(SceneItem):
 
         self._connection._removeConnection(self)
         self._connection = None
+        SceneItem.invalidateDependencies()
 
         return True
 
@@ -131,6 +133,7 @@ class ComponentInputPort(SceneItem):
         """
 
         self._target = target
+        SceneItem.invalidateDependencies()
 
 
     def getTarget(self):
@@ -170,5 +173,55 @@ class ComponentInputPort(SceneItem):
         """
 
         self._index = index
+        SceneItem.invalidateDependencies()
 
-        return True
\ No newline at end of file
+        return True
+
+    # ===================
+    # Evaluation Methods
+    # ===================
+    def getConnectionTarget(self):
+        """Returns the object the target of this input is driven by.
+
+        Returns:
+            Object: The target of the connection, the element at the index of
+                this input for array connections, None if not connected.
+
+        """
+
+        if self._connection is None:
+            return None
+
+        connectionTarget = self._connection.getTarget()
+        if self._connection.getDataType().endswith('[]'):
+            if self._index > len(connectionTarget) - 1:
+                inputParent = self.getParent()
+                fullInputName = inputParent.getName() + inputParent.getNameDecoration() + "." + self.getName()
+
+                raise Exception(fullInputName + " index ("
+                                + str(self._index) + ") is out of range ("
+                                + str(len(connectionTarget) - 1) + ")!")
+
+            connectionTarget = connectionTarget[self._index]
+
+        return connectionTarget
+
+
+    def evaluate(self):
+        """Copies the value of the connection to the target of this input.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        connectionTarget = self.getConnectionTarget()
+        if connectionTarget is None or self._target is None:
+            return False
+
+        if self._dataType.startswith('Xfo'):
+            self._target.xfo = connectionTarget.xfo
+        else:
+            self._target.setValue(connectionTarget.getValue())
+
+        return True
@@ -135,6 +135,7 @@ class ComponentOutputPort(SceneItem):
         """
 
         self._target = target
+        SceneItem.invalidateDependencies()
 
 
     def getTarget(self):
@@ -5,6 +5,8 @@ Constraint - Base Constraint.
 
 """
 
+import functools
+
 from kraken.core.objects.scene_item import SceneItem
 from kraken.core.objects.object_3d import Object3D
 
@@ -61,6 +63,7 @@ class Constraint(SceneItem):
         """
 
         self._constrainee = constrainee
+        SceneItem.invalidateDependencies()
 
         return True
 
@@ -114,6 +117,7 @@ class Constraint(SceneItem):
             raise Exception("'kObject3D' argument is already a constrainer: '" + kObject3D.getName() + "'.")
 
         self._constrainers[index] = kObject3D
+        SceneItem.invalidateDependencies()
 
         return True
 
@@ -165,12 +169,13 @@ class Constraint(SceneItem):
 
         jsonData = {
             '__typeHierarchy__': classHierarchy,
-            'name': self.name,
-            'constrainee': self._constrainee.getName(),
+            '__id__': saver.getItemId(self),
+            'name': self.getName(),
+            'constrainee': saver.getItemId(self._constrainee),
             'constrainers': []
         }
         for cnstrnr in self._constrainers:
-            jsonData['constrainers'].append(cnstrnr.getName())
+            jsonData['constrainers'].append(saver.getItemId(cnstrnr))
 
         return jsonData
 
@@ -189,7 +194,17 @@ class Constraint(SceneItem):
 
         loader.registerConstructionCallback(jsonData['constrainee'], self.setConstrainee)
 
-        for cnstrnr in jsonData['constrainers']:
-            loader.registerConstructionCallback(cnstrnr, self.addConstrainer)
+        # Constrainers are constructed in any order, they are added in their
+        # saved order once they are all constructed.
+        constrainers = [None] * len(jsonData['constrainers'])
+
+        def setConstrainer(index, cnstrnr):
+            constrainers[index] = cnstrnr
+            if all([x is not None for x in constrainers]):
+                for constrainer in constrainers:
+                    self.addConstrainer(constrainer)
+
+        for i, cnstrnr in enumerate(jsonData['constrainers']):
+            loader.registerConstructionCallback(cnstrnr, functools.partial(setConstrainer, i))
 
         return True
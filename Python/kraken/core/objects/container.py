@@ -13,9 +13,178 @@ class Container(Object3D):
     """Container object."""
 
     def __init__(self, name):
+        # Path and decorated path of each object of the hierarchy, and the
+        # paths each object is indexed with. The objects that were renamed,
+        # reparented or removed are re-indexed on the next lookup, and the
+        # whole hierarchy is indexed again when most of it changed.
+        self._pathIndex = {}
+        self._decoratedPathIndex = {}
+        self._indexedPaths = {}
+        self._pendingPathItems = {}
+        self._pathIndexValid = False
+
         super(Container, self).__init__(name, None)
 
         self.setShapeVisibility(False)
         self.lockRotation(x=True, y=True, z=True)
         self.lockScale(x=True, y=True, z=True)
         self.lockTranslation(x=True, y=True, z=True)
+
+
+    def __getstate__(self):
+        state = super(Container, self).__getstate__()
+        state['_pathIndex'] = {}
+        state['_decoratedPathIndex'] = {}
+        state['_indexedPaths'] = {}
+        state['_pendingPathItems'] = {}
+        state['_pathIndexValid'] = False
+
+        return state
+
+
+    # ===================
+    # Path Index Methods
+    # ===================
+    def findByPath(self, path, decorated=False):
+        """Returns the object of the hierarchy with the specified path.
+
+        The objects are indexed by path on the first lookup. The objects
+        reparented, renamed or removed since are re-indexed with the objects
+        under them on the next lookup.
+
+        Args:
+            path (str): Full path of the object, including the container.
+            decorated (bool): Whether the path is a decorated path.
+
+        Returns:
+            Object: Object if found, None otherwise.
+
+        """
+
+        if self._pathIndexValid is False:
+            self._rebuildPathIndex()
+        elif len(self._pendingPathItems) > 0:
+            self._updatePathIndex()
+
+        if decorated is True:
+            return self._decoratedPathIndex.get(path)
+
+        return self._pathIndex.get(path)
+
+
+    def _queuePathIndexUpdate(self, item):
+        """Queues an object of the hierarchy, or one that left it, to be
+        re-indexed with the objects under it on the next lookup.
+
+        Args:
+            item (Object): The object.
+
+        """
+
+        if self._pathIndexValid is False:
+            return
+
+        self._pendingPathItems[id(item)] = item
+
+        # Indexing everything again is cheaper than re-indexing most of it.
+        if len(self._pendingPathItems) > max(16, len(self._indexedPaths) / 4):
+            self._pathIndexValid = False
+            self._pendingPathItems.clear()
+
+
+    def _isIndexed(self, item):
+        """Returns whether an object is a descendant of this container, each
+        object above it listing it as a child.
+
+        Args:
+            item (Object): The object.
+
+        Returns:
+            bool: True if the object belongs to the hierarchy.
+
+        """
+
+        while item is not self:
+            parent = item.getParent()
+            if parent is None or item not in parent.getChildren():
+                return False
+
+            item = parent
+
+        return True
+
+
+    def _updatePathIndex(self):
+        """Re-indexes the queued objects and the objects under them.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        pathIndex = self._pathIndex
+        decoratedPathIndex = self._decoratedPathIndex
+        indexedPaths = self._indexedPaths
+
+        visited = set()
+        for root in self._pendingPathItems.values():
+            addItems = self._isIndexed(root)
+
+            stack = [root]
+            while len(stack) > 0:
+                item = stack.pop()
+                if id(item) in visited:
+                    continue
+
+                visited.add(id(item))
+
+                paths = indexedPaths.pop(id(item), None)
+                if paths is not None:
+                    if pathIndex.get(paths[0]) is item:
+                        del pathIndex[paths[0]]
+                    if decoratedPathIndex.get(paths[1]) is item:
+                        del decoratedPathIndex[paths[1]]
+
+                if addItems is True:
+                    path = item.getPath()
+                    decoratedPath = item.getDecoratedPath()
+                    pathIndex[path] = item
+                    decoratedPathIndex[decoratedPath] = item
+                    indexedPaths[id(item)] = (path, decoratedPath)
+
+                stack.extend(item.getChildren())
+
+        self._pendingPathItems.clear()
+
+        return True
+
+
+    def _rebuildPathIndex(self):
+        """Indexes the objects of the hierarchy by path and decorated path.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        pathIndex = self._pathIndex
+        decoratedPathIndex = self._decoratedPathIndex
+        indexedPaths = self._indexedPaths
+        pathIndex.clear()
+        decoratedPathIndex.clear()
+        indexedPaths.clear()
+
+        stack = [self]
+        while len(stack) > 0:
+            item = stack.pop()
+            path = item.getPath()
+            decoratedPath = item.getDecoratedPath()
+            pathIndex[path] = item
+            decoratedPathIndex[decoratedPath] = item
+            indexedPaths[id(item)] = (path, decoratedPath)
+            stack.extend(item.getChildren())
+
+        self._pendingPathItems.clear()
+        self._pathIndexValid = True
+
+        return True
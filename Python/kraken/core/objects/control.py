@@ -54,57 +54,59 @@ class Control(Curve):
         """
 
         config = Config.getInstance()
-        configShapes = config.getControlShapes()
-        if shape not in configShapes.keys():
+        shapeLibrary = config.getControlShapeLibrary()
+        if shapeLibrary.hasShape(shape) is False:
             raise KeyError("'" + shape + "' is not a valid shape in the loaded config.")
 
-        self.setCurveData(configShapes[shape])
+        self.setCurveShape(shapeLibrary.getShape(shape))
 
         return True
 
 
-
     # ==============
     # Align Methods
     # ==============
-    def alignOnXAxis(self, negative=False):
-        """Aligns the control shape on the X axis.
+    def _alignOnAxis(self, axis, negative):
+        """Moves the control shape so that it lies on one side of an axis.
 
         Args:
-            negative (bool): Whether to align the control on the negative X axis.
+            axis (int): Index of the axis.
+            negative (bool): Whether to align the control on the negative side.
 
         Returns:
             bool: True if successful.
 
         """
 
-        furthest = 0.0
-
-        curveData = list(self.getCurveData())
+        bounds = self.getPointBounds()
+        if bounds is None:
+            return True
 
-        for eachSubCurve in curveData:
-            for eachPoint in eachSubCurve["points"]:
+        if negative is False:
+            furthest = min(bounds[0][axis], 0.0)
+        else:
+            furthest = max(bounds[1][axis], 0.0)
 
-                if negative is False:
+        offset = [0.0, 0.0, 0.0]
+        offset[axis] = 0.0 - furthest
 
-                    if eachPoint[0] < furthest:
-                        furthest = eachPoint[0]
+        self.translatePoints(Vec3(offset[0], offset[1], offset[2]))
 
-                else:
+        return True
 
-                    if eachPoint[0] > furthest:
-                        furthest = eachPoint[0]
 
+    def alignOnXAxis(self, negative=False):
+        """Aligns the control shape on the X axis.
 
-        offset = 0.0 - furthest
+        Args:
+            negative (bool): Whether to align the control on the negative X axis.
 
-        for eachSubCurve in curveData:
-            for eachPoint in eachSubCurve["points"]:
-                eachPoint[0] += offset
+        Returns:
+            bool: True if successful.
 
-        self.setCurveData(curveData)
+        """
 
-        return True
+        return self._alignOnAxis(0, negative)
 
 
     def alignOnYAxis(self, negative=False):
@@ -118,32 +120,7 @@ class Control(Curve):
 
         """
 
-        furthest = 0.0
-
-        curveData = list(self.getCurveData())
-
-        for eachSubCurve in curveData:
-            for eachPoint in eachSubCurve["points"]:
-
-                if negative is False:
-
-                    if eachPoint[1] < furthest:
-                        furthest = eachPoint[1]
-
-                else:
-
-                    if eachPoint[1] > furthest:
-                        furthest = eachPoint[1]
-
-        offset = 0.0 - furthest
-
-        for eachSubCurve in curveData:
-            for eachPoint in eachSubCurve["points"]:
-                eachPoint[1] += offset
-
-        self.setCurveData(curveData)
-
-        return True
+        return self._alignOnAxis(1, negative)
 
 
     def alignOnZAxis(self, negative=False):
@@ -157,32 +134,7 @@ class Control(Curve):
 
         """
 
-        furthest = 0.0
-
-        curveData = list(self.getCurveData())
-
-        for eachSubCurve in curveData:
-            for eachPoint in eachSubCurve["points"]:
-
-                if negative is False:
-
-                    if eachPoint[2] < furthest:
-                        furthest = eachPoint[2]
-
-                else:
-
-                    if eachPoint[2] > furthest:
-                        furthest = eachPoint[2]
-
-        offset = 0.0 - furthest
-
-        for eachSubCurve in curveData:
-            for eachPoint in eachSubCurve["points"]:
-                eachPoint[2] += offset
-
-        self.setCurveData(curveData)
-
-        return True
+        return self._alignOnAxis(2, negative)
 
 
     # ==============
@@ -199,17 +151,9 @@ class Control(Curve):
 
         """
 
-        curveData = list(self.getCurveData())
-
-        for eachSubCurve in curveData:
-            for eachPoint in eachSubCurve["points"]:
-                eachPoint[0] *= scaleVec.x
-                eachPoint[1] *= scaleVec.y
-                eachPoint[2] *= scaleVec.z
-
-        self.setCurveData(curveData)
-
-        return True
+        return self.transformPoints((scaleVec.x, 0.0, 0.0, 0.0,
+                                     0.0, scaleVec.y, 0.0, 0.0,
+                                     0.0, 0.0, scaleVec.z, 0.0))
 
 
     # ===============
@@ -228,25 +172,18 @@ class Control(Curve):
 
         """
 
-        curveData = list(self.getCurveData())
-
         quatRot = Quat()
         quatRot.setFromEuler(Euler(Math_degToRad(xRot), Math_degToRad(yRot),
                                    Math_degToRad(zRot)))
 
-        newPoints = []
-        for eachSubCurve in curveData:
-
-            for eachPoint in eachSubCurve["points"]:
-                pointVec = Vec3(eachPoint[0], eachPoint[1], eachPoint[2])
-                rotVec = quatRot.rotateVector(pointVec)
-                eachPoint[0] = rotVec.x
-                eachPoint[1] = rotVec.y
-                eachPoint[2] = rotVec.z
+        # The columns of the rotation matrix are the rotated axes.
+        xAxis = quatRot.rotateVector(Vec3(1.0, 0.0, 0.0))
+        yAxis = quatRot.rotateVector(Vec3(0.0, 1.0, 0.0))
+        zAxis = quatRot.rotateVector(Vec3(0.0, 0.0, 1.0))
 
-        self.setCurveData(curveData)
-
-        return True
+        return self.transformPoints((xAxis.x, yAxis.x, zAxis.x, 0.0,
+                                     xAxis.y, yAxis.y, zAxis.y, 0.0,
+                                     xAxis.z, yAxis.z, zAxis.z, 0.0))
 
 
     # ==================
@@ -263,14 +200,6 @@ class Control(Curve):
 
         """
 
-        curveData = list(self.getCurveData())
-
-        for eachSubCurve in curveData:
-            for eachPoint in eachSubCurve["points"]:
-                eachPoint[0] += translateVec.x
-                eachPoint[1] += translateVec.y
-                eachPoint[2] += translateVec.z
-
-        self.setCurveData(curveData)
-
-        return True
+        return self.transformPoints((1.0, 0.0, 0.0, translateVec.x,
+                                     0.0, 1.0, 0.0, translateVec.y,
+                                     0.0, 0.0, 1.0, translateVec.z))
@@ -8,6 +8,7 @@ Curve - Curve.
 import copy
 
 from kraken.core.objects.object_3d import Object3D
+from kraken.core.objects.curve_shape import multiplyTransforms, transformPointValues
 
 
 class Curve(Object3D):
@@ -17,6 +18,8 @@ class Curve(Object3D):
         super(Curve, self).__init__(name, parent=parent)
 
         self._data = None
+        self._shape = None
+        self._shapeTransform = None
 
 
     # ======================
@@ -25,11 +28,16 @@ class Curve(Object3D):
     def getCurveData(self):
         """Returns the data of the curve.
 
+        Curves set from a shared shape build their own data from the shape the
+        first time it is requested.
+
         Returns:
             list: Dictionaries defining each sub-curve of this curve.
 
         """
 
+        self._copyShapeData()
+
         return self._data
 
 
@@ -45,10 +53,115 @@ class Curve(Object3D):
         """
 
         self._data = copy.deepcopy(data)
+        self._shape = None
+        self._shapeTransform = None
 
         return True
 
 
+    def _copyShapeData(self):
+        """Builds the curve data of the curve from its shared shape, before
+        the data is returned or edited.
+
+        Returns:
+            bool: True if the data was built.
+
+        """
+
+        if self._shape is None:
+            return False
+
+        self._data = self._shape.getCurveData(transform=self._shapeTransform)
+        self._shape = None
+        self._shapeTransform = None
+
+        return True
+
+
+    def getCurveShape(self):
+        """Returns the shared shape the curve was set from.
+
+        Returns:
+            CurveShape: The shape, None if the curve holds its own data.
+
+        """
+
+        return self._shape
+
+
+    def setCurveShape(self, shape):
+        """Sets the curve from a shared shape. The shape isn't copied, the
+        curve data is only built from it when requested.
+
+        Args:
+            shape (CurveShape): The shape.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        self._data = None
+        self._shape = shape
+        self._shapeTransform = None
+
+        return True
+
+
+    def transformPoints(self, transform):
+        """Transforms the points of the curve.
+
+        The transform is combined with the transform of the shared shape
+        until the curve data is requested.
+
+        Args:
+            transform (tuple): The 12 values (row major) of the top 3 rows of
+                an affine matrix, the translation in the last column.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        if self._shape is not None:
+            if self._shapeTransform is None:
+                self._shapeTransform = tuple(transform)
+            else:
+                self._shapeTransform = multiplyTransforms(transform, self._shapeTransform)
+
+            return True
+
+        for eachSubCurve in self._data:
+            values = [x for point in eachSubCurve["points"] for x in point[0:3]]
+            values = transformPointValues(transform, values)
+            for i, eachPoint in enumerate(eachSubCurve["points"]):
+                eachPoint[0] = values[i * 3]
+                eachPoint[1] = values[i * 3 + 1]
+                eachPoint[2] = values[i * 3 + 2]
+
+        return True
+
+
+    def getPointBounds(self):
+        """Returns the minimum and maximum of the points on each axis.
+
+        Returns:
+            tuple: The minimum and the maximum x, y, z values, None if the
+                curve has no points.
+
+        """
+
+        if self._shape is not None:
+            return self._shape.getPointBounds(transform=self._shapeTransform)
+
+        points = [point for eachSubCurve in self._data for point in eachSubCurve["points"]]
+        if len(points) == 0:
+            return None
+
+        return ([min([x[axis] for x in points]) for axis in xrange(3)],
+                [max([x[axis] for x in points]) for axis in xrange(3)])
+
+
     def appendCurveData(self, data):
         """Appends sub-curve data to this curve.
 
@@ -61,6 +174,7 @@ class Curve(Object3D):
 
         """
 
+        self._copyShapeData()
         self._data += data
 
         return True
@@ -77,7 +191,7 @@ class Curve(Object3D):
 
         """
 
-        if index > len(self.getCurveData()):
+        if index > self.getNumSubCurves():
             raise IndexError("'" + str(index) + "' is out of the range of the 'data' array.")
 
         return True
@@ -91,6 +205,9 @@ class Curve(Object3D):
 
         """
 
+        if self._shape is not None:
+            return self._shape.getNumSubCurves()
+
         return len(self.getCurveData())
 
 
@@ -108,6 +225,9 @@ class Curve(Object3D):
         if self.checkSubCurveIndex(index) is not True:
             return False
 
+        if self._shape is not None:
+            return self._shape.getSubCurveClosed(index)
+
         return self._data[index]["closed"]
 
 
@@ -125,7 +245,7 @@ class Curve(Object3D):
         if self.checkSubCurveIndex(index) is not True:
             return False
 
-        return self._data[index]
+        return self.getCurveData()[index]
 
 
     def setSubCurveData(self, index, data):
@@ -143,6 +263,7 @@ class Curve(Object3D):
         if self.checkSubCurveIndex(index) is not True:
             return False
 
+        self._copyShapeData()
         self._data[index] = data
 
         return True
@@ -162,6 +283,7 @@ class Curve(Object3D):
         if self.checkSubCurveIndex(index) is not True:
             return False
 
+        self._copyShapeData()
         del self._data[index]
 
         return True
@@ -0,0 +1,282 @@
+"""Kraken - objects.curve_shape module.
+
+Classes:
+CurveShape -- Immutable curve data held in a point array.
+CurveShapeLibrary -- Shared curve shapes of the control shapes of a config.
+
+"""
+
+from array import array
+
+
+IDENTITY_TRANSFORM = (1.0, 0.0, 0.0, 0.0,
+                      0.0, 1.0, 0.0, 0.0,
+                      0.0, 0.0, 1.0, 0.0)
+
+
+def multiplyTransforms(a, b):
+    """Returns the transform applying b and then a.
+
+    Transforms are the 12 values (row major) of the top 3 rows of an affine
+    matrix, the translation in the last column.
+
+    Args:
+        a (tuple): The transform applied last.
+        b (tuple): The transform applied first.
+
+    Returns:
+        tuple: The combined transform.
+
+    """
+
+    result = []
+    for row in xrange(3):
+        a0, a1, a2, a3 = a[row * 4:row * 4 + 4]
+        result.extend([a0 * b[0] + a1 * b[4] + a2 * b[8],
+                       a0 * b[1] + a1 * b[5] + a2 * b[9],
+                       a0 * b[2] + a1 * b[6] + a2 * b[10],
+                       a0 * b[3] + a1 * b[7] + a2 * b[11] + a3])
+
+    return tuple(result)
+
+
+def transformPointValues(transform, values):
+    """Returns the supplied points transformed.
+
+    Args:
+        transform (tuple): The transform, see multiplyTransforms.
+        values (array): The x, y, z values of the points.
+
+    Returns:
+        array: The transformed values.
+
+    """
+
+    if transform is None or transform == IDENTITY_TRANSFORM:
+        return array('d', values)
+
+    m00, m01, m02, m03, m10, m11, m12, m13, m20, m21, m22, m23 = transform
+
+    result = array('d', values)
+    for i in xrange(0, len(values), 3):
+        x, y, z = values[i], values[i + 1], values[i + 2]
+        result[i] = m00 * x + m01 * y + m02 * z + m03
+        result[i + 1] = m10 * x + m11 * y + m12 * z + m13
+        result[i + 2] = m20 * x + m21 * y + m22 * z + m23
+
+    return result
+
+
+class CurveShape(object):
+    """Curve data held in one contiguous array of point values, with the
+    offset, degree and closed flag of each sub-curve.
+
+    Shapes are never modified once created, so a shape can be shared by all
+    the curves that use it. Curves hold the shape and a transform applied to
+    its points, and only build their own curve data when it is requested.
+
+    Args:
+        curveData (list): Dictionaries defining each sub-curve of the shape.
+
+    """
+
+    __slots__ = ('_points', '_subCurves')
+
+    def __init__(self, curveData):
+        super(CurveShape, self).__init__()
+
+        points = array('d')
+        subCurves = []
+        for subCurveData in curveData:
+            offset = len(points) / 3
+            for point in subCurveData["points"]:
+                points.extend([float(point[0]), float(point[1]), float(point[2])])
+
+            subCurves.append((offset, len(points) / 3 - offset, subCurveData["degree"], subCurveData["closed"]))
+
+        self._points = points
+        self._subCurves = tuple(subCurves)
+
+
+    def __getstate__(self):
+        return (self._points, self._subCurves)
+
+
+    def __setstate__(self, state):
+        self._points, self._subCurves = state
+
+
+    # ==================
+    # Sub-Curve Methods
+    # ==================
+    def getNumSubCurves(self):
+        """Returns the number of sub-curves of the shape.
+
+        Returns:
+            int: Number of sub-curves.
+
+        """
+
+        return len(self._subCurves)
+
+
+    def getSubCurveClosed(self, index):
+        """Returns whether a sub-curve is closed.
+
+        Args:
+            index (int): Index of the sub-curve.
+
+        Returns:
+            bool: True if the sub-curve is closed.
+
+        """
+
+        return self._subCurves[index][3]
+
+
+    def getSubCurveDegree(self, index):
+        """Returns the degree of a sub-curve.
+
+        Args:
+            index (int): Index of the sub-curve.
+
+        Returns:
+            int: The degree.
+
+        """
+
+        return self._subCurves[index][2]
+
+
+    # ==============
+    # Point Methods
+    # ==============
+    def getNumPoints(self):
+        """Returns the number of points of the shape.
+
+        Returns:
+            int: Number of points of all the sub-curves.
+
+        """
+
+        return len(self._points) / 3
+
+
+    def getPointValues(self, transform=None):
+        """Returns the x, y, z values of the points of the shape.
+
+        Args:
+            transform (tuple): Transform applied to the points.
+
+        Returns:
+            array: A copy of the values.
+
+        """
+
+        return transformPointValues(transform, self._points)
+
+
+    def getPointBounds(self, transform=None):
+        """Returns the minimum and maximum of the points on each axis.
+
+        Args:
+            transform (tuple): Transform applied to the points.
+
+        Returns:
+            tuple: The minimum and the maximum x, y, z values, None if the
+                shape has no points.
+
+        """
+
+        values = self.getPointValues(transform=transform)
+        if len(values) == 0:
+            return None
+
+        return ([min(values[0::3]), min(values[1::3]), min(values[2::3])],
+                [max(values[0::3]), max(values[1::3]), max(values[2::3])])
+
+
+    def getCurveData(self, transform=None):
+        """Returns new curve data built from the shape.
+
+        Args:
+            transform (tuple): Transform applied to the points.
+
+        Returns:
+            list: Dictionaries defining each sub-curve.
+
+        """
+
+        values = self.getPointValues(transform=transform)
+
+        curveData = []
+        for offset, count, degree, closed in self._subCurves:
+            curveData.append({
+                "points": [[values[i * 3], values[i * 3 + 1], values[i * 3 + 2]] for i in xrange(offset, offset + count)],
+                "degree": degree,
+                "closed": closed
+            })
+
+        return curveData
+
+
+class CurveShapeLibrary(object):
+    """Curve shapes of a set of named curve data, created once per name.
+
+    Args:
+        shapesData (dict): Curve data of each shape, by name.
+
+    """
+
+    def __init__(self, shapesData):
+        super(CurveShapeLibrary, self).__init__()
+
+        self._shapesData = shapesData
+        self._shapes = {}
+
+
+    def hasShape(self, name):
+        """Returns whether the library has a shape with the supplied name.
+
+        Args:
+            name (str): Name of the shape.
+
+        Returns:
+            bool: True if the shape exists.
+
+        """
+
+        return name in self._shapesData
+
+
+    def getShapeNames(self):
+        """Returns the names of the shapes of the library.
+
+        Returns:
+            list: The names.
+
+        """
+
+        return self._shapesData.keys()
+
+
+    def getShape(self, name):
+        """Returns the shape with the supplied name.
+
+        Args:
+            name (str): Name of the shape.
+
+        Returns:
+            CurveShape: The shape, shared by all callers.
+
+        """
+
+        shape = self._shapes.get(name)
+        if shape is None:
+            if name not in self._shapesData:
+                raise KeyError("'" + name + "' is not a valid shape in the library.")
+
+            shape = CurveShape(self._shapesData[name])
+            self._shapes[name] = shape
+
+        return shape
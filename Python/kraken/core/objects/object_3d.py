@@ -3,6 +3,9 @@
 Classes:
 Object3D - Base Object3D Object.
 
+Functions:
+resolveBuildNames - Resolves the build names of a hierarchy in one pass.
+
 """
 
 import re
@@ -21,6 +24,7 @@ class Object3D(SceneItem):
         super(Object3D, self).__init__(name, parent)
         self._component = None
         self._children = []
+        self._childIndex = {}
         self._flags = {}
         self._attributeGroups = []
         self._constraints = []
@@ -29,11 +33,24 @@ class Object3D(SceneItem):
         self._color = None
         self._visibility = True
         self._shapeVisibility = True
+        self._transformStore = None
+        self._transformIndex = -1
+        self._buildName = None
+        self._buildNameKey = None
+        self._buildNameRevision = 0
 
         if parent is not None:
             parent.addChild(self)
 
 
+    def __getstate__(self):
+        state = super(Object3D, self).__getstate__()
+        state['_buildName'] = None
+        state['_buildNameKey'] = None
+
+        return state
+
+
     # ==================
     # Property Methods
     # ==================
@@ -65,6 +82,9 @@ class Object3D(SceneItem):
             share the same tr value. Here we implcitly clone the math object to
             ensure the same behavior as in KL.
 
+            Objects held by a TransformStore copy the values in their slot of
+            the store instead, the Xfo returned before keeping its values.
+
         Args:
             value (Xfo): Vector to set the xfo by.
 
@@ -73,7 +93,13 @@ class Object3D(SceneItem):
 
         """
 
-        self._xfo = value.clone()
+        if self._transformStore is not None:
+            self._transformStore.detachXfo(self)
+            self._transformStore.setXfo(self._transformIndex, value)
+        else:
+            self._xfo = value.clone()
+
+        self.markDirty()
 
         return True
 
@@ -127,14 +153,65 @@ class Object3D(SceneItem):
     def getBuildName(self):
         """Returns the build name for the object.
 
+        The build name is cached until the object, its component or its
+        container is renamed, it is moved to another component or container,
+        or the config changes, configs being identified by their hash.
+
         Returns:
             str: Name to be used in the DCC.
 
         """
 
-        typeNameHierarchy = self.getTypeHierarchyNames()
-
         config = Config.getInstance()
+        container = self.getContainer()
+        buildNameKey = self._getBuildNameKey(config.getHash(), container)
+        if self._buildNameKey != buildNameKey:
+            self._buildName = self._resolveBuildName(config, container)
+            self._buildNameKey = buildNameKey
+
+        return self._buildName
+
+
+    def _getBuildNameKey(self, configHash, container):
+        """Returns the key the cached build name is valid for, made of the
+        revisions of the object, its component and its container.
+
+        Args:
+            configHash (str): The hash of the config.
+            container (Container): The container of the object.
+
+        Returns:
+            tuple: The key of the build name.
+
+        """
+
+        component = self._component
+        if component is not None:
+            componentRevision = component._buildNameRevision
+        else:
+            componentRevision = None
+
+        if container is not None:
+            containerRevision = container._buildNameRevision
+        else:
+            containerRevision = None
+
+        return (configHash, self._buildNameRevision, component, componentRevision, container, containerRevision)
+
+
+    def _resolveBuildName(self, config, container):
+        """Resolves the build name of the object from the name template.
+
+        Args:
+            config (Config): The config holding the name template.
+            container (Container): The container of the object.
+
+        Returns:
+            str: Name to be used in the DCC.
+
+        """
+
+        typeNameHierarchy = self.getTypeHierarchyNames()
 
         # If flag is set on object to use explicit name, return it.
         if config.getExplicitNaming() is True or self.testFlag('EXPLICIT_NAME'):
@@ -200,16 +277,31 @@ class Object3D(SceneItem):
                 builtName += self.getComponent().getName()
 
             elif token is 'container':
-                if self.getContainer() is None:
+                if container is None:
                     skipSep = True
                     continue
-                builtName += self.getContainer().getName()
+                builtName += container.getName()
 
             else:
                 raise ValueError("Unresolvabled token '" + token + "' used on: " + self.getPath())
 
         return builtName
 
+
+    def invalidateBuildName(self):
+        """Invalidates the cached build name of the object, and of the objects
+        of the component or container when the object is one.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        self._buildNameRevision += 1
+
+        return True
+
+
     def setName(self, name):
         """Sets the name of the object with a string.
 
@@ -221,27 +313,20 @@ class Object3D(SceneItem):
 
         """
 
+        parent = self.getParent()
+
         # check for name collision and adjust the name if they exist
-        if self.getParent() is not None:
+        if parent is not None:
             # Increment name if it already exists
-            initName = name
-            suffix = 1
-            collision = True
-            while collision:
-                child = self.getParent().getChildByDecoratedName(name + self.getNameDecoration())
-                collision = child != None and child is not self
-                if not collision:
-                    break
-
-                result = re.split(r"(\d+)$", initName, 1)
-                if len(result) > 1:
-                    initName = result[0]
-                    suffix = int(result[1])
-
-                name = initName + str(suffix).zfill(2)
-                suffix += 1
+            name = parent._getFreeChildName(self, name, useNameSuffix=True)
 
+        prevName = self.getName()
         super(Object3D, self).setName(name)
+        self.invalidateBuildName()
+        self.invalidatePathIndices()
+
+        if isinstance(parent, Object3D) and name != prevName:
+            parent._reindexChild(self, prevName)
 
         return True
 
@@ -249,6 +334,53 @@ class Object3D(SceneItem):
     # ==================
     # Hierarchy Methods
     # ==================
+    def setParent(self, parent):
+        """Sets the parent attribute of this object.
+
+        Args:
+            parent (Object): Object that is the parent of this one.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        # The object is re-indexed by the containers it leaves and joins.
+        if self.getParent() is not None:
+            self.invalidatePathIndices()
+
+        super(Object3D, self).setParent(parent)
+        self.invalidatePathIndices()
+
+        return True
+
+
+    def invalidatePathIndices(self):
+        """Queues the object and the objects under it to be re-indexed by the
+        path index of the containers above it.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        for container in self._getPathContainers():
+            container._queuePathIndexUpdate(self)
+
+        return True
+
+
+    def _getPathChildren(self):
+        """Returns the items whose paths are built from the path of this item.
+
+        Returns:
+            list: The children, attribute groups and constraints.
+
+        """
+
+        return self._children + self._attributeGroups + self._constraints
+
+
     def getContainer(self):
         """Returns the Container the object belongs to.
 
@@ -279,6 +411,17 @@ class Object3D(SceneItem):
         return parent
 
 
+    def getTransformStore(self):
+        """Returns the TransformStore holding the xfo of this object.
+
+        Returns:
+            TransformStore: The transform store, None if the xfo isn't stored.
+
+        """
+
+        return self._transformStore
+
+
     # ==================
     # Component Methods
     # ==================
@@ -359,26 +502,28 @@ class Object3D(SceneItem):
             parent = child.getParent()
             if child in parent.getChildren():
                 parent.getChildren().remove(child)
+                parent._removeChildFromIndex(child, child.getName())
 
         # check for name collision and adjust the name if they exist
         # Increment name if it already exists
         initName = child.getName()
-        name = initName
-        suffix = 1
-
-        while self.getChildByDecoratedName(name + child.getNameDecoration()) != None:
-            name = initName + str(suffix).zfill(2)
-            suffix += 1
+        name = self._getFreeChildName(child, initName)
         if initName != name:
             child.setName(name)
 
         self.getChildren().append(child)
+        self._addChildToIndex(child)
         child.setParent(self)
 
         # Assign the child the same component.
         if self._component is not None:
             child.setComponent(self._component)
 
+        if self._transformStore is not None:
+            self._transformStore.addHierarchy(child)
+        elif child._transformStore is not None:
+            child._transformStore.removeHierarchy(child)
+
         return True
 
 
@@ -396,7 +541,14 @@ class Object3D(SceneItem):
         if self._checkChildIndex(index) is not True:
             return False
 
+        child = self.getChildren()[index]
+        if child._transformStore is not None:
+            child._transformStore.removeHierarchy(child)
+
         del self.getChildren()[index]
+        self._removeChildFromIndex(child, child.getName())
+        child.invalidatePathIndices()
+        SceneItem.invalidateHierarchy()
 
         return True
 
@@ -412,16 +564,11 @@ class Object3D(SceneItem):
 
         """
 
-        removeIndex = None
-
-        for i, eachChild in enumerate(self.getChildren()):
-            if eachChild.getName() == name:
-                removeIndex = i
-
-        if removeIndex is None:
+        children = self._childIndex.get(name)
+        if children is None:
             raise ValueError("'" + name + "' is not a valid child of this object.")
 
-        self.removeChildByIndex(removeIndex)
+        self.removeChildByIndex(self.getChildren().index(children[-1]))
 
         return True
 
@@ -442,8 +589,12 @@ class Object3D(SceneItem):
                 names.append(c.getName())
             raise Exception("Object '"+self.getPath() + "' does not have child:"+child.getPath() + ". it does have:" + str(names))
 
+        self._removeChildFromIndex(child, child.getName())
         child.setParent(None)
 
+        if child._transformStore is not None:
+            child._transformStore.removeHierarchy(child)
+
         # Un-assign the child the component.
         if self._component is not None:
             child.setComponent(None)
@@ -451,10 +602,37 @@ class Object3D(SceneItem):
         return True
 
 
+    def moveChild(self, child, index):
+        """Moves a child of this object to another index in its children.
+
+        Args:
+            child (Object): Child to move.
+            index (int): New index of the child.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        children = self.getChildren()
+        if child not in children:
+            raise ValueError("'" + child.getName() + "' is not a child of this object.")
+
+        children.remove(child)
+        children.insert(index, child)
+        SceneItem.invalidateHierarchy()
+
+        return True
+
+
 
     def getChildren(self):
         """Gets the children of this object.
 
+        Note:
+            The returned list must not be modified, the children are indexed
+            by name. Use addChild and removeChild instead.
+
         Returns:
             list: Child objects.
 
@@ -502,11 +680,11 @@ class Object3D(SceneItem):
 
         """
 
-        for eachChild in self.getChildren():
-            if eachChild.getName() == name:
-                return eachChild
+        children = self._childIndex.get(name)
+        if children is None:
+            return None
 
-        return None
+        return children[0]
 
 
     def getChildByDecoratedName(self, decoratedName):
@@ -520,13 +698,114 @@ class Object3D(SceneItem):
 
         """
 
-        for eachChild in self.getChildren():
-            if eachChild.getDecoratedName() == decoratedName:
-                return eachChild
+        # The decorated name starts with the name of the child. Look up each
+        # prefix of the decorated name in the name index, longest first.
+        childIndex = self._childIndex
+        for i in xrange(len(decoratedName), -1, -1):
+            children = childIndex.get(decoratedName[:i])
+            if children is None:
+                continue
+
+            for eachChild in children:
+                if eachChild.getDecoratedName() == decoratedName:
+                    return eachChild
 
         return None
 
 
+    def _getFreeChildName(self, child, name, useNameSuffix=False):
+        """Returns a name for the child that doesn't collide with the decorated
+        names of the other children.
+
+        If the name collides, candidates are built from the name and a 2 digit
+        suffix counting up from 1. Each candidate is tested with a lookup in
+        the name index.
+
+        Args:
+            child (Object): The child to name.
+            name (str): The requested name.
+            useNameSuffix (bool): Whether to count up from the numeric suffix
+                of the requested name instead of appending a new one.
+
+        Returns:
+            str: The requested name if it is free, the first free candidate
+                otherwise.
+
+        """
+
+        decoration = child.getNameDecoration()
+
+        existing = self.getChildByDecoratedName(name + decoration)
+        if existing is None or existing is child:
+            return name
+
+        baseName = name
+        suffix = 1
+        if useNameSuffix:
+            result = re.split(r"(\d+)$", name, 1)
+            if len(result) > 1:
+                baseName = result[0]
+                suffix = int(result[1])
+
+        while True:
+            candidate = baseName + str(suffix).zfill(2)
+            existing = self.getChildByDecoratedName(candidate + decoration)
+            if existing is None or existing is child:
+                return candidate
+
+            suffix += 1
+
+
+    def _addChildToIndex(self, child):
+        """Adds the child to the name index, children with the same name are
+        kept in the order of the children.
+
+        Args:
+            child (Object): The child to index.
+
+        """
+
+        children = self._childIndex.setdefault(child.getName(), [])
+        children.append(child)
+        if len(children) > 1:
+            children.sort(key=self._children.index)
+
+
+    def _removeChildFromIndex(self, child, name):
+        """Removes the child from the name index.
+
+        Args:
+            child (Object): The child to remove.
+            name (str): The name the child is indexed with.
+
+        """
+
+        children = self._childIndex.get(name)
+        if children is None or child not in children:
+            return
+
+        children.remove(child)
+        if len(children) == 0:
+            del self._childIndex[name]
+
+
+    def _reindexChild(self, child, prevName):
+        """Updates the name index after the child was renamed.
+
+        Args:
+            child (Object): The renamed child.
+            prevName (str): The name the child is indexed with.
+
+        """
+
+        children = self._childIndex.get(prevName)
+        if children is None or child not in children:
+            return
+
+        self._removeChildFromIndex(child, prevName)
+        self._addChildToIndex(child)
+
+
     def getChildrenByType(self, childType):
         """Returns all children that are of the specified type.
 
@@ -558,6 +837,7 @@ class Object3D(SceneItem):
         """
 
         self._flags[name] = True
+        self.invalidateBuildName()
 
         return True
 
@@ -592,6 +872,7 @@ class Object3D(SceneItem):
 
         if name in self._flags:
             del self._flags[name]
+            self.invalidateBuildName()
             return True
 
         return False
@@ -764,6 +1045,7 @@ class Object3D(SceneItem):
         self._constraints.append(constraint)
         constraint.setParent(self)
         constraint.setConstrainee(self)
+        SceneItem.invalidateDependencies()
 
         return True
 
@@ -783,6 +1065,7 @@ class Object3D(SceneItem):
             return False
 
         del self._constraints[index]
+        SceneItem.invalidateDependencies()
 
         return True
 
@@ -1041,26 +1324,23 @@ class Object3D(SceneItem):
 
         jsonData = {
             '__typeHierarchy__': classHierarchy,
+            '__id__': saver.getItemId(self),
             'name': self.getName(),
-            'parent': None,
+            'parent': saver.getItemId(self.getParent()),
             'children': [],
             'flags': self._flags,
             'attributeGroups': [],
             'constraints': [],
-            'xfo': self.xfo.jsonEncode(),
-            'color': self.getColor(),
+            'xfo': saver.encodeValue(self.xfo),
+            'color': saver.encodeValue(self.getColor()),
             'visibility': self._visibility,
             'shapeVisibility': self._shapeVisibility,
         }
 
-        if self.getParent() is not None:
-            jsonData['parent'] = self.getParent().getName()
-
-        if self.getColor() is not None:
-            jsonData['color'] = saver.encodeValue(self.getColor())
-
-        for child in self.getChildren():
-            jsonData['children'].append(child.jsonEncode(saver))
+        # Streamed items are written as records of their own.
+        if saver.getEncodeChildren() is True:
+            for child in self.getChildren():
+                jsonData['children'].append(child.jsonEncode(saver))
 
         for attrGroup in self._attributeGroups:
             jsonData['attributeGroups'].append(attrGroup.jsonEncode(saver))
@@ -1097,7 +1377,7 @@ class Object3D(SceneItem):
             # There is one default attribute group assigned to each scene item.
             # Load data into the existing item instead of constructing a new one.
             if attrGroup['name'] == '':
-                loader.registerItem(self._attributeGroups[0])
+                loader.registerItem(self._attributeGroups[0], itemId=attrGroup.get('__id__'))
                 self._attributeGroups[0].jsonDecode(loader, attrGroup)
             else:
                 self.addAttributeGroup(loader.construct(attrGroup))
@@ -1106,3 +1386,42 @@ class Object3D(SceneItem):
             self.addConstraint(loader.construct(constr))
 
         return True
+
+
+def resolveBuildNames(kSceneItem):
+    """Resolves the build names of the supplied object and of all its
+    descendants in a single top down pass, filling the build name cache.
+
+    The container of each object is passed down the hierarchy instead of being
+    looked up from every object.
+
+    Args:
+        kSceneItem (Object3D): Root of the hierarchy.
+
+    Returns:
+        dict: The build name of each object of the hierarchy.
+
+    """
+
+    config = Config.getInstance()
+    configHash = config.getHash()
+
+    buildNames = {}
+    stack = [(kSceneItem, kSceneItem.getContainer())]
+    while len(stack) > 0:
+        kObject, container = stack.pop()
+
+        buildNameKey = kObject._getBuildNameKey(configHash, container)
+        if kObject._buildNameKey != buildNameKey:
+            kObject._buildName = kObject._resolveBuildName(config, container)
+            kObject._buildNameKey = buildNameKey
+
+        buildNames[kObject] = kObject._buildName
+
+        if kObject.isTypeOf('Container'):
+            container = kObject
+
+        for child in kObject.getChildren():
+            stack.append((child, container))
+
+    return buildNames
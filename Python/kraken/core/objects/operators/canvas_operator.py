@@ -15,25 +15,23 @@ from kraken.core.kraken_system import ks
 class CanvasOperator(Operator):
     """Splice Operator representation."""
 
+    # Parsed graph description of each preset keyed by preset path.
+    _presetDescs = {}
+
+    # Idle bindings of each preset keyed by preset path. Bindings are taken
+    # from the pool for an evaluation and returned to it afterwards, only their
+    # argument values are set between evaluations.
+    _bindingPool = {}
+
     def __init__(self, name, canvasPresetPath):
         super(CanvasOperator, self).__init__(name)
 
         self.canvasPresetPath = canvasPresetPath
 
-        # Note: this is a temporary solution to getting the descritption of a Canvas node.
-        # I beleive that the API does provide a method to retrieve the node desc, but I couldn't find it.
-        def getPresetDesc(path):
-
-            fileContents = ""
-            with open(ks.getCoreClient().DFG.host.getPresetImportPathname(path), 'r') as presetFile:
-                fileContents = presetFile.read()
-                fileContents = "".join(fileContents.split('\n'))
-                fileContents = "".join(fileContents.split('\r'))
-                fileContents = "  ".join(fileContents.split('\t'))
-
-            return json.loads(fileContents)
+        if self.canvasPresetPath not in CanvasOperator._presetDescs:
+            CanvasOperator._presetDescs[self.canvasPresetPath] = self._loadPresetDesc(self.canvasPresetPath)
 
-        self.graphDesc = getPresetDesc(self.canvasPresetPath)
+        self.graphDesc = CanvasOperator._presetDescs[self.canvasPresetPath]
 
         # Initialize the inputs and outputs based on the given args.
         for port in self.graphDesc['ports']:
@@ -56,6 +54,30 @@ class CanvasOperator(Operator):
                     self.outputs[portName] = None
 
 
+    @classmethod
+    def _loadPresetDesc(cls, path):
+        """Reads and parses the description of a preset.
+
+        Args:
+            path (str): Path of the preset within the Canvas library.
+
+        Returns:
+            dict: The json description of the preset.
+
+        """
+
+        # Note: this is a temporary solution to getting the descritption of a Canvas node.
+        # I beleive that the API does provide a method to retrieve the node desc, but I couldn't find it.
+        fileContents = ""
+        with open(ks.getCoreClient().DFG.host.getPresetImportPathname(path), 'r') as presetFile:
+            fileContents = presetFile.read()
+            fileContents = "".join(fileContents.split('\n'))
+            fileContents = "".join(fileContents.split('\r'))
+            fileContents = "  ".join(fileContents.split('\t'))
+
+        return json.loads(fileContents)
+
+
     def getPresetPath(self):
         """Returns the preset path within the Canvas library for the node used by this operator.
 
@@ -86,12 +108,15 @@ class CanvasOperator(Operator):
 
         """
 
-        def getRTVal(obj):
+        def getValue(obj):
             if isinstance(obj, Object3D):
                 return obj.xfo.getRTVal().toMat44('Mat44')
             elif isinstance(obj, Attribute):
                 return obj.getRTVal()
 
+        def getRTVal(obj):
+            return ks.toFabricRTVal(getValue(obj))
+
         portVals = []
         for port in self.graphDesc['ports']:
             portName = port['name']
@@ -102,43 +127,87 @@ class CanvasOperator(Operator):
                 return
 
             if portDataType == 'EvalContext':
-                portVals.append(ks.constructRTVal(portDataType))
+                portVals.append(ks.toFabricRTVal(ks.constructRTVal(portDataType)))
                 continue
             if portName == 'time':
-                portVals.append(ks.constructRTVal(portDataType))
+                portVals.append(ks.toFabricRTVal(ks.constructRTVal(portDataType)))
                 continue
             if portName == 'frame':
-                portVals.append(ks.constructRTVal(portDataType))
+                portVals.append(ks.toFabricRTVal(ks.constructRTVal(portDataType)))
                 continue
 
             if portConnectionType == 'In':
                 if str(portDataType).endswith('[]'):
-                    rtValArray = ks.rtVal(portDataType[:-2]+'Array')
-                    rtValArray.resize(len(self.inputs[portName]))
-                    for j in xrange(len(self.inputs[portName])):
-                        rtValArray[j] = getRTVal(self.inputs[portName][j])
-                    portVals.append(rtValArray)
+                    values = [getValue(x) for x in self.inputs[portName]]
+                    portVals.append(ks.toFabricRTVal(ks.constructRTValArray(portDataType[:-2], values)))
                 else:
                     portVals.append(getRTVal(self.inputs[portName]))
             else:
                 if str(portDataType).endswith('[]'):
-                    rtValArray = ks.rtVal(portDataType[:-2]+'Array')
-                    rtValArray.resize(len(self.outputs[portName]))
-                    for j in xrange(len(self.outputs[portName])):
-                        rtValArray[j] = getRTVal(self.outputs[portName][j])
-                    portVals.append(rtValArray)
+                    values = [getValue(x) for x in self.outputs[portName]]
+                    portVals.append(ks.toFabricRTVal(ks.constructRTValArray(portDataType[:-2], values)))
                 else:
                     portVals.append(getRTVal(self.outputs[portName]))
 
 
-        host = ks.getCoreClient().DFG.host
-        binding = host.createBindingToPreset(self.canvasPresetPath, portVals)
+        binding = self._acquireBinding(portVals)
         binding.execute()
+        self._setOutputValues(binding)
+        self._releaseBinding(binding)
+
+        return True
+
+
+    def _acquireBinding(self, portVals):
+        """Returns a binding to the preset of this operator with the given
+        argument values, reusing an idle binding of the pool when possible.
+
+        Args:
+            portVals (list): RTVal of each port of the preset.
+
+        Returns:
+            object: The DFG binding.
+
+        """
+
+        bindings = CanvasOperator._bindingPool.setdefault(self.canvasPresetPath, [])
+        if len(bindings) == 0:
+            host = ks.getCoreClient().DFG.host
+            return host.createBindingToPreset(self.canvasPresetPath, portVals)
+
+        binding = bindings.pop()
+        for port, portVal in zip(self.graphDesc['ports'], portVals):
+            binding.setArgValue(port['name'], portVal, False)
+
+        return binding
+
+
+    def _releaseBinding(self, binding):
+        """Returns a binding to the pool of the preset of this operator.
+
+        Args:
+            binding (object): The DFG binding.
+
+        """
+
+        CanvasOperator._bindingPool[self.canvasPresetPath].append(binding)
+
+
+    def _setOutputValues(self, binding):
+        """Puts the values computed by a binding out to the connected output
+        objects.
+
+        Args:
+            binding (object): The executed DFG binding.
+
+        Returns:
+            bool: True if successful.
+
+        """
 
-        # Now put the computed values out to the connected output objects.
         def setRTVal(obj, rtval):
             if isinstance(obj, Object3D):
-                obj.xfo.setFromMat44(Mat44(rtval))
+                obj.xfo.setFromMat44(Mat44(ks.fromFabricRTVal(rtval, 'Mat44')))
             elif isinstance(obj, Attribute):
                 obj.setValue(rtval)
 
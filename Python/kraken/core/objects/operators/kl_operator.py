@@ -21,27 +21,19 @@ class KLOperator(Operator):
     # an attirbute array called 'klOperators' that contains sets of what we
     # currently have setup.
 
+    # Arguments of each solver keyed by (extension, solverTypeName): the
+    # KrakenSolverArg[] RTVal and a tuple of (name, dataType, connectionType).
+    _solverSignatures = {}
+
     def __init__(self, name, solverTypeName, extension):
         super(KLOperator, self).__init__(name)
 
         self.solverTypeName = solverTypeName
         self.extension = extension
-
-        # Load the Fabric Engine client and construct the RTVal for the Solver
-        ks.loadCoreClient()
-        ks.loadExtension('Kraken')
-        if self.extension != 'Kraken':
-            ks.loadExtension(self.extension)
-        self.solverRTVal = ks.constructRTVal(self.solverTypeName)
-        self.args = self.solverRTVal.getArguments('KrakenSolverArg[]')
+        self._initSolver()
 
         # Initialize the inputs and outputs based on the given args.
-        for i in xrange(len(self.args)):
-            arg = self.args[i]
-            argName = arg.name.getSimpleType()
-            argDataType = arg.dataType.getSimpleType()
-            argConnectionType = arg.connectionType.getSimpleType()
-
+        for argName, argDataType, argConnectionType in self.signature:
             if argConnectionType == 'In':
                 if argDataType.endswith('[]'):
                     self.inputs[argName] = []
@@ -54,6 +46,66 @@ class KLOperator(Operator):
                     self.outputs[argName] = None
 
 
+    def __getstate__(self):
+        # The solver and its RTVals only exist in this process, they are
+        # constructed again from the solver type and extension when unpickled.
+        state = super(KLOperator, self).__getstate__()
+        state['solver'] = None
+        state['solverRTVal'] = None
+        state['args'] = None
+
+        return state
+
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._initSolver()
+
+
+    def _initSolver(self):
+        """Constructs the solver of the operator and reads its signature.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        self.solver = None
+
+        # With the python math backend, solvers with a Python implementation
+        # are evaluated without Fabric.
+        if ks.getMathBackend() == 'python' and ks.loadSolverModules() and \
+                self.solverTypeName in ks.getSolverTypeNames():
+            self.solver = ks.getSolverClass(self.solverTypeName)()
+            self.solverRTVal = None
+            self.args = None
+            self.signature = self.solver.getArguments()
+        else:
+            # Load the Fabric Engine client and construct the RTVal for the Solver
+            ks.loadCoreClient()
+            ks.loadExtension('Kraken')
+            if self.extension != 'Kraken':
+                ks.loadExtension(self.extension)
+            self.solverRTVal = ks.constructRTVal(self.solverTypeName)
+
+            signatureKey = (self.extension, self.solverTypeName)
+            if signatureKey not in KLOperator._solverSignatures:
+                args = self.solverRTVal.getArguments('KrakenSolverArg[]')
+
+                signature = []
+                for i in xrange(len(args)):
+                    arg = args[i]
+                    signature.append((arg.name.getSimpleType(),
+                                      arg.dataType.getSimpleType(),
+                                      arg.connectionType.getSimpleType()))
+
+                KLOperator._solverSignatures[signatureKey] = (args, tuple(signature))
+
+            self.args, self.signature = KLOperator._solverSignatures[signatureKey]
+
+        return True
+
+
     def getSolverTypeName(self):
         """Returns the solver type name for this operator.
 
@@ -87,6 +139,17 @@ class KLOperator(Operator):
         return self.args
 
 
+    def getSolverSignature(self):
+        """Returns the arguments of the solver as plain Python values.
+
+        Returns:
+            tuple: (name, dataType, connectionType) tuples, one per argument.
+
+        """
+
+        return self.signature
+
+
     def generateSourceCode(self, arraySizes={}):
         """Returns the source code for a stub operator that will invoke the KL operator
 
@@ -106,9 +169,9 @@ class KLOperator(Operator):
         opSourceCode += "  if(solver == null)\n"
         opSourceCode += "    solver = " + self.solverTypeName + "();\n"
         opSourceCode += "  solver.solve(\n"
-        for i in xrange(len(self.args)):
-            argName = self.args[i].name.getSimpleType()
-            if i == len(self.args) - 1:
+        for i in xrange(len(self.signature)):
+            argName = self.signature[i][0]
+            if i == len(self.signature) - 1:
                 opSourceCode += "    " + argName + "\n"
             else:
                 opSourceCode += "    " + argName + ",\n"
@@ -127,45 +190,40 @@ class KLOperator(Operator):
 
         """
 
-        def getRTVal(obj):
+        if self.solver is not None:
+            return self._evaluateSolver()
+
+        def getValue(obj):
             if isinstance(obj, Object3D):
                 return obj.xfo.getRTVal().toMat44('Mat44')
             elif isinstance(obj, Attribute):
                 return obj.getRTVal()
 
-        argVals = []
-        for i in xrange(len(self.args)):
-            arg = self.args[i]
-            argName = arg.name.getSimpleType()
-            argDataType = arg.dataType.getSimpleType()
-            argConnectionType = arg.connectionType.getSimpleType()
+        def getRTVal(obj):
+            return ks.toFabricRTVal(getValue(obj))
 
+        argVals = []
+        for argName, argDataType, argConnectionType in self.signature:
             if argDataType == 'EvalContext':
-                argVals.append(ks.constructRTVal(argDataType))
+                argVals.append(ks.toFabricRTVal(ks.constructRTVal(argDataType)))
                 continue
             if argName == 'time':
-                argVals.append(ks.constructRTVal(argDataType))
+                argVals.append(ks.toFabricRTVal(ks.constructRTVal(argDataType)))
                 continue
             if argName == 'frame':
-                argVals.append(ks.constructRTVal(argDataType))
+                argVals.append(ks.toFabricRTVal(ks.constructRTVal(argDataType)))
                 continue
 
             if argConnectionType == 'In':
                 if str(argDataType).endswith('[]'):
-                    rtValArray = ks.rtVal(argDataType[:-2]+'Array')
-                    rtValArray.resize(len(self.inputs[argName]))
-                    for j in xrange(len(self.inputs[argName])):
-                        rtValArray[j] = getRTVal(self.inputs[argName][j])
-                    argVals.append(rtValArray)
+                    values = [getValue(x) for x in self.inputs[argName]]
+                    argVals.append(ks.toFabricRTVal(ks.constructRTValArray(argDataType[:-2], values)))
                 else:
                     argVals.append(getRTVal(self.inputs[argName]))
             else:
                 if str(argDataType).endswith('[]'):
-                    rtValArray = ks.rtVal(argDataType[:-2]+'Array')
-                    rtValArray.resize(len(self.outputs[argName]))
-                    for j in xrange(len(self.outputs[argName])):
-                        rtValArray[j] = getRTVal(self.outputs[argName][j])
-                    argVals.append(rtValArray)
+                    values = [getValue(x) for x in self.outputs[argName]]
+                    argVals.append(ks.toFabricRTVal(ks.constructRTValArray(argDataType[:-2], values)))
                 else:
                     argVals.append(getRTVal(self.outputs[argName]))
 
@@ -174,21 +232,73 @@ class KLOperator(Operator):
         # Now put the computed values out to the connected output objects.
         def setRTVal(obj, rtval):
             if isinstance(obj, Object3D):
-                obj.xfo.setFromMat44(Mat44(rtval))
+                obj.xfo.setFromMat44(Mat44(ks.fromFabricRTVal(rtval, 'Mat44')))
             elif isinstance(obj, Attribute):
                 obj.setValue(rtval)
 
         for i in xrange(len(argVals)):
-            arg = self.args[i]
-            argName = arg.name.getSimpleType()
-            argDataType = arg.dataType.getSimpleType()
-            argConnectionType = arg.connectionType.getSimpleType()
+            argName, argDataType, argConnectionType = self.signature[i]
 
             if argConnectionType != 'In':
                 if argDataType.endswith('[]'):
-                    for j in xrange(len(argVals[i])):
-                        setRTVal(self.outputs[argName][j], argVals[i][j])
+                    rtValArray = ks.fromFabricRTVal(argVals[i], argDataType)
+                    for j in xrange(len(rtValArray)):
+                        setRTVal(self.outputs[argName][j], rtValArray[j])
                 else:
                     setRTVal(self.outputs[argName], argVals[i])
 
-        return True
\ No newline at end of file
+        return True
+
+
+    def _evaluateSolver(self):
+        """Evaluates the Python implementation of the solver.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        def getValue(obj):
+            if isinstance(obj, Object3D):
+                matValues = obj.xfo.getRTVal().toMat44('Mat44').getValues()
+                return [matValues[0:4], matValues[4:8], matValues[8:12], matValues[12:16]]
+            elif isinstance(obj, Attribute):
+                return obj.getValue()
+
+        args = {}
+        for argName, argDataType, argConnectionType in self.signature:
+            if argConnectionType == 'In':
+                argValue = self.inputs[argName]
+            else:
+                argValue = self.outputs[argName]
+
+            if argValue is None:
+                continue
+
+            if argDataType.endswith('[]'):
+                args[argName] = [getValue(x) for x in argValue]
+            else:
+                args[argName] = getValue(argValue)
+
+        results = self.solver.solve(**args)
+
+        # Now put the computed values out to the connected output objects.
+        def setValue(obj, value):
+            if isinstance(obj, Object3D):
+                matRTVal = ks.rtVal('Mat44')
+                matRTVal.setValues([float(x) for x in value.flatten()])
+                obj.xfo.setFromMat44(Mat44(matRTVal))
+            elif isinstance(obj, Attribute):
+                obj.setValue(value)
+
+        for argName, argDataType, argConnectionType in self.signature:
+            if argConnectionType == 'In':
+                continue
+
+            if argDataType.endswith('[]'):
+                for j, outputObj in enumerate(self.outputs[argName]):
+                    setValue(outputObj, results[argName][0, j])
+            elif self.outputs[argName] is not None:
+                setValue(self.outputs[argName], results[argName][0])
+
+        return True
@@ -72,6 +72,8 @@ class Operator(SceneItem):
         else:
             self.inputs[name] = operatorInput
 
+        SceneItem.invalidateDependencies()
+
         return True
 
 
@@ -145,6 +147,8 @@ class Operator(SceneItem):
         else:
             self.outputs[name] = operatorOutput
 
+        SceneItem.invalidateDependencies()
+
         return True
 
 
@@ -5,15 +5,66 @@ Rig -- Rig representation.
 
 """
 
+import cPickle
 import importlib
-import json
+import multiprocessing
 import os
 
 from container import Container
+from kraken.core.objects.scene_item import SceneItem
+from kraken.core.evaluation_graph import EvaluationGraph
 from kraken.core.kraken_system import KrakenSystem
 from kraken.core.profiler import Profiler
 from kraken.core.objects.layer import Layer
-from kraken.helpers.utility_methods import prepareToSave, prepareToLoad
+from kraken.core.objects.transform_store import TransformStore
+from kraken.core.io import json_codec
+from kraken.core.io.rig_file import RigFile, BINARY_EXTENSION
+
+
+def _loadComponentInWorker(job):
+    """Constructs and loads a component in a worker process.
+
+    The component is built in a scratch rig with the name of the target rig,
+    so the layers and component groups it creates are laid out as in the
+    target rig.
+
+    Args:
+        job (tuple): The name of the target rig and the component data.
+
+    Returns:
+        str: The pickled scratch rig and the items marked dirty while loading,
+            None if the component holds objects that can't be pickled.
+
+    """
+
+    rigName, componentData = job
+
+    KrakenSystem.getInstance().setMathBackend('python')
+
+    # Only the items marked dirty by the component are sent back, the items
+    # that were already dirty are marked again once the component is loaded.
+    prevDirtyItems = SceneItem._dirtyItems.values()
+    SceneItem._dirtyItems.clear()
+
+    scratchRig = Rig(rigName)
+    scratchRig._loadComponents([componentData])
+
+    # Give the objects standalone xfos, they are moved to the transform store
+    # of the target rig when stitched.
+    transformStore = scratchRig.getTransformStore()
+    if transformStore is not None:
+        transformStore.removeHierarchy(scratchRig)
+
+    try:
+        payload = cPickle.dumps((scratchRig, SceneItem._dirtyItems.values()), cPickle.HIGHEST_PROTOCOL)
+    except (cPickle.PicklingError, TypeError):
+        # e.g. attribute callbacks bound to the component.
+        payload = None
+
+    for item in prevDirtyItems:
+        item.markDirty()
+
+    return payload
 
 
 class Rig(Container):
@@ -22,12 +73,52 @@ class Rig(Container):
     def __init__(self, name='rig'):
         super(Rig, self).__init__(name)
         self._metaData = {}
+        self._evaluationGraph = None
+        self._evaluationGraphKey = None
+        self._loadingComponents = False
+
+        # With the python math backend, the transforms of all the objects of
+        # the rig are held in a single contiguous buffer.
+        if KrakenSystem.getInstance().getMathBackend() == 'python':
+            TransformStore().addHierarchy(self)
+
+
+    def __getstate__(self):
+        state = super(Rig, self).__getstate__()
+        state['_evaluationGraph'] = None
+        state['_evaluationGraphKey'] = None
+
+        return state
+
+    def _writeDefinitionFile(self, filepath, data):
+        """Writes rig data to a file on disk, to a binary rig file if the file
+        has the .krb extension and to a JSON file otherwise.
+
+        Args:
+            filepath (str): The file path of the rig definition file.
+            data (dict): The rig data.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        if os.path.splitext(filepath)[1].lower() == BINARY_EXTENSION:
+            return RigFile.write(filepath, data)
+
+        # The math values are encoded while the data is written.
+        with open(filepath,'w') as rigFile:
+            json_codec.dump(data, rigFile)
+
+        return True
+
 
     def writeRigDefinitionFile(self, filepath):
         """Load a rig definition from a file on disk.
 
         Args:
-            filepath (str): The file path of the rig definition file.
+            filepath (str): The file path of the rig definition file, a
+                binary rig file is written if it has the .krb extension.
 
         Returns:
             bool: True if successful.
@@ -37,21 +128,21 @@ class Rig(Container):
         Profiler.getInstance().push("writeRigDefinitionFile:" + filepath)
 
         jsonData = self.getData()
-
-        # now preprocess the data ready for saving to disk.
-        pureJSON = prepareToSave(jsonData)
-
-        with open(filepath,'w') as rigFile:
-            rigFile.write(json.dumps(pureJSON, indent=2))
+        self._writeDefinitionFile(filepath, jsonData)
 
         Profiler.getInstance().pop()
 
 
-    def loadRigDefinitionFile(self, filepath):
+    def loadRigDefinitionFile(self, filepath, processes=None, buildCache=None):
         """Load a rig definition from a file on disk.
 
         Args:
-            filepath (str): The file path of the rig definition file.
+            filepath (str): The file path of the rig definition file, a JSON
+                or a binary rig file.
+            processes (int): Number of worker processes constructing the
+                components, see loadRigDefinition.
+            buildCache (BuildCache): Cache of the constructed components, see
+                loadRigDefinition.
 
         Returns:
             bool: True if successful.
@@ -63,45 +154,216 @@ class Rig(Container):
         if not os.path.exists(filepath):
             raise Exception("File not found:" + filepath)
 
-        with open(filepath) as rigFile:
-            jsonData = json.load(rigFile)
+        if RigFile.isRigFile(filepath):
+            # The data of each component is decoded as it is constructed.
+            rigFile = RigFile(filepath)
+            try:
+                self.loadRigDefinition(rigFile.getRigDefinition(), processes=processes, buildCache=buildCache)
+            finally:
+                rigFile.close()
+        else:
+            # The math values are decoded while the data is read.
+            with open(filepath) as rigFile:
+                jsonData = json_codec.load(rigFile)
 
-        # now preprocess the data ready for loading.
-        jsonData = prepareToLoad(jsonData)
+            self.loadRigDefinition(jsonData, processes=processes, buildCache=buildCache)
 
-        self.loadRigDefinition(jsonData)
         Profiler.getInstance().pop()
 
 
-    def _loadComponents(self, componentsJson):
+    def _loadComponents(self, componentsJson, processes=None, buildCache=None):
         """Loads components from a JSON dict.
 
         Args:
             componentsJson (dict): Dictionary of components to load.
+            processes (int): Number of worker processes constructing the
+                components, they are constructed in this process if None.
+            buildCache (BuildCache): Cache the constructed components are
+                loaded from and saved to.
 
         """
 
+        if buildCache is not None and buildCache.isEnabled() is False:
+            buildCache = None
 
-        Profiler.getInstance().push("__loadComponents")
+        loadingComponents = self._loadingComponents
+        self._loadingComponents = True
+        try:
+            if (buildCache is not None or (processes is not None and processes > 1)) and \
+                    self._canLoadComponentsInScratchRigs(componentsJson):
+                return self._loadComponentsInScratchRigs(componentsJson, processes, buildCache)
 
-        krakenSystem = KrakenSystem.getInstance()
+            Profiler.getInstance().push("__loadComponents")
+
+            for componentData in componentsJson:
+                self._loadComponent(componentData)
+
+            Profiler.getInstance().pop()
+        finally:
+            self._loadingComponents = loadingComponents
+
+
+    def isLoadingComponents(self):
+        """Returns whether components are being loaded in the rig. The loaded
+        components are evaluated by the rig once they are connected, instead
+        of each one evaluating itself as its data is loaded.
+
+        Returns:
+            bool: True while components are being loaded.
+
+        """
+
+        return self._loadingComponents
+
+
+    def _loadComponent(self, componentData):
+        """Constructs a component in this rig and loads its data.
+
+        Args:
+            componentData (dict): The data of the component.
+
+        Returns:
+            object: The component.
+
+        """
+
+        # trim off the class name to get the module path.
+        modulePath = '.'.join(componentData['class'].split('.')[:-1])
+        if modulePath != "":
+            importlib.import_module(modulePath)
+
+        componentClass = KrakenSystem.getInstance().getComponentClass(componentData['class'])
+        if 'name' in componentData:
+            component = componentClass(name=componentData['name'], parent=self)
+        else:
+            component = componentClass(parent=self)
+        component.loadData(componentData)
+
+        return component
+
+
+    def _canLoadComponentsInScratchRigs(self, componentsJson):
+        """Returns whether the components can be constructed in scratch rigs,
+        in worker processes or loaded from a build cache.
+
+        Objects are sent back from the workers and cached pickled, which
+        requires the 'python' math backend. Components are named in their
+        scratch rig, so each component must have a name and location of its
+        own for the names to match the ones given when loading in order.
+
+        Args:
+            componentsJson (dict): Dictionary of components to load.
+
+        Returns:
+            bool: True if the components can be constructed in scratch rigs.
+
+        """
+
+        if KrakenSystem.getInstance().getMathBackend() != 'python':
+            return False
+
+        decoratedNames = set()
+        for child in self.getChildren():
+            if child.isTypeOf('Component'):
+                decoratedNames.add((child.getName(), child.getLocation()))
 
         for componentData in componentsJson:
-            # trim off the class name to get the module path.
-            modulePath = '.'.join(componentData['class'].split('.')[:-1])
-            if modulePath is not "":
-                importlib.import_module(modulePath)
-
-            componentClass = krakenSystem.getComponentClass(componentData['class'])
-            if 'name' in componentData:
-                component = componentClass(name=componentData['name'], parent=self)
+            if 'name' not in componentData:
+                return False
+
+            decoratedName = (componentData['name'], componentData.get('location', 'M'))
+            if decoratedName in decoratedNames:
+                return False
+
+            decoratedNames.add(decoratedName)
+
+        return True
+
+
+    def _loadComponentsInScratchRigs(self, componentsJson, processes=None, buildCache=None):
+        """Constructs and loads each component in a scratch rig and stitches
+        them into the rig, in order.
+
+        Components found in the build cache are loaded from it, the other ones
+        are constructed in a pool of worker processes, or in this process if
+        processes is None, and saved to the cache. Components holding objects
+        that can't be pickled are constructed again directly in this rig.
+
+        Args:
+            componentsJson (dict): Dictionary of components to load.
+            processes (int): Number of worker processes.
+            buildCache (BuildCache): Cache of the constructed components.
+
+        """
+
+        Profiler.getInstance().push("__loadComponentsInScratchRigs")
+
+        jobs = [(self.getName(), componentData) for componentData in componentsJson]
+
+        componentHashes = [None] * len(jobs)
+        payloads = [None] * len(jobs)
+        if buildCache is not None:
+            componentHashes = [buildCache.getComponentHash(componentData) for rigName, componentData in jobs]
+            payloads = [buildCache.load(x) for x in componentHashes]
+
+        missingJobs = [job for job, payload in zip(jobs, payloads) if payload is None]
+
+        pool = None
+        if processes is not None and processes > 1 and len(missingJobs) > 1:
+            pool = multiprocessing.Pool(min(processes, len(missingJobs)))
+
+        try:
+            if pool is not None:
+                missingPayloads = pool.imap(_loadComponentInWorker, missingJobs)
             else:
-                component = componentClass(parent=self)
-            component.loadData(componentData)
+                missingPayloads = (_loadComponentInWorker(job) for job in missingJobs)
+
+            for i in xrange(len(jobs)):
+                payload = payloads[i]
+                if payload is None:
+                    payload = next(missingPayloads)
+                    if payload is None:
+                        self._loadComponent(jobs[i][1])
+                        continue
+
+                    if buildCache is not None:
+                        buildCache.save(componentHashes[i], payload)
+
+                scratchRig, dirtyItems = cPickle.loads(payload)
+                self._stitchComponents(scratchRig)
+
+                for item in dirtyItems:
+                    item.markDirty()
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
 
         Profiler.getInstance().pop()
 
 
+    def _stitchComponents(self, scratchRig):
+        """Moves the components and layers of a scratch rig into this rig.
+        The content of layers that already exist in this rig is moved into
+        them.
+
+        Args:
+            scratchRig (Rig): The rig the components were constructed in.
+
+        """
+
+        for child in list(scratchRig.getChildren()):
+            if child.isTypeOf('Layer'):
+                layer = self.getChildByName(child.getName())
+                if layer is not None and layer.isTypeOf('Layer'):
+                    for layerChild in list(child.getChildren()):
+                        layer.addChild(layerChild)
+
+                    continue
+
+            self.addChild(child)
+
+
     def _makeConnections(self, connectionsJson):
         """Makes connections based on JSON dict.
 
@@ -144,11 +406,25 @@ class Rig(Container):
         Profiler.getInstance().pop()
 
 
-    def loadRigDefinition(self, jsonData):
+    def loadRigDefinition(self, jsonData, processes=None, buildCache=None):
         """Load a rig definition from a JSON structure.
 
+        Components are independent until their connections are made, they can
+        be constructed in a pool of worker processes by passing a number of
+        processes. Components are then constructed in the order of the
+        definition and sent back pickled. They are constructed in this process
+        when the 'fabric' math backend is used, or when components share a
+        name and location.
+
+        With a build cache, the constructed components are saved to disk and
+        the components with the same class, data and config are loaded from
+        it on the next loads instead of being constructed again.
+
         Args:
             jsonData (dict): JSON data containing the rig definition.
+            processes (int): Number of worker processes constructing the
+                components, they are constructed in this process if None.
+            buildCache (BuildCache): Cache of the constructed components.
 
         Returns:
             bool: True if successful.
@@ -163,11 +439,13 @@ class Rig(Container):
             self.setName(jsonData['name'])
 
         if 'components' in jsonData:
-            self._loadComponents(jsonData['components'])
+            self._loadComponents(jsonData['components'], processes=processes, buildCache=buildCache)
 
             if 'connections' in jsonData:
                 self._makeConnections(jsonData['connections'])
 
+            self.evaluate()
+
         if 'metaData' in jsonData:
 
             for k, v in jsonData['metaData'].iteritems():
@@ -181,7 +459,8 @@ class Rig(Container):
         """Writes a rig definition to a file on disk.
 
         Args:
-            filepath (str): The file path of the rig definition file.
+            filepath (str): The file path of the rig definition file, a
+                binary rig file is written if it has the .krb extension.
 
         Returns:
             bool: True if successful.
@@ -191,12 +470,7 @@ class Rig(Container):
         Profiler.getInstance().push("WriteGuideDefinitionFile:" + filepath)
 
         guideData = self.getRigBuildData()
-
-        # now preprocess the data ready for saving to disk.
-        pureJSON = prepareToSave(guideData)
-
-        with open(filepath,'w') as rigDef:
-            rigDef.write(json.dumps(pureJSON, indent=2))
+        self._writeDefinitionFile(filepath, guideData)
 
         Profiler.getInstance().pop()
 
@@ -273,6 +547,65 @@ class Rig(Container):
 
         return guideData
 
+    # ===================
+    # Evaluation Methods
+    # ===================
+    def createEvaluationGraph(self):
+        """Creates the dependency graph of the constraints, operators and
+        component connections of the rig.
+
+        Returns:
+            object: The evaluation graph.
+
+        """
+
+        return EvaluationGraph(self)
+
+
+    def getEvaluationGraph(self):
+        """Returns the evaluation graph of the rig.
+
+        The graph is cached until an object is reparented or renamed, or a
+        constraint, operator or connection is changed.
+
+        Returns:
+            object: The evaluation graph.
+
+        """
+
+        key = (SceneItem._hierarchyRevision, SceneItem._dependencyRevision)
+        if self._evaluationGraphKey != key:
+            self._evaluationGraph = self.createEvaluationGraph()
+            self._evaluationGraphKey = key
+
+        return self._evaluationGraph
+
+
+    def evaluate(self):
+        """Evaluates the constraints, operators and component connections of
+        the rig once, in dependency order.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        return self.getEvaluationGraph().evaluate()
+
+
+    def evaluateDirty(self):
+        """Re-evaluates only the constraints, operators and component
+        connections downstream of the items that changed since the last
+        evaluation.
+
+        Returns:
+            list: The nodes that were evaluated.
+
+        """
+
+        return self.getEvaluationGraph().evaluateDirty()
+
+
     # ==========
     # Meta Data
     # ==========
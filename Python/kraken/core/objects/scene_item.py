@@ -5,14 +5,36 @@ SceneItem - Base SceneItem Object.
 
 """
 
+import weakref
+
+from kraken.core.type_registry import getTypeHierarchy
+
 
 class SceneItem(object):
     """Kraken base object type for any 3D object."""
 
+    # Incremented whenever a scene item is reparented, renamed or removed.
+    _hierarchyRevision = 0
+
+    # Incremented whenever a constraint, operator or component connection is
+    # added, removed or rewired.
+    _dependencyRevision = 0
+
+    # Scene items whose value changed since their hierarchy was last evaluated.
+    _dirtyItems = weakref.WeakValueDictionary()
+
     def __init__(self, name, parent=None):
         super(SceneItem, self).__init__()
         self._parent = parent
         self._name = name
+        self._path = None
+        self._decoratedPath = None
+        self._pathContainers = None
+
+
+    def __getstate__(self):
+        # Subclasses drop the state that is only valid in this process.
+        return self.__dict__.copy()
 
 
     # ==============
@@ -37,13 +59,7 @@ class SceneItem(object):
 
         """
 
-        khierarchy = []
-        for cls in type.mro(type(self)):
-            if cls == object:
-                break;
-            khierarchy.append(cls.__name__)
-
-        return khierarchy
+        return list(getTypeHierarchy(type(self))[0])
 
 
     def isTypeOf(self, typeName):
@@ -54,11 +70,7 @@ class SceneItem(object):
 
         """
 
-        for cls in type.mro(type(self)):
-            if cls.__name__ == typeName:
-                return True
-
-        return False
+        return typeName in getTypeHierarchy(type(self))[1]
 
 
     # =============
@@ -87,6 +99,8 @@ class SceneItem(object):
         """
 
         self._name = name
+        self.invalidatePaths()
+        SceneItem.invalidateHierarchy()
 
         return True
 
@@ -94,15 +108,31 @@ class SceneItem(object):
     def getPath(self):
         """Returns the full hierarchical path to this object.
 
+        The path is cached until the object or one of its ancestors is renamed
+        or reparented, and is built from the cached path of its parent.
+
         Returns:
             str: Full name of the object.
 
         """
 
-        if self.getParent() is not None:
-            return self.getParent().getPath() + '.' + self.getName()
+        if self._path is None:
+            # Walk up to the closest ancestor with a cached path, then build
+            # the paths back down.
+            items = []
+            item = self
+            while item is not None and item._path is None:
+                items.append(item)
+                item = item.getParent()
+
+            for item in reversed(items):
+                parent = item.getParent()
+                if parent is not None:
+                    item._path = parent._path + '.' + item.getName()
+                else:
+                    item._path = item.getName()
 
-        return self.getName()
+        return self._path
 
 
     def getNameDecoration(self):
@@ -135,11 +165,154 @@ class SceneItem(object):
 
         """
 
+        if self._decoratedPath is None:
+            items = []
+            item = self
+            while item is not None and item._decoratedPath is None:
+                items.append(item)
+                item = item.getParent()
+
+            for item in reversed(items):
+                parent = item.getParent()
+                if parent is not None:
+                    item._decoratedPath = parent._decoratedPath + '.' + item.getDecoratedName()
+                else:
+                    item._decoratedPath = item.getDecoratedName()
+
+        return self._decoratedPath
+
+
+    def _getPathChildren(self):
+        """Returns the items whose paths are built from the path of this item.
+
+        Returns:
+            list: The items parented to this item.
+
+        """
+
+        return []
+
+
+    def _getPathContainers(self):
+        """Returns the containers indexing this item by path, the containers
+        above it and the item itself if it is one.
+
+        The containers are cached until the item or one of its ancestors is
+        reparented, and are built from the cached containers of its parent.
+
+        Returns:
+            tuple: The containers, outermost first.
+
+        """
+
+        if self._pathContainers is None:
+            items = []
+            item = self
+            while item is not None and item._pathContainers is None:
+                items.append(item)
+                item = item.getParent()
+
+            for item in reversed(items):
+                parent = item.getParent()
+                if parent is not None:
+                    containers = parent._pathContainers
+                else:
+                    containers = ()
+
+                if item.isTypeOf('Container'):
+                    containers = containers + (item,)
+
+                item._pathContainers = containers
+
+        return self._pathContainers
+
+
+    def invalidatePaths(self):
+        """Invalidates the cached paths and containers of this item and of
+        the items under it.
+
+        A path is only cached once the path of the parent is, so the items
+        under an item without cached paths have none either and aren't
+        visited.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        stack = [self]
+        while len(stack) > 0:
+            item = stack.pop()
+            if item._path is None and item._decoratedPath is None and item._pathContainers is None:
+                continue
 
-        if self.getParent() is not None:
-            return self.getParent().getDecoratedPath() + '.' + self.getDecoratedName()
+            item._path = None
+            item._decoratedPath = None
+            item._pathContainers = None
+            stack.extend(item._getPathChildren())
 
-        return self.getDecoratedName()
+        return True
+
+
+    # ==============
+    # Dirty Methods
+    # ==============
+    def markDirty(self):
+        """Marks the value of this item as changed so the constraints and
+        operators depending on it are re-evaluated by evaluateDirty.
+
+        Setting the xfo of an object or the value of an attribute marks it
+        automatically, in place edits such as setting obj.xfo.tr must be
+        followed by a call to this method.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        SceneItem._dirtyItems[id(self)] = self
+
+        return True
+
+
+    def isDirty(self):
+        """Returns whether the value of this item changed since its hierarchy
+        was last evaluated.
+
+        Returns:
+            bool: True if the item is dirty.
+
+        """
+
+        return id(self) in SceneItem._dirtyItems
+
+
+    @classmethod
+    def invalidateHierarchy(cls):
+        """Invalidates the data cached from the hierarchy of the scene items.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        SceneItem._hierarchyRevision += 1
+
+        return True
+
+
+    @classmethod
+    def invalidateDependencies(cls):
+        """Invalidates the cached dependencies between scene items.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        SceneItem._dependencyRevision += 1
+
+        return True
 
 
     # ===============
@@ -168,5 +341,7 @@ class SceneItem(object):
         """
 
         self._parent = parent
+        self.invalidatePaths()
+        SceneItem.invalidateHierarchy()
 
         return True
@@ -0,0 +1,383 @@
+"""Kraken - objects.transform_store module.
+
+Classes:
+TransformStore -- Contiguous buffer holding the transforms of a rig.
+
+"""
+
+from array import array
+
+from kraken.core.kraken_system import ks
+from kraken.core.maths.xfo import Xfo
+from kraken.core.python_backend import PyXfoRTVal, xfoFromMat44, xfoToMat44
+
+
+def _getHierarchy(obj):
+    """Returns an object and all its descendants, parents first.
+
+    Args:
+        obj (Object3D): Root of the hierarchy.
+
+    Returns:
+        list: The objects of the hierarchy.
+
+    """
+
+    objects = []
+    stack = [obj]
+    while len(stack) > 0:
+        current = stack.pop()
+        objects.append(current)
+        stack.extend(reversed(current.getChildren()))
+
+    return objects
+
+
+class TransformStore(object):
+    """Contiguous buffer holding the transforms of the objects of a rig.
+
+    Every object added to the store owns a slot of 10 floats (tr, ori, sc) in
+    a single buffer. The xfo of the object becomes a view on its slot. Reading
+    the xfo doesn't allocate anything, and assigning it copies the values into
+    the slot instead of cloning the assigned Xfo.
+
+    Slots are kept contiguous and ordered. Removing objects moves the
+    remaining ones into a new buffer, so the views held on the xfo of a
+    removed object keep their values and never point at the transform of
+    another object. Assigning the xfo of an object detaches the Xfo returned
+    before, as when the assigned Xfo is cloned.
+
+    The store requires the 'python' math backend.
+
+    """
+
+    STRIDE = 10
+
+    def __init__(self):
+        super(TransformStore, self).__init__()
+
+        if ks.getMathBackend() != 'python':
+            raise Exception("TransformStore requires the 'python' math backend.")
+
+        self._buffer = array('d')
+        self._objects = []
+
+
+    def __len__(self):
+        return len(self._objects)
+
+
+    # =================
+    # Object Methods
+    # =================
+
+    def getObjects(self):
+        """Returns the objects of the store ordered by slot index.
+
+        Returns:
+            list: The objects of the store.
+
+        """
+
+        return list(self._objects)
+
+
+    def getIndex(self, obj):
+        """Returns the slot index of the given object.
+
+        Args:
+            obj (Object3D): Object to get the slot index for.
+
+        Returns:
+            int: The slot index, -1 if the object isn't in this store.
+
+        """
+
+        if obj._transformStore is not self:
+            return -1
+
+        return obj._transformIndex
+
+
+    def addObject(self, obj):
+        """Adds the given object to the store, moving its xfo into a new slot.
+
+        Args:
+            obj (Object3D): Object to add.
+
+        Returns:
+            int: The slot index of the object.
+
+        """
+
+        if obj._transformStore is self:
+            return obj._transformIndex
+
+        if obj._transformStore is not None:
+            obj._transformStore.removeObject(obj)
+
+        return self._addObject(obj)
+
+
+    def _addObject(self, obj):
+        """Appends a slot for an object that isn't held by any store.
+
+        Args:
+            obj (Object3D): Object to add.
+
+        Returns:
+            int: The slot index of the object.
+
+        """
+
+        index = len(self._objects)
+        self._buffer.extend(obj.xfo.getRTVal().getValues())
+        self._objects.append(obj)
+
+        obj._transformStore = self
+        obj._transformIndex = index
+        obj._xfo = Xfo(PyXfoRTVal(self._buffer, index * self.STRIDE))
+
+        return index
+
+
+    def addHierarchy(self, obj):
+        """Adds the given object and all its descendants to the store.
+
+        Args:
+            obj (Object3D): Root of the hierarchy to add.
+
+        """
+
+        objects = _getHierarchy(obj)
+
+        # Objects held by other stores are removed in one pass per store.
+        otherStores = {}
+        for kObject in objects:
+            if kObject._transformStore is not None and kObject._transformStore is not self:
+                otherStores.setdefault(id(kObject._transformStore), (kObject._transformStore, []))[1].append(kObject)
+
+        for store, storeObjects in otherStores.values():
+            store.removeObjects(storeObjects)
+
+        for kObject in objects:
+            if kObject._transformStore is None:
+                self._addObject(kObject)
+
+
+    def removeObject(self, obj):
+        """Removes the given object from the store. The object keeps its Xfo,
+        which gets a standalone copy of its values.
+
+        Args:
+            obj (Object3D): Object to remove.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        return self.removeObjects([obj])
+
+
+    def removeObjects(self, objects):
+        """Removes the given objects from the store. The objects keep their
+        Xfo, which gets a standalone copy of their values, and the remaining
+        objects are moved into a new buffer in the same order.
+
+        Args:
+            objects (list): Objects to remove.
+
+        Returns:
+            bool: True if an object was removed.
+
+        """
+
+        removedIds = set()
+        for obj in objects:
+            if obj._transformStore is not self:
+                continue
+
+            obj._xfo.setRTVal(obj._xfo.getRTVal().clone())
+            obj._transformStore = None
+            obj._transformIndex = -1
+            removedIds.add(id(obj))
+
+        if len(removedIds) == 0:
+            return False
+
+        stride = self.STRIDE
+        buf = self._buffer
+        newBuffer = array('d')
+        newObjects = []
+        for index, obj in enumerate(self._objects):
+            if id(obj) in removedIds:
+                continue
+
+            newBuffer.extend(buf[index * stride:(index + 1) * stride])
+            obj._transformIndex = len(newObjects)
+            newObjects.append(obj)
+
+        for index, obj in enumerate(newObjects):
+            obj._xfo.setRTVal(PyXfoRTVal(newBuffer, index * stride))
+
+        self._buffer = newBuffer
+        self._objects = newObjects
+
+        return True
+
+
+    def removeHierarchy(self, obj):
+        """Removes the given object and all its descendants from the store.
+
+        Args:
+            obj (Object3D): Root of the hierarchy to remove.
+
+        """
+
+        self.removeObjects(_getHierarchy(obj))
+
+
+    def detachXfo(self, obj):
+        """Gives the Xfo of an object a standalone copy of its values and the
+        object a new view on its slot, so the Xfo held by callers keeps its
+        values when the object's xfo is assigned.
+
+        Args:
+            obj (Object3D): Object of the store.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        if obj._transformStore is not self:
+            return False
+
+        obj._xfo.setRTVal(obj._xfo.getRTVal().clone())
+        obj._xfo = Xfo(PyXfoRTVal(self._buffer, obj._transformIndex * self.STRIDE))
+
+        return True
+
+
+    # ================
+    # Xfo Methods
+    # ================
+
+    def getXfo(self, index):
+        """Returns the xfo stored in the given slot. The returned Xfo is a view
+        on the buffer.
+
+        Args:
+            index (int): The slot index.
+
+        Returns:
+            Xfo: The xfo of the slot.
+
+        """
+
+        return self._objects[index]._xfo
+
+
+    def setXfo(self, index, xfo):
+        """Copies the values of the given xfo into the given slot.
+
+        Args:
+            index (int): The slot index.
+            xfo (Xfo): The xfo to copy.
+
+        """
+
+        stride = self.STRIDE
+        self._buffer[index * stride:(index + 1) * stride] = array('d', xfo.getRTVal().getValues())
+
+
+    def getBuffer(self):
+        """Returns the buffer holding the transforms. The buffer is shared with
+        the objects of the store and must not be resized, removing objects
+        replaces it.
+
+        Returns:
+            array: The buffer of N x 10 floats (tr, ori, sc).
+
+        """
+
+        return self._buffer
+
+
+    def getXfoValues(self):
+        """Returns a copy of all the transforms of the store.
+
+        Returns:
+            array: N x 10 floats (tr, ori, sc), ordered by slot index.
+
+        """
+
+        return array('d', self._buffer)
+
+
+    def setXfoValues(self, values):
+        """Sets all the transforms of the store.
+
+        Args:
+            values (list): N x 10 floats (tr, ori, sc), ordered by slot index.
+
+        """
+
+        if len(values) != len(self._buffer):
+            raise Exception("Invalid number of values:" + str(len(values)) + ", expected:" + str(len(self._buffer)))
+
+        self._buffer[:] = array('d', values)
+
+
+    def getMat44Values(self):
+        """Returns all the transforms of the store as matrices.
+
+        Returns:
+            list: N x 16 floats (row major), ordered by slot index.
+
+        """
+
+        stride = self.STRIDE
+        buf = self._buffer
+        values = []
+        for i in xrange(len(self._objects)):
+            values.extend(xfoToMat44(buf[i * stride:(i + 1) * stride]))
+
+        return values
+
+
+    def setMat44Values(self, values):
+        """Sets all the transforms of the store from matrices.
+
+        Args:
+            values (list): N x 16 floats (row major), ordered by slot index.
+
+        """
+
+        if len(values) != len(self._objects) * 16:
+            raise Exception("Invalid number of values:" + str(len(values)) + ", expected:" + str(len(self._objects) * 16))
+
+        stride = self.STRIDE
+        buf = self._buffer
+        for i in xrange(len(self._objects)):
+            buf[i * stride:(i + 1) * stride] = array('d', xfoFromMat44(values[i * 16:(i + 1) * 16]))
+
+
+    def setMat44ValuesAt(self, indices, values):
+        """Sets the transforms of the given slots from matrices.
+
+        Args:
+            indices (list): The slot indices.
+            values (list): len(indices) x 16 floats (row major), in the order
+                of the indices.
+
+        """
+
+        if len(values) != len(indices) * 16:
+            raise Exception("Invalid number of values:" + str(len(values)) + ", expected:" + str(len(indices) * 16))
+
+        stride = self.STRIDE
+        buf = self._buffer
+        for i, index in enumerate(indices):
+            buf[index * stride:(index + 1) * stride] = array('d', xfoFromMat44(values[i * 16:(i + 1) * 16]))
@@ -5,19 +5,73 @@ Profiler - Profiler Object.
 
 """
 
+import json
+import sys
 import time
-import operator
+
+
+def _getClock():
+    """Returns a monotonic high resolution clock, so durations aren't
+    affected by changes to the system time.
+
+    Python 3 provides time.perf_counter and time.clock is monotonic on
+    Windows. Other platforms call clock_gettime(CLOCK_MONOTONIC) through
+    ctypes, falling back to time.time, which isn't monotonic, if it isn't
+    available.
+
+    Returns:
+        function: The clock, returning a time in seconds.
+
+    """
+
+    if hasattr(time, 'perf_counter'):
+        return time.perf_counter
+
+    if sys.platform == 'win32':
+        return time.clock
+
+    try:
+        import ctypes
+        import ctypes.util
+
+        class Timespec(ctypes.Structure):
+            _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        clockGetTime = libc.clock_gettime
+        clockGetTime.argtypes = [ctypes.c_int, ctypes.POINTER(Timespec)]
+
+        # CLOCK_MONOTONIC
+        clockId = 6 if sys.platform == 'darwin' else 1
+        if clockGetTime(clockId, ctypes.byref(Timespec())) != 0:
+            return time.time
+
+        def monotonicClock():
+            timespec = Timespec()
+            clockGetTime(clockId, ctypes.byref(timespec))
+            return timespec.tv_sec + timespec.tv_nsec * 1e-9
+
+        return monotonicClock
+
+    except (ImportError, OSError, AttributeError):
+        return time.time
+
+
+_clock = _getClock()
 
 
 class _ProfilerItem(object):
 
+    __slots__ = ('label', 'start', 'end', 'childTime', 'children')
+
     def __init__(self, label):
         super(_ProfilerItem, self).__init__()
 
-        t = time.time()
+        t = _clock()
         self.label = label
         self.start = t
         self.end = t
+        self.childTime = 0.0
         self.children = []
 
 
@@ -26,17 +80,65 @@ class _ProfilerItem(object):
 
 
     def endProfiling(self):
-        self.end = time.time()
+        self.end = _clock()
+
+
+class _ProfilerScope(object):
+    """Profiles a block of code as a context manager, or every call of a
+    function as a decorator."""
+
+    def __init__(self, profiler, label):
+        super(_ProfilerScope, self).__init__()
+        self.profiler = profiler
+        self.label = label
+
+
+    def __enter__(self):
+        self.profiler.push(self.label)
+        return self
+
+
+    def __exit__(self, excType, excValue, traceback):
+        self.profiler.pop()
+        return False
+
+
+    def __call__(self, fn):
+        profiler = self.profiler
+        label = self.label
+
+        def wrapper(*args, **kwargs):
+            profiler.push(label)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profiler.pop()
+
+        wrapper.__name__ = fn.__name__
+        wrapper.__doc__ = fn.__doc__
+
+        return wrapper
 
 
 class Profiler(object):
-    """Kraken profiler object for debugging performance issues."""
+    """Kraken profiler object for debugging performance issues.
+
+    Items are recorded in a tree with push and pop, or with the scope context
+    manager / decorator. Statistics are aggregated by label as items are
+    popped. The tree can be exported as a text report, as Chrome trace events
+    (chrome://tracing, Perfetto, Speedscope) or as collapsed stacks for flame
+    graph tools.
+
+    Disabling the profiler turns push and pop into no-ops.
+
+    """
 
     __instance = None
 
 
     def __init__(self):
         super(Profiler, self).__init__()
+        self.__enabled = True
         self.reset()
 
 
@@ -45,8 +147,47 @@ class Profiler(object):
 
         self.__roots = []
         self.__stack = []
+        self.__stats = {}
 
 
+    # ================
+    # Enable Methods
+    # ================
+    def isEnabled(self):
+        """Returns whether the profiler records items.
+
+        Returns:
+            bool: True if the profiler is enabled.
+
+        """
+
+        return self.__enabled
+
+
+    def setEnabled(self, enabled):
+        """Enables or disables the profiler. A disabled profiler doesn't record
+        anything.
+
+        Args:
+            enabled (bool): Whether to record items.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        if len(self.__stack) != 0:
+            raise Exception("Unable to enable or disable the profiler while " +
+                            "brackets are open.")
+
+        self.__enabled = enabled
+
+        return True
+
+
+    # ===================
+    # Profiling Methods
+    # ===================
     def push(self, label):
 
         """Adds a new child to the profiling tree and activates it.
@@ -56,6 +197,9 @@ class Profiler(object):
 
         """
 
+        if not self.__enabled:
+            return
+
         item = _ProfilerItem(label)
         if len(self.__stack) == 0:
             self.__roots.append(item)
@@ -69,44 +213,102 @@ class Profiler(object):
         """Deactivates the current item in the tree and returns the profiler to
         the parent item"""
 
-        end = time.time()
+        if not self.__enabled:
+            return
+
         if len(self.__stack) == 0:
             raise Exception("""Unable to close bracket. Pop has been called more """+
                             """times than push.""")
 
-        self.__stack[-1].endProfiling()
-        self.__stack.pop()
+        item = self.__stack.pop()
+        item.endProfiling()
 
+        duration = item.end - item.start
+        if len(self.__stack) > 0:
+            self.__stack[-1].childTime += duration
 
-    def generateReport(self, listFunctionTotals=False):
-        """Returns a report string containing all the data gathered turing
-        profiling.
+        # Aggregate by label: [count, total, self, min, max]
+        stats = self.__stats.get(item.label)
+        if stats is None:
+            self.__stats[item.label] = [1, duration, duration - item.childTime, duration, duration]
+        else:
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] += duration - item.childTime
+            if duration < stats[3]:
+                stats[3] = duration
+            if duration > stats[4]:
+                stats[4] = duration
+
+
+    def scope(self, label):
+        """Returns an object profiling a block of code, usable as a context
+        manager or as a function decorator.
 
         Args:
-            listFunctionTotals (bool): list information relating to the total time spent in each function.
+            label (str): The label of the profiled block.
 
         Returns:
-            str: The profiler report.
+            object: The profiler scope.
 
         """
 
+        return _ProfilerScope(self, label)
+
+
+    # ================
+    # Report Methods
+    # ================
+    def _checkBrackets(self):
         if len(self.__stack) != 0:
             raise Exception("""Profiler brackets not closed properly. """+
                             """Pop must be called for every call to push. Pop """+
                             """needs to be called another """ +
                              str(len(self.__stack)) + """ times""")
 
+
+    def getStats(self):
+        """Returns the statistics aggregated by label.
+
+        Returns:
+            dict: For each label, a dict with the 'count', 'total', 'self',
+                'min' and 'max' times in seconds.
+
+        """
+
+        result = {}
+        for label, stats in self.__stats.iteritems():
+            result[label] = {
+                'count': stats[0],
+                'total': stats[1],
+                'self': stats[2],
+                'min': stats[3],
+                'max': stats[4]
+            }
+
+        return result
+
+
+    def generateReport(self, listFunctionTotals=False):
+        """Returns a report string containing all the data gathered turing
+        profiling.
+
+        Args:
+            listFunctionTotals (bool): list information relating to the total time spent in each function.
+
+        Returns:
+            str: The profiler report.
+
+        """
+
+        self._checkBrackets()
+
         report = []
         report.append("--callstack--")
 
-        functions = {}
         def reportItem(item, indent):
             duration = item.end - item.start
             report.append(indent + item.label + ' duration: ' + str(duration))
-            if item.label not in functions:
-                functions[item.label] = duration
-            else:
-                functions[item.label] += duration
 
             for childItem in item.children:
                 reportItem(childItem, indent + '  ')
@@ -117,16 +319,115 @@ class Profiler(object):
         if listFunctionTotals:
             report.append("--functions--")
 
-            def reverse_numeric(x, y):
-                return y < x
+            sortedStats = sorted(self.__stats.items(), key=lambda x: x[1][1], reverse=True)
+            for label, stats in sortedStats:
+                report.append(str(stats[1]) + ': ' + label + ' calls: ' +
+                              str(stats[0]) + ' self: ' + str(stats[2]) +
+                              ' min: ' + str(stats[3]) + ' max: ' + str(stats[4]))
+
+        return '\n'.join(report)
 
-            sorted_fns = sorted(functions.items(), key=operator.itemgetter(1),
-                                cmp=reverse_numeric)
 
-            for fn_tuple in sorted_fns:
-                report.append(str(fn_tuple[1]) +': ' + fn_tuple[0])
+    def exportChromeTrace(self):
+        """Returns the profiling tree as Chrome trace events.
 
-        return '\n'.join(report)
+        Returns:
+            dict: The trace, to be saved as JSON.
+
+        """
+
+        self._checkBrackets()
+
+        events = []
+        if len(self.__roots) == 0:
+            return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+        origin = self.__roots[0].start
+
+        stack = list(reversed(self.__roots))
+        while len(stack) > 0:
+            item = stack.pop()
+            events.append({
+                'name': item.label,
+                'ph': 'X',
+                'ts': (item.start - origin) * 1000000.0,
+                'dur': (item.end - item.start) * 1000000.0,
+                'pid': 0,
+                'tid': 0
+            })
+
+            stack.extend(reversed(item.children))
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+    def saveChromeTrace(self, filePath):
+        """Saves the profiling tree as a Chrome trace event JSON file.
+
+        Args:
+            filePath (str): The path of the file to write.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        with open(filePath, 'w') as traceFile:
+            json.dump(self.exportChromeTrace(), traceFile)
+
+        return True
+
+
+    def exportCollapsedStacks(self):
+        """Returns the profiling tree as collapsed stacks: one line per call
+        stack with the labels separated by ';' followed by the self time of
+        the stack in microseconds.
+
+        Returns:
+            str: The collapsed stacks.
+
+        """
+
+        self._checkBrackets()
+
+        selfTimes = {}
+        order = []
+
+        stack = [((item.label,), item) for item in reversed(self.__roots)]
+        while len(stack) > 0:
+            path, item = stack.pop()
+
+            key = ';'.join(x.replace(';', ':') for x in path)
+            if key not in selfTimes:
+                selfTimes[key] = 0.0
+                order.append(key)
+            selfTimes[key] += (item.end - item.start) - item.childTime
+
+            for childItem in reversed(item.children):
+                stack.append((path + (childItem.label,), childItem))
+
+        lines = []
+        for key in order:
+            lines.append(key + ' ' + str(int(round(selfTimes[key] * 1000000.0))))
+
+        return '\n'.join(lines)
+
+
+    def saveCollapsedStacks(self, filePath):
+        """Saves the profiling tree as a collapsed stacks file.
+
+        Args:
+            filePath (str): The path of the file to write.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        with open(filePath, 'w') as stacksFile:
+            stacksFile.write(self.exportCollapsedStacks() + '\n')
+
+        return True
 
 
     @classmethod
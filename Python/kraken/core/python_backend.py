@@ -0,0 +1,1440 @@
+"""Kraken - core.python_backend module.
+
+Classes:
+PyRTVal -- Base class for the pure Python RTVal stand-ins.
+PySimpleRTVal -- Simple typed value (Scalar, Integer, Boolean, String...).
+PyStructRTVal -- Base class for the math struct values.
+PyArrayRTVal -- Variable array of math struct values.
+
+The classes in this module mirror the subset of the KL Math extension used by
+the kraken.core.maths wrappers. The wrappers call into them exactly as they
+call into Fabric RTVals (``rtval.method('ReturnType', *args)`` and member
+access returning values with ``getSimpleType()``), so switching the math
+backend does not require any change to the wrappers.
+
+Struct values store their data as plain floats in a flat buffer at a given
+offset. Members of compound types (Xfo.tr, Quat.v, Mat44.row0...) are views
+sharing the buffer of their owner, so in-place edits behave like they do on
+Fabric RTVals.
+
+"""
+
+import math
+from array import array
+
+
+PRECISION = 1.0e-5
+DIVIDEPRECISION = 1.0e-9
+
+SIMPLE_TYPES = {
+    'Boolean': bool,
+    'Byte': int,
+    'SInt8': int,
+    'UInt8': int,
+    'SInt16': int,
+    'UInt16': int,
+    'SInt32': int,
+    'UInt32': int,
+    'SInt64': long,
+    'UInt64': long,
+    'Integer': int,
+    'Size': int,
+    'Index': int,
+    'Count': int,
+    'Float32': float,
+    'Float64': float,
+    'Scalar': float,
+    'String': str
+}
+
+# Axes in matrix product order for each RotationOrder.order value:
+# an order 'ABC' represents the rotation matrix R = R_A * R_B * R_C.
+ROTATION_ORDER_AXES = {
+    0: (0, 1, 2),  # XYZ
+    1: (1, 2, 0),  # YZX
+    2: (2, 0, 1),  # ZXY
+    3: (0, 2, 1),  # XZY
+    4: (2, 1, 0),  # ZYX
+    5: (1, 0, 2)  # YXZ
+}
+
+
+def value(val):
+    """Returns the Python value held by a simple value.
+
+    Args:
+        val (object): PySimpleRTVal or plain Python value.
+
+    Returns:
+        object: The unwrapped value.
+
+    """
+
+    if isinstance(val, PySimpleRTVal):
+        return val._value
+
+    return val
+
+
+def values(val):
+    """Returns the flat list of floats held by a struct value.
+
+    Args:
+        val (object): PyStructRTVal or sequence of floats.
+
+    Returns:
+        list: The flat values.
+
+    """
+
+    if isinstance(val, PyStructRTVal):
+        return val.getValues()
+
+    return list(val)
+
+
+# ==================
+# Helper Functions
+# ==================
+
+def _clampUnit(v):
+    return max(-1.0, min(1.0, v))
+
+
+def _dot(a, b):
+    return sum([x * y for x, y in zip(a, b)])
+
+
+def _cross(a, b):
+    return [a[1] * b[2] - a[2] * b[1],
+            a[2] * b[0] - a[0] * b[2],
+            a[0] * b[1] - a[1] * b[0]]
+
+
+def _length(a):
+    return math.sqrt(_dot(a, a))
+
+
+def _unitSafe(a):
+    length = _length(a)
+    if length < DIVIDEPRECISION:
+        return [0.0] * len(a)
+
+    return [x / length for x in a]
+
+
+def _quatMultiply(a, b):
+    ax, ay, az, aw = a
+    bx, by, bz, bw = b
+
+    return [aw * bx + bw * ax + ay * bz - az * by,
+            aw * by + bw * ay + az * bx - ax * bz,
+            aw * bz + bw * az + ax * by - ay * bx,
+            aw * bw - ax * bx - ay * by - az * bz]
+
+
+def _quatConjugate(q):
+    return [-q[0], -q[1], -q[2], q[3]]
+
+
+def _quatInverse(q):
+    lengthSquared = _dot(q, q)
+    if lengthSquared < DIVIDEPRECISION:
+        return [0.0, 0.0, 0.0, 1.0]
+
+    return [-q[0] / lengthSquared, -q[1] / lengthSquared,
+            -q[2] / lengthSquared, q[3] / lengthSquared]
+
+
+def _quatRotateVector(q, v):
+    temp = _quatMultiply(q, [v[0], v[1], v[2], 0.0])
+
+    return _quatMultiply(temp, _quatConjugate(q))[:3]
+
+
+def _quatFromAxisAndAngle(axis, angle):
+    halfAngle = angle * 0.5
+    s = math.sin(halfAngle)
+    unitAxis = _unitSafe(axis)
+
+    return [unitAxis[0] * s, unitAxis[1] * s, unitAxis[2] * s,
+            math.cos(halfAngle)]
+
+
+def _quatToMat33(q):
+    x, y, z, w = q
+    xx = x * x
+    yy = y * y
+    zz = z * z
+    xy = x * y
+    xz = x * z
+    yz = y * z
+    xw = x * w
+    yw = y * w
+    zw = z * w
+
+    return [1.0 - 2.0 * (yy + zz), 2.0 * (xy - zw), 2.0 * (xz + yw),
+            2.0 * (xy + zw), 1.0 - 2.0 * (xx + zz), 2.0 * (yz - xw),
+            2.0 * (xz - yw), 2.0 * (yz + xw), 1.0 - 2.0 * (xx + yy)]
+
+
+def _quatFromMat33(m):
+    trace = m[0] + m[4] + m[8]
+    if trace > 0.0:
+        s = 2.0 * math.sqrt(trace + 1.0)
+        q = [(m[7] - m[5]) / s, (m[2] - m[6]) / s, (m[3] - m[1]) / s,
+             0.25 * s]
+    elif m[0] > m[4] and m[0] > m[8]:
+        s = 2.0 * math.sqrt(1.0 + m[0] - m[4] - m[8])
+        q = [0.25 * s, (m[1] + m[3]) / s, (m[2] + m[6]) / s,
+             (m[7] - m[5]) / s]
+    elif m[4] > m[8]:
+        s = 2.0 * math.sqrt(1.0 + m[4] - m[0] - m[8])
+        q = [(m[1] + m[3]) / s, 0.25 * s, (m[5] + m[7]) / s,
+             (m[2] - m[6]) / s]
+    else:
+        s = 2.0 * math.sqrt(1.0 + m[8] - m[0] - m[4])
+        q = [(m[2] + m[6]) / s, (m[5] + m[7]) / s, 0.25 * s,
+             (m[3] - m[1]) / s]
+
+    return _unitSafe(q)
+
+
+def _quatFromEulerAngles(angles, order):
+    q = [0.0, 0.0, 0.0, 1.0]
+    for axis in ROTATION_ORDER_AXES[order]:
+        axisVec = [0.0, 0.0, 0.0]
+        axisVec[axis] = 1.0
+        q = _quatMultiply(q, _quatFromAxisAndAngle(axisVec, angles[axis]))
+
+    return q
+
+
+def _mat33ToEulerAngles(m, order):
+    # R = R_k * R_j * R_i where i is the axis applied first.
+    k, j, i = ROTATION_ORDER_AXES[order]
+    if (j - i) % 3 == 1:
+        sign = 1.0
+    else:
+        sign = -1.0
+
+    angles = [0.0, 0.0, 0.0]
+    sinJ = -sign * m[k * 3 + i]
+    if abs(sinJ) < 1.0 - DIVIDEPRECISION:
+        angles[j] = math.asin(sinJ)
+        angles[i] = math.atan2(sign * m[k * 3 + j], m[k * 3 + k])
+        angles[k] = math.atan2(sign * m[j * 3 + i], m[i * 3 + i])
+    else:
+        # Gimbal lock, the last rotation is folded into the first one.
+        angles[j] = math.copysign(math.pi * 0.5, sinJ)
+        angles[i] = math.atan2(sinJ * m[i * 3 + j], m[j * 3 + j])
+        angles[k] = 0.0
+
+    return angles
+
+
+def _matMultiply(a, b, size):
+    result = [0.0] * (size * size)
+    for row in xrange(size):
+        for col in xrange(size):
+            total = 0.0
+            for n in xrange(size):
+                total += a[row * size + n] * b[n * size + col]
+            result[row * size + col] = total
+
+    return result
+
+
+def _matTranspose(m, size):
+    return [m[col * size + row] for row in xrange(size) for col in xrange(size)]
+
+
+def _matMinor(m, size, row, col):
+    return [m[r * size + c] for r in xrange(size) if r != row
+            for c in xrange(size) if c != col]
+
+
+def _matDeterminant(m, size):
+    if size == 2:
+        return m[0] * m[3] - m[1] * m[2]
+
+    if size == 3:
+        return (m[0] * (m[4] * m[8] - m[5] * m[7]) -
+                m[1] * (m[3] * m[8] - m[5] * m[6]) +
+                m[2] * (m[3] * m[7] - m[4] * m[6]))
+
+    total = 0.0
+    for col in xrange(size):
+        if m[col] == 0.0:
+            continue
+        sign = -1.0 if col % 2 else 1.0
+        total += sign * m[col] * _matDeterminant(_matMinor(m, size, 0, col), size - 1)
+
+    return total
+
+
+def _matAdjoint(m, size):
+    result = [0.0] * (size * size)
+    for row in xrange(size):
+        for col in xrange(size):
+            sign = -1.0 if (row + col) % 2 else 1.0
+            # The adjoint is the transpose of the cofactor matrix.
+            result[col * size + row] = sign * _matDeterminant(_matMinor(m, size, row, col), size - 1)
+
+    return result
+
+
+def _matInverse(m, size):
+    det = _matDeterminant(m, size)
+    if abs(det) < DIVIDEPRECISION:
+        return None
+
+    return [x / det for x in _matAdjoint(m, size)]
+
+
+def _matIdentity(size):
+    return [1.0 if row == col else 0.0 for row in xrange(size) for col in xrange(size)]
+
+
+def xfoToMat44(xfo):
+    """Returns the 16 values (row major) of the matrix of the given 10 Xfo
+    values (tr, ori, sc).
+
+    Args:
+        xfo (list): The Xfo values.
+
+    Returns:
+        list: The matrix values.
+
+    """
+
+    tr = xfo[0:3]
+    rot = _quatToMat33(xfo[3:7])
+    sc = xfo[7:10]
+
+    return [rot[0] * sc[0], rot[1] * sc[1], rot[2] * sc[2], tr[0],
+            rot[3] * sc[0], rot[4] * sc[1], rot[5] * sc[2], tr[1],
+            rot[6] * sc[0], rot[7] * sc[1], rot[8] * sc[2], tr[2],
+            0.0, 0.0, 0.0, 1.0]
+
+
+def xfoFromMat44(m):
+    """Returns the 10 Xfo values (tr, ori, sc) of the given 16 matrix values
+    (row major).
+
+    Args:
+        m (list): The matrix values.
+
+    Returns:
+        list: The Xfo values.
+
+    """
+
+    tr = [m[3], m[7], m[11]]
+    columns = [[m[0], m[4], m[8]], [m[1], m[5], m[9]], [m[2], m[6], m[10]]]
+    sc = [_length(column) for column in columns]
+
+    rot3 = [m[0], m[1], m[2], m[4], m[5], m[6], m[8], m[9], m[10]]
+    if _matDeterminant(rot3, 3) < 0.0:
+        sc = [-x for x in sc]
+
+    for i in xrange(3):
+        if abs(sc[i]) < DIVIDEPRECISION:
+            continue
+        for row in xrange(3):
+            rot3[row * 3 + i] /= sc[i]
+
+    return tr + _quatFromMat33(rot3) + sc
+
+
+def _xfoMultiply(a, b):
+    ori = _quatMultiply(a[3:7], b[3:7])
+    scaledTr = [a[7] * b[0], a[8] * b[1], a[9] * b[2]]
+    rotatedTr = _quatRotateVector(a[3:7], scaledTr)
+
+    return ([a[0] + rotatedTr[0], a[1] + rotatedTr[1], a[2] + rotatedTr[2]] +
+            _unitSafe(ori) +
+            [a[7] * b[7], a[8] * b[8], a[9] * b[9]])
+
+
+def _xfoInverse(xfo):
+    sc = [1.0 / x if abs(x) > DIVIDEPRECISION else 0.0 for x in xfo[7:10]]
+    ori = _quatInverse(xfo[3:7])
+    tr = _quatRotateVector(ori, [-xfo[0], -xfo[1], -xfo[2]])
+
+    return [tr[0] * sc[0], tr[1] * sc[1], tr[2] * sc[2]] + ori + sc
+
+
+def _quatSlerp(a, b, t):
+    b = list(b)
+    cosAngle = _dot(a, b)
+    if cosAngle < 0.0:
+        cosAngle = -cosAngle
+        b = [-x for x in b]
+
+    if cosAngle > 1.0 - PRECISION:
+        result = [x + (y - x) * t for x, y in zip(a, b)]
+        return _unitSafe(result)
+
+    angle = math.acos(_clampUnit(cosAngle))
+    sinAngle = math.sin(angle)
+    ratioA = math.sin((1.0 - t) * angle) / sinAngle
+    ratioB = math.sin(t * angle) / sinAngle
+
+    return [x * ratioA + y * ratioB for x, y in zip(a, b)]
+
+
+# ==================
+# Member Properties
+# ==================
+
+def _scalarMember(index, typeName='Scalar'):
+    """Returns a property exposing one float of the struct buffer."""
+
+    def getter(self):
+        return PySimpleRTVal(typeName, self._buf[self._off + index])
+
+    def setter(self, val):
+        self._buf[self._off + index] = SIMPLE_TYPES[typeName](value(val))
+
+    return property(getter, setter)
+
+
+def _structMember(index, typeName):
+    """Returns a property exposing a view on a part of the struct buffer."""
+
+    def getter(self):
+        return STRUCT_TYPES[typeName](self._buf, self._off + index)
+
+    def setter(self, val):
+        STRUCT_TYPES[typeName](self._buf, self._off + index).setValues(values(val))
+
+    return property(getter, setter)
+
+
+# ============
+# Base Types
+# ============
+
+class PyRTVal(object):
+    """Base class for the pure Python RTVal stand-ins."""
+
+    __slots__ = ()
+
+    typeName = None
+
+
+    def getTypeName(self):
+        """Returns the KL type name of the value.
+
+        Returns:
+            str: The KL type name.
+
+        """
+
+        return self.typeName
+
+
+class PySimpleRTVal(PyRTVal):
+    """Simple typed value."""
+
+    __slots__ = ('typeName', '_value')
+
+
+    def __init__(self, typeName, val=None):
+        super(PySimpleRTVal, self).__init__()
+        self.typeName = typeName
+
+        if val is None:
+            self._value = SIMPLE_TYPES[typeName]()
+        else:
+            self._value = SIMPLE_TYPES[typeName](value(val))
+
+
+    def __repr__(self):
+        return self.typeName + "(" + repr(self._value) + ")"
+
+
+    def getSimpleType(self):
+        """Returns the Python value.
+
+        Returns:
+            object: The Python value.
+
+        """
+
+        return self._value
+
+
+class PyStructRTVal(PyRTVal):
+    """Base class for the math struct values.
+
+    Args:
+        buf (list): Buffer holding the values, a new one is allocated if None.
+        off (int): Offset of the first value in the buffer.
+
+    """
+
+    __slots__ = ('_buf', '_off')
+
+    size = 0
+    default = ()
+    members = ()
+
+
+    def __init__(self, buf=None, off=0):
+        super(PyStructRTVal, self).__init__()
+
+        if buf is None:
+            buf = list(self.default)
+
+        self._buf = buf
+        self._off = off
+
+
+    def __repr__(self):
+        return self.typeName + str(self.getValues())
+
+
+    @classmethod
+    def create(cls, vals):
+        """Creates a new value owning a copy of the given values.
+
+        Args:
+            vals (list): The flat values.
+
+        Returns:
+            object: The new value.
+
+        """
+
+        return cls(list(vals))
+
+
+    def getValues(self):
+        """Returns a copy of the flat values of this struct.
+
+        Returns:
+            list: The flat values.
+
+        """
+
+        return list(self._buf[self._off:self._off + self.size])
+
+
+    def setValues(self, vals):
+        """Sets the flat values of this struct.
+
+        Args:
+            vals (list): The flat values.
+
+        """
+
+        buf = self._buf
+        off = self._off
+        for i in xrange(self.size):
+            buf[off + i] = vals[i]
+
+
+    def clone(self):
+        """Returns a copy of this value which doesn't share its buffer.
+
+        Returns:
+            object: The copy.
+
+        """
+
+        return self.create(self.getValues())
+
+
+    def equal(self, returnType, other):
+        return PySimpleRTVal('Boolean', self.getValues() == values(other))
+
+
+    def almostEqual(self, returnType, other, precision=PRECISION):
+        precision = value(precision)
+        for a, b in zip(self.getValues(), values(other)):
+            if abs(a - b) >= precision:
+                return PySimpleRTVal('Boolean', False)
+
+        return PySimpleRTVal('Boolean', True)
+
+
+class _PyVectorRTVal(PyStructRTVal):
+    """Base class for the vector like types (Vec2, Vec3, Vec4, Color)."""
+
+    __slots__ = ()
+
+
+    def _result(self, vals):
+        return self.create(vals)
+
+
+    def set(self, returnType, *args):
+        if returnType == 'Boolean':
+            return self.equal(returnType, args[0])
+
+        self.setValues([float(value(x)) for x in args])
+
+
+    def setNull(self, returnType):
+        self.setValues([0.0] * self.size)
+
+
+    def component(self, returnType, i):
+        return PySimpleRTVal('Scalar', self._buf[self._off + value(i)])
+
+
+    def setComponent(self, returnType, i, val):
+        self._buf[self._off + value(i)] = float(value(val))
+
+
+    def add(self, returnType, other):
+        return self._result([a + b for a, b in zip(self.getValues(), values(other))])
+
+
+    def subtract(self, returnType, other):
+        return self._result([a - b for a, b in zip(self.getValues(), values(other))])
+
+
+    def multiply(self, returnType, other):
+        return self._result([a * b for a, b in zip(self.getValues(), values(other))])
+
+
+    def divide(self, returnType, other):
+        return self._result([a / b for a, b in zip(self.getValues(), values(other))])
+
+
+    def multiplyScalar(self, returnType, other):
+        other = value(other)
+        return self._result([a * other for a in self.getValues()])
+
+
+    def divideScalar(self, returnType, other):
+        other = value(other)
+        return self._result([a / other for a in self.getValues()])
+
+
+    def negate(self, returnType):
+        return self._result([-a for a in self.getValues()])
+
+
+    def inverse(self, returnType):
+        return self._result([1.0 / a for a in self.getValues()])
+
+
+    def dot(self, returnType, other):
+        return PySimpleRTVal('Scalar', _dot(self.getValues(), values(other)))
+
+
+    def lengthSquared(self, returnType):
+        vals = self.getValues()
+        return PySimpleRTVal('Scalar', _dot(vals, vals))
+
+
+    def length(self, returnType):
+        return PySimpleRTVal('Scalar', _length(self.getValues()))
+
+
+    def unit(self, returnType):
+        return self._result(_unitSafe(self.getValues()))
+
+
+    def unit_safe(self, returnType):
+        return self._result(_unitSafe(self.getValues()))
+
+
+    def setUnit(self, returnType):
+        vals = self.getValues()
+        length = _length(vals)
+        self.setValues(_unitSafe(vals))
+
+        return PySimpleRTVal('Scalar', length)
+
+
+    def normalize(self, returnType):
+        return self.setUnit(returnType)
+
+
+    def clamp(self, returnType, minVal, maxVal):
+        return self._result([max(lo, min(hi, a)) for a, lo, hi in
+                             zip(self.getValues(), values(minVal), values(maxVal))])
+
+
+    def unitsAngleTo(self, returnType, other):
+        cosAngle = _clampUnit(_dot(self.getValues(), values(other)))
+        return PySimpleRTVal('Scalar', math.acos(cosAngle))
+
+
+    def angleTo(self, returnType, other):
+        cosAngle = _clampUnit(_dot(_unitSafe(self.getValues()), _unitSafe(values(other))))
+        return PySimpleRTVal('Scalar', math.acos(cosAngle))
+
+
+    def distanceTo(self, returnType, other):
+        return PySimpleRTVal('Scalar', _length([a - b for a, b in zip(self.getValues(), values(other))]))
+
+
+    def linearInterpolate(self, returnType, other, t):
+        t = value(t)
+        return self._result([a + (b - a) * t for a, b in zip(self.getValues(), values(other))])
+
+
+    def distanceToLine(self, returnType, lineP0, lineP1):
+        p = self.getValues()
+        p0 = values(lineP0)
+        direction = _unitSafe([b - a for a, b in zip(p0, values(lineP1))])
+        offset = [a - b for a, b in zip(p, p0)]
+        projected = _dot(offset, direction)
+        return PySimpleRTVal('Scalar', _length([a - projected * d for a, d in zip(offset, direction)]))
+
+
+    def distanceToSegment(self, returnType, segmentP0, segmentP1):
+        p = self.getValues()
+        p0 = values(segmentP0)
+        segment = [b - a for a, b in zip(p0, values(segmentP1))]
+        offset = [a - b for a, b in zip(p, p0)]
+        lengthSquared = _dot(segment, segment)
+        t = 0.0
+        if lengthSquared > DIVIDEPRECISION:
+            t = max(0.0, min(1.0, _dot(offset, segment) / lengthSquared))
+
+        return PySimpleRTVal('Scalar', _length([a - t * s for a, s in zip(offset, segment)]))
+
+
+# ============
+# Math Types
+# ============
+
+class PyVec2RTVal(_PyVectorRTVal):
+    """Vec2 value."""
+
+    __slots__ = ()
+
+    typeName = 'Vec2'
+    size = 2
+    default = (0.0, 0.0)
+    members = (('x', 'Scalar'), ('y', 'Scalar'))
+
+    x = _scalarMember(0)
+    y = _scalarMember(1)
+
+
+    def cross(self, returnType, other):
+        a = self.getValues()
+        b = values(other)
+        return PySimpleRTVal('Scalar', a[0] * b[1] - a[1] * b[0])
+
+
+class PyVec3RTVal(_PyVectorRTVal):
+    """Vec3 value."""
+
+    __slots__ = ()
+
+    typeName = 'Vec3'
+    size = 3
+    default = (0.0, 0.0, 0.0)
+    members = (('x', 'Scalar'), ('y', 'Scalar'), ('z', 'Scalar'))
+
+    x = _scalarMember(0)
+    y = _scalarMember(1)
+    z = _scalarMember(2)
+
+
+    def cross(self, returnType, other):
+        return self._result(_cross(self.getValues(), values(other)))
+
+
+class PyVec4RTVal(_PyVectorRTVal):
+    """Vec4 value."""
+
+    __slots__ = ()
+
+    typeName = 'Vec4'
+    size = 4
+    default = (0.0, 0.0, 0.0, 0.0)
+    members = (('x', 'Scalar'), ('y', 'Scalar'), ('z', 'Scalar'), ('t', 'Scalar'))
+
+    x = _scalarMember(0)
+    y = _scalarMember(1)
+    z = _scalarMember(2)
+    t = _scalarMember(3)
+
+
+    def cross(self, returnType, other):
+        return self._result(_cross(self.getValues(), values(other)) + [0.0])
+
+
+class PyColorRTVal(_PyVectorRTVal):
+    """Color value."""
+
+    __slots__ = ()
+
+    typeName = 'Color'
+    size = 4
+    default = (0.0, 0.0, 0.0, 1.0)
+    members = (('r', 'Scalar'), ('g', 'Scalar'), ('b', 'Scalar'), ('a', 'Scalar'))
+
+    r = _scalarMember(0)
+    g = _scalarMember(1)
+    b = _scalarMember(2)
+    a = _scalarMember(3)
+
+
+class PyRotationOrderRTVal(PyStructRTVal):
+    """RotationOrder value."""
+
+    __slots__ = ()
+
+    typeName = 'RotationOrder'
+    size = 1
+    default = (0,)
+    members = (('order', 'Integer'),)
+
+    order = _scalarMember(0, 'Integer')
+
+
+    def setXYZ(self, returnType):
+        self._buf[self._off] = 0
+
+
+    def setYZX(self, returnType):
+        self._buf[self._off] = 1
+
+
+    def setZXY(self, returnType):
+        self._buf[self._off] = 2
+
+
+    def setXZY(self, returnType):
+        self._buf[self._off] = 3
+
+
+    def setZYX(self, returnType):
+        self._buf[self._off] = 4
+
+
+    def setYXZ(self, returnType):
+        self._buf[self._off] = 5
+
+
+class PyEulerRTVal(PyStructRTVal):
+    """Euler value."""
+
+    __slots__ = ()
+
+    typeName = 'Euler'
+    size = 4
+    default = (0.0, 0.0, 0.0, 0)
+    members = (('x', 'Scalar'), ('y', 'Scalar'), ('z', 'Scalar'), ('ro', 'RotationOrder'))
+
+    x = _scalarMember(0)
+    y = _scalarMember(1)
+    z = _scalarMember(2)
+    ro = _structMember(3, 'RotationOrder')
+
+
+    def set(self, returnType, x, y, z, ro=None):
+        off = self._off
+        self._buf[off] = float(value(x))
+        self._buf[off + 1] = float(value(y))
+        self._buf[off + 2] = float(value(z))
+        if ro is not None:
+            self._buf[off + 3] = values(ro)[0]
+
+
+    def toMat33(self, returnType):
+        vals = self.getValues()
+        return PyMat33RTVal.create(_quatToMat33(_quatFromEulerAngles(vals[:3], vals[3])))
+
+
+class PyQuatRTVal(PyStructRTVal):
+    """Quat value."""
+
+    __slots__ = ()
+
+    typeName = 'Quat'
+    size = 4
+    default = (0.0, 0.0, 0.0, 1.0)
+    members = (('v', 'Vec3'), ('w', 'Scalar'))
+
+    v = _structMember(0, 'Vec3')
+    w = _scalarMember(3)
+
+
+    def set(self, returnType, v, w):
+        self.setValues(values(v) + [float(value(w))])
+
+
+    def setIdentity(self, returnType):
+        self.setValues([0.0, 0.0, 0.0, 1.0])
+
+
+    def setFromEuler(self, returnType, angles, ro=None):
+        vals = values(angles)
+        if len(vals) == 4:
+            order = vals[3]
+        elif ro is not None:
+            order = values(ro)[0]
+        else:
+            order = 0
+
+        self.setValues(_quatFromEulerAngles(vals[:3], order))
+        return self.clone()
+
+
+    def setFromAxisAndAngle(self, returnType, axis, angle):
+        self.setValues(_quatFromAxisAndAngle(values(axis), value(angle)))
+        return self.clone()
+
+
+    def setFromMat33(self, returnType, mat):
+        self.setValues(_quatFromMat33(values(mat)))
+        return self.clone()
+
+
+    def setFromDirectionAndUpvector(self, returnType, direction, upvector):
+        zAxis = _unitSafe(values(direction))
+        xAxis = _unitSafe(_cross(values(upvector), zAxis))
+        yAxis = _unitSafe(_cross(zAxis, xAxis))
+
+        self.setValues(_quatFromMat33([xAxis[0], yAxis[0], zAxis[0],
+                                       xAxis[1], yAxis[1], zAxis[1],
+                                       xAxis[2], yAxis[2], zAxis[2]]))
+        return self.clone()
+
+
+    def setFrom2Vectors(self, returnType, sourceDirVec, destDirVec, arbitraryIfAmbiguous=True):
+        source = _unitSafe(values(sourceDirVec))
+        dest = _unitSafe(values(destDirVec))
+        cosAngle = _dot(source, dest)
+
+        if cosAngle < -1.0 + PRECISION:
+            if not value(arbitraryIfAmbiguous):
+                self.setValues([0.0, 0.0, 0.0, 1.0])
+                return self.clone()
+
+            axis = _cross([1.0, 0.0, 0.0], source)
+            if _length(axis) < PRECISION:
+                axis = _cross([0.0, 1.0, 0.0], source)
+            self.setValues(_quatFromAxisAndAngle(axis, math.pi))
+        else:
+            axis = _cross(source, dest)
+            self.setValues(_unitSafe(axis + [1.0 + cosAngle]))
+
+        return self.clone()
+
+
+    def toMat33(self, returnType):
+        return PyMat33RTVal.create(_quatToMat33(self.getValues()))
+
+
+    def toEuler(self, returnType, ro):
+        order = values(ro)[0]
+        angles = _mat33ToEulerAngles(_quatToMat33(self.getValues()), order)
+        return PyEulerRTVal.create(angles + [order])
+
+
+    def toEulerAngles(self, returnType, ro=None):
+        order = 0
+        if ro is not None:
+            order = values(ro)[0]
+
+        return PyVec3RTVal.create(_mat33ToEulerAngles(_quatToMat33(self.getValues()), order))
+
+
+    def mirror(self, returnType, axisIndex):
+        # Reflects the rotation across the plane normal to the given axis.
+        vals = self.getValues()
+        axisIndex = value(axisIndex)
+        for i in xrange(3):
+            if i != axisIndex:
+                vals[i] = -vals[i]
+
+        self.setValues(vals)
+        return self.clone()
+
+
+    def add(self, returnType, other):
+        return self.create([a + b for a, b in zip(self.getValues(), values(other))])
+
+
+    def subtract(self, returnType, other):
+        return self.create([a - b for a, b in zip(self.getValues(), values(other))])
+
+
+    def multiply(self, returnType, other):
+        return self.create(_quatMultiply(self.getValues(), values(other)))
+
+
+    def multiplyScalar(self, returnType, other):
+        other = value(other)
+        return self.create([a * other for a in self.getValues()])
+
+
+    def divide(self, returnType, other):
+        return self.create(_quatMultiply(self.getValues(), _quatInverse(values(other))))
+
+
+    def divideScalar(self, returnType, other):
+        other = value(other)
+        return self.create([a / other for a in self.getValues()])
+
+
+    def rotateVector(self, returnType, v):
+        return PyVec3RTVal.create(_quatRotateVector(self.getValues(), values(v)))
+
+
+    def dot(self, returnType, other):
+        return PySimpleRTVal('Scalar', _dot(self.getValues(), values(other)))
+
+
+    def getXaxis(self, returnType):
+        return PyVec3RTVal.create(_quatRotateVector(self.getValues(), [1.0, 0.0, 0.0]))
+
+
+    def getYaxis(self, returnType):
+        return PyVec3RTVal.create(_quatRotateVector(self.getValues(), [0.0, 1.0, 0.0]))
+
+
+    def getZaxis(self, returnType):
+        return PyVec3RTVal.create(_quatRotateVector(self.getValues(), [0.0, 0.0, 1.0]))
+
+
+    def conjugate(self, returnType):
+        return self.create(_quatConjugate(self.getValues()))
+
+
+    def inverse(self, returnType):
+        return self.create(_quatInverse(self.getValues()))
+
+
+    def lengthSquared(self, returnType):
+        vals = self.getValues()
+        return PySimpleRTVal('Scalar', _dot(vals, vals))
+
+
+    def length(self, returnType):
+        return PySimpleRTVal('Scalar', _length(self.getValues()))
+
+
+    def unit(self, returnType):
+        return self.create(_unitSafe(self.getValues()))
+
+
+    def unit_safe(self, returnType):
+        return self.create(_unitSafe(self.getValues()))
+
+
+    def setUnit(self, returnType):
+        vals = self.getValues()
+        length = _length(vals)
+        self.setValues(_unitSafe(vals))
+
+        return PySimpleRTVal('Scalar', length)
+
+
+    def alignWith(self, returnType, other):
+        if _dot(self.getValues(), values(other)) < 0.0:
+            self.setValues([-a for a in self.getValues()])
+
+        return self.clone()
+
+
+    def getAngle(self, returnType):
+        return PySimpleRTVal('Scalar', math.acos(_clampUnit(self._buf[self._off + 3])) * 2.0)
+
+
+    def sphericalLinearInterpolate(self, returnType, other, t):
+        return self.create(_quatSlerp(self.getValues(), values(other), value(t)))
+
+
+class _PyMatRTVal(PyStructRTVal):
+    """Base class for the square matrix types."""
+
+    __slots__ = ()
+
+    rowSize = 0
+    rowType = None
+
+
+    def _rowValues(self, row):
+        vals = values(row)
+        if len(vals) < self.rowSize:
+            vals = vals + [0.0] * (self.rowSize - len(vals))
+
+        return vals[:self.rowSize]
+
+
+    def setRows(self, returnType, *rows):
+        vals = []
+        for row in rows:
+            vals += self._rowValues(row)
+
+        self.setValues(vals)
+
+
+    def setColumns(self, returnType, *columns):
+        vals = []
+        for column in columns:
+            vals += self._rowValues(column)
+
+        self.setValues(_matTranspose(vals, self.rowSize))
+
+
+    def setNull(self, returnType):
+        self.setValues([0.0] * self.size)
+
+
+    def setIdentity(self, returnType):
+        self.setValues(_matIdentity(self.rowSize))
+
+
+    def setDiagonal(self, returnType, v):
+        if isinstance(v, PyStructRTVal):
+            diagonal = self._rowValues(v)
+            if v.size < self.rowSize:
+                diagonal[-1] = 1.0
+        else:
+            diagonal = [float(value(v))] * self.rowSize
+
+        vals = [0.0] * self.size
+        for i in xrange(self.rowSize):
+            vals[i * self.rowSize + i] = diagonal[i]
+
+        self.setValues(vals)
+
+
+    def add(self, returnType, other):
+        return self.create([a + b for a, b in zip(self.getValues(), values(other))])
+
+
+    def subtract(self, returnType, other):
+        return self.create([a - b for a, b in zip(self.getValues(), values(other))])
+
+
+    def multiply(self, returnType, other):
+        return self.create(_matMultiply(self.getValues(), values(other), self.rowSize))
+
+
+    def multiplyScalar(self, returnType, other):
+        other = value(other)
+        return self.create([a * other for a in self.getValues()])
+
+
+    def divideScalar(self, returnType, other):
+        other = value(other)
+        return self.create([a / other for a in self.getValues()])
+
+
+    def determinant(self, returnType):
+        return PySimpleRTVal('Scalar', _matDeterminant(self.getValues(), self.rowSize))
+
+
+    def adjoint(self, returnType):
+        return self.create(_matAdjoint(self.getValues(), self.rowSize))
+
+
+    def inverse(self, returnType):
+        result = _matInverse(self.getValues(), self.rowSize)
+        if result is None:
+            raise Exception(self.typeName + ".inverse: singular matrix.")
+
+        return self.create(result)
+
+
+    def inverse_safe(self, returnType):
+        result = _matInverse(self.getValues(), self.rowSize)
+        if result is None:
+            result = _matIdentity(self.rowSize)
+
+        return self.create(result)
+
+
+    def transpose(self, returnType):
+        return self.create(_matTranspose(self.getValues(), self.rowSize))
+
+
+class PyMat33RTVal(_PyMatRTVal):
+    """Mat33 value."""
+
+    __slots__ = ()
+
+    typeName = 'Mat33'
+    size = 9
+    rowSize = 3
+    default = (1.0, 0.0, 0.0,
+               0.0, 1.0, 0.0,
+               0.0, 0.0, 1.0)
+    members = (('row0', 'Vec3'), ('row1', 'Vec3'), ('row2', 'Vec3'))
+
+    row0 = _structMember(0, 'Vec3')
+    row1 = _structMember(3, 'Vec3')
+    row2 = _structMember(6, 'Vec3')
+
+
+    def multiplyVector(self, returnType, other):
+        m = self.getValues()
+        v = values(other)
+        return PyVec3RTVal.create([_dot(m[0:3], v), _dot(m[3:6], v), _dot(m[6:9], v)])
+
+
+class PyMat44RTVal(_PyMatRTVal):
+    """Mat44 value."""
+
+    __slots__ = ()
+
+    typeName = 'Mat44'
+    size = 16
+    rowSize = 4
+    default = (1.0, 0.0, 0.0, 0.0,
+               0.0, 1.0, 0.0, 0.0,
+               0.0, 0.0, 1.0, 0.0,
+               0.0, 0.0, 0.0, 1.0)
+    members = (('row0', 'Vec4'), ('row1', 'Vec4'), ('row2', 'Vec4'), ('row3', 'Vec4'))
+
+    row0 = _structMember(0, 'Vec4')
+    row1 = _structMember(4, 'Vec4')
+    row2 = _structMember(8, 'Vec4')
+    row3 = _structMember(12, 'Vec4')
+
+
+    def multiplyVector(self, returnType, other):
+        m = self.getValues()
+        v = values(other)
+        if len(v) == 4:
+            return PyVec4RTVal.create([_dot(m[0:4], v), _dot(m[4:8], v),
+                                       _dot(m[8:12], v), _dot(m[12:16], v)])
+
+        v = v + [1.0]
+        result = [_dot(m[0:4], v), _dot(m[4:8], v), _dot(m[8:12], v)]
+        w = _dot(m[12:16], v)
+        if w != 1.0 and abs(w) > DIVIDEPRECISION:
+            result = [a / w for a in result]
+
+        return PyVec3RTVal.create(result)
+
+
+class PyXfoRTVal(PyStructRTVal):
+    """Xfo value, stored as tr (3 floats), ori (4 floats) and sc (3 floats)."""
+
+    __slots__ = ()
+
+    typeName = 'Xfo'
+    size = 10
+    default = (0.0, 0.0, 0.0,
+               0.0, 0.0, 0.0, 1.0,
+               1.0, 1.0, 1.0)
+    members = (('tr', 'Vec3'), ('ori', 'Quat'), ('sc', 'Vec3'))
+
+    tr = _structMember(0, 'Vec3')
+    ori = _structMember(3, 'Quat')
+    sc = _structMember(7, 'Vec3')
+
+
+    def set(self, returnType, tr, ori, sc):
+        self.setValues(values(tr) + values(ori) + values(sc))
+
+
+    def setIdentity(self, returnType):
+        self.setValues(self.default)
+
+
+    def setFromMat44(self, returnType, m):
+        self.setValues(xfoFromMat44(values(m)))
+        return self.clone()
+
+
+    def toMat44(self, returnType):
+        return PyMat44RTVal.create(xfoToMat44(self.getValues()))
+
+
+    def multiply(self, returnType, other):
+        return self.create(_xfoMultiply(self.getValues(), values(other)))
+
+
+    def inverse(self, returnType):
+        return self.create(_xfoInverse(self.getValues()))
+
+
+    def transformVector(self, returnType, v):
+        xfo = self.getValues()
+        v = values(v)
+        rotated = _quatRotateVector(xfo[3:7], [v[0] * xfo[7], v[1] * xfo[8], v[2] * xfo[9]])
+        return PyVec3RTVal.create([a + b for a, b in zip(xfo[0:3], rotated)])
+
+
+    def inverseTransformVector(self, returnType, v):
+        xfo = self.getValues()
+        v = values(v)
+        local = _quatRotateVector(_quatInverse(xfo[3:7]), [a - b for a, b in zip(v, xfo[0:3])])
+        return PyVec3RTVal.create([a / b for a, b in zip(local, xfo[7:10])])
+
+
+    def linearInterpolate(self, returnType, other, t):
+        t = value(t)
+        a = self.getValues()
+        b = values(other)
+        tr = [x + (y - x) * t for x, y in zip(a[0:3], b[0:3])]
+        sc = [x + (y - x) * t for x, y in zip(a[7:10], b[7:10])]
+        return self.create(tr + _quatSlerp(a[3:7], b[3:7], t) + sc)
+
+
+STRUCT_TYPES = {
+    'Vec2': PyVec2RTVal,
+    'Vec3': PyVec3RTVal,
+    'Vec4': PyVec4RTVal,
+    'Color': PyColorRTVal,
+    'RotationOrder': PyRotationOrderRTVal,
+    'Euler': PyEulerRTVal,
+    'Quat': PyQuatRTVal,
+    'Mat33': PyMat33RTVal,
+    'Mat44': PyMat44RTVal,
+    'Xfo': PyXfoRTVal
+}
+
+
+class PyArrayRTVal(PyRTVal):
+    """Variable array of math struct values.
+
+    The values of all the elements are stored in a single contiguous buffer.
+    Elements returned by indexing are views on the buffer.
+
+    Args:
+        elementType (str): The KL type of the elements.
+        vals (list): The flat values of the elements.
+
+    """
+
+    __slots__ = ('typeName', 'elementType', '_elementClass', '_buf')
+
+
+    def __init__(self, elementType, vals=None):
+        super(PyArrayRTVal, self).__init__()
+        self.typeName = elementType + '[]'
+        self.elementType = elementType
+        self._elementClass = STRUCT_TYPES[elementType]
+
+        if vals is None:
+            self._buf = array('d')
+        else:
+            self._buf = array('d', vals)
+
+
+    def __repr__(self):
+        return self.typeName + str([self[i] for i in xrange(len(self))])
+
+
+    def __len__(self):
+        return len(self._buf) // self._elementClass.size
+
+
+    def __getitem__(self, index):
+        if index < 0 or index >= len(self):
+            raise IndexError("Index out of range:" + str(index))
+
+        return self._elementClass(self._buf, index * self._elementClass.size)
+
+
+    def __setitem__(self, index, val):
+        self[index].setValues(values(val))
+
+
+    def resize(self, size):
+        """Resizes the array, new elements are set to the default value of
+        the element type.
+
+        Args:
+            size (int): The new number of elements.
+
+        """
+
+        count = len(self)
+        if size < count:
+            del self._buf[size * self._elementClass.size:]
+        else:
+            self._buf.extend(list(self._elementClass.default) * (size - count))
+
+
+    def getValues(self):
+        """Returns a copy of the flat values of all the elements.
+
+        Returns:
+            array: The flat values.
+
+        """
+
+        return array('d', self._buf)
+
+
+    def setValues(self, vals):
+        """Sets the flat values of all the elements, resizing the array.
+
+        Args:
+            vals (list): The flat values.
+
+        """
+
+        self._buf = array('d', vals)
+
+
+def isSupportedType(dataType):
+    """Returns True if the given KL type can be constructed by this backend.
+
+    Args:
+        dataType (str): The name of the KL type.
+
+    Returns:
+        bool: True if the type is supported.
+
+    """
+
+    if dataType.endswith('[]'):
+        return dataType[:-2] in STRUCT_TYPES
+
+    return dataType in STRUCT_TYPES or dataType in SIMPLE_TYPES
+
+
+def constructRTVal(dataType, defaultValue=None):
+    """Constructs a new value of the given KL type.
+
+    Args:
+        dataType (str): The name of the data type to construct.
+        defaultValue (value): The default value to use to initialize the value.
+
+    Returns:
+        object: The constructed value.
+
+    """
+
+    if dataType in SIMPLE_TYPES:
+        return PySimpleRTVal(dataType, defaultValue)
+
+    if dataType.endswith('[]') and dataType[:-2] in STRUCT_TYPES:
+        if isinstance(defaultValue, PyArrayRTVal):
+            return defaultValue
+
+        return PyArrayRTVal(dataType[:-2], defaultValue)
+
+    if dataType not in STRUCT_TYPES:
+        raise Exception("Error constructing RTVal:" + dataType)
+
+    rtvalClass = STRUCT_TYPES[dataType]
+    if defaultValue is None:
+        return rtvalClass()
+
+    if hasattr(defaultValue, '_rtval'):
+        return defaultValue._rtval
+
+    if isinstance(defaultValue, PyStructRTVal):
+        return defaultValue
+
+    if isinstance(defaultValue, (int, long)) and dataType == 'RotationOrder':
+        return rtvalClass([defaultValue])
+
+    result = rtvalClass()
+    for memberName, memberType in rtvalClass.members:
+        if hasattr(defaultValue, memberName):
+            setattr(result, memberName, constructRTVal(memberType, getattr(defaultValue, memberName)))
+
+    return result
@@ -0,0 +1,13 @@
+"""Kraken Solvers.
+
+NumPy implementations of the Kraken KL solvers, evaluating batches of poses
+without Fabric. Importing this package registers the solvers with the
+KrakenSystem.
+
+"""
+
+import two_bone_ik_solver
+import nbone_ik_solver
+import bezier_spine_solver
+import dynamic_chain_solver
+import tentacle_solver
@@ -0,0 +1,257 @@
+"""Kraken - core.solvers.batch_math module.
+
+Vectorized versions of the KL Math functions used by the solvers. Each
+function operates on arrays of values stacked along the leading axes:
+
+- Vec3: (..., 3) arrays.
+- Quat: (..., 4) arrays of (x, y, z, w) values.
+- Mat33: (..., 3, 3) arrays.
+- Mat44: (..., 4, 4) row major arrays, the translation in the last column.
+- Xfo: (tr, ori, sc) tuples of Vec3, Quat and Vec3 arrays.
+
+The functions follow the implementations of kraken.core.python_backend so
+both backends produce the same results.
+
+"""
+
+import numpy as np
+
+from kraken.core.python_backend import PRECISION, DIVIDEPRECISION
+
+
+# ==============
+# Vec3 Methods
+# ==============
+
+def dot(a, b):
+    return np.sum(a * b, axis=-1)
+
+
+def cross(a, b):
+    return np.cross(a, b)
+
+
+def length(a):
+    return np.sqrt(dot(a, a))
+
+
+def unitSafe(a):
+    aLength = length(a)[..., None]
+    valid = aLength >= DIVIDEPRECISION
+
+    return np.where(valid, a / np.where(valid, aLength, 1.0), 0.0)
+
+
+def angleTo(a, b):
+    return np.arccos(np.clip(dot(unitSafe(a), unitSafe(b)), -1.0, 1.0))
+
+
+def vec3(x, y, z, shape=()):
+    result = np.empty(tuple(shape) + (3,))
+    result[..., 0] = x
+    result[..., 1] = y
+    result[..., 2] = z
+
+    return result
+
+
+# ==============
+# Quat Methods
+# ==============
+
+def quatIdentity(shape=()):
+    result = np.zeros(tuple(shape) + (4,))
+    result[..., 3] = 1.0
+
+    return result
+
+
+def quatMultiply(a, b):
+    ax, ay, az, aw = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+    bx, by, bz, bw = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+
+    return np.stack([aw * bx + bw * ax + ay * bz - az * by,
+                     aw * by + bw * ay + az * bx - ax * bz,
+                     aw * bz + bw * az + ax * by - ay * bx,
+                     aw * bw - ax * bx - ay * by - az * bz], axis=-1)
+
+
+def quatInverse(q):
+    lengthSquared = dot(q, q)[..., None]
+    valid = lengthSquared >= DIVIDEPRECISION
+    inverse = q * np.array([-1.0, -1.0, -1.0, 1.0]) / np.where(valid, lengthSquared, 1.0)
+
+    return np.where(valid, inverse, quatIdentity(q.shape[:-1]))
+
+
+def quatRotateVector(q, v):
+    qv = q[..., :3]
+    qw = q[..., 3:]
+
+    # Expansion of q * v * conjugate(q) for unit quaternions.
+    t = 2.0 * cross(qv, v)
+
+    return v + qw * t + cross(qv, t)
+
+
+def quatFromAxisAndAngle(axis, angle):
+    halfAngle = np.asarray(angle, dtype=float) * 0.5
+    axis = unitSafe(np.asarray(axis, dtype=float))
+
+    result = np.empty(np.broadcast(axis[..., 0], halfAngle).shape + (4,))
+    result[..., :3] = axis * np.sin(halfAngle)[..., None]
+    result[..., 3] = np.cos(halfAngle)
+
+    return result
+
+
+def quatToMat33(q):
+    x, y, z, w = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+
+    return np.stack([
+        np.stack([1.0 - 2.0 * (y * y + z * z), 2.0 * (x * y - z * w), 2.0 * (x * z + y * w)], axis=-1),
+        np.stack([2.0 * (x * y + z * w), 1.0 - 2.0 * (x * x + z * z), 2.0 * (y * z - x * w)], axis=-1),
+        np.stack([2.0 * (x * z - y * w), 2.0 * (y * z + x * w), 1.0 - 2.0 * (x * x + y * y)], axis=-1)
+    ], axis=-2)
+
+
+def quatFromMat33(m):
+    m00, m01, m02 = m[..., 0, 0], m[..., 0, 1], m[..., 0, 2]
+    m10, m11, m12 = m[..., 1, 0], m[..., 1, 1], m[..., 1, 2]
+    m20, m21, m22 = m[..., 2, 0], m[..., 2, 1], m[..., 2, 2]
+
+    def root(x):
+        return 2.0 * np.sqrt(np.maximum(x, DIVIDEPRECISION))
+
+    # The four candidate solutions, the branch is selected as in the python
+    # backend.
+    trace = m00 + m11 + m22
+    s = root(trace + 1.0)
+    qTrace = np.stack([(m21 - m12) / s, (m02 - m20) / s, (m10 - m01) / s, 0.25 * s], axis=-1)
+
+    s = root(1.0 + m00 - m11 - m22)
+    qX = np.stack([0.25 * s, (m01 + m10) / s, (m02 + m20) / s, (m21 - m12) / s], axis=-1)
+
+    s = root(1.0 + m11 - m00 - m22)
+    qY = np.stack([(m01 + m10) / s, 0.25 * s, (m12 + m21) / s, (m02 - m20) / s], axis=-1)
+
+    s = root(1.0 + m22 - m00 - m11)
+    qZ = np.stack([(m02 + m20) / s, (m12 + m21) / s, 0.25 * s, (m10 - m01) / s], axis=-1)
+
+    q = np.where((m11 > m22)[..., None], qY, qZ)
+    q = np.where(((m00 > m11) & (m00 > m22))[..., None], qX, q)
+    q = np.where((trace > 0.0)[..., None], qTrace, q)
+
+    return unitSafe(q)
+
+
+def quatFrom2Vectors(sourceDirVec, destDirVec):
+    source = unitSafe(sourceDirVec)
+    dest = unitSafe(destDirVec)
+    cosAngle = dot(source, dest)
+
+    result = unitSafe(np.concatenate([cross(source, dest), (1.0 + cosAngle)[..., None]], axis=-1))
+
+    # Opposite vectors: rotate by PI around an axis perpendicular to the source.
+    axis = cross(vec3(1.0, 0.0, 0.0, source.shape[:-1]), source)
+    fallbackAxis = cross(vec3(0.0, 1.0, 0.0, source.shape[:-1]), source)
+    axis = np.where((length(axis) < PRECISION)[..., None], fallbackAxis, axis)
+    opposite = quatFromAxisAndAngle(axis, np.full(source.shape[:-1], np.pi))
+
+    return np.where((cosAngle < -1.0 + PRECISION)[..., None], opposite, result)
+
+
+def quatGetXaxis(q):
+    return quatRotateVector(q, vec3(1.0, 0.0, 0.0, q.shape[:-1]))
+
+
+def quatSlerp(a, b, t):
+    t = np.asarray(t, dtype=float)[..., None]
+
+    cosAngle = dot(a, b)[..., None]
+    b = np.where(cosAngle < 0.0, -b, b)
+    cosAngle = np.abs(cosAngle)
+
+    linear = unitSafe(a + (b - a) * t)
+
+    angle = np.arccos(np.clip(cosAngle, -1.0, 1.0))
+    sinAngle = np.sin(angle)
+    spherical = (a * np.sin((1.0 - t) * angle) + b * np.sin(t * angle)) / np.where(sinAngle == 0.0, 1.0, sinAngle)
+
+    return np.where(cosAngle > 1.0 - PRECISION, linear, spherical)
+
+
+# ==============
+# Xfo Methods
+# ==============
+
+def xfoToMat44(xfo):
+    tr, ori, sc = xfo
+
+    result = np.zeros(tr.shape[:-1] + (4, 4))
+    result[..., :3, :3] = quatToMat33(ori) * sc[..., None, :]
+    result[..., :3, 3] = tr
+    result[..., 3, 3] = 1.0
+
+    return result
+
+
+def xfoFromMat44(m):
+    m = np.asarray(m, dtype=float)
+
+    tr = m[..., :3, 3]
+    rot = m[..., :3, :3]
+    sc = np.sqrt(np.sum(rot * rot, axis=-2))
+    sc = np.where((np.linalg.det(rot) < 0.0)[..., None], -sc, sc)
+
+    valid = np.abs(sc) >= DIVIDEPRECISION
+    rot = np.where(valid[..., None, :], rot / np.where(valid, sc, 1.0)[..., None, :], rot)
+
+    return (tr, quatFromMat33(rot), sc)
+
+
+def xfoMultiply(a, b):
+    ori = quatMultiply(a[1], b[1])
+    tr = a[0] + quatRotateVector(a[1], a[2] * b[0])
+
+    return (tr, unitSafe(ori), a[2] * b[2])
+
+
+def xfoInverse(xfo):
+    tr, ori, sc = xfo
+
+    valid = np.abs(sc) > DIVIDEPRECISION
+    invSc = np.where(valid, 1.0 / np.where(valid, sc, 1.0), 0.0)
+    invOri = quatInverse(ori)
+
+    return (quatRotateVector(invOri, -tr) * invSc, invOri, invSc)
+
+
+def xfoTransformVector(xfo, v):
+    tr, ori, sc = xfo
+
+    return tr + quatRotateVector(ori, sc * v)
+
+
+def xfoIndex(xfo, index):
+    return (xfo[0][index], xfo[1][index], xfo[2][index])
+
+
+def xfoCopy(xfo):
+    return (xfo[0].copy(), xfo[1].copy(), xfo[2].copy())
+
+
+def xfoWhere(condition, a, b):
+    condition = np.asarray(condition)[..., None]
+
+    return (np.where(condition, a[0], b[0]),
+            np.where(condition, a[1], b[1]),
+            np.where(condition, a[2], b[2]))
+
+
+# ==============
+# Mat44 Methods
+# ==============
+
+def mat44TransformVector(m, v):
+    return np.einsum('...ij,...j->...i', m[..., :3, :3], v) + m[..., :3, 3]
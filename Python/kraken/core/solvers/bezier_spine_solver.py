@@ -0,0 +1,153 @@
+"""Kraken - core.solvers.bezier_spine_solver module.
+
+Classes:
+BezierSpineSolver -- Python implementation of the BezierSpineSolver KL solver.
+
+"""
+
+import numpy as np
+
+from kraken.core.kraken_system import ks
+from kraken.core.solvers.solver import Solver
+from kraken.core.solvers import batch_math as bm
+
+
+def bezierCoeffs(p0, p1, p2, p3):
+    """Returns the coefficients of a batch of cubic bezier curves.
+
+    Args:
+        p0 (array): (N, 3) first control points.
+        p1 (array): (N, 3) second control points.
+        p2 (array): (N, 3) third control points.
+        p3 (array): (N, 3) last control points.
+
+    Returns:
+        tuple: The 4 (N, 3) coefficients.
+
+    """
+
+    return (p3 - p0 - 3.0 * p2 + 3.0 * p1,
+            p0 - 2.0 * p1 + p2,
+            -p0 + p1,
+            p0)
+
+
+def evalBezier(coeffs, t):
+    """Evaluates a batch of cubic bezier curves.
+
+    Args:
+        coeffs (tuple): The 4 (N, 3) coefficients of the curves.
+        t (array): (N,) or (N, S) parameters.
+
+    Returns:
+        array: (N, 3) or (N, S, 3) positions.
+
+    """
+
+    t = np.asarray(t)
+    if t.ndim == 2:
+        coeffs = [x[:, None] for x in coeffs]
+
+    t = t[..., None]
+
+    return coeffs[0] * t ** 3 + 3.0 * coeffs[1] * t ** 2 + 3.0 * coeffs[2] * t + coeffs[3]
+
+
+def measureBezierLength(coeffs, numSamples):
+    """Returns the curve length at regularly spaced samples of a batch of
+    cubic bezier curves.
+
+    Args:
+        coeffs (tuple): The 4 (N, 3) coefficients of the curves.
+        numSamples (int): Number of samples.
+
+    Returns:
+        array: (N, numSamples) distances along the curves.
+
+    """
+
+    t = np.arange(numSamples) / float(numSamples - 1)
+    positions = evalBezier(coeffs, np.broadcast_to(t, (coeffs[0].shape[0], numSamples)))
+
+    distances = np.zeros((coeffs[0].shape[0], numSamples))
+    distances[:, 1:] = np.cumsum(bm.length(positions[:, 1:] - positions[:, :-1]), axis=1)
+
+    return distances
+
+
+class BezierSpineSolver(Solver):
+    """Spine solver distributing joints along a cubic bezier curve."""
+
+    solverTypeName = 'BezierSpineSolver'
+
+    arguments = (('length', 'Scalar', 'In'),
+                 ('base', 'Mat44', 'In'),
+                 ('baseHandle', 'Mat44', 'In'),
+                 ('tipHandle', 'Mat44', 'In'),
+                 ('tip', 'Mat44', 'In'),
+                 ('outputs', 'Mat44[]', 'Out'))
+
+    def solveBatch(self, batchSize, values):
+        rigScale = values['rigScale']
+        outputCount = self._getArraySize(values, 'outputs')
+
+        basePos = values['base'][:, :3, 3]
+        tipHandlePos = values['tipHandle'][:, :3, 3]
+        coeffs = bezierCoeffs(basePos, values['baseHandle'][:, :3, 3], tipHandlePos, values['tip'][:, :3, 3])
+
+        # Sample the curve 2x for every output joint.
+        distances = measureBezierLength(coeffs, outputCount * 2)
+        sampleCount = distances.shape[1]
+        curveLength = distances[:, -1]
+
+        jointLength = (values['length'] * rigScale) / float(outputCount)
+        baseXfo = bm.xfoFromMat44(values['base'])
+        tipXfo = bm.xfoFromMat44(values['tip'])
+
+        # Align the x axis of the outputs down the length of the spine.
+        xAlignmentOffset = bm.quatFromAxisAndAngle(bm.vec3(0.0, 1.0, 0.0), np.pi * 0.5)
+        baseOri = bm.quatMultiply(baseXfo[1], xAlignmentOffset)
+        tipOri = bm.quatMultiply(tipXfo[1], xAlignmentOffset)
+
+        batchIndices = np.arange(batchSize)
+        outScaling = bm.vec3(rigScale, rigScale, rigScale, (batchSize,))
+
+        outputs = np.zeros((batchSize, outputCount, 4, 4))
+        for i in xrange(outputCount):
+            if i == 0:
+                outTr = basePos
+            else:
+                outTr = prevTr + bm.quatRotateVector(prevOri, bm.vec3(jointLength, 0.0, 0.0, (batchSize,)))
+
+            # Interpolate the rotation of the base and tip controllers.
+            outOri = bm.quatSlerp(baseOri, tipOri, (i + 0.5) / float(outputCount))
+
+            # Determine the curve parameter for the tip of the joint by walking
+            # the distances of the curve.
+            tipDist = jointLength * (i + 1)
+            onCurve = tipDist < curveLength
+
+            j = np.argmax(distances[:, 1:] > tipDist[:, None], axis=1) + 1
+            ratio = (tipDist - distances[batchIndices, j - 1]) / (distances[batchIndices, j] - distances[batchIndices, j - 1])
+            curveTipParam = np.where(onCurve,
+                                     ((j - 1) / float(sampleCount - 1)) + (ratio / float(sampleCount - 1)),
+                                     1.0 + ((tipDist - curveLength) / jointLength))
+
+            # Position of the tip of the joint, on the curve or projected off
+            # the end of the curve.
+            onCurvePos = evalBezier(coeffs, curveTipParam)
+            offCurvePos = tipXfo[0] + bm.unitSafe(tipXfo[0] - tipHandlePos) * ((curveTipParam - 1.0) * jointLength)[:, None]
+            targ = np.where((curveTipParam < 1.0)[:, None], onCurvePos, offCurvePos)
+
+            # Align the joint so it points at the target position computed.
+            alignment = bm.quatFrom2Vectors(bm.quatGetXaxis(outOri), bm.unitSafe(targ - outTr))
+            outOri = bm.quatMultiply(alignment, outOri)
+
+            outputs[:, i] = bm.xfoToMat44((outTr, outOri, outScaling))
+            prevTr = outTr
+            prevOri = outOri
+
+        return {'outputs': outputs}
+
+
+ks.registerSolver(BezierSpineSolver)
@@ -0,0 +1,154 @@
+"""Kraken - core.solvers.dynamic_chain_solver module.
+
+Classes:
+DynamicChainSolver -- Python implementation of the DynamicChainSolver KL solver.
+
+"""
+
+import numpy as np
+
+from kraken.core.kraken_system import ks
+from kraken.core.solvers.solver import Solver
+from kraken.core.solvers import batch_math as bm
+
+
+class DynamicChainSolver(Solver):
+    """Verlet simulation of a chain of bones driven by an FK pose.
+
+    The simulation state is held per pose of the batch in contiguous arrays:
+    (N, M) bone lengths and (N, M, 3) previous and current positions of the
+    bone tips. The last pose solved is kept to anchor the root of the chain,
+    like the io pose of the KL solver.
+
+    """
+
+    solverTypeName = 'DynamicChainSolver'
+
+    arguments = (('resetframe', 'Scalar', 'In'),
+                 ('frame', 'Scalar', 'In'),
+                 ('simBlendStart', 'Scalar', 'In'),
+                 ('simBlendEnd', 'Scalar', 'In'),
+                 ('dampening', 'Scalar', 'In'),
+                 ('gravity', 'Scalar', 'In'),
+                 ('simulate', 'Boolean', 'In'),
+                 ('massStart', 'Scalar', 'In'),
+                 ('massEnd', 'Scalar', 'In'),
+                 ('fkPose', 'Mat44[]', 'In'),
+                 ('animPose', 'Mat44[]', 'Out'))
+
+    defaults = dict(Solver.defaults, simulate=True, massStart=1.0, massEnd=1.0)
+
+    timeArgument = 'frame'
+
+    def __init__(self):
+        super(DynamicChainSolver, self).__init__()
+
+        self.initialized = None
+        self.boneLengths = None
+        self.trPrev = None
+        self.trCurr = None
+        self.animPose = None
+
+
+    def reset(self):
+        self.initialized = None
+        self.boneLengths = None
+        self.trPrev = None
+        self.trCurr = None
+        self.animPose = None
+
+        return True
+
+
+    def solveBatch(self, batchSize, values):
+        fkPose = values['fkPose']
+        boneCount = fkPose.shape[1]
+        timeStep = 1.0 / 24.0
+
+        if self.initialized is None or self.trCurr.shape[:2] != (batchSize, boneCount):
+            self.initialized = np.zeros(batchSize, dtype=bool)
+            self.boneLengths = np.zeros((batchSize, boneCount))
+            self.trPrev = np.zeros((batchSize, boneCount, 3))
+            self.trCurr = np.zeros((batchSize, boneCount, 3))
+            self.animPose = np.array(fkPose)
+
+        resetPose = values['frame'] <= values['resetframe']
+        wasInitialized = self.initialized & ~resetPose
+
+        # Initialize the bone lengths, previous and current positions of the
+        # chains simulated for the first time.
+        initPose = ~self.initialized & ~resetPose
+        if np.any(initPose):
+            boneLengths = np.full((batchSize, boneCount), 0.25)
+            boneLengths[:, :-1] = bm.length(fkPose[:, :-1, :3, 3] - fkPose[:, 1:, :3, 3])
+            tips = bm.mat44TransformVector(fkPose, bm.vec3(boneLengths, 0.0, 0.0, boneLengths.shape))
+
+            self.boneLengths = np.where(initPose[:, None], boneLengths, self.boneLengths)
+            self.trPrev = np.where(initPose[:, None, None], tips, self.trPrev)
+            self.trCurr = np.where(initPose[:, None, None], tips, self.trCurr)
+
+        self.initialized = ~resetPose
+
+        simulate = ~resetPose & (values['simulate'] > 0.5)
+        animPose = np.array(fkPose)
+
+        if np.any(simulate):
+            boneLengths = self.boneLengths
+            temp = self.trCurr
+
+            # Compute the Verlet simulation of the strands.
+            ratio = np.arange(boneCount) / float(max(boneCount - 1, 1))
+            mass = values['massStart'][:, None] + (values['massEnd'] - values['massStart'])[:, None] * ratio
+            trPrev = self.trPrev + (self.trCurr - self.trPrev) * values['dampening'][:, None, None]
+            delta = bm.vec3(0.0, values['gravity'][:, None] / mass, 0.0, mass.shape) * (timeStep * timeStep)
+            trCurr = self.trCurr + (self.trCurr - trPrev) + delta
+
+            # Now apply the inter-link constraints that keep the chains from
+            # stretching, on the chains initialized before this frame.
+            temp2 = trCurr
+            prevAnchor = np.concatenate([self.animPose[:, :1, :3, 3], temp2[:, :-1]], axis=1)
+            prevVec = prevAnchor - temp2
+            prevVecLength = bm.length(prevVec)
+            correction = prevVec * ((prevVecLength - boneLengths) / prevVecLength)[..., None] * 0.45
+
+            nextVec = temp2[:, 1:] - temp2[:, :-1]
+            nextVecLength = bm.length(nextVec)
+            correction[:, :-1] += nextVec * ((nextVecLength - boneLengths[:, 1:]) / nextVecLength)[..., None] * 0.45
+
+            trCurr = np.where(wasInitialized[:, None, None], trCurr + correction, trCurr)
+
+            # Now apply the simulation to the poses.
+            fkXfos = bm.xfoFromMat44(fkPose)
+            simBlend = values['simBlendStart'][:, None] + (values['simBlendEnd'] - values['simBlendStart'])[:, None] * ratio
+            identity = bm.quatIdentity((batchSize,))
+            for i in xrange(boneCount):
+                boneTr, boneOri, boneSc = bm.xfoIndex(fkXfos, np.s_[:, i])
+                if i > 0:
+                    boneTr = bm.mat44TransformVector(animPose[:, i - 1], bm.vec3(boneLengths[:, i - 1], 0.0, 0.0, (batchSize,)))
+
+                # Rotate the bone to look at the simulated point.
+                boneOffsetRotation = bm.quatFrom2Vectors(bm.quatGetXaxis(boneOri), bm.unitSafe(trCurr[:, i] - boneTr))
+                boneOffsetRotation = bm.quatSlerp(identity, boneOffsetRotation, simBlend[:, i])
+
+                # The last bone is aligned to the previous one to stabilize the tip.
+                if i == boneCount - 1:
+                    boneOri = bm.quatFromMat33(animPose[:, i - 1, :3, :3])
+                else:
+                    boneOri = bm.quatMultiply(boneOffsetRotation, boneOri)
+
+                boneXfo = (boneTr, boneOri, boneSc)
+                animPose[:, i] = np.where(simulate[:, None, None], bm.xfoToMat44(boneXfo), animPose[:, i])
+
+                # Integrate the results back into the simulation so that the
+                # next evaluation is based on the resulting pose.
+                trCurr[:, i] = bm.xfoTransformVector(boneXfo, bm.vec3(boneLengths[:, i], 0.0, 0.0, (batchSize,)))
+
+            self.trCurr = np.where(simulate[:, None, None], trCurr, self.trCurr)
+            self.trPrev = np.where(simulate[:, None, None], temp, self.trPrev)
+
+        self.animPose = animPose
+
+        return {'animPose': animPose}
+
+
+ks.registerSolver(DynamicChainSolver)
@@ -0,0 +1,298 @@
+"""Kraken - core.solvers.nbone_ik_solver module.
+
+Classes:
+NBoneIKSolver -- Python implementation of the NBoneIKSolver KL solver.
+
+"""
+
+import numpy as np
+
+from kraken.core.kraken_system import ks
+from kraken.core.solvers.solver import Solver
+from kraken.core.solvers import batch_math as bm
+
+
+def solveNBoneIK(basePose, goalPosition, rigScale):
+    """Solves a batch of chains, see solveNBoneIK in Math.kl.
+
+    Args:
+        basePose (tuple): Xfo of the (N, M) bones of the chains.
+        goalPosition (array): (N, 3) positions of the ik goals.
+        rigScale (array): (N,) scales of the rigs.
+
+    Returns:
+        tuple: Xfo of the (N, M) bones of the solved chains.
+
+    """
+
+    baseTr, baseOri, baseSc = basePose
+    batchSize, boneCount = baseTr.shape[:2]
+    lastBoneIndex = boneCount - 1
+
+    ikTr = baseTr.copy()
+    ikOri = baseOri.copy()
+    ikSc = baseSc.copy()
+
+    # The tip of the ik pose is a default Xfo, only its position is set.
+    ikOri[:, lastBoneIndex] = bm.quatIdentity((batchSize,))
+    ikSc[:, lastBoneIndex] = 1.0
+
+    boneVectors = np.zeros((batchSize, boneCount, 3))
+    boneLengths = np.zeros((batchSize, boneCount))
+    remainingChainLength = np.zeros(batchSize)
+    for i in xrange(boneCount - 1):
+        boneXfo = bm.xfoIndex(basePose, np.s_[:, i])
+        boneVectors[:, i] = bm.xfoTransformVector(bm.xfoInverse(boneXfo), baseTr[:, i + 1])
+        boneLengths[:, i] = bm.length(boneVectors[:, i]) * rigScale
+        remainingChainLength += np.abs(boneLengths[:, i])
+
+    chainRootPos = baseTr[:, 0]
+    fkChainTip = baseTr[:, lastBoneIndex]
+    chainOffsetRotation = bm.quatIdentity((batchSize,))
+
+    for i in xrange(boneCount - 1):
+        boneTr = baseTr[:, i]
+        boneOri = baseOri[:, i]
+
+        if i == 0:
+            vecToFkChainTip = fkChainTip - boneTr
+        else:
+            # Transform the bone position by the overall chain offset.
+            vecToFkChainTip = fkChainTip - (chainRootPos + bm.quatRotateVector(chainOffsetRotation, boneTr - chainRootPos))
+
+            # Calculate a new pose position based on the parent bones new orientation.
+            parentXfo = (ikTr[:, i - 1], ikOri[:, i - 1], ikSc[:, i - 1])
+            boneTr = bm.xfoTransformVector(parentXfo, boneVectors[:, i - 1])
+
+        distToFkChainTip = bm.length(vecToFkChainTip)
+        vecToFkChainTip = vecToFkChainTip / distToFkChainTip[:, None]
+
+        vecToIkGoal = goalPosition - boneTr
+        distToIkGoal = bm.length(vecToIkGoal)
+        vecToIkGoal = vecToIkGoal / distToIkGoal[:, None]
+        boneLength = np.abs(boneLengths[:, i])
+
+        if i == 0:
+            # Calculate and store the overall chain offset towards the ik target.
+            chainOffsetRotation = bm.quatFrom2Vectors(vecToFkChainTip, vecToIkGoal)
+
+            fkChainTip = boneTr + vecToIkGoal * distToFkChainTip[:, None]
+            boneOri = bm.quatMultiply(chainOffsetRotation, boneOri)
+        else:
+            # Apply the chain offset, and any incremental correction.
+            boneOffsetRotation = bm.quatFrom2Vectors(vecToFkChainTip, vecToIkGoal)
+            boneOri = bm.quatMultiply(bm.quatMultiply(boneOffsetRotation, chainOffsetRotation), boneOri)
+
+        solved = np.ones(batchSize, dtype=bool)
+
+        if i <= boneCount - 3:
+            # Remove the current bones length from the chain.
+            remainingChainLength = remainingChainLength - boneLength
+            boneLengthVector = bm.quatRotateVector(boneOri, bm.unitSafe(boneVectors[:, i]))
+
+            # This is the current angle of the bone.
+            fkBoneAngle = np.arccos(np.clip(bm.dot(boneLengthVector, vecToIkGoal), -1.0, 1.0))
+
+            # Bones already pointing directly at the target are left as is.
+            solved = fkBoneAngle >= 0.0001
+
+            bendAxis = bm.unitSafe(bm.cross(vecToIkGoal, boneLengthVector))
+
+            if i == boneCount - 3:
+                # Law of cosines.
+                ikBoneAngle = np.arccos(np.clip(
+                    (boneLength ** 2 + distToIkGoal ** 2 - remainingChainLength ** 2) / (2.0 * boneLength * distToIkGoal),
+                    -1.0, 1.0))
+            else:
+                # Maximum angles of the bone using the fk chain tip and the ik
+                # goal, adding the remaining chain length as radians when the
+                # chain can reach past them.
+                def maxBoneAngle(dist):
+                    return np.where(
+                        dist > remainingChainLength,
+                        np.arccos(np.clip((boneLength ** 2 + dist ** 2 - remainingChainLength ** 2) / (2.0 * boneLength * dist), -1.0, 1.0)),
+                        np.arccos(np.clip((boneLength * 0.5) / remainingChainLength, 0.0, 1.0)) + (remainingChainLength - dist) / boneLength)
+
+                ikBoneAngle = maxBoneAngle(distToIkGoal) * (fkBoneAngle / maxBoneAngle(distToFkChainTip))
+
+            # Apply the rotation delta to the current bone.
+            offset = bm.quatFromAxisAndAngle(bendAxis, ikBoneAngle - fkBoneAngle)
+            boneOri = bm.quatMultiply(offset, boneOri)
+
+        ikTr[:, i] = np.where(solved[:, None], boneTr, ikTr[:, i])
+        ikOri[:, i] = np.where(solved[:, None], boneOri, ikOri[:, i])
+
+    parentXfo = (ikTr[:, lastBoneIndex - 1], ikOri[:, lastBoneIndex - 1], ikSc[:, lastBoneIndex - 1])
+    ikTr[:, lastBoneIndex] = bm.xfoTransformVector(parentXfo, boneVectors[:, lastBoneIndex - 1])
+
+    return (ikTr, ikOri, ikSc)
+
+
+def solveNBoneIKWithUpVector(basePose, goalPosition, upVPosition, upVector, rigScale):
+    """Solves a batch of chains after aligning them with the goal and up
+    vector, see solveNBoneIKWithUpVector in Math.kl.
+
+    Args:
+        basePose (tuple): Xfo of the (N, M) bones of the chains.
+        goalPosition (array): (N, 3) positions of the ik goals.
+        upVPosition (array): (N, 3) positions of the up vectors.
+        upVector (array): (3,) up axis of the first bone.
+        rigScale (array): (N,) scales of the rigs.
+
+    Returns:
+        tuple: Xfo of the (N, M) bones of the solved chains.
+
+    """
+
+    baseTr, baseOri, baseSc = basePose
+    boneCount = baseTr.shape[1]
+
+    chainRootPos = baseTr[:, 0]
+    fkChainTip = baseTr[:, boneCount - 1]
+    vecToFkChainTip = bm.unitSafe(fkChainTip - chainRootPos)
+    vecToIkGoal = bm.unitSafe(goalPosition - chainRootPos)
+
+    chainOffsetRotation = bm.quatFrom2Vectors(vecToFkChainTip, vecToIkGoal)
+
+    # Compute the current upvector of the chain using the first joints xfo.
+    fkChainUp = bm.quatRotateVector(bm.quatMultiply(chainOffsetRotation, baseOri[:, 0]), upVector)
+    vecToUpVPos = upVPosition - chainRootPos
+
+    # Project the vectors onto the plane defined by the root to goal vector.
+    vecToUpVPos = bm.unitSafe(vecToUpVPos - bm.dot(vecToUpVPos, vecToIkGoal)[:, None] * vecToIkGoal)
+    fkChainUp = bm.unitSafe(fkChainUp - bm.dot(fkChainUp, vecToIkGoal)[:, None] * vecToIkGoal)
+
+    angle = bm.angleTo(fkChainUp, vecToUpVPos)
+    angle = np.where(bm.dot(bm.cross(fkChainUp, vecToUpVPos), vecToIkGoal) < 0.0, -angle, angle)
+
+    # Apply the upvector alignment to the chain rotation.
+    upVectorOffset = bm.quatFromAxisAndAngle(vecToIkGoal, angle)
+    chainOffsetRotation = bm.quatMultiply(upVectorOffset, chainOffsetRotation)
+
+    # Compute a new aligned chain including the re-orientation.
+    alignedTr = baseTr.copy()
+    alignedOri = bm.quatMultiply(chainOffsetRotation[:, None], baseOri)
+    alignedSc = baseSc.copy()
+    for i in xrange(1, boneCount):
+        localTr = bm.xfoTransformVector(bm.xfoInverse(bm.xfoIndex(basePose, np.s_[:, i - 1])), baseTr[:, i])
+        alignedTr[:, i] = bm.xfoTransformVector((alignedTr[:, i - 1], alignedOri[:, i - 1], alignedSc[:, i - 1]), localTr)
+
+    return solveNBoneIK((alignedTr, alignedOri, alignedSc), goalPosition, rigScale)
+
+
+class NBoneIKSolver(Solver):
+    """IK solver for chains of any number of bones blending with an FK chain.
+
+    The initial pose is captured from the first pose solved, like the KL
+    solver does on its first evaluation.
+
+    """
+
+    solverTypeName = 'NBoneIKSolver'
+
+    arguments = (('useInitPose', 'Boolean', 'In'),
+                 ('ikblend', 'Scalar', 'In'),
+                 ('chainBase', 'Mat44', 'In'),
+                 ('ikgoal', 'Mat44', 'In'),
+                 ('upVector', 'Mat44', 'In'),
+                 ('fkcontrols', 'Mat44[]', 'In'),
+                 ('tipBoneLen', 'Scalar', 'In'),
+                 ('rootIndex', 'Integer', 'In'),
+                 ('pose', 'Mat44[]', 'Out'),
+                 ('legEnd', 'Mat44', 'Out'))
+
+    defaults = dict(Solver.defaults, useInitPose=False, rootIndex=0)
+
+    def __init__(self, initPose=None):
+        super(NBoneIKSolver, self).__init__()
+
+        self.initPose = initPose
+
+
+    def reset(self):
+        self.initPose = None
+
+        return True
+
+
+    def solveBatch(self, batchSize, values):
+        rigScale = values['rigScale']
+        fkcontrols = values['fkcontrols']
+        tipBoneLen = values['tipBoneLen']
+        controlCount = fkcontrols.shape[1]
+
+        if values['pose'] is not None and self._getArraySize(values, 'pose') != controlCount:
+            raise Exception("Error in NBoneIKSolver. The number of FKControls does not match the number of joints")
+
+        fkXfos = bm.xfoFromMat44(fkcontrols)
+        tipVector = bm.vec3(tipBoneLen, 0.0, 0.0, (batchSize,))
+
+        if self.initPose is None:
+            tipTr = bm.xfoTransformVector(bm.xfoIndex(fkXfos, np.s_[0, -1]), tipVector[0])
+            self.initPose = (np.concatenate([fkXfos[0][0], tipTr[None]]),
+                             np.concatenate([fkXfos[1][0], fkXfos[1][0, -1:]]),
+                             np.concatenate([fkXfos[2][0], fkXfos[2][0, -1:]]))
+
+        # The fk pose with the tip of the chain appended.
+        boneVectors = np.zeros((batchSize, controlCount, 3))
+        for i in xrange(1, controlCount):
+            boneVectors[:, i - 1] = bm.xfoTransformVector(bm.xfoInverse(bm.xfoIndex(fkXfos, np.s_[:, i - 1])), fkXfos[0][:, i])
+        boneVectors[:, controlCount - 1] = tipVector
+
+        lastFkXfo = bm.xfoIndex(fkXfos, np.s_[:, -1:])
+        xfoTr = np.concatenate([fkXfos[0], bm.xfoTransformVector(lastFkXfo, boneVectors[:, -1:])], axis=1)
+        xfoOri = np.concatenate([fkXfos[1], lastFkXfo[1]], axis=1)
+        xfoSc = np.concatenate([fkXfos[2], lastFkXfo[2]], axis=1)
+
+        useIk = values['ikblend'] > 0.0
+        if np.any(useIk):
+            initPoseSize = self.initPose[0].shape[0]
+            ikIndex = min(self._getUniformInteger(values, 'rootIndex'), initPoseSize - 3)
+
+            useInitPose = values['useInitPose'] > 0.5
+
+            ikPose = None
+            if np.any(useInitPose):
+                # Offset the init pose by the chain base input.
+                chainBase = bm.xfoFromMat44(values['chainBase'])
+                initRootInverse = bm.xfoInverse(bm.xfoIndex(self.initPose, 0))
+                localPose = bm.xfoMultiply(tuple(x[None] for x in initRootInverse), self.initPose)
+                offsetInitPose = bm.xfoMultiply(tuple(x[:, None] for x in chainBase),
+                                                tuple(x[None] for x in localPose))
+
+                ikPose = solveNBoneIKWithUpVector(
+                    tuple(x[:, ikIndex:] for x in offsetInitPose),
+                    values['ikgoal'][:, :3, 3],
+                    values['upVector'][:, :3, 3],
+                    bm.vec3(0.0, 1.0, 0.0),
+                    rigScale)
+
+            if not np.all(useInitPose):
+                fkIkPose = solveNBoneIK(
+                    (xfoTr[:, ikIndex:], xfoOri[:, ikIndex:], xfoSc[:, ikIndex:]),
+                    values['ikgoal'][:, :3, 3],
+                    rigScale)
+
+                if ikPose is None:
+                    ikPose = fkIkPose
+                else:
+                    ikPose = bm.xfoWhere(useInitPose[:, None], ikPose, fkIkPose)
+
+            # Now blend the IK result with the FK result.
+            ikblend = values['ikblend']
+            for i in xrange(ikIndex, xfoTr.shape[1]):
+                ori = bm.quatSlerp(xfoOri[:, i], ikPose[1][:, i - ikIndex], ikblend)
+                xfoOri[:, i] = np.where(useIk[:, None], ori, xfoOri[:, i])
+                if i > 0:
+                    tr = bm.xfoTransformVector((xfoTr[:, i - 1], xfoOri[:, i - 1], xfoSc[:, i - 1]), boneVectors[:, i - 1])
+                    xfoTr[:, i] = np.where(useIk[:, None], tr, xfoTr[:, i])
+
+        pose = bm.xfoToMat44((xfoTr, xfoOri, xfoSc))
+
+        return {
+            'pose': pose[:, :controlCount],
+            'legEnd': pose[:, controlCount]
+        }
+
+
+ks.registerSolver(NBoneIKSolver)
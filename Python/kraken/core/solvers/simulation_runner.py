@@ -0,0 +1,272 @@
+"""Kraken - core.solvers.simulation_runner module.
+
+Classes:
+SimulationRunner -- Steps stateful solvers over frame ranges without a DCC.
+
+"""
+
+import multiprocessing
+
+import numpy as np
+
+from kraken.core.kraken_system import ks
+
+
+def _runChunk(job):
+    """Runs the simulation of a chunk of the batch in a worker process.
+
+    Args:
+        job (tuple): The solver type name, frames and arguments of the chunk.
+
+    Returns:
+        dict: The curves of the outputs of the chunk.
+
+    """
+
+    solverTypeName, frames, args, animatedArgs = job
+
+    ks.loadSolverModules()
+
+    return SimulationRunner(solverTypeName).run(frames, args, animatedArgs)
+
+
+class SimulationRunner(object):
+    """Steps a solver over a range of frames for a batch of chains at once.
+
+    Solvers such as the DynamicChainSolver and TentacleSolver carry state from
+    one frame to the next, so they are stepped in frame order on a single
+    solver instance, the whole batch being solved for each frame. The results
+    are stored in contiguous (F, N, ...) arrays, one per output, F being the
+    number of frames and N the number of chains.
+
+    Arguments are passed as to Solver.solve. Animated arguments carry a leading
+    frame axis, with a value per frame. The time argument of the solver is set
+    to the frame number unless it is animated.
+
+    Example:
+        runner = SimulationRunner('TentacleSolver')
+        curves = runner.run(xrange(1, 101), args, animatedArgs={'ikgoal': goals})
+        runner.saveCurves('/path/to/cache.npz', xrange(1, 101), curves)
+
+    """
+
+    def __init__(self, solverTypeName):
+        super(SimulationRunner, self).__init__()
+
+        ks.loadSolverModules()
+
+        self.solverTypeName = solverTypeName
+        self.solverClass = ks.getSolverClass(solverTypeName)
+
+
+    # ===============
+    # Batch Methods
+    # ===============
+    def getBatchSize(self, args, animatedArgs=None):
+        """Returns the number of chains simulated with the given arguments.
+
+        Args:
+            args (dict): Values of the arguments of the solver.
+            animatedArgs (dict): Values of the animated arguments, per frame.
+
+        Returns:
+            int: The number of chains.
+
+        """
+
+        batchSize = 1
+        for name, batchAxis in self._getBatchAxes(args, animatedArgs).iteritems():
+            if batchAxis == 0:
+                batchSize = max(batchSize, np.shape(args[name])[batchAxis])
+            else:
+                batchSize = max(batchSize, np.shape(animatedArgs[name])[batchAxis])
+
+        return batchSize
+
+
+    def _getBatchAxes(self, args, animatedArgs):
+        """Returns the batch axis of the batched arguments.
+
+        Args:
+            args (dict): Values of the arguments of the solver.
+            animatedArgs (dict): Values of the animated arguments, per frame.
+
+        Returns:
+            dict: The batch axis of each batched argument.
+
+        """
+
+        if animatedArgs is None:
+            animatedArgs = {}
+
+        dataTypes = dict([(x[0], x[1]) for x in self.solverClass.getArguments()])
+
+        batchAxes = {}
+        for frameAxisCount, argValues in ((0, args), (1, animatedArgs)):
+            for name, value in argValues.iteritems():
+                if name not in dataTypes:
+                    raise Exception("'" + name + "' is not an argument of solver: " + self.solverTypeName + ".")
+
+                if np.ndim(value) == self.solverClass.getElementRank(dataTypes[name]) + frameAxisCount + 1:
+                    batchAxes[name] = frameAxisCount
+
+        return batchAxes
+
+
+    # ==================
+    # Simulate Methods
+    # ==================
+    def run(self, frames, args, animatedArgs=None):
+        """Simulates the chains over the given frames.
+
+        Args:
+            frames (list): The frame numbers, in evaluation order.
+            args (dict): Values of the arguments of the solver.
+            animatedArgs (dict): Values of the animated arguments, per frame.
+
+        Returns:
+            dict: The (F, N, ...) curves of the outputs of the solver.
+
+        """
+
+        if animatedArgs is None:
+            animatedArgs = {}
+
+        frames = list(frames)
+        for name, values in animatedArgs.iteritems():
+            if len(values) != len(frames):
+                raise Exception("Animated argument '" + name + "' has " + str(len(values)) +
+                                " values, expected " + str(len(frames)) + ".")
+
+        solver = self.solverClass()
+        solver.reset()
+
+        curves = None
+        frameArgs = dict(args)
+        for i, frame in enumerate(frames):
+            for name, values in animatedArgs.iteritems():
+                frameArgs[name] = values[i]
+
+            if solver.timeArgument is not None and solver.timeArgument not in animatedArgs:
+                frameArgs[solver.timeArgument] = float(frame)
+
+            results = solver.solve(**frameArgs)
+
+            if curves is None:
+                curves = {}
+                for name, value in results.iteritems():
+                    curves[name] = np.empty((len(frames),) + value.shape)
+
+            for name, value in results.iteritems():
+                curves[name][i] = value
+
+        return curves
+
+
+    def runParallel(self, frames, args, animatedArgs=None, processes=None, chunkCount=None):
+        """Simulates the chains over the given frames, splitting the batch in
+        chunks simulated in separate processes.
+
+        Args:
+            frames (list): The frame numbers, in evaluation order.
+            args (dict): Values of the arguments of the solver.
+            animatedArgs (dict): Values of the animated arguments, per frame.
+            processes (int): Number of worker processes, defaults to the
+                number of CPUs.
+            chunkCount (int): Number of chunks, defaults to the number of
+                worker processes.
+
+        Returns:
+            dict: The (F, N, ...) curves of the outputs of the solver.
+
+        """
+
+        if animatedArgs is None:
+            animatedArgs = {}
+
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+
+        if chunkCount is None:
+            chunkCount = processes
+
+        frames = list(frames)
+        batchSize = self.getBatchSize(args, animatedArgs)
+        chunkCount = min(chunkCount, batchSize)
+        if chunkCount <= 1 or processes <= 1:
+            return self.run(frames, args, animatedArgs)
+
+        batchAxes = self._getBatchAxes(args, animatedArgs)
+
+        jobs = []
+        for indices in np.array_split(np.arange(batchSize), chunkCount):
+            chunkArgs = dict(args)
+            chunkAnimatedArgs = dict(animatedArgs)
+            for name, batchAxis in batchAxes.iteritems():
+                if batchAxis == 0:
+                    chunkArgs[name] = np.asarray(args[name])[indices]
+                else:
+                    chunkAnimatedArgs[name] = np.asarray(animatedArgs[name])[:, indices]
+
+            jobs.append((self.solverTypeName, frames, chunkArgs, chunkAnimatedArgs))
+
+        pool = multiprocessing.Pool(min(processes, chunkCount))
+        try:
+            results = pool.map(_runChunk, jobs)
+        finally:
+            pool.close()
+            pool.join()
+
+        curves = {}
+        for name in results[0]:
+            curves[name] = np.concatenate([x[name] for x in results], axis=1)
+
+        return curves
+
+
+    # ===============
+    # Cache Methods
+    # ===============
+    def saveCurves(self, filePath, frames, curves):
+        """Saves simulated curves to a NumPy archive.
+
+        Args:
+            filePath (str): Path of the archive.
+            frames (list): The frame numbers of the curves.
+            curves (dict): The curves of the outputs of the solver.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        np.savez(filePath, frames=np.asarray(list(frames), dtype=float),
+                 solverTypeName=np.asarray(self.solverTypeName),
+                 **dict([('curve_' + name, value) for name, value in curves.iteritems()]))
+
+        return True
+
+
+    @classmethod
+    def loadCurves(cls, filePath):
+        """Loads simulated curves saved with saveCurves.
+
+        Args:
+            filePath (str): Path of the archive.
+
+        Returns:
+            tuple: The frame numbers and the dict of curves.
+
+        """
+
+        archive = np.load(filePath)
+        try:
+            frames = archive['frames']
+            curves = {}
+            for name in archive.files:
+                if name.startswith('curve_'):
+                    curves[name[len('curve_'):]] = archive[name]
+        finally:
+            archive.close()
+
+        return frames, curves
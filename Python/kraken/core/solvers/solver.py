@@ -0,0 +1,231 @@
+"""Kraken - core.solvers.solver module.
+
+Classes:
+Solver -- Base class of the Python implementations of the KL solvers.
+
+"""
+
+import numpy as np
+
+
+class Solver(object):
+    """Base class of the Python reference implementations of the KL solvers.
+
+    A solver is registered with the KrakenSystem under the name of the KL
+    solver type it implements and declares the same arguments, so a
+    KLOperator can evaluate it without Fabric.
+
+    Solvers are evaluated on batches of poses. The arguments are passed as
+    keyword arguments named after the KL arguments:
+
+    - Boolean, Integer and Scalar: a value, or an (N,) array.
+    - Mat44: a (4, 4) matrix, or an (N, 4, 4) array.
+    - Mat44[]: an (M, 4, 4) array, or an (N, M, 4, 4) array.
+
+    Values without the leading batch axis are shared by all the poses of the
+    batch. Output arrays are passed like the inputs, only their size is used.
+
+    Like the KL objects, solver instances hold state between evaluations
+    (e.g. the initial pose of the NBoneIKSolver).
+
+    """
+
+    # Name of the KL solver type implemented.
+    solverTypeName = None
+
+    # Arguments declared by KrakenSolver.getArguments.
+    baseArguments = (('drawDebug', 'Boolean', 'In'),
+                     ('rigScale', 'Scalar', 'In'))
+
+    # Arguments of the solver as (name, dataType, connectionType) tuples.
+    arguments = ()
+
+    # Values used for the inputs that aren't passed.
+    defaults = {'drawDebug': False, 'rigScale': 1.0}
+
+    # Input driven by the current frame when simulating, for solvers carrying
+    # state from one frame to the next.
+    timeArgument = None
+
+    def __init__(self):
+        super(Solver, self).__init__()
+
+
+    @classmethod
+    def getArguments(cls):
+        """Returns the arguments of the solver, in the order of the KL solver.
+
+        Returns:
+            tuple: (name, dataType, connectionType) tuples, one per argument.
+
+        """
+
+        return cls.baseArguments + cls.arguments
+
+
+    @classmethod
+    def getElementRank(cls, dataType):
+        """Returns the number of dimensions of one value of the given type.
+
+        Args:
+            dataType (str): KL type of the argument.
+
+        Returns:
+            int: The number of dimensions, without the batch axis.
+
+        """
+
+        if dataType.endswith('[]'):
+            return 3
+        elif dataType == 'Mat44':
+            return 2
+
+        return 0
+
+
+    def reset(self):
+        """Resets the state held by the solver between evaluations.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        return True
+
+
+    # ===============
+    # Solve Methods
+    # ===============
+    def solve(self, **args):
+        """Solves a batch of poses.
+
+        Args:
+            args (dict): Values of the arguments of the solver.
+
+        Returns:
+            dict: The output values, (N, 4, 4) arrays for Mat44 outputs and
+                (N, M, 4, 4) arrays for Mat44[] outputs.
+
+        """
+
+        batchSize, values = self._prepareArguments(args)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.solveBatch(batchSize, values)
+
+
+    def solveBatch(self, batchSize, values):
+        """Solves a batch of poses. Implemented by each solver.
+
+        Args:
+            batchSize (int): Number of poses in the batch.
+            values (dict): Arrays of the arguments, with a leading batch axis.
+                Outputs that weren't passed are None.
+
+        Returns:
+            dict: The output values.
+
+        """
+
+        raise NotImplementedError("Solver '" + str(self.solverTypeName) + "' doesn't implement solveBatch.")
+
+
+    def _prepareArguments(self, args):
+        """Validates the arguments and broadcasts them to the batch size.
+
+        Args:
+            args (dict): Values of the arguments of the solver.
+
+        Returns:
+            tuple: The batch size and the dict of argument arrays.
+
+        """
+
+        signature = self.getArguments()
+
+        argNames = set([x[0] for x in signature])
+        for name in args:
+            if name not in argNames:
+                raise Exception("'" + name + "' is not an argument of solver: " + self.solverTypeName + ".")
+
+        batchSize = None
+        arrays = {}
+        for name, dataType, connectionType in signature:
+            if name not in args:
+                if connectionType == 'In' and name not in self.defaults:
+                    raise Exception("Argument '" + name + "' is missing for solver: " + self.solverTypeName + ".")
+
+                continue
+
+            value = np.asarray(args[name], dtype=float)
+            elementRank = self.getElementRank(dataType)
+
+            if value.ndim == elementRank + 1:
+                if batchSize is None:
+                    batchSize = value.shape[0]
+                elif value.shape[0] != batchSize:
+                    raise Exception("Argument '" + name + "' has a batch size of " + str(value.shape[0]) +
+                                    ", expected " + str(batchSize) + ".")
+            elif value.ndim != elementRank:
+                raise Exception("Argument '" + name + "' has an invalid shape: " + str(value.shape) + ".")
+
+            arrays[name] = (value, value.ndim == elementRank + 1)
+
+        if batchSize is None:
+            batchSize = 1
+
+        values = {}
+        for name, dataType, connectionType in signature:
+            if name in arrays:
+                value, batched = arrays[name]
+                if not batched:
+                    value = np.broadcast_to(value, (batchSize,) + value.shape)
+
+                values[name] = value
+
+            elif name in self.defaults:
+                values[name] = np.full(batchSize, float(self.defaults[name]))
+
+            else:
+                values[name] = None
+
+        return batchSize, values
+
+
+    def _getUniformInteger(self, values, name):
+        """Returns the value of an integer argument that must be the same for
+        all the poses of the batch.
+
+        Args:
+            values (dict): Arrays of the arguments.
+            name (str): Name of the argument.
+
+        Returns:
+            int: The value of the argument.
+
+        """
+
+        value = values[name]
+        if np.any(value != value[0]):
+            raise Exception("Argument '" + name + "' must have the same value for all the poses of the batch.")
+
+        return int(value[0])
+
+
+    def _getArraySize(self, values, name):
+        """Returns the number of elements of an array argument.
+
+        Args:
+            values (dict): Arrays of the arguments.
+            name (str): Name of the argument.
+
+        Returns:
+            int: The number of elements.
+
+        """
+
+        if values[name] is None:
+            raise Exception("Array argument '" + name + "' is missing for solver: " + self.solverTypeName + ".")
+
+        return values[name].shape[1]
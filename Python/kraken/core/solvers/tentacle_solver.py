@@ -0,0 +1,287 @@
+"""Kraken - core.solvers.tentacle_solver module.
+
+Classes:
+TentacleSolver -- Python implementation of the TentacleSolver KL solver.
+
+"""
+
+import numpy as np
+
+from kraken.core.kraken_system import ks
+from kraken.core.solvers.solver import Solver
+from kraken.core.solvers import batch_math as bm
+
+
+def softTentacleLimit(val, maxVal, maxValSoftening):
+    """Softly clamps a batch of values, see softTentacleLimit in
+    TentacleSolver.kl.
+
+    The softened range is evaluated as the cubic bezier curve defined by the
+    two keyframes of the KL function.
+
+    Args:
+        val (array): (N,) values to clamp.
+        maxVal (array): (N,) maximum values.
+        maxValSoftening (tuple): (N,) ranges softened below and above the
+            maximum values.
+
+    Returns:
+        array: (N,) clamped values.
+
+    """
+
+    softBelow, softAbove = maxValSoftening
+
+    # Control points of the curve, as (time, value) pairs.
+    p0 = (maxVal - softBelow, maxVal - softBelow)
+    p1 = (p0[0] + softBelow * 0.5, p0[1] + softBelow * 0.5)
+    p3 = (maxVal + softAbove, maxVal)
+    p2 = (p3[0] - softAbove * 0.5, p3[1])
+
+    def bezier(points, t):
+        return ((1.0 - t) ** 3 * points[0] + 3.0 * (1.0 - t) ** 2 * t * points[1] +
+                3.0 * (1.0 - t) * t ** 2 * points[2] + t ** 3 * points[3])
+
+    # Find the parameter of the curve at the value by bisection, the time is
+    # monotonic along the curve.
+    low = np.zeros(np.shape(val))
+    high = np.ones(np.shape(val))
+    times = (p0[0], p1[0], p2[0], p3[0])
+    for i in xrange(32):
+        t = (low + high) * 0.5
+        below = bezier(times, t) < val
+        low = np.where(below, t, low)
+        high = np.where(below, high, t)
+
+    softened = bezier((p0[1], p1[1], p2[1], p3[1]), (low + high) * 0.5)
+
+    return np.where(val > maxVal - softBelow, np.where(val > maxVal + softAbove, maxVal, softened), val)
+
+
+def solveTentacleIK(basePose, goalPosition):
+    """Solves a batch of tentacle chains, see solveTentacleIK in
+    TentacleSolver.kl.
+
+    Args:
+        basePose (tuple): Xfo of the (N, M) bones of the chains.
+        goalPosition (array): (N, 3) positions of the ik goals.
+
+    Returns:
+        tuple: Xfo of the (N, M) bones of the solved chains.
+
+    """
+
+    baseTr, baseOri, baseSc = basePose
+    batchSize, boneCount = baseTr.shape[:2]
+    lastBoneIndex = boneCount - 1
+
+    ikTr = baseTr.copy()
+    ikOri = baseOri.copy()
+    ikSc = baseSc.copy()
+
+    # The tip of the ik pose is a default Xfo, only its position is set.
+    ikOri[:, lastBoneIndex] = bm.quatIdentity((batchSize,))
+    ikSc[:, lastBoneIndex] = 1.0
+
+    boneVectors = np.zeros((batchSize, boneCount, 3))
+    for i in xrange(boneCount - 1):
+        boneXfo = bm.xfoIndex(basePose, np.s_[:, i])
+        boneVectors[:, i] = bm.xfoTransformVector(bm.xfoInverse(boneXfo), baseTr[:, i + 1])
+
+    fkChainTip = baseTr[:, lastBoneIndex]
+    identity = bm.quatIdentity((batchSize,))
+
+    for i in xrange(boneCount - 1):
+        boneTr = baseTr[:, i]
+        if i > 0:
+            # Calculate a new pose position based on the parent bones new orientation.
+            boneTr = bm.xfoTransformVector((ikTr[:, i - 1], ikOri[:, i - 1], ikSc[:, i - 1]), boneVectors[:, i - 1])
+
+        vecToFkChainTip = fkChainTip - boneTr
+        vecToFkChainTip = vecToFkChainTip / bm.length(vecToFkChainTip)[:, None]
+
+        vecToIkGoal = goalPosition - boneTr
+        vecToIkGoal = vecToIkGoal / bm.length(vecToIkGoal)[:, None]
+
+        if i == 0:
+            # Calculate and store the overall chain offset towards the ik target.
+            chainOffsetRotation = bm.quatFrom2Vectors(vecToFkChainTip, vecToIkGoal)
+
+        # Apply the chain offset, and any incremental correction, both faded
+        # in along the chain.
+        boneOffsetRotation = bm.quatFrom2Vectors(vecToFkChainTip, vecToIkGoal)
+        fraction = i / float(boneCount - 1)
+        boneOffsetRotation = bm.quatSlerp(bm.quatSlerp(identity, chainOffsetRotation, fraction), boneOffsetRotation, fraction)
+
+        ikTr[:, i] = boneTr
+        ikOri[:, i] = bm.quatMultiply(boneOffsetRotation, baseOri[:, i])
+
+    parentXfo = (ikTr[:, lastBoneIndex - 1], ikOri[:, lastBoneIndex - 1], ikSc[:, lastBoneIndex - 1])
+    ikTr[:, lastBoneIndex] = bm.xfoTransformVector(parentXfo, boneVectors[:, lastBoneIndex - 1])
+
+    return (ikTr, ikOri, ikSc)
+
+
+class TentacleSolver(Solver):
+    """Tentacle solver animating an FK chain with waves and a dynamic IK goal.
+
+    The verlet state of the IK goal is held per pose of the batch, in
+    (N, 3) arrays, and is advanced each time a pose blending in IK is solved.
+
+    """
+
+    solverTypeName = 'TentacleSolver'
+
+    arguments = (('time', 'Scalar', 'In'),
+                 ('ikblend', 'Scalar', 'In'),
+                 ('waveLength_Y', 'Scalar', 'In'),
+                 ('waveAmplitude_Y', 'Scalar', 'In'),
+                 ('waveFrequency_Y', 'Scalar', 'In'),
+                 ('waveLength_Z', 'Scalar', 'In'),
+                 ('waveAmplitude_Z', 'Scalar', 'In'),
+                 ('waveFrequency_Z', 'Scalar', 'In'),
+                 ('tipBias', 'Scalar', 'In'),
+                 ('springStrength', 'Scalar', 'In'),
+                 ('dampening', 'Scalar', 'In'),
+                 ('simulationWeight', 'Scalar', 'In'),
+                 ('softLimitBounds', 'Scalar', 'In'),
+                 ('chainBase', 'Mat44', 'In'),
+                 ('ikgoal', 'Mat44', 'In'),
+                 ('fkcontrols', 'Mat44[]', 'In'),
+                 ('tipBoneLen', 'Scalar', 'In'),
+                 ('pose', 'Mat44[]', 'Out'),
+                 ('tentacleEnd', 'Mat44', 'Out'))
+
+    defaults = dict(Solver.defaults, time=0.0)
+
+    timeArgument = 'time'
+
+    def __init__(self):
+        super(TentacleSolver, self).__init__()
+
+        self.trCurr = None
+        self.trPrev = None
+
+
+    def reset(self):
+        self.trCurr = None
+        self.trPrev = None
+
+        return True
+
+
+    def solveDynamics(self, goalPosition, springStrength, dampening, simulationWeight, softLimitBounds, mask):
+        """Advances the verlet simulation of the ik goals by one step.
+
+        Args:
+            goalPosition (array): (N, 3) positions of the ik goals.
+            springStrength (array): (N,) strengths of the springs.
+            dampening (array): (N,) dampening of the simulations.
+            simulationWeight (array): (N,) blend to the simulated positions.
+            softLimitBounds (array): (N,) distances the goals can drift.
+            mask (array): (N,) poses of the batch to advance.
+
+        Returns:
+            array: (N, 3) simulated positions of the ik goals.
+
+        """
+
+        timeStep = 1.0 / 30.0
+        mass = 1.0
+
+        if self.trCurr is None or self.trCurr.shape != goalPosition.shape:
+            self.trCurr = np.zeros(goalPosition.shape)
+            self.trPrev = np.zeros(goalPosition.shape)
+
+        temp = self.trCurr
+        trPrev = self.trPrev + (self.trCurr - self.trPrev) * dampening[:, None]
+
+        force = (goalPosition - self.trCurr) * springStrength[:, None]
+        trCurr = self.trCurr + (self.trCurr - trPrev) + ((force / mass) * (timeStep * timeStep))
+
+        # Apply a soft limit to the distance the verlet bone and move from the attach point.
+        vecToAttachXfo = trCurr - goalPosition
+        distToAttachXfo = bm.length(vecToAttachXfo)
+        limitedDist = softTentacleLimit(distToAttachXfo, softLimitBounds, (softLimitBounds * 0.5, softLimitBounds * 1.5))
+        trCurr = np.where((distToAttachXfo > softLimitBounds * 0.5)[:, None],
+                          goalPosition + vecToAttachXfo * (limitedDist / distToAttachXfo)[:, None],
+                          trCurr)
+
+        self.trCurr = np.where(mask[:, None], trCurr, self.trCurr)
+        self.trPrev = np.where(mask[:, None], temp, self.trPrev)
+
+        return goalPosition + (trCurr - goalPosition) * simulationWeight[:, None]
+
+
+    def solveBatch(self, batchSize, values):
+        fkcontrols = values['fkcontrols']
+        controlCount = fkcontrols.shape[1]
+
+        if values['pose'] is not None and self._getArraySize(values, 'pose') != controlCount:
+            raise Exception("Error in TentacleSolver. The number of FKControls does not match the number of joints")
+
+        fkXfos = bm.xfoFromMat44(fkcontrols)
+        time = values['time']
+        tipBias = values['tipBias']
+
+        xfoTr = np.zeros((batchSize, controlCount + 1, 3))
+        xfoOri = np.zeros((batchSize, controlCount + 1, 4))
+        xfoSc = np.zeros((batchSize, controlCount + 1, 3))
+        boneVectors = np.zeros((batchSize, controlCount, 3))
+        for i in xrange(controlCount):
+            localXfo = bm.xfoIndex(fkXfos, np.s_[:, i])
+            if i > 0:
+                localXfo = bm.xfoMultiply(bm.xfoInverse(bm.xfoIndex(fkXfos, np.s_[:, i - 1])), localXfo)
+                boneVectors[:, i - 1] = localXfo[0]
+
+            fraction = i / float(controlCount)
+            bias = 1.0 - (((np.cos(fraction * np.pi) * 0.5) + 0.5) * tipBias)
+
+            # Euler(0.0, y, z) with the XYZ rotation order.
+            waveY = np.cos((time * -values['waveFrequency_Y']) + (fraction * values['waveLength_Y'] * np.pi)) * values['waveAmplitude_Y'] * bias
+            waveZ = np.cos((time * -values['waveFrequency_Z']) + (fraction * values['waveLength_Z'] * np.pi)) * values['waveAmplitude_Z'] * bias
+            wave = bm.quatMultiply(bm.quatFromAxisAndAngle(bm.vec3(0.0, 1.0, 0.0), waveY),
+                                   bm.quatFromAxisAndAngle(bm.vec3(0.0, 0.0, 1.0), waveZ))
+
+            localXfo = (localXfo[0], bm.quatMultiply(localXfo[1], wave), localXfo[2])
+
+            if i > 0:
+                localXfo = bm.xfoMultiply((xfoTr[:, i - 1], xfoOri[:, i - 1], xfoSc[:, i - 1]), localXfo)
+
+            xfoTr[:, i], xfoOri[:, i], xfoSc[:, i] = localXfo
+
+        boneVectors[:, controlCount - 1] = bm.vec3(values['tipBoneLen'], 0.0, 0.0, (batchSize,))
+        lastXfo = (xfoTr[:, controlCount - 1], xfoOri[:, controlCount - 1], xfoSc[:, controlCount - 1])
+        xfoTr[:, controlCount] = bm.xfoTransformVector(lastXfo, boneVectors[:, controlCount - 1])
+        xfoOri[:, controlCount] = lastXfo[1]
+        xfoSc[:, controlCount] = lastXfo[2]
+
+        useIk = values['ikblend'] > 0.0
+        if np.any(useIk):
+            goalPosition = self.solveDynamics(values['ikgoal'][:, :3, 3],
+                                              values['springStrength'],
+                                              values['dampening'],
+                                              values['simulationWeight'],
+                                              values['softLimitBounds'],
+                                              useIk)
+
+            ikPose = solveTentacleIK((xfoTr, xfoOri, xfoSc), goalPosition)
+
+            # Now blend the IK result with the FK result.
+            ikblend = values['ikblend']
+            for i in xrange(controlCount + 1):
+                ori = bm.quatSlerp(xfoOri[:, i], ikPose[1][:, i], ikblend)
+                xfoOri[:, i] = np.where(useIk[:, None], ori, xfoOri[:, i])
+                if i > 0:
+                    tr = bm.xfoTransformVector((xfoTr[:, i - 1], xfoOri[:, i - 1], xfoSc[:, i - 1]), boneVectors[:, i - 1])
+                    xfoTr[:, i] = np.where(useIk[:, None], tr, xfoTr[:, i])
+
+        pose = bm.xfoToMat44((xfoTr, xfoOri, xfoSc))
+
+        return {
+            'pose': pose[:, :controlCount],
+            'tentacleEnd': pose[:, controlCount]
+        }
+
+
+ks.registerSolver(TentacleSolver)
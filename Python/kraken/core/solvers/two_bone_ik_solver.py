@@ -0,0 +1,120 @@
+"""Kraken - core.solvers.two_bone_ik_solver module.
+
+Classes:
+TwoBoneIKSolver -- Python implementation of the TwoBoneIKSolver KL solver.
+
+"""
+
+import numpy as np
+
+from kraken.core.kraken_system import ks
+from kraken.core.solvers.solver import Solver
+from kraken.core.solvers import batch_math as bm
+
+
+def solve2BoneIK(bone0Length, bone1Length, rootPosition, upVPosition, goalPosition):
+    """Solves a batch of 2 bone chains, see solve2BoneIK in Math.kl.
+
+    Args:
+        bone0Length (array): (N,) lengths of the first bones.
+        bone1Length (array): (N,) lengths of the second bones.
+        rootPosition (array): (N, 3) positions of the chain roots.
+        upVPosition (array): (N, 3) positions of the up vectors.
+        goalPosition (array): (N, 3) positions of the ik goals.
+
+    Returns:
+        tuple: The (N, 3) positions and (N, 4) orientations of both bones.
+
+    """
+
+    rootToGoal = goalPosition - rootPosition
+    rootToUpV = upVPosition - rootPosition
+
+    bone0Tr = rootPosition
+
+    xaxis = bm.unitSafe(rootToGoal)
+    zaxis = -bm.unitSafe(bm.cross(bm.cross(xaxis, bm.unitSafe(rootToUpV)), xaxis))
+    yaxis = bm.unitSafe(bm.cross(zaxis, xaxis))
+    bone0Ori = bm.quatFromMat33(np.stack([xaxis, yaxis, zaxis], axis=-1))
+
+    # Law of cosines.
+    distToIkGoal = bm.length(rootToGoal)
+    ikBoneAngle = np.arccos(np.clip(
+        (bone0Length ** 2 + distToIkGoal ** 2 - bone1Length ** 2) / (2.0 * bone0Length * distToIkGoal),
+        -1.0, 1.0))
+
+    offset = bm.quatFromAxisAndAngle(bm.vec3(0.0, 1.0, 0.0), ikBoneAngle)
+    bone0Ori = bm.quatMultiply(bone0Ori, offset)
+
+    bone1Tr = bone0Tr + bm.quatRotateVector(bone0Ori, bm.vec3(bone0Length, 0.0, 0.0, bone0Length.shape))
+
+    offset = bm.quatFrom2Vectors(bm.quatGetXaxis(bone0Ori), bm.unitSafe(goalPosition - bone1Tr))
+    bone1Ori = bm.quatMultiply(offset, bone0Ori)
+
+    return bone0Tr, bone0Ori, bone1Tr, bone1Ori
+
+
+class TwoBoneIKSolver(Solver):
+    """Two bone IK solver blending an IK and an FK chain."""
+
+    solverTypeName = 'TwoBoneIKSolver'
+
+    arguments = (('rightSide', 'Boolean', 'In'),
+                 ('ikblend', 'Scalar', 'In'),
+                 ('softIK', 'Boolean', 'In'),
+                 ('softDist', 'Scalar', 'In'),
+                 ('stretch', 'Boolean', 'In'),
+                 ('stretchBlend', 'Scalar', 'In'),
+                 ('root', 'Mat44', 'In'),
+                 ('bone0FK', 'Mat44', 'In'),
+                 ('bone1FK', 'Mat44', 'In'),
+                 ('ikHandle', 'Mat44', 'In'),
+                 ('upV', 'Mat44', 'In'),
+                 ('bone0Len', 'Scalar', 'In'),
+                 ('bone1Len', 'Scalar', 'In'),
+                 ('bone0Out', 'Mat44', 'Out'),
+                 ('bone1Out', 'Mat44', 'Out'),
+                 ('bone2Out', 'Mat44', 'Out'))
+
+    defaults = dict(Solver.defaults, rightSide=False, softIK=False,
+                    softDist=0.0, stretch=False, stretchBlend=0.0)
+
+    def solveBatch(self, batchSize, values):
+        rigScale = values['rigScale']
+        ikblend = values['ikblend']
+        bone0Len = values['bone0Len']
+        bone1Len = values['bone1Len']
+
+        bone0FkXfo = bm.xfoFromMat44(values['bone0FK'])
+        bone1FkXfo = bm.xfoFromMat44(values['bone1FK'])
+
+        bone0Tr, bone0Ori, bone1Tr, bone1Ori = solve2BoneIK(
+            bone0Len * rigScale,
+            bone1Len * rigScale,
+            values['root'][:, :3, 3],
+            values['upV'][:, :3, 3],
+            values['ikHandle'][:, :3, 3])
+
+        # Blend the IK result with the FK chain.
+        bone0IkXfo = (bone0Tr, bm.quatSlerp(bone0FkXfo[1], bone0Ori, ikblend), bone0FkXfo[2])
+        bone1IkXfo = (bm.xfoTransformVector(bone0IkXfo, bm.vec3(bone0Len, 0.0, 0.0, (batchSize,))),
+                      bm.quatSlerp(bone1FkXfo[1], bone1Ori, ikblend),
+                      bone1FkXfo[2])
+
+        useIk = ikblend > 0.0
+        bone0Xfo = bm.xfoWhere(useIk, bone0IkXfo, bone0FkXfo)
+        bone1Xfo = bm.xfoWhere(useIk, bone1IkXfo, bone1FkXfo)
+
+        # Project bone2 to the end of bone 1.
+        bone2Tr = bm.xfoTransformVector(bone1Xfo, bm.vec3(bone1Len, 0.0, 0.0, (batchSize,)))
+
+        outScaling = bm.vec3(rigScale, rigScale, rigScale, (batchSize,))
+
+        return {
+            'bone0Out': bm.xfoToMat44((bone0Xfo[0], bone0Xfo[1], outScaling)),
+            'bone1Out': bm.xfoToMat44((bone1Xfo[0], bone1Xfo[1], outScaling)),
+            'bone2Out': bm.xfoToMat44((bone2Tr, bone1Xfo[1], outScaling))
+        }
+
+
+ks.registerSolver(TwoBoneIKSolver)
@@ -1,3 +1,8 @@
+from collections import OrderedDict
+
+from kraken.core.maths import Xfo, Vec3, Quat
+from kraken.core.python_backend import xfoFromMat44
+from kraken.core.dcc_item_cache import DCCItemCache
 
 
 class Synchronizer(object):
@@ -15,7 +20,7 @@ class Synchronizer(object):
         """
 
         super(Synchronizer, self).__init__()
-        self._hrcMap = {}
+        self._hrcMap = OrderedDict()
         self._target = None
 
         if target is not None:
@@ -63,13 +68,39 @@ class Synchronizer(object):
         """Gets the hierarchy map from the Inspector.
 
         Returns:
-            dict: The hierarhcy map. None if it hasn't been created.
+            OrderedDict: The hierarhcy map, in traversal order. None if it
+                hasn't been created.
 
         """
 
         return self._hrcMap
 
 
+    def getHierarchyMapItem(self, path, decorated=False):
+        """Gets the mapped object with the specified path, found through the
+        path index of the target.
+
+        Args:
+            path (str): Full path of the object.
+            decorated (bool): Whether the path is a decorated path.
+
+        Returns:
+            tuple: The object and its mapping, None if no mapped object has
+                the path.
+
+        """
+
+        target = self.getTarget()
+        if target is None or target.isTypeOf('Container') is False:
+            return None
+
+        kObject = target.findByPath(path, decorated=decorated)
+        if kObject is None or kObject not in self._hrcMap:
+            return None
+
+        return kObject, self._hrcMap[kObject]
+
+
     def createHierarchyMap(self, kObject):
 
         # ==============
@@ -78,7 +109,7 @@ class Synchronizer(object):
 
         # Skip components in the mapping as they are not built into the DCC
         if kObject.isTypeOf('Component') is False:
-            dccItem = self.getDCCItem(kObject)
+            dccItem = self.resolveDCCItem(kObject)
 
             self._hrcMap[kObject] = {
                            "dccItem": dccItem
@@ -109,6 +140,34 @@ class Synchronizer(object):
         return
 
 
+    def resolveDCCItem(self, kObject):
+        """Returns the DCC item of an object, using the handle recorded in the
+        DCCItemCache when the object was built.
+
+        The object is only looked up in the DCC by its path when no handle was
+        recorded or the recorded one is no longer valid, and the item found is
+        recorded for the next syncs.
+
+        Args:
+            kObject (object): The Kraken object.
+
+        Returns:
+            object: The DCC item, None if it isn't found.
+
+        """
+
+        dccItemCache = DCCItemCache.getInstance()
+
+        dccItem = dccItemCache.getDCCItem(kObject)
+        if dccItem is not None and self.isDCCItemValid(dccItem):
+            return dccItem
+
+        dccItem = self.getDCCItem(kObject)
+        dccItemCache.setDCCItem(kObject, dccItem)
+
+        return dccItem
+
+
     def clearHierarchyMap(self):
         """Clears the hierarhcy map data.
 
@@ -117,7 +176,7 @@ class Synchronizer(object):
 
         """
 
-        self._hrcMap = {}
+        self._hrcMap = OrderedDict()
 
         return True
 
@@ -128,22 +187,29 @@ class Synchronizer(object):
     def sync(self):
         """Synchronizes the target hierarchy with the matching objects in the DCC.
 
+        The xfos are synchronized in one batch when the DCC supports it, see
+        syncXfos.
+
         Returns:
             bool: True if successful.
 
         """
 
-        self.synchronize(self.getTarget())
+        if self.syncXfos() is True:
+            self.synchronize(self.getTarget(), syncXfos=False)
+        else:
+            self.synchronize(self.getTarget())
 
         return True
 
 
-    def synchronize(self, kObject):
+    def synchronize(self, kObject, syncXfos=True):
         """Iteration method that traverses the hierarchy and syncs the different
         object types.
 
         Args:
             kObject (object): object to synchronize.
+            syncXfos (bool): Whether to sync the xfos of the objects.
 
         Returns:
             bool: True if successful.
@@ -156,7 +222,7 @@ class Synchronizer(object):
         if kObject.isTypeOf('Object3D'):
 
             # Sync Xfo if it's not a Component
-            if kObject.isTypeOf('Component') is False:
+            if syncXfos is True and kObject.isTypeOf('Component') is False:
                 self.syncXfo(kObject)
 
             # Sync Curves / Controls
@@ -176,20 +242,104 @@ class Synchronizer(object):
             # Iterate over attribute groups
             for i in xrange(kObject.getNumAttributeGroups()):
                 attrGrp = kObject.getAttributeGroupByIndex(i)
-                self.synchronize(attrGrp)
+                self.synchronize(attrGrp, syncXfos=syncXfos)
 
         # Iterate over attributes
         if kObject.isTypeOf('AttributeGroup'):
             for i in xrange(kObject.getNumAttributes()):
                 attr = kObject.getAttributeByIndex(i)
-                self.synchronize(attr)
+                self.synchronize(attr, syncXfos=syncXfos)
 
         if kObject.isTypeOf('Object3D'):
 
             # Iterate over children
             for i in xrange(kObject.getNumChildren()):
                 child = kObject.getChildByIndex(i)
-                self.synchronize(child)
+                self.synchronize(child, syncXfos=syncXfos)
+
+        return True
+
+
+    def syncXfos(self):
+        """Syncs the xfos of all the mapped objects from the DCC in one batch.
+
+        The DCC items of the objects are gathered from the hierarchy map,
+        their world matrices are read in one query with getDCCWorldMatrices
+        and the xfos are written in one update with setXfosFromMat44Values.
+
+        Returns:
+            bool: True if successful, False if the DCC can't query the world
+                matrices in batches.
+
+        """
+
+        kObjects = []
+        dccItems = []
+        missingObjects = []
+        for kObject, mapping in self._hrcMap.iteritems():
+            if kObject.isTypeOf('Object3D') is False:
+                continue
+
+            if mapping['dccItem'] is None:
+                missingObjects.append(kObject)
+                continue
+
+            kObjects.append(kObject)
+            dccItems.append(mapping['dccItem'])
+
+        mat44Values = self.getDCCWorldMatrices(dccItems)
+        if mat44Values is None:
+            return False
+
+        for kObject in missingObjects:
+            print "Warning Syncing. No DCC Item for :" + kObject.getPath()
+
+        self.setXfosFromMat44Values(kObjects, mat44Values)
+
+        return True
+
+
+    def setXfosFromMat44Values(self, kObjects, mat44Values):
+        """Sets the xfos of the supplied objects from matrices.
+
+        The transforms of objects held by a TransformStore are written to the
+        store in one update per store.
+
+        Args:
+            kObjects (list): The objects to set the xfos of.
+            mat44Values (list): len(kObjects) x 16 floats (row major), in the
+                order of the objects.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        if len(mat44Values) != len(kObjects) * 16:
+            raise Exception("Invalid number of values:" + str(len(mat44Values)) + ", expected:" + str(len(kObjects) * 16))
+
+        stores = OrderedDict()
+        for i, kObject in enumerate(kObjects):
+            transformStore = kObject.getTransformStore()
+            if transformStore is None:
+                xfoValues = xfoFromMat44(mat44Values[i * 16:(i + 1) * 16])
+                kObject.xfo = Xfo(tr=Vec3(*xfoValues[0:3]),
+                                  ori=Quat(v=Vec3(*xfoValues[3:6]), w=xfoValues[6]),
+                                  sc=Vec3(*xfoValues[7:10]))
+                continue
+
+            if id(transformStore) not in stores:
+                stores[id(transformStore)] = (transformStore, [], [], [])
+
+            storeObjects, indices, values = stores[id(transformStore)][1:]
+            storeObjects.append(kObject)
+            indices.append(transformStore.getIndex(kObject))
+            values.extend(mat44Values[i * 16:(i + 1) * 16])
+
+        for transformStore, storeObjects, indices, values in stores.itervalues():
+            transformStore.setMat44ValuesAt(indices, values)
+            for kObject in storeObjects:
+                kObject.markDirty()
 
         return True
 
@@ -216,6 +366,45 @@ class Synchronizer(object):
         return dccItem
 
 
+    def isDCCItemValid(self, dccItem):
+        """Returns whether a recorded DCC item handle still refers to an item
+        in the DCC.
+
+        **This should be re-implemented in the sub-classed synchronizer for each
+        plugin.** This is called for each mapped object, it should be cheaper
+        than getDCCItem.
+
+        Args:
+            dccItem (object): The DCC item.
+
+        Returns:
+            bool: True if the DCC item can be used.
+
+        """
+
+        return True
+
+
+    def getDCCWorldMatrices(self, dccItems):
+        """Returns the world matrices of the supplied DCC items, read in one
+        batched query.
+
+        **This should be re-implemented in the sub-classed synchronizer for each
+        plugin.** The xfos are synced one object at a time with syncXfo when
+        it isn't.
+
+        Args:
+            dccItems (list): The DCC items to get the world matrices of.
+
+        Returns:
+            list: len(dccItems) x 16 floats (row major, translation in the
+                last column), None if batched queries aren't supported.
+
+        """
+
+        return None
+
+
     def syncXfo(self, kObject):
         """Syncs the xfo from the DCC object to the Kraken object.
 
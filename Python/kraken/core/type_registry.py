@@ -0,0 +1,109 @@
+"""Kraken - core.type_registry module.
+
+Classes:
+TypeDispatcher -- Resolves classes to the first matching entry of an ordered
+                  table of type names.
+
+"""
+
+import weakref
+
+
+_noMatch = object()
+
+# Cache of the type hierarchy of each class: (list of names, set of names).
+# Classes re-imported when components are reloaded get new entries, the old
+# ones are released with their classes.
+_typeHierarchies = weakref.WeakKeyDictionary()
+
+
+def registerType(cls):
+    """Computes and caches the type hierarchy of the given class.
+
+    Args:
+        cls (type): The class to register.
+
+    Returns:
+        tuple: The list of the type names of the class hierarchy, and the set
+            of these names.
+
+    """
+
+    names = []
+    for mroCls in type.mro(cls):
+        if mroCls == object:
+            break
+        names.append(mroCls.__name__)
+
+    typeHierarchy = (names, frozenset(names))
+    _typeHierarchies[cls] = typeHierarchy
+
+    return typeHierarchy
+
+
+def getTypeHierarchy(cls):
+    """Returns the cached type hierarchy of the given class.
+
+    Args:
+        cls (type): The class to get the type hierarchy for.
+
+    Returns:
+        tuple: The list of the type names of the class hierarchy, and the set
+            of these names.
+
+    """
+
+    typeHierarchy = _typeHierarchies.get(cls)
+    if typeHierarchy is None:
+        typeHierarchy = registerType(cls)
+
+    return typeHierarchy
+
+
+class TypeDispatcher(object):
+    """Resolves classes to the value of the first entry of an ordered table
+    whose type name is in the class hierarchy.
+
+    This replaces chains of isTypeOf tests: the table is ordered like the
+    chain, and the result is cached per class so that each lookup is a single
+    dict access.
+
+    Args:
+        table (list): Ordered list of (typeName, value) tuples.
+
+    """
+
+    def __init__(self, table):
+        super(TypeDispatcher, self).__init__()
+        self._table = list(table)
+        self._cache = weakref.WeakKeyDictionary()
+
+
+    def resolve(self, cls, default=None):
+        """Returns the value the given class resolves to.
+
+        Args:
+            cls (type): The class to resolve.
+            default (object): The value returned if no entry matches.
+
+        Returns:
+            object: The value of the first matching entry.
+
+        """
+
+        try:
+            value = self._cache[cls]
+        except KeyError:
+            value = _noMatch
+            typeNames = getTypeHierarchy(cls)[1]
+            for typeName, entryValue in self._table:
+                if typeName in typeNames:
+                    value = entryValue
+                    break
+
+            self._cache[cls] = value
+
+        if value is _noMatch:
+            return default
+
+        return value
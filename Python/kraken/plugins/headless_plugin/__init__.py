@@ -0,0 +1,13 @@
+"""Kraken Headless Plug-in.
+
+Builds and synchronizes rigs in a pure Python stand-in scene, for tests and
+benchmarks run without a DCC. It is used when the KRAKEN_DCC environment
+variable is set to 'Headless'.
+
+"""
+
+import os
+
+
+def dccTest():
+    return os.environ.get('KRAKEN_DCC') == 'Headless'
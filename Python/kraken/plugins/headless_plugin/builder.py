@@ -0,0 +1,544 @@
+"""Kraken Headless - Headless Builder module.
+
+Classes:
+Builder -- Builds Kraken objects into the headless scene.
+
+"""
+
+from kraken.core.builder import Builder
+from kraken.core.python_backend import xfoToMat44
+from kraken.plugins.headless_plugin.scene import Scene, Plug
+
+
+class Builder(Builder):
+    """Builder object for building Kraken objects in the headless scene."""
+
+    def __init__(self, scene=None):
+        super(Builder, self).__init__()
+
+        if scene is None:
+            scene = Scene.getInstance()
+
+        self._scene = scene
+
+
+    def getScene(self):
+        """Returns the scene the objects are built into.
+
+        Returns:
+            Scene: The headless scene.
+
+        """
+
+        return self._scene
+
+
+    # ========================
+    # Object3D Build Methods
+    # ========================
+    def _buildNode(self, kSceneItem, buildName, nodeType):
+        """Creates the node of a scene item under the node of its parent.
+
+        Args:
+            kSceneItem (Object): kSceneItem to build.
+            buildName (str): The name to use on the built object.
+            nodeType (str): Type of the node.
+
+        Returns:
+            object: Node that is created.
+
+        """
+
+        parentNode = None
+        if kSceneItem.getParent() is not None:
+            parentNode = self.getDCCSceneItem(kSceneItem.getParent())
+
+        dccSceneItem = self._scene.createNode(buildName, nodeType=nodeType, parent=parentNode)
+
+        self._registerSceneItemPair(kSceneItem, dccSceneItem)
+
+        return dccSceneItem
+
+
+    def buildContainer(self, kSceneItem, buildName):
+        """Builds a container / namespace object.
+
+        Args:
+            kSceneItem (Object): kSceneItem that represents a container to be built.
+            buildName (str): The name to use on the built object.
+
+        Returns:
+            object: Node that is created.
+
+        """
+
+        return self._buildNode(kSceneItem, buildName, 'transform')
+
+
+    def buildLayer(self, kSceneItem, buildName):
+        """Builds a layer object.
+
+        Args:
+            kSceneItem (Object): kSceneItem that represents a layer to be built.
+            buildName (str): The name to use on the built object.
+
+        Returns:
+            object: Node that is created.
+
+        """
+
+        return self._buildNode(kSceneItem, buildName, 'transform')
+
+
+    def buildHierarchyGroup(self, kSceneItem, buildName):
+        """Builds a hierarchy group object.
+
+        Args:
+            kSceneItem (Object): kSceneItem that represents a group to be built.
+            buildName (str): The name to use on the built object.
+
+        Returns:
+            object: Node that is created.
+
+        """
+
+        return self._buildNode(kSceneItem, buildName, 'transform')
+
+
+    def buildGroup(self, kSceneItem, buildName):
+        """Builds a group object.
+
+        Args:
+            kSceneItem (Object): kSceneItem that represents a group to be built.
+            buildName (str): The name to use on the built object.
+
+        Returns:
+            object: Node that is created.
+
+        """
+
+        return self._buildNode(kSceneItem, buildName, 'transform')
+
+
+    def buildJoint(self, kSceneItem, buildName):
+        """Builds a joint object.
+
+        Args:
+            kSceneItem (Object): kSceneItem that represents a joint to be built.
+            buildName (str): The name to use on the built object.
+
+        Returns:
+            object: Node that is created.
+
+        """
+
+        return self._buildNode(kSceneItem, buildName, 'joint')
+
+
+    def buildLocator(self, kSceneItem, buildName):
+        """Builds a locator / null object.
+
+        Args:
+            kSceneItem (Object): locator / null object to be built.
+            buildName (str): The name to use on the built object.
+
+        Returns:
+            object: Node that is created.
+
+        """
+
+        return self._buildNode(kSceneItem, buildName, 'locator')
+
+
+    def buildCurve(self, kSceneItem, buildName):
+        """Builds a Curve object.
+
+        Args:
+            kSceneItem (Object): kSceneItem that represents a curve to be built.
+            buildName (str): The name to use on the built object.
+
+        Returns:
+            object: Node that is created.
+
+        """
+
+        dccSceneItem = self._buildNode(kSceneItem, buildName, 'curve')
+        dccSceneItem.setCurveData(kSceneItem.getCurveData())
+
+        return dccSceneItem
+
+
+    def buildControl(self, kSceneItem, buildName):
+        """Builds a Control object.
+
+        Args:
+            kSceneItem (Object): kSceneItem that represents a control to be built.
+            buildName (str): The name to use on the built object.
+
+        Returns:
+            object: Node that is created.
+
+        """
+
+        return self.buildCurve(kSceneItem, buildName)
+
+
+    # ========================
+    # Attribute Build Methods
+    # ========================
+    def _buildPlug(self, kAttribute):
+        """Adds the plug of an attribute to the node of its object.
+
+        Args:
+            kAttribute (Object): kAttribute to build.
+
+        Returns:
+            object: Plug that is created.
+
+        """
+
+        parentDCCSceneItem = self.getDCCSceneItem(kAttribute.getParent().getParent())
+        dccSceneItem = parentDCCSceneItem.addPlug(kAttribute.getName(), value=kAttribute.getValue())
+        dccSceneItem.setLocked(kAttribute.getLock())
+
+        self._registerSceneItemPair(kAttribute, dccSceneItem)
+
+        return dccSceneItem
+
+
+    def buildBoolAttribute(self, kAttribute):
+        """Builds a Bool attribute.
+
+        Args:
+            kAttribute (Object): kAttribute that represents a boolean attribute to be built.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        self._buildPlug(kAttribute)
+
+        return True
+
+
+    def buildScalarAttribute(self, kAttribute):
+        """Builds a Float attribute.
+
+        Args:
+            kAttribute (Object): kAttribute that represents a float attribute to be built.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        self._buildPlug(kAttribute)
+
+        return True
+
+
+    def buildIntegerAttribute(self, kAttribute):
+        """Builds a Integer attribute.
+
+        Args:
+            kAttribute (Object): kAttribute that represents a integer attribute to be built.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        self._buildPlug(kAttribute)
+
+        return True
+
+
+    def buildStringAttribute(self, kAttribute):
+        """Builds a String attribute.
+
+        Args:
+            kAttribute (Object): kAttribute that represents a string attribute to be built.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        self._buildPlug(kAttribute)
+
+        return True
+
+
+    def buildAttributeGroup(self, kAttributeGroup):
+        """Builds attribute groups on the DCC object.
+
+        Args:
+            kAttributeGroup (object): Kraken object to build the attribute group on.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        parentDCCSceneItem = self.getDCCSceneItem(kAttributeGroup.getParent())
+
+        dccSceneItem = parentDCCSceneItem.addPlug(kAttributeGroup.getName())
+        dccSceneItem.setLocked(True)
+
+        self._registerSceneItemPair(kAttributeGroup, dccSceneItem)
+
+        # Create Attributes on this Attribute Group
+        for i in xrange(kAttributeGroup.getNumAttributes()):
+            kAttribute = kAttributeGroup.getAttributeByIndex(i)
+
+            if kAttribute.isTypeOf("BoolAttribute"):
+                self.buildBoolAttribute(kAttribute)
+
+            elif kAttribute.isTypeOf("ScalarAttribute"):
+                self.buildScalarAttribute(kAttribute)
+
+            elif kAttribute.isTypeOf("IntegerAttribute"):
+                self.buildIntegerAttribute(kAttribute)
+
+            elif kAttribute.isTypeOf("StringAttribute"):
+                self.buildStringAttribute(kAttribute)
+
+            else:
+                raise NotImplementedError(kAttribute.getName() + ' has an unsupported type: ' + str(type(kAttribute)))
+
+        return True
+
+
+    def connectAttribute(self, kAttribute):
+        """Connects the driver attribute to this one.
+
+        Args:
+            kAttribute (Object): Attribute to connect.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        if kAttribute.isConnected() is True:
+
+            driver = self.getDCCSceneItem(kAttribute.getConnection())
+            driven = self.getDCCSceneItem(kAttribute)
+
+            driven.connect(driver)
+
+        return True
+
+
+    # =========================
+    # Constraint Build Methods
+    # =========================
+    def _buildConstraintNode(self, kConstraint, suffix):
+        """Records a constraint as a node under its constrainee. Constraints
+        aren't evaluated in the headless scene.
+
+        Args:
+            kConstraint (Object): Kraken constraint object to build.
+            suffix (str): Suffix of the name of the constraint node.
+
+        Returns:
+            object: Node that is created.
+
+        """
+
+        constraineeDCCSceneItem = self.getDCCSceneItem(kConstraint.getConstrainee())
+        dccSceneItem = self._scene.createNode(kConstraint.getName() + suffix, nodeType='constraint',
+                                              parent=constraineeDCCSceneItem)
+        dccSceneItem.setData('constrainers', [self.getDCCSceneItem(x) for x in kConstraint.getConstrainers()])
+        dccSceneItem.setData('maintainOffset', kConstraint.getMaintainOffset())
+
+        self._registerSceneItemPair(kConstraint, dccSceneItem)
+
+        return dccSceneItem
+
+
+    def buildOrientationConstraint(self, kConstraint):
+        """Builds an orientation constraint represented by the kConstraint.
+
+        Args:
+            kConstraint (Object): Kraken constraint object to build.
+
+        Returns:
+            object: dccSceneItem that was created.
+
+        """
+
+        return self._buildConstraintNode(kConstraint, "_ori_cns")
+
+
+    def buildPoseConstraint(self, kConstraint):
+        """Builds an pose constraint represented by the kConstraint.
+
+        Args:
+            kConstraint (Object): kraken constraint object to build.
+
+        Returns:
+            object: dccSceneItem that was created.
+
+        """
+
+        return self._buildConstraintNode(kConstraint, "_par_cns")
+
+
+    def buildPositionConstraint(self, kConstraint):
+        """Builds an position constraint represented by the kConstraint.
+
+        Args:
+            kConstraint (Object): Kraken constraint object to build.
+
+        Returns:
+            object: dccSceneItem that was created.
+
+        """
+
+        return self._buildConstraintNode(kConstraint, "_pos_cns")
+
+
+    def buildScaleConstraint(self, kConstraint):
+        """Builds an scale constraint represented by the kConstraint.
+
+        Args:
+            kConstraint (Object): Kraken constraint object to build.
+
+        Returns:
+            object: dccSceneItem that was created.
+
+        """
+
+        return self._buildConstraintNode(kConstraint, "_scl_cns")
+
+
+    # ========================
+    # Component Build Methods
+    # ========================
+    def buildAttributeConnection(self, connectionInput):
+        """Builds the connection between the attribute and the connection.
+
+        Args:
+            connectionInput (Object): Kraken connection to build.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        if connectionInput.isConnected() is False:
+            return False
+
+        connection = connectionInput.getConnection()
+        inputTarget = connectionInput.getTarget()
+
+        if connection.getDataType().endswith('[]'):
+            connectionTarget = connection.getTarget()[connectionInput.getIndex()]
+        else:
+            connectionTarget = connection.getTarget()
+
+        connectionTargetDCCSceneItem = self.getDCCSceneItem(connectionTarget)
+        targetDCCSceneItem = self.getDCCSceneItem(inputTarget)
+
+        targetDCCSceneItem.connect(connectionTargetDCCSceneItem)
+
+        return True
+
+
+    # ===================
+    # Visibility Methods
+    # ===================
+    def setVisibility(self, kSceneItem):
+        """Sets the visibility of the object after its been created.
+
+        Args:
+            kSceneItem (Object): The scene item to set the visibility on.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        if hasattr(kSceneItem, 'getShapeVisibility') is False:
+            return False
+
+        dccSceneItem = self.getDCCSceneItem(kSceneItem)
+        dccSceneItem.setData('shapeVisibility', kSceneItem.getShapeVisibility())
+
+        return True
+
+
+    # ================
+    # Display Methods
+    # ================
+    def setObjectColor(self, kSceneItem):
+        """Sets the color on the dccSceneItem.
+
+        Args:
+            kSceneItem (Object): kraken object to set the color on.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        buildColor = self.getBuildColor(kSceneItem)
+
+        if buildColor is not None:
+            dccSceneItem = self.getDCCSceneItem(kSceneItem)
+            dccSceneItem.setData('color', buildColor)
+
+        return True
+
+
+    # ==================
+    # Transform Methods
+    # ==================
+    def setTransform(self, kSceneItem):
+        """Sets the world matrix of the node from the xfo of the scene item.
+
+        Args:
+            kSceneItem (Object): object to set the transform on.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        dccSceneItem = self.getDCCSceneItem(kSceneItem)
+
+        xfo = kSceneItem.xfo
+        xfoValues = [xfo.tr.x, xfo.tr.y, xfo.tr.z,
+                     xfo.ori.v.x, xfo.ori.v.y, xfo.ori.v.z, xfo.ori.w,
+                     xfo.sc.x, xfo.sc.y, xfo.sc.z]
+
+        self._scene.setWorldMatrix(dccSceneItem, xfoToMat44(xfoValues))
+
+        return True
+
+
+    # =================
+    # Teardown Methods
+    # =================
+    def deleteDCCSceneItem(self, dccSceneItem):
+        """Deletes a node or plug that was built by this builder.
+
+        Args:
+            dccSceneItem (object): DCC scene item to delete.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        if not dccSceneItem.exists():
+            return False
+
+        if isinstance(dccSceneItem, Plug):
+            dccSceneItem.getNode().removePlug(dccSceneItem.getName())
+        else:
+            self._scene.deleteNode(dccSceneItem)
+
+        return True
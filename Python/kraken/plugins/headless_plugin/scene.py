@@ -0,0 +1,669 @@
+"""Kraken Headless - Headless Scene module.
+
+Classes:
+Plug -- Attribute of a node of the headless scene.
+Node -- Node of the headless scene.
+Scene -- Pure Python stand-in for the scene of a DCC.
+
+"""
+
+from collections import OrderedDict
+
+from kraken.core.python_backend import _matMultiply, _matInverse, _matIdentity
+
+
+class Plug(object):
+    """Attribute of a node of the headless scene."""
+
+    def __init__(self, node, name, value=None):
+        super(Plug, self).__init__()
+
+        self._node = node
+        self._name = name
+        self._value = value
+        self._locked = False
+        self._connection = None
+
+
+    def getName(self):
+        """Returns the name of the plug.
+
+        Returns:
+            str: The name.
+
+        """
+
+        return self._name
+
+
+    def getPath(self):
+        """Returns the path of the plug, the node path and the name of the plug
+        separated by a '.'.
+
+        Returns:
+            str: The path.
+
+        """
+
+        return self._node.getPath() + '.' + self._name
+
+
+    def getNode(self):
+        """Returns the node of the plug.
+
+        Returns:
+            Node: The node.
+
+        """
+
+        return self._node
+
+
+    def exists(self):
+        """Returns whether the plug is still in the scene.
+
+        Returns:
+            bool: True if the plug and its node weren't deleted.
+
+        """
+
+        return self._node.exists() and self._node.getPlug(self._name) is self
+
+
+    def get(self):
+        """Returns the value of the plug, the value of the connected plug if
+        the plug is connected.
+
+        Returns:
+            object: The value.
+
+        """
+
+        if self._connection is not None:
+            return self._connection.get()
+
+        return self._value
+
+
+    def set(self, value):
+        """Sets the value of the plug.
+
+        Args:
+            value (object): The value.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        if self._locked is True:
+            raise Exception("Plug is locked: " + self.getPath())
+
+        self._value = value
+
+        return True
+
+
+    def setLocked(self, locked):
+        """Sets whether the value of the plug is locked.
+
+        Args:
+            locked (bool): True to lock the plug.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        self._locked = locked
+
+        return True
+
+
+    def connect(self, plug):
+        """Connects the supplied plug to this one.
+
+        Args:
+            plug (Plug): The driving plug, None to disconnect this plug.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        self._connection = plug
+
+        return True
+
+
+    def getConnection(self):
+        """Returns the plug driving this one.
+
+        Returns:
+            Plug: The driving plug, None if this plug isn't connected.
+
+        """
+
+        return self._connection
+
+
+class Node(object):
+    """Node of the headless scene.
+
+    Nodes hold their local matrix, 16 floats (row major, translation in the
+    last column) relative to their parent.
+
+    """
+
+    def __init__(self, scene, name, nodeType, parent=None):
+        super(Node, self).__init__()
+
+        self._scene = scene
+        self._name = name
+        self._nodeType = nodeType
+        self._parent = parent
+        self._children = []
+        self._plugs = OrderedDict()
+        self._matrix = _matIdentity(4)
+        self._curveData = None
+        self._data = {}
+
+
+    def getName(self):
+        """Returns the name of the node.
+
+        Returns:
+            str: The name.
+
+        """
+
+        return self._name
+
+
+    def getType(self):
+        """Returns the type of the node.
+
+        Returns:
+            str: The type, 'transform', 'joint', 'locator', 'curve' or
+                'constraint'.
+
+        """
+
+        return self._nodeType
+
+
+    def getPath(self):
+        """Returns the path of the node, the names of the node and its parents
+        separated by '|'.
+
+        Returns:
+            str: The path.
+
+        """
+
+        if self._parent is None:
+            return self._name
+
+        return self._parent.getPath() + '|' + self._name
+
+
+    def getParent(self):
+        """Returns the parent of the node.
+
+        Returns:
+            Node: The parent, None for root nodes.
+
+        """
+
+        return self._parent
+
+
+    def getChildren(self):
+        """Returns the children of the node.
+
+        Returns:
+            list: The child nodes.
+
+        """
+
+        return list(self._children)
+
+
+    def getChild(self, name):
+        """Returns the child of the node with the supplied name.
+
+        Args:
+            name (str): Name of the child.
+
+        Returns:
+            Node: The child, None if the node has no child with this name.
+
+        """
+
+        for child in self._children:
+            if child.getName() == name:
+                return child
+
+        return None
+
+
+    def exists(self):
+        """Returns whether the node is still in the scene.
+
+        Returns:
+            bool: True if the node wasn't deleted.
+
+        """
+
+        return self._scene is not None
+
+
+    def getScene(self):
+        """Returns the scene of the node.
+
+        Returns:
+            Scene: The scene, None if the node was deleted.
+
+        """
+
+        return self._scene
+
+
+    # =============
+    # Plug Methods
+    # =============
+    def addPlug(self, name, value=None):
+        """Adds a plug to the node.
+
+        Args:
+            name (str): Name of the plug.
+            value (object): Value of the plug.
+
+        Returns:
+            Plug: The plug.
+
+        """
+
+        if name in self._plugs:
+            raise Exception("Node '" + self.getPath() + "' already has a plug named: " + name)
+
+        plug = Plug(self, name, value=value)
+        self._plugs[name] = plug
+
+        return plug
+
+
+    def removePlug(self, name):
+        """Removes a plug from the node.
+
+        Args:
+            name (str): Name of the plug.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        if name not in self._plugs:
+            return False
+
+        del self._plugs[name]
+
+        return True
+
+
+    def getPlug(self, name):
+        """Returns the plug of the node with the supplied name.
+
+        Args:
+            name (str): Name of the plug.
+
+        Returns:
+            Plug: The plug, None if the node has no plug with this name.
+
+        """
+
+        return self._plugs.get(name)
+
+
+    def getPlugNames(self):
+        """Returns the names of the plugs of the node.
+
+        Returns:
+            list: The names of the plugs.
+
+        """
+
+        return self._plugs.keys()
+
+
+    # ==============
+    # Data Methods
+    # ==============
+    def getCurveData(self):
+        """Returns the curve data of the node.
+
+        Returns:
+            list: The curve data, None if the node isn't a curve.
+
+        """
+
+        return self._curveData
+
+
+    def setCurveData(self, curveData):
+        """Sets the curve data of the node.
+
+        Args:
+            curveData (list): The curve data.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        self._curveData = curveData
+
+        return True
+
+
+    def getData(self, key, default=None):
+        """Returns a value stored on the node.
+
+        Args:
+            key (str): Key of the value.
+            default (object): Value returned if none is stored.
+
+        Returns:
+            object: The value.
+
+        """
+
+        return self._data.get(key, default)
+
+
+    def setData(self, key, value):
+        """Stores a value on the node, such as the display settings or the
+        constrainers of constraint nodes.
+
+        Args:
+            key (str): Key of the value.
+            value (object): The value.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        self._data[key] = value
+
+        return True
+
+
+    # ==================
+    # Transform Methods
+    # ==================
+    def getMatrix(self):
+        """Returns the local matrix of the node.
+
+        Returns:
+            list: 16 floats (row major).
+
+        """
+
+        return list(self._matrix)
+
+
+    def setMatrix(self, values):
+        """Sets the local matrix of the node.
+
+        Args:
+            values (list): 16 floats (row major).
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        if len(values) != 16:
+            raise Exception("Invalid number of values:" + str(len(values)) + ", expected:16")
+
+        self._matrix = [float(x) for x in values]
+
+        if self._scene is not None:
+            self._scene._clearWorldMatrixCache()
+
+        return True
+
+
+class Scene(object):
+    """Pure Python stand-in for the scene of a DCC.
+
+    The scene holds a hierarchy of named nodes with local matrices and plugs,
+    enough for the headless builder to build rigs into it and for the headless
+    synchronizer to read them back without a DCC. World matrices are computed
+    from the local matrices of the nodes and their parents; constraints and
+    operators are recorded but not evaluated.
+
+    """
+
+    __instance = None
+
+    def __init__(self):
+        super(Scene, self).__init__()
+
+        self._roots = []
+        self._worldMatrices = {}
+
+
+    # ==============
+    # Node Methods
+    # ==============
+    def createNode(self, name, nodeType='transform', parent=None):
+        """Creates a node in the scene.
+
+        Args:
+            name (str): Name of the node, unique among its siblings.
+            nodeType (str): Type of the node.
+            parent (Node): Parent of the node, None for root nodes.
+
+        Returns:
+            Node: The node.
+
+        """
+
+        siblings = self._roots if parent is None else parent._children
+        for sibling in siblings:
+            if sibling.getName() == name:
+                raise Exception("Node already exists: " + sibling.getPath())
+
+        node = Node(self, name, nodeType, parent=parent)
+        siblings.append(node)
+
+        self._clearWorldMatrixCache()
+
+        return node
+
+
+    def deleteNode(self, node):
+        """Deletes a node and its children from the scene.
+
+        Args:
+            node (Node): The node.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        if node.exists() is False:
+            return False
+
+        for child in node.getChildren():
+            self.deleteNode(child)
+
+        siblings = self._roots if node._parent is None else node._parent._children
+        siblings.remove(node)
+        node._scene = None
+
+        self._clearWorldMatrixCache()
+
+        return True
+
+
+    def getNode(self, path):
+        """Returns the node at the supplied path.
+
+        Args:
+            path (str): The names of the node and its parents separated by '|'.
+
+        Returns:
+            Node: The node, None if there is no node at the path.
+
+        """
+
+        node = None
+        children = self._roots
+        for name in path.split('|'):
+            node = None
+            for child in children:
+                if child.getName() == name:
+                    node = child
+                    break
+
+            if node is None:
+                return None
+
+            children = node._children
+
+        return node
+
+
+    def getRoots(self):
+        """Returns the root nodes of the scene.
+
+        Returns:
+            list: The root nodes.
+
+        """
+
+        return list(self._roots)
+
+
+    def iterNodes(self):
+        """Iterates over the nodes of the scene, parents first.
+
+        Returns:
+            generator: The nodes.
+
+        """
+
+        stack = list(reversed(self._roots))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node._children))
+
+
+    # ==================
+    # Transform Methods
+    # ==================
+    def _clearWorldMatrixCache(self):
+        self._worldMatrices = {}
+
+
+    def getWorldMatrix(self, node):
+        """Returns the world matrix of a node.
+
+        Args:
+            node (Node): The node.
+
+        Returns:
+            list: 16 floats (row major, translation in the last column).
+
+        """
+
+        worldMatrix = self._worldMatrices.get(id(node))
+        if worldMatrix is None:
+            if node._parent is None:
+                worldMatrix = list(node._matrix)
+            else:
+                worldMatrix = _matMultiply(self.getWorldMatrix(node._parent), node._matrix, 4)
+
+            self._worldMatrices[id(node)] = worldMatrix
+
+        return worldMatrix
+
+
+    def getWorldMatrices(self, nodes):
+        """Returns the world matrices of the supplied nodes in one batched
+        query, the world matrices of shared parents being computed once.
+
+        Args:
+            nodes (list): The nodes.
+
+        Returns:
+            list: len(nodes) x 16 floats (row major).
+
+        """
+
+        values = []
+        for node in nodes:
+            values.extend(self.getWorldMatrix(node))
+
+        return values
+
+
+    def setWorldMatrix(self, node, values):
+        """Sets the local matrix of a node so that its world matrix is the
+        supplied one.
+
+        Args:
+            node (Node): The node.
+            values (list): 16 floats (row major).
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        if node._parent is None:
+            return node.setMatrix(values)
+
+        parentInverse = _matInverse(self.getWorldMatrix(node._parent), 4)
+        if parentInverse is None:
+            raise Exception("Parent world matrix can't be inverted: " + node._parent.getPath())
+
+        return node.setMatrix(_matMultiply(parentInverse, values, 4))
+
+
+    # ==================
+    # Instance Methods
+    # ==================
+    @classmethod
+    def getInstance(cls):
+        """This class method returns the singleton instance of the Scene.
+
+        Returns:
+            object: The singleton instance.
+
+        """
+
+        if cls.__instance is None:
+            cls.__instance = Scene()
+
+        return cls.__instance
+
+
+    @classmethod
+    def clearInstance(cls):
+        """Clears the singleton instance of the Scene.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        cls.__instance = None
+
+        return True
@@ -0,0 +1,200 @@
+from kraken.core.maths import Xfo, Vec3, Quat
+
+from kraken.core.synchronizer import Synchronizer
+from kraken.core.python_backend import xfoFromMat44
+from kraken.plugins.headless_plugin.scene import Scene
+
+
+class Synchronizer(Synchronizer):
+    """The Synchronizer is a singleton object used to synchronize data between
+    Kraken objects and the headless scene."""
+
+    def __init__(self, scene=None):
+        if scene is None:
+            scene = Scene.getInstance()
+
+        self._scene = scene
+
+        super(Synchronizer, self).__init__()
+
+
+    def getScene(self):
+        """Returns the scene the objects are synchronized from.
+
+        Returns:
+            Scene: The headless scene.
+
+        """
+
+        return self._scene
+
+
+    # ============
+    # DCC Methods
+    # ============
+    def getDCCItem(self, kObject):
+        """Gets the DCC Item from the full decorated path.
+
+        Args:
+            kObject (object): The Kraken Python object that we must find the corresponding DCC item.
+
+        Returns:
+            object: The node or plug, None if it isn't in the scene.
+
+        """
+
+        path = kObject.getPath()
+        pathSections = path.split('.')
+        pathObj = kObject
+        nodePath = ''
+        plugName = None
+        index = len(pathSections) - 1
+        for pathSection in reversed(pathSections):
+
+            if pathObj is None:
+                raise Exception("parent not specified for object, so a full path cannot be resolved to a scene node:" + path)
+
+            if pathObj.isTypeOf('AttributeGroup'):
+                if plugName is None:
+                    plugName = pathObj.getName()
+
+            elif pathObj.isTypeOf('Attribute'):
+                plugName = pathObj.getName()
+
+            else:
+                if index > 0:
+                    nodePath = '|' + pathObj.getBuildName() + nodePath
+                else:
+                    nodePath = pathObj.getBuildName() + nodePath
+
+            pathObj = pathObj.getParent()
+            index -= 1
+
+        foundItem = self._scene.getNode(nodePath)
+        if foundItem is not None and plugName is not None:
+            foundItem = foundItem.getPlug(plugName)
+
+        return foundItem
+
+
+    def isDCCItemValid(self, dccItem):
+        """Returns whether a recorded DCC item handle still refers to an item
+        in the DCC.
+
+        Args:
+            dccItem (object): The DCC item.
+
+        Returns:
+            bool: True if the DCC item can be used.
+
+        """
+
+        return dccItem.exists()
+
+
+    def getDCCWorldMatrices(self, dccItems):
+        """Returns the world matrices of the supplied DCC items, read in one
+        batched query.
+
+        Args:
+            dccItems (list): The DCC items to get the world matrices of.
+
+        Returns:
+            list: len(dccItems) x 16 floats (row major, translation in the
+                last column).
+
+        """
+
+        return self._scene.getWorldMatrices(dccItems)
+
+
+    def syncXfo(self, kObject):
+        """Syncs the xfo from the DCC object to the Kraken object.
+
+        Args:
+            kObject (object): Object to sync the xfo for.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        hrcMap = self.getHierarchyMap()
+
+        if kObject not in hrcMap:
+            print "Warning! 3D Object '" + kObject.getName() + "' was not found in the mapping!"
+            return False
+
+        dccItem = hrcMap[kObject]['dccItem']
+
+        if dccItem is None:
+            print "Warning Syncing. No DCC Item for :" + kObject.getPath()
+            return
+
+        xfoValues = xfoFromMat44(self._scene.getWorldMatrix(dccItem))
+
+        pos = Vec3(x=xfoValues[0], y=xfoValues[1], z=xfoValues[2])
+        quat = Quat(v=Vec3(xfoValues[3], xfoValues[4], xfoValues[5]), w=xfoValues[6])
+        scl = Vec3(x=xfoValues[7], y=xfoValues[8], z=xfoValues[9])
+
+        newXfo = Xfo(tr=pos, ori=quat, sc=scl)
+
+        kObject.xfo = newXfo
+
+        return True
+
+
+    def syncAttribute(self, kObject):
+        """Syncs the attribute value from the DCC objec to the Kraken object.
+
+        Args:
+            kObject (object): Object to sync the attribute value for.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        hrcMap = self.getHierarchyMap()
+
+        if kObject not in hrcMap:
+            print "Warning! Attribute '" + kObject.getName() + "' was not found in the mapping!"
+            return False
+
+        dccItem = hrcMap[kObject]['dccItem']
+
+        if dccItem is None:
+            print "Warning Syncing. No DCC Item for :" + kObject.getPath()
+            return
+
+        kObject.setValue(dccItem.get())
+
+        return True
+
+
+    def syncCurveData(self, kObject):
+        """Syncs the curve data from the DCC object to the Kraken object.
+
+        Args:
+            kObject (object): object to sync the curve data for.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        hrcMap = self.getHierarchyMap()
+
+        if kObject not in hrcMap:
+            print "Warning! 3D Object '" + kObject.getName() + "' was not found in the mapping!"
+            return False
+
+        dccItem = hrcMap[kObject]['dccItem']
+
+        if dccItem is None:
+            print "Warning Syncing. No DCC Item for :" + kObject.getPath()
+            return
+
+        kObject.setCurveData(dccItem.getCurveData())
+
+        return True
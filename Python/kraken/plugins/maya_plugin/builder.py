@@ -588,13 +588,7 @@ class Builder(Builder):
 
             arraySizes = {}
             # connect the operator to the objects in the DCC
-            args = kOperator.getSolverArgs()
-            for i in xrange(len(args)):
-                arg = args[i]
-                argName = arg.name.getSimpleType()
-                argDataType = arg.dataType.getSimpleType()
-                argConnectionType = arg.connectionType.getSimpleType()
-
+            for argName, argDataType, argConnectionType in kOperator.getSolverSignature():
                 if argConnectionType == 'In':
                     cmds.FabricCanvasAddPort(mayaNode=spliceNode, execPath="", desiredPortName=argName, portType="In", typeSpec=argDataType, connectToPortPath="")
                     cmds.FabricCanvasAddPort(mayaNode=spliceNode, execPath=kOperator.getName(), desiredPortName=argName, portType="In", typeSpec=argDataType, connectToPortPath="")
@@ -690,6 +684,8 @@ class Builder(Builder):
             opSourceCode = kOperator.generateSourceCode(arraySizes=arraySizes)
             cmds.FabricCanvasSetCode(mayaNode=spliceNode, execPath=kOperator.getName(), code=opSourceCode)
 
+            self._registerSceneItemPair(kOperator, pm.PyNode(spliceNode))
+
         finally:
             pass
 
@@ -814,6 +810,8 @@ class Builder(Builder):
                     else:
                         connectOutput(str(spliceNode + "." + portName), connectionTargets['opObject'], connectionTargets['dccSceneItem'])
 
+            self._registerSceneItemPair(kOperator, pm.PyNode(spliceNode))
+
         finally:
             pass
 
@@ -950,6 +948,31 @@ class Builder(Builder):
         return True
 
 
+    # =================
+    # Teardown Methods
+    # =================
+    def deleteDCCSceneItem(self, dccSceneItem):
+        """Deletes a node or attribute that was built by this builder.
+
+        Args:
+            dccSceneItem (object): DCC scene item to delete.
+
+        Return:
+            bool: True if successful.
+
+        """
+
+        if not dccSceneItem.exists():
+            return False
+
+        if isinstance(dccSceneItem, pm.Attribute):
+            pm.deleteAttr(dccSceneItem)
+        else:
+            pm.delete(dccSceneItem)
+
+        return True
+
+
     # ==============
     # Build Methods
     # ==============
@@ -1,3 +1,5 @@
+import maya.api.OpenMaya as om
+
 from kraken.core.maths import Xfo, Vec3, Quat
 
 from kraken.core.synchronizer import Synchronizer
@@ -62,6 +64,55 @@ class Synchronizer(Synchronizer):
         return foundItem
 
 
+    def isDCCItemValid(self, dccItem):
+        """Returns whether a recorded DCC item handle still refers to an item
+        in the DCC.
+
+        Args:
+            dccItem (object): The DCC item.
+
+        Returns:
+            bool: True if the DCC item can be used.
+
+        """
+
+        return dccItem.exists()
+
+
+    def getDCCWorldMatrices(self, dccItems):
+        """Returns the world matrices of the supplied DCC items, read in one
+        batched query.
+
+        As in syncXfo, the translation and rotation are in world space and the
+        scale is the local scale of the items.
+
+        Args:
+            dccItems (list): The DCC items to get the world matrices of.
+
+        Returns:
+            list: len(dccItems) x 16 floats (row major, translation in the
+                last column).
+
+        """
+
+        selectionList = om.MSelectionList()
+        for dccItem in dccItems:
+            selectionList.add(dccItem.longName())
+
+        values = []
+        for i in xrange(selectionList.length()):
+            dagPath = selectionList.getDagPath(i)
+
+            transform = om.MTransformationMatrix(dagPath.inclusiveMatrix())
+            transform.setScale(om.MFnTransform(dagPath).scale(), om.MSpace.kTransform)
+            matrix = transform.asMatrix()
+
+            # Maya matrices transform row vectors, transpose them.
+            values.extend([matrix.getElement(column, row) for row in xrange(4) for column in xrange(4)])
+
+        return values
+
+
     def syncXfo(self, kObject):
         """Syncs the xfo from the DCC object to the Kraken object.
 
@@ -75,7 +126,7 @@ class Synchronizer(Synchronizer):
 
         hrcMap = self.getHierarchyMap()
 
-        if kObject not in hrcMap.keys():
+        if kObject not in hrcMap:
             print "Warning! 3D Object '" + kObject.getName() + "' was not found in the mapping!"
             return False
 
@@ -113,7 +164,7 @@ class Synchronizer(Synchronizer):
 
         hrcMap = self.getHierarchyMap()
 
-        if kObject not in hrcMap.keys():
+        if kObject not in hrcMap:
             print "Warning! Attribute '" + kObject.getName() + "' was not found in the mapping!"
             return False
 
@@ -141,7 +192,7 @@ class Synchronizer(Synchronizer):
 
         hrcMap = self.getHierarchyMap()
 
-        if kObject not in hrcMap.keys():
+        if kObject not in hrcMap:
             print "Warning! 3D Object '" + kObject.getName() + "' was not found in the mapping!"
             return False
 
@@ -634,16 +634,11 @@ class Builder(Builder):
         """
         try:
             solverTypeName = kOperator.getSolverTypeName()
-            args = kOperator.getSolverArgs()
+            signature = kOperator.getSolverSignature()
 
 
             def findPortOfType(dataTypes, connectionTypes):
-                for i in xrange(len(args)):
-                    arg = args[i]
-                    argName = arg.name.getSimpleType()
-                    argDataType = arg.dataType.getSimpleType()
-                    argConnectionType = arg.connectionType.getSimpleType()
-
+                for i, (argName, argDataType, argConnectionType) in enumerate(signature):
                     if argDataType in dataTypes and argConnectionType in connectionTypes:
                         return i
 
@@ -654,10 +649,7 @@ class Builder(Builder):
             if ownerOutPortIndex is -1:
                 raise Exception("Solver '" + kOperator.getName() + "' has no Mat44 outputs!")
 
-            ownerArg = args[ownerOutPortIndex]
-            ownerArgName = ownerArg.name.getSimpleType()
-            ownerArgDataType = ownerArg.dataType.getSimpleType()
-            ownerArgConnectionType = ownerArg.connectionType.getSimpleType()
+            ownerArgName, ownerArgDataType, ownerArgConnectionType = signature[ownerOutPortIndex]
 
             if ownerArgDataType == 'Mat44[]':
                 operatorOwner = self.getDCCSceneItem( kOperator.getOutput(ownerArgName)[0] )
@@ -730,12 +722,7 @@ class Builder(Builder):
 
             arraySizes = {}
             # connect the operator to the objects in the DCC
-            for i in xrange(len(args)):
-                arg = args[i]
-                argName = arg.name.getSimpleType()
-                argDataType = arg.dataType.getSimpleType()
-                argConnectionType = arg.connectionType.getSimpleType()
-
+            for i, (argName, argDataType, argConnectionType) in enumerate(signature):
                 canvasOpPath2 = str(canvasOpPath) + ":"
 
                 if argDataType.endswith('[]'):
@@ -1109,6 +1096,29 @@ class Builder(Builder):
         return True
 
 
+    # =================
+    # Teardown Methods
+    # =================
+    def deleteDCCSceneItem(self, dccSceneItem):
+        """Deletes an object, property or parameter that was built by this
+        builder.
+
+        Args:
+            dccSceneItem (object): DCC scene item to delete.
+
+        Returns:
+            bool: True if successful.
+
+        """
+
+        if dccSceneItem.IsClassOf(constants.siParameterID):
+            si.RemoveCustomParam(dccSceneItem.FullName)
+        else:
+            si.DeleteObj(dccSceneItem)
+
+        return True
+
+
     # ==============
     # Build Methods
     # ==============
@@ -58,6 +58,50 @@ class Synchronizer(Synchronizer):
         return findItem
 
 
+    def isDCCItemValid(self, dccItem):
+        """Returns whether a recorded DCC item handle still refers to an item
+        in the DCC.
+
+        Args:
+            dccItem (object): The DCC item.
+
+        Returns:
+            bool: True if the DCC item can be used.
+
+        """
+
+        # Deleted objects raise when accessed.
+        try:
+            dccItem.FullName
+        except:
+            return False
+
+        return True
+
+
+    def getDCCWorldMatrices(self, dccItems):
+        """Returns the world matrices of the supplied DCC items, read in one
+        batched query.
+
+        Args:
+            dccItems (list): The DCC items to get the world matrices of.
+
+        Returns:
+            list: len(dccItems) x 16 floats (row major, translation in the
+                last column).
+
+        """
+
+        values = []
+        for dccItem in dccItems:
+            matrix = dccItem.Kinematics.Global.GetTransform2(None).Matrix4.Get2()
+
+            # Softimage matrices transform row vectors, transpose them.
+            values.extend([matrix[column * 4 + row] for row in xrange(4) for column in xrange(4)])
+
+        return values
+
+
     def syncXfo(self, kObject):
         """Syncs the xfo from the DCC object to the Kraken object.
 
@@ -71,7 +115,7 @@ class Synchronizer(Synchronizer):
 
         hrcMap = self.getHierarchyMap()
 
-        if kObject not in hrcMap.keys():
+        if kObject not in hrcMap:
             log("Warning! 3D Object '" + kObject.getName() + "' was not found in the mapping!", 8)
             return False
 
@@ -110,7 +154,7 @@ class Synchronizer(Synchronizer):
 
         hrcMap = self.getHierarchyMap()
 
-        if kObject not in hrcMap.keys():
+        if kObject not in hrcMap:
             log("Warning! Attribute '" + kObject.getName() + "' was not found in the mapping!", 8)
             return False
 
@@ -138,7 +182,7 @@ class Synchronizer(Synchronizer):
 
         hrcMap = self.getHierarchyMap()
 
-        if kObject not in hrcMap.keys():
+        if kObject not in hrcMap:
             log("Warning! 3D Object '" + kObject.getName() + "' was not found in the mapping!", 8)
             return False
 
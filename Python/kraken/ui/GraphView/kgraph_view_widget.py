@@ -13,6 +13,8 @@ from kraken.ui.undoredo.undo_redo_manager import UndoRedoManager
 import graph_commands
 
 from kraken.core.objects.rig import Rig
+from kraken.core.build_cache import BuildCache
+from kraken.core.incremental_build import IncrementalBuild
 from kraken import plugins
 
 
@@ -83,6 +85,7 @@ class KGraphViewWidget(GraphViewWidget):
 
     def newRigPreset(self):
         self.guideRig = Rig()
+        self.incrementalBuild = None
         self.getGraphView().displayGraph(self.guideRig)
         self.setRigName('MyRig')
 
@@ -120,7 +123,7 @@ class KGraphViewWidget(GraphViewWidget):
                 fileDialog.setWindowTitle('Save Rig Preset As')
                 fileDialog.setDirectory(os.path.abspath(filePath))
                 fileDialog.setAcceptMode(QtGui.QFileDialog.AcceptSave)
-                fileDialog.setNameFilter('Kraken Rig (*.krg)')
+                fileDialog.setNameFilter('Kraken Rig (*.krg *.krb)')
                 fileDialog.setDefaultSuffix('krg')
 
                 if fileDialog.exec_() == QtGui.QFileDialog.Accepted:
@@ -188,7 +191,7 @@ class KGraphViewWidget(GraphViewWidget):
             fileDialog.setWindowTitle('Open Rig Preset')
             fileDialog.setDirectory(os.path.dirname(os.path.abspath(lastFilePath)))
             fileDialog.setAcceptMode(QtGui.QFileDialog.AcceptOpen)
-            fileDialog.setNameFilter('Kraken Rig (*.krg)')
+            fileDialog.setNameFilter('Kraken Rig (*.krg *.krb)')
 
             if fileDialog.exec_() == QtGui.QFileDialog.Accepted:
                 filePath = fileDialog.selectedFiles()[0]
@@ -199,6 +202,7 @@ class KGraphViewWidget(GraphViewWidget):
 
     def loadRigPreset(self, filePath):
         self.guideRig = Rig()
+        self.incrementalBuild = None
         self.guideRig.loadRigDefinitionFile(filePath)
 
         self.graphView.displayGraph(self.guideRig)
@@ -244,6 +248,14 @@ class KGraphViewWidget(GraphViewWidget):
 
 
     def buildRig(self):
+        self._buildRig(incremental=False)
+
+
+    def rebuildRig(self):
+        self._buildRig(incremental=True)
+
+
+    def _buildRig(self, incremental):
 
         try:
             self.window().statusBar().showMessage('Building Rig')
@@ -253,17 +265,26 @@ class KGraphViewWidget(GraphViewWidget):
             self.synchGuideRig()
 
             rigBuildData = self.guideRig.getRigBuildData()
-            rig = Rig()
-            rig.loadRigDefinition(rigBuildData)
+            rigName = rigBuildData['name'].replace('_guide', '')
 
-            rig.setName(rig.getName().replace('_guide', ''))
+            # Only the components that changed since the last build are
+            # rebuilt, through the builder of the last build.
+            if incremental is False or self.incrementalBuild is None:
+                self.incrementalBuild = IncrementalBuild(plugins.getBuilder(), buildCache=BuildCache())
 
-            builder = plugins.getBuilder()
-            builder.build(rig)
+            changes = self.incrementalBuild.build(rigBuildData, rigName=rigName)
 
             self.window().krakenMenu.setCurrentConfig(initConfigIndex)
 
+            if incremental is True:
+                self.reportMessage('Rebuilt ' + str(len(changes['rebuilt'])) + ' component(s), reconnected ' +
+                                   str(len(changes['reconnected'])) + ', removed ' + str(len(changes['removed'])),
+                                   level='information')
+
         except Exception as e:
+            # The built rig can't be diffed against after a failed build.
+            self.incrementalBuild = None
+
             # Add the callstak to the log
             callstack = traceback.format_exc()
             print callstack
@@ -86,6 +86,10 @@ class KrakenMenu(QtGui.QWidget):
         self.buildRigAction.setShortcut('Ctrl+B')
         self.buildRigAction.setObjectName("buildRigAction")
 
+        self.rebuildRigAction = self.buildMenu.addAction('Rebuild &Changed Components')
+        self.rebuildRigAction.setShortcut('Ctrl+Shift+B')
+        self.rebuildRigAction.setObjectName("rebuildRigAction")
+
         # Tools Menu
         self.toolsMenu = self.menuBar.addMenu('&Tools')
         self.reloadComponentsAction = self.toolsMenu.addAction('Reload Component Modules')
@@ -177,6 +181,7 @@ class KrakenMenu(QtGui.QWidget):
         # Build Menu Connections
         self.buildGuideAction.triggered.connect(graphViewWidget.buildGuideRig)
         self.buildRigAction.triggered.connect(graphViewWidget.buildRig)
+        self.rebuildRigAction.triggered.connect(graphViewWidget.rebuildRig)
 
         # Tools Menu Connections
         self.reloadComponentsAction.triggered.connect(self.reloadAllComponents)
@@ -433,11 +433,15 @@ class ArmComponentRig(ArmComponent):
         # Outputs
         self.handOutputTgt.xfo = data['handXfo']
 
+        # While the rig loads, it evaluates the component once all the
+        # components are connected.
+        if self.isLoadingInRig() is True:
+            return
+
         # Eval Constraints
         self.armIKCtrlSpaceInputConstraint.evaluate()
         self.armUpVCtrlSpaceInputConstraint.evaluate()
         self.armRootInputConstraint.evaluate()
-        self.armRootInputConstraint.evaluate()
         self.handConstraint.evaluate()
         self.handCtrlSpaceConstraint.evaluate()
 
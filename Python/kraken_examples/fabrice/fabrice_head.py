@@ -324,6 +324,11 @@ class FabriceHeadRig(FabriceHead):
         self.headOutputTgt.xfo = headXfo
         self.jawOutputTgt.xfo.tr = jawPosition
 
+        # While the rig loads, it evaluates the component once all the
+        # components are connected.
+        if self.isLoadingInRig() is True:
+            return
+
         # ====================
         # Evaluate Splice Ops
         # ====================
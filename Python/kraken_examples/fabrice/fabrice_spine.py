@@ -238,7 +238,10 @@ class FabriceSpineGuide(FabriceSpine):
         self.lengthInputAttr.setMax(length * 3.0)
         self.lengthInputAttr.setValue(length)
 
-        self.bezierSpineKLOp.evaluate()
+        # While the rig loads, it evaluates the guide once all the components
+        # are connected.
+        if self.isLoadingInRig() is False:
+            self.bezierSpineKLOp.evaluate()
 
         return True
 
@@ -532,6 +535,11 @@ class FabriceSpineRig(FabriceSpine):
         # Set IO Xfos
         # ============
 
+        # While the rig loads, it evaluates the component once all the
+        # components are connected.
+        if self.isLoadingInRig() is True:
+            return
+
         # ====================
         # Evaluate Splice Ops
         # ====================
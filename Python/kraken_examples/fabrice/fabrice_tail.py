@@ -226,7 +226,10 @@ class FabriceTailGuide(FabriceTail):
         self.lengthInputAttr.setMax(length * 3.0)
         self.lengthInputAttr.setValue(length)
 
-        self.bezierSpineKLOp.evaluate()
+        # While the rig loads, it evaluates the guide once all the components
+        # are connected.
+        if self.isLoadingInRig() is False:
+            self.bezierSpineKLOp.evaluate()
 
         return True
 
@@ -474,6 +477,11 @@ class FabriceTailRig(FabriceTail):
         # Set IO Xfos
         # ============
 
+        # While the rig loads, it evaluates the component once all the
+        # components are connected.
+        if self.isLoadingInRig() is True:
+            return
+
         # ====================
         # Evaluate Splice Ops
         # ====================
@@ -465,6 +465,11 @@ class FKChainComponentRig(FKChainComponent):
         # Set IO Attrs
         # =============
 
+        # While the rig loads, it evaluates the component once all the
+        # components are connected.
+        if self.isLoadingInRig() is True:
+            return
+
         # ====================
         # Evaluate Splice Ops
         # ====================
@@ -511,6 +511,11 @@ class InsectLegComponentRig(InsectLegComponent):
         self.tipBoneLenInputAttr.setMax(tipBoneLen * 2.0)
         self.tipBoneLenInputAttr.setValue(tipBoneLen)
 
+        # While the rig loads, it evaluates the component once all the
+        # components are connected.
+        if self.isLoadingInRig() is True:
+            return
+
         # ====================
         # Evaluate Splice Ops
         # ====================
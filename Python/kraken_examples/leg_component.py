@@ -478,6 +478,11 @@ class LegComponentRig(LegComponent):
 
         self.legPelvisInputTgt.xfo = data['femurXfo']
 
+        # While the rig loads, it evaluates the component once all the
+        # components are connected.
+        if self.isLoadingInRig() is True:
+            return
+
         # Eval Constraints
         self.legIKCtrlSpaceInputConstraint.evaluate()
         self.legUpVCtrlSpaceInputConstraint.evaluate()
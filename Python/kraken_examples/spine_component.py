@@ -400,6 +400,11 @@ class SpineComponentRig(SpineComponent):
         # Set IO Xfos
         # ============
 
+        # While the rig loads, it evaluates the component once all the
+        # components are connected.
+        if self.isLoadingInRig() is True:
+            return
+
         # ====================
         # Evaluate Splice Ops
         # ====================
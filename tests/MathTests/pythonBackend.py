@@ -0,0 +1,30 @@
+from kraken.core.kraken_system import ks
+from kraken.core.maths import *
+
+
+prevBackend = ks.getMathBackend()
+ks.setMathBackend('python')
+
+xfo1 = Xfo(tr=Vec3(1.0, 0.0, 2.0), ori=Quat(Euler(0.6, 0.7, 0.8)), sc=Vec3(2.0, 2.0, 2.0))
+xfo2 = Xfo(tr=Vec3(0.0, 3.0, 0.0), ori=Quat(Euler(1.0, 0.0, 2.0, 'ZYX')))
+print "backend:" + ks.getMathBackend()
+print "rtval:" + ks.getRTValTypeName(xfo1.getRTVal())
+print "multiply:" + str(xfo1.multiply(xfo2))
+print "inverse:" + str(xfo1.inverse())
+print "identity:" + str(xfo1.multiply(xfo1.inverse()).toMat44().almostEqual(Mat44()))
+print "toMat44:" + str(xfo1.toMat44())
+
+xfo3 = Xfo()
+xfo3.setFromMat44(xfo1.toMat44().multiply(xfo2.toMat44()))
+print "setFromMat44:" + str(xfo3)
+
+xfo3.tr.x = 5.0
+xfo3.ori.setFromMat33(xfo2.ori.toMat33())
+print "inPlace:" + str(xfo3)
+
+quat = xfo1.ori.clone()
+print "toEuler:" + str(quat.toEuler(RotationOrder('ZYX')))
+quat.mirror(0)
+print "mirror:" + str(quat)
+
+ks.setMathBackend(prevBackend)
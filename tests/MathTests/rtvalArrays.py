@@ -0,0 +1,40 @@
+from kraken.core.kraken_system import ks
+from kraken.core.maths import *
+
+
+prevBackend = ks.getMathBackend()
+ks.setMathBackend('python')
+
+for typeName in ['Vec3', 'Quat', 'Euler', 'Mat44', 'Xfo']:
+    members, size = ks.getRTValLayout(typeName)
+    print typeName + ":" + str([x[0] for x in members]) + " size:" + str(size)
+
+xfos = [Xfo(tr=Vec3(float(i), 0.0, 0.0), ori=Quat(Euler(0.1 * i, 0.0, 0.0))) for i in xrange(3)]
+mat44s = [x.toMat44() for x in xfos]
+
+mat44Array = ks.constructRTValArray('Mat44', mat44s)
+print "type:" + ks.getRTValTypeName(mat44Array)
+print "length:" + str(len(mat44Array))
+print "element:" + str(Mat44(mat44Array[1]))
+
+values = ks.unpackRTValArray(mat44Array, 'Mat44')
+print "values:" + str(len(values))
+
+flatValues = []
+for xfo in xfos:
+    flatValues.extend(xfo.getRTVal().getValues())
+
+xfoArray = ks.constructRTValArray('Xfo', flatValues)
+print "flat:" + str(len(xfoArray)) + " " + str(Xfo(xfoArray[2]))
+
+# Elements are views on the array.
+element = mat44Array[2]
+element.row3.x = 10.0
+print "view:" + str(mat44Array[2].row3.x.getSimpleType())
+
+mat44Array.resize(4)
+mat44Array[3] = mat44s[0].getRTVal()
+print "resize:" + str(len(mat44Array)) + " " + str(Mat44(mat44Array[3]).almostEqual(mat44s[0]))
+print "fromFabricRTVal:" + str(ks.fromFabricRTVal(mat44Array, 'Mat44[]') is mat44Array)
+
+ks.setMathBackend(prevBackend)
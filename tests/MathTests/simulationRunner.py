@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from kraken.core.kraken_system import ks
+from kraken.core.maths import *
+
+
+def toArray(xfo):
+    return np.array(xfo.toMat44().getRTVal().getValues()).reshape(4, 4)
+
+
+def formatTr(mat):
+    return "(" + ", ".join(["%.3f" % (x + 0.0) for x in np.round(mat[:3, 3], 3)]) + ")"
+
+
+if np is None:
+    print "Test Skipped: NumPy is not installed."
+else:
+    from kraken.core.solvers.simulation_runner import SimulationRunner
+
+    prevBackend = ks.getMathBackend()
+    ks.setMathBackend('python')
+
+    frames = range(0, 24)
+    fkPose = np.array([[toArray(Xfo(tr=Vec3(i * 2.0, 0.0, chain))) for i in xrange(4)] for chain in xrange(3)])
+
+    runner = SimulationRunner('DynamicChainSolver')
+    curves = runner.run(frames, {'resetframe': 0.0, 'simBlendStart': 0.0, 'simBlendEnd': 1.0,
+                                 'dampening': 0.1, 'gravity': -9.8, 'fkPose': fkPose,
+                                 'animPose': np.zeros((4, 4, 4))})
+    print "dynamicChain:" + str(curves['animPose'].shape)
+    print "dynamicChainTip:" + " ".join([formatTr(curves['animPose'][i, 0, 3]) for i in [0, 1, 12, 23]])
+    print "dynamicChainBoneLength:" + "%.3f" % np.linalg.norm(curves['animPose'][23, 2, 2, :3, 3] - curves['animPose'][23, 2, 1, :3, 3])
+
+    goals = np.array([[toArray(Xfo(tr=Vec3(6.0, 2.0 * np.sin(frame * 0.25), chain))) for chain in xrange(3)] for frame in frames])
+    args = {'ikblend': 1.0, 'waveLength_Y': 1.0, 'waveAmplitude_Y': 0.2, 'waveFrequency_Y': 2.0,
+            'waveLength_Z': 1.0, 'waveAmplitude_Z': 0.1, 'waveFrequency_Z': 1.0, 'tipBias': 0.5,
+            'springStrength': 50.0, 'dampening': 0.1, 'simulationWeight': 1.0, 'softLimitBounds': 5.0,
+            'chainBase': toArray(Xfo()), 'fkcontrols': fkPose[0], 'tipBoneLen': 2.0,
+            'pose': np.zeros((4, 4, 4))}
+
+    runner = SimulationRunner('TentacleSolver')
+    print "batchSize:" + str(runner.getBatchSize(args, {'ikgoal': goals}))
+    curves = runner.run(frames, args, {'ikgoal': goals})
+    print "tentacle:" + str(curves['pose'].shape)
+    print "tentacleEnd:" + " ".join([formatTr(curves['tentacleEnd'][i, 1]) for i in [0, 12, 23]])
+
+    single = runner.run(frames, args, {'ikgoal': goals[:, 1]})
+    print "batchMatch:" + str(np.allclose(single['tentacleEnd'][:, 0], curves['tentacleEnd'][:, 1]))
+
+    parallel = runner.runParallel(frames, args, {'ikgoal': goals}, processes=2)
+    print "parallelMatch:" + str(sorted(parallel.keys()) == sorted(curves.keys()) and
+                                 all([np.allclose(parallel[x], curves[x]) for x in curves]))
+
+    cacheDir = tempfile.mkdtemp()
+    try:
+        cachePath = os.path.join(cacheDir, 'tentacle.npz')
+        print "saved:" + str(runner.saveCurves(cachePath, frames, curves))
+        cachedFrames, cachedCurves = SimulationRunner.loadCurves(cachePath)
+        print "cachedFrames:" + str(list(cachedFrames) == frames)
+        print "cachedCurves:" + str(sorted(cachedCurves.keys()) == sorted(curves.keys()) and
+                                    all([np.array_equal(cachedCurves[x], curves[x]) for x in curves]))
+    finally:
+        shutil.rmtree(cacheDir)
+
+    try:
+        runner.run(frames, args, {'ikgoal': goals[:10]})
+    except Exception as e:
+        print "error:" + str(e)
+
+    ks.setMathBackend(prevBackend)
@@ -0,0 +1,79 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from kraken.core.kraken_system import ks
+from kraken.core.maths import *
+
+
+def toArray(xfo):
+    return np.array(xfo.toMat44().getRTVal().getValues()).reshape(4, 4)
+
+
+def formatTr(mat):
+    return "(" + ", ".join(["%.3f" % (x + 0.0) for x in np.round(mat[:3, 3], 3)]) + ")"
+
+
+if np is None:
+    print "Test Skipped: NumPy is not installed."
+else:
+    prevBackend = ks.getMathBackend()
+    ks.setMathBackend('python')
+
+    print "loaded:" + str(ks.loadSolverModules())
+    print "solvers:" + str(ks.getSolverTypeNames())
+
+    root = toArray(Xfo())
+    upV = toArray(Xfo(tr=Vec3(0.0, 0.0, 5.0)))
+    handles = np.array([toArray(Xfo(tr=Vec3(3.0, 2.0, 0.0))),
+                        toArray(Xfo(tr=Vec3(1.0, 4.0, 1.0))),
+                        toArray(Xfo(tr=Vec3(10.0, 0.0, 0.0)))])
+
+    solver = ks.getSolverClass('TwoBoneIKSolver')()
+    print "arguments:" + str([x[0] for x in solver.getArguments()])
+
+    results = solver.solve(ikblend=1.0, root=root, bone0FK=root, bone1FK=root,
+                           ikHandle=handles, upV=upV, bone0Len=3.0, bone1Len=3.0)
+    for i in xrange(len(handles)):
+        print "twoBone" + str(i) + ":" + formatTr(results['bone1Out'][i]) + " " + formatTr(results['bone2Out'][i])
+
+    single = solver.solve(ikblend=1.0, root=root, bone0FK=root, bone1FK=root,
+                          ikHandle=handles[1], upV=upV, bone0Len=3.0, bone1Len=3.0)
+    print "batchMatch:" + str(np.allclose(single['bone2Out'][0], results['bone2Out'][1]))
+
+    fkcontrols = np.array([toArray(Xfo(tr=Vec3(i * 2.0, 1.0 - abs(i - 1.0), 0.0))) for i in xrange(3)])
+    goals = np.array([toArray(Xfo(tr=Vec3(5.0, 3.0, 0.0))),
+                      toArray(Xfo(tr=Vec3(0.0, 6.0, 0.0))),
+                      toArray(Xfo(tr=Vec3(20.0, 0.0, 0.0)))])
+
+    solver = ks.getSolverClass('NBoneIKSolver')()
+    results = solver.solve(ikblend=1.0, chainBase=root, ikgoal=goals, upVector=upV,
+                           fkcontrols=np.array([fkcontrols] * len(goals)), tipBoneLen=2.0,
+                           pose=np.zeros((3, 4, 4)))
+    for i in xrange(len(goals)):
+        print "nBone" + str(i) + ":" + " ".join([formatTr(x) for x in results['pose'][i]]) + " " + formatTr(results['legEnd'][i])
+
+    single = solver.solve(ikblend=1.0, chainBase=root, ikgoal=goals[1], upVector=upV,
+                          fkcontrols=fkcontrols, tipBoneLen=2.0, pose=np.zeros((3, 4, 4)))
+    print "batchMatch:" + str(np.allclose(single['legEnd'][0], results['legEnd'][1]))
+
+    fk = solver.solve(ikblend=0.0, chainBase=root, ikgoal=goals[0], upVector=upV,
+                      fkcontrols=fkcontrols, tipBoneLen=2.0, pose=np.zeros((3, 4, 4)))
+    print "fkMatch:" + str(np.allclose(fk['pose'][0], fkcontrols))
+
+    solver = ks.getSolverClass('BezierSpineSolver')()
+    results = solver.solve(length=10.0,
+                           base=root,
+                           baseHandle=toArray(Xfo(tr=Vec3(0.0, 3.0, 0.0))),
+                           tipHandle=toArray(Xfo(tr=Vec3(0.0, 7.0, 0.0))),
+                           tip=toArray(Xfo(tr=Vec3(0.0, 10.0, 0.0))),
+                           outputs=np.zeros((4, 4, 4)))
+    print "bezierSpine:" + " ".join([formatTr(x) for x in results['outputs'][0]])
+
+    try:
+        solver.solve(length=10.0, base=root)
+    except Exception as e:
+        print "error:" + str(e)
+
+    ks.setMathBackend(prevBackend)
@@ -0,0 +1,81 @@
+import json
+import os
+import shutil
+import tempfile
+
+from kraken.core.maths import *
+from kraken.core.objects.rig import Rig
+from kraken.core.io import json_codec
+from kraken.core.io.rig_file import RigFile
+from kraken_examples.bob_guide_data import bob_guide_data
+
+
+def toJSON(data):
+    return json.dumps(json.loads(json_codec.dumps(data)), sort_keys=True)
+
+
+guideRig = Rig("char_bob")
+guideRig.loadRigDefinition(bob_guide_data)
+guideRig.setMetaData('backdrops', [{'name': 'Arms', 'graphPos': (10, 20)}])
+guideData = guideRig.getData()
+
+tempDir = tempfile.mkdtemp()
+try:
+    krbPath = os.path.join(tempDir, 'char_bob.krb')
+    krgPath = os.path.join(tempDir, 'char_bob.krg')
+    guideRig.writeRigDefinitionFile(krbPath)
+    guideRig.writeRigDefinitionFile(krgPath)
+
+    print "isRigFile krb:" + str(RigFile.isRigFile(krbPath)) + " krg:" + str(RigFile.isRigFile(krgPath))
+
+    # The graph of the rig is read from the index.
+    rigFile = RigFile(krbPath)
+    print "name:" + rigFile.getName()
+    for i in xrange(rigFile.getNumComponents()):
+        info = rigFile.getComponentInfo(i)
+        print info['name'] + ":" + info['location'] + " " + info['class'] + " " + str(info['graphPos'])
+
+    print "connections:" + str(len(rigFile.getConnections()))
+    print "metaData:" + str(rigFile.getMetaData())
+
+    # Component data is decoded on request.
+    neckData = rigFile.getComponentData(1)
+    print "neck:" + str(neckData['neckPosition'])
+
+    # The binary file converts to and from the JSON data without loss.
+    print "dataMatch:" + str(toJSON(rigFile.getData()) == toJSON(guideData))
+
+    with open(krgPath) as f:
+        krgData = json_codec.load(f)
+
+    print "krgMatch:" + str(toJSON(rigFile.getData()) == toJSON(krgData))
+
+    # Rigs are loaded from the rig definition, its components decoded as
+    # they are accessed.
+    rigDefinition = rigFile.getRigDefinition()
+    print "lazyComponents:" + str(len(rigDefinition['components'])) + " last:" + rigDefinition['components'][-1]['name']
+    print "lazyMatch:" + str(toJSON(dict(rigDefinition, components=list(rigDefinition['components']))) == toJSON(guideData))
+    rigFile.close()
+
+    copyPath = os.path.join(tempDir, 'copy.krb')
+    RigFile.write(copyPath, krgData)
+    copyFile = RigFile(copyPath)
+    print "copyMatch:" + str(toJSON(copyFile.getData()) == toJSON(guideData))
+    copyFile.close()
+
+    # Math values with integer members keep them.
+    eulerPath = os.path.join(tempDir, 'euler.krb')
+    RigFile.write(eulerPath, {'name': 'euler', 'components': [{'name': 'a', 'ro': Euler(0.5, 0.25, 0.125, ro=RotationOrder(4))}]})
+    eulerFile = RigFile(eulerPath)
+    print "euler:" + str(eulerFile.getComponentData(0)['ro'])
+    eulerFile.close()
+
+    # Rigs load the same from both files.
+    krbRig = Rig()
+    krbRig.loadRigDefinitionFile(krbPath)
+    krgRig = Rig()
+    krgRig.loadRigDefinitionFile(krgPath)
+    print "rigMatch:" + str(toJSON(krbRig.getData()) == toJSON(krgRig.getData()))
+
+finally:
+    shutil.rmtree(tempDir)
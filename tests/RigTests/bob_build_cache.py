@@ -0,0 +1,107 @@
+import json
+import os
+import shutil
+import tempfile
+
+from kraken.core.maths import Vec3
+from kraken.core.objects.rig import Rig
+from kraken.core.build_cache import BuildCache
+from kraken.core.configs.config import Config
+from kraken_examples.bob_guide_data import bob_guide_data
+from kraken.helpers.utility_methods import prepareToSave
+
+
+class CountingBuildCache(BuildCache):
+
+    def __init__(self, cachePath, maxSize=None):
+        super(CountingBuildCache, self).__init__(cachePath, maxSize=maxSize)
+        self.hits = 0
+        self.saves = 0
+
+    def load(self, componentHash):
+        payload = super(CountingBuildCache, self).load(componentHash)
+        if payload is not None:
+            self.hits += 1
+
+        return payload
+
+    def save(self, componentHash, payload):
+        self.saves += 1
+        return super(CountingBuildCache, self).save(componentHash, payload)
+
+
+def loadGuideData(guideData, buildCache):
+    buildCache.hits = 0
+    buildCache.saves = 0
+
+    rig = Rig("char_bob")
+    rig.loadRigDefinition(guideData, buildCache=buildCache)
+    print "hits:" + str(buildCache.hits) + " saves:" + str(buildCache.saves)
+
+    return rig
+
+
+guideRig = Rig("char_bob")
+guideRig.loadRigDefinition(bob_guide_data)
+guideData = guideRig.getData()
+
+serialRig = Rig("char_bob")
+serialRig.loadRigDefinition(guideData)
+serialData = json.dumps(prepareToSave(serialRig.getData()), sort_keys=True)
+
+cachePath = tempfile.mkdtemp()
+try:
+    buildCache = CountingBuildCache(cachePath)
+
+    loadGuideData(guideData, buildCache)
+    cachedRig = loadGuideData(guideData, buildCache)
+
+    cachedData = json.dumps(prepareToSave(cachedRig.getData()), sort_keys=True)
+    print "dataMatch:" + str(serialData == cachedData)
+
+    serialPaths = [x.getDecoratedPath() for x in serialRig.getChildren()]
+    cachedPaths = [x.getDecoratedPath() for x in cachedRig.getChildren()]
+    print "orderMatch:" + str(serialPaths == cachedPaths)
+
+    # Only the component whose data changed is constructed again.
+    neckData = [x for x in guideData['components'] if x['name'] == 'neck'][0]
+    neckData['neckPosition'] = Vec3(0.0, 16.0, -0.6915)
+    loadGuideData(guideData, buildCache)
+
+    # Components are constructed again with another config.
+    config = Config.getInstance()
+    config.setExplicitNaming(not config.getExplicitNaming())
+    loadGuideData(guideData, buildCache)
+    config.setExplicitNaming(not config.getExplicitNaming())
+
+    # The least recently used files are removed past the maximum size.
+    cacheFiles = [os.path.join(cachePath, x) for x in os.listdir(cachePath)]
+    cacheSize = sum([os.path.getsize(x) for x in cacheFiles])
+    print "files:" + str(len(cacheFiles))
+
+    loadGuideData(guideData, buildCache)
+    buildCache = CountingBuildCache(cachePath, maxSize=cacheSize / 2)
+    print "pruned:" + str(buildCache.prune() > 0)
+    print "size:" + str(sum([os.path.getsize(os.path.join(cachePath, x)) for x in os.listdir(cachePath)]) <= cacheSize / 2)
+    loadGuideData(guideData, buildCache)
+
+finally:
+    shutil.rmtree(cachePath)
+
+# Cache files are only loaded from a directory other users can't write to.
+cachePath = tempfile.mkdtemp()
+try:
+    cachePath = os.path.join(cachePath, 'cache')
+    buildCache = CountingBuildCache(cachePath)
+    print "default:" + str(BuildCache.getDefaultCachePath().startswith(tempfile.gettempdir()))
+
+    loadGuideData(guideData, buildCache)
+    print "mode:" + oct(os.stat(cachePath).st_mode & 0o777)
+
+    os.chmod(cachePath, 0o777)
+    loadGuideData(guideData, buildCache)
+    os.chmod(cachePath, 0o700)
+    loadGuideData(guideData, buildCache)
+
+finally:
+    shutil.rmtree(os.path.dirname(cachePath))
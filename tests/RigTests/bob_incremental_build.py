@@ -0,0 +1,57 @@
+from kraken import plugins
+from kraken.core.maths import Vec3
+from kraken.core.objects.rig import Rig
+from kraken.core.incremental_build import IncrementalBuild
+from kraken_examples.bob_guide_data import bob_guide_data
+
+
+bobGuideRig = Rig("char_bob")
+bobGuideRig.loadRigDefinition(bob_guide_data)
+guideData = bobGuideRig.getData()
+
+
+def printChanges(label, changes):
+    print label + ":" + " ".join([x + "=" + str(len(changes[x])) for x in ['rebuilt', 'reconnected', 'removed']])
+
+
+builder = plugins.getBuilder()
+builder._debugMode = False
+
+incrementalBuild = IncrementalBuild(builder)
+printChanges("full", incrementalBuild.build(guideData))
+printChanges("unchanged", incrementalBuild.build(guideData))
+
+# Move the neck, the head is connected to it.
+builder._debugMode = True
+guideData = bobGuideRig.getData()
+neckData = [x for x in guideData['components'] if x['name'] == 'neck'][0]
+neckData['neckPosition'] = Vec3(0.0, 16.0, -0.6915)
+changes = incrementalBuild.build(guideData)
+print "rebuilt:" + str(changes['rebuilt'])
+print "reconnected:" + str(changes['reconnected'])
+
+rig = incrementalBuild.getRig()
+neck = rig.getChildByDecoratedName('neck:M')
+head = rig.getChildByDecoratedName('head:M')
+headInput = head.getInputByName('headBase')
+print "headConnected:" + str(headInput.getConnection().getParent() is neck)
+
+# Remove the right leg.
+builder._debugMode = False
+guideData['components'] = [x for x in guideData['components'] if x['name'] + ':' + x['location'] != 'Leg:R']
+guideData['connections'] = [x for x in guideData['connections'] if not x['target'].startswith('Leg:R.')]
+changes = incrementalBuild.build(guideData)
+print "removed:" + str(changes['removed'])
+print "components:" + str([x.getDecoratedName() for x in rig.getChildrenByType('Component')])
+print "legGroups:" + str([x.getPath() for x in rig.getChildByName('controls').getChildren() if x.getName() == 'Leg'])
+
+# A rig built from the same data in one go holds the same data.
+fullRig = Rig("char_bob")
+fullRig.loadRigDefinition(guideData)
+fullData = dict([(x['name'] + ':' + x['location'], IncrementalBuild.hashData(x)) for x in fullRig.getData()['components']])
+incrementalData = dict([(x['name'] + ':' + x['location'], IncrementalBuild.hashData(x)) for x in rig.getData()['components']])
+print "dataMatch:" + str(fullData == incrementalData)
+print "orderMatch:" + str([x.getDecoratedName() for x in rig.getChildrenByType('Component')] ==
+                          [x.getDecoratedName() for x in fullRig.getChildrenByType('Component')])
+print "groupOrderMatch:" + str([x.getName() for x in rig.getChildByName('controls').getChildren()] ==
+                               [x.getName() for x in fullRig.getChildByName('controls').getChildren()])
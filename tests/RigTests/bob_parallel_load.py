@@ -0,0 +1,27 @@
+import json
+
+from kraken.core.objects.rig import Rig
+from kraken_examples.bob_guide_data import bob_guide_data
+from kraken.core.profiler import Profiler
+from kraken.helpers.utility_methods import logHierarchy, prepareToSave
+
+
+Profiler.getInstance().push("bob_parallel_load")
+
+bobGuideRig = Rig("char_bob")
+bobGuideRig.loadRigDefinition(bob_guide_data, processes=4)
+
+logHierarchy(bobGuideRig)
+
+serialRig = Rig("char_bob")
+serialRig.loadRigDefinition(bob_guide_data)
+
+serialData = json.dumps(prepareToSave(serialRig.getData()), sort_keys=True)
+parallelData = json.dumps(prepareToSave(bobGuideRig.getData()), sort_keys=True)
+print "dataMatch:" + str(serialData == parallelData)
+
+serialPaths = [x.getDecoratedPath() for x in serialRig.getChildren()]
+parallelPaths = [x.getDecoratedPath() for x in bobGuideRig.getChildren()]
+print "orderMatch:" + str(serialPaths == parallelPaths)
+
+Profiler.getInstance().pop()
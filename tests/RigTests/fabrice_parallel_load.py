@@ -0,0 +1,76 @@
+import cPickle
+import json
+
+from kraken.core.maths import Vec3
+from kraken.core.objects.rig import Rig
+from kraken.core.objects.locator import Locator
+from kraken.core.objects.attributes.scalar_attribute import ScalarAttribute
+from kraken.core.objects.operators.kl_operator import KLOperator
+from kraken_examples.fabrice.fabrice_spine import FabriceSpineGuide
+from kraken_examples.fabrice.fabrice_tail import FabriceTailGuide
+from kraken.helpers.utility_methods import prepareToSave
+
+
+def formatTr(kObject):
+    return "(" + ", ".join(["%.3f" % (x + 0.0) for x in [kObject.xfo.tr.x, kObject.xfo.tr.y, kObject.xfo.tr.z]]) + ")"
+
+
+# The guides of these components carry KL operators with Python solvers.
+guideData = {
+    'name': 'fabrice',
+    'components': [FabriceSpineGuide('spine').saveData(), FabriceTailGuide('tail').saveData()]
+}
+
+parallelRig = Rig('fabrice')
+parallelRig.loadRigDefinition(guideData, processes=2)
+
+serialRig = Rig('fabrice')
+serialRig.loadRigDefinition(guideData)
+
+serialData = json.dumps(prepareToSave(serialRig.getData()), sort_keys=True)
+parallelData = json.dumps(prepareToSave(parallelRig.getData()), sort_keys=True)
+print "dataMatch:" + str(serialData == parallelData)
+
+serialPaths = [x.getDecoratedPath() for x in serialRig.getChildren()]
+parallelPaths = [x.getDecoratedPath() for x in parallelRig.getChildren()]
+print "orderMatch:" + str(serialPaths == parallelPaths)
+
+for rig in (serialRig, parallelRig):
+    spine = rig.getChildByDecoratedName('spine:M')
+    op = spine.getOperatorByName('spineGuideKLOp')
+    print "solver:" + type(op.solver).__name__ + " " + str(op.getParent() is spine)
+
+# Components loaded by a rig are evaluated by the rig once connected, the
+# other ones evaluate themselves in loadData.
+loadStates = []
+loadData = FabriceSpineGuide.loadData
+
+def recordLoadData(self, data):
+    loadStates.append(self.isLoadingInRig())
+    return loadData(self, data)
+
+FabriceSpineGuide.loadData = recordLoadData
+Rig('fabrice').loadRigDefinition(guideData)
+FabriceSpineGuide('spine').loadData(guideData['components'][0])
+FabriceSpineGuide.loadData = loadData
+print "loadingInRig:" + str(loadStates)
+
+# The solver of an operator is constructed again when it is unpickled.
+op = KLOperator('ikOp', 'TwoBoneIKSolver', 'Kraken')
+for name in ('root', 'bone0FK', 'bone1FK', 'ikHandle', 'upV'):
+    op.setInput(name, Locator(name))
+for name, value in (('ikblend', 1.0), ('bone0Len', 3.0), ('bone1Len', 3.0)):
+    op.setInput(name, ScalarAttribute(name, value=value))
+for name in ('bone0Out', 'bone1Out', 'bone2Out'):
+    op.setOutput(name, Locator(name))
+
+op.inputs['upV'].xfo.tr = Vec3(0.0, 0.0, 5.0)
+op.inputs['ikHandle'].xfo.tr = Vec3(1.0, 4.0, 1.0)
+
+copy = cPickle.loads(cPickle.dumps(op, cPickle.HIGHEST_PROTOCOL))
+print "copy:" + type(copy.solver).__name__ + " " + str(copy.solver is not op.solver) + " " + \
+    str(copy.signature == op.signature)
+
+op.evaluate()
+copy.evaluate()
+print "evaluated:" + formatTr(op.outputs['bone2Out']) + " " + formatTr(copy.outputs['bone2Out'])
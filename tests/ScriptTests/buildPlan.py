@@ -0,0 +1,38 @@
+from kraken import plugins
+from kraken.core.objects.container import Container
+from kraken.core.objects.layer import Layer
+from kraken.core.objects.control import Control
+from kraken.core.objects.joint import Joint
+from kraken.core.objects.locator import Locator
+from kraken.core.objects.attributes.attribute_group import AttributeGroup
+from kraken.core.objects.attributes.scalar_attribute import ScalarAttribute
+from kraken.core.objects.constraints.pose_constraint import PoseConstraint
+
+
+container = Container("myRig")
+layer = Layer("rig", parent=container)
+ctrl = Control("myCtrl", parent=layer, shape="circle")
+loc = Locator("myLocator", parent=ctrl)
+joint = Joint("myJoint", parent=layer)
+
+settingsGrp = AttributeGroup("settings", parent=ctrl)
+blendAttr = ScalarAttribute("blend", value=0.5, parent=settingsGrp)
+
+jointConstraint = PoseConstraint("myJointConstraint")
+jointConstraint.setConstrainee(joint)
+jointConstraint.addConstrainer(loc)
+joint.addConstraint(jointConstraint)
+
+builder = plugins.getBuilder()
+
+config = builder.getConfig()
+config.setExplicitNaming(True)
+
+buildPlan = builder.createBuildPlan(container)
+description = buildPlan.getDescription()
+for phase in buildPlan.phases:
+    print phase + ":"
+    for item in description[phase]:
+        print "  " + item
+
+builder.build(container, buildPlan=buildPlan)
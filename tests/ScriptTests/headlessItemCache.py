@@ -0,0 +1,84 @@
+from kraken.core.objects.rig import Rig
+from kraken.core.dcc_item_cache import DCCItemCache
+from kraken.plugins.headless_plugin.builder import Builder
+from kraken.plugins.headless_plugin.scene import Scene
+from kraken.plugins.headless_plugin.synchronizer import Synchronizer
+from kraken_examples.bob_guide_data import bob_guide_data
+
+
+class CountingSynchronizer(Synchronizer):
+    """Counts the objects looked up by their path in the scene."""
+
+    def __init__(self):
+        self.lookups = 0
+        super(CountingSynchronizer, self).__init__()
+
+
+    def getDCCItem(self, kObject):
+        self.lookups += 1
+        return super(CountingSynchronizer, self).getDCCItem(kObject)
+
+
+def mapRig(rig):
+    synchronizer = CountingSynchronizer()
+    synchronizer.setTarget(rig)
+    dccItems = [x['dccItem'] for x in synchronizer.getHierarchyMap().itervalues()]
+
+    return synchronizer.lookups, dccItems
+
+
+def findObject(rig, path):
+    synchronizer = CountingSynchronizer()
+    synchronizer.setTarget(rig)
+    for kObject in synchronizer.getHierarchyMap():
+        if kObject.getPath() == path:
+            return kObject
+
+    return None
+
+
+# Start from an empty scene and cache, other tests may have built rigs.
+Scene.clearInstance()
+DCCItemCache.getInstance().clear()
+
+rig = Rig("char_bob")
+rig.loadRigDefinition(bob_guide_data)
+
+builder = Builder()
+builder.build(rig)
+print "cached:" + str(len(DCCItemCache.getInstance()))
+
+# The handles recorded by the builder are used, only the objects that weren't
+# built are looked up.
+lookups, dccItems = mapRig(rig)
+print "lookups after build:" + str(lookups)
+print "mapped:" + str(len([x for x in dccItems if x is not None]))
+
+lookups, dccItems = mapRig(rig)
+print "lookups on next sync:" + str(lookups)
+
+# Without the cache, every object is looked up by its path.
+DCCItemCache.getInstance().clear()
+lookups, pathItems = mapRig(rig)
+print "lookups without cache:" + str(lookups)
+print "same items:" + str(pathItems == dccItems)
+
+# Deleted nodes are detected and looked up again, the node and its plugs.
+scene = Scene.getInstance()
+head = findObject(rig, 'char_bob.controls.head.head')
+headNode = DCCItemCache.getInstance().getDCCItem(head)
+parentNode = headNode.getParent()
+scene.deleteNode(headNode)
+newHeadNode = scene.createNode(headNode.getName(), nodeType='curve', parent=parentNode)
+
+lookups, dccItems = mapRig(rig)
+print "lookups after delete:" + str(lookups)
+print "new handle:" + str(DCCItemCache.getInstance().getDCCItem(head) is newHeadNode)
+
+# Torn down items are removed from the cache.
+builder.deleteBuildElements([findObject(rig, 'char_bob.controls.neck.neck')])
+lookups, dccItems = mapRig(rig)
+print "lookups after teardown:" + str(lookups)
+
+Scene.clearInstance()
+DCCItemCache.getInstance().clear()
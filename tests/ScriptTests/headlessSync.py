@@ -0,0 +1,96 @@
+import os
+
+from kraken import plugins
+from kraken.core.objects.rig import Rig
+from kraken.core.python_backend import _matMultiply
+from kraken.plugins.headless_plugin.builder import Builder
+from kraken.plugins.headless_plugin.scene import Scene
+from kraken.plugins.headless_plugin.synchronizer import Synchronizer
+from kraken_examples.bob_guide_data import bob_guide_data
+
+
+def formatXfo(xfo):
+    return " ".join(["%.3f" % (x + 0.0) for x in [xfo.tr.x, xfo.tr.y, xfo.tr.z, xfo.sc.x]])
+
+
+def buildBob():
+    Scene.clearInstance()
+
+    bobGuideRig = Rig("char_bob")
+    bobGuideRig.loadRigDefinition(bob_guide_data)
+
+    builder = Builder()
+    builder.build(bobGuideRig)
+
+    return bobGuideRig
+
+
+def moveNodes(scene):
+    # Offset the root, scale the neck and move the head.
+    offset = [1.0, 0.0, 0.0, 0.5, 0.0, 1.0, 0.0, 1.0, 0.0, 0.0, 1.0, -2.0, 0.0, 0.0, 0.0, 1.0]
+    root = scene.getRoots()[0]
+    root.setMatrix(_matMultiply(offset, root.getMatrix(), 4))
+
+    for node in scene.iterNodes():
+        if node.getName() == 'neck_M_neck_ctrl':
+            node.setMatrix(_matMultiply(node.getMatrix(), [2.0, 0.0, 0.0, 0.0, 0.0, 2.0, 0.0, 0.0, 0.0, 0.0, 2.0, 0.0, 0.0, 0.0, 0.0, 1.0], 4))
+        elif node.getName() == 'head_M_head_ctrl':
+            node.setMatrix(_matMultiply([1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 3.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0], node.getMatrix(), 4))
+
+
+def getXfos(rig):
+    return [(kObject.getPath(), formatXfo(kObject.xfo)) for kObject in iterObjects(rig)]
+
+
+def iterObjects(kObject):
+    if kObject.isTypeOf('Component') is False:
+        yield kObject
+
+    for i in xrange(kObject.getNumChildren()):
+        for child in iterObjects(kObject.getChildByIndex(i)):
+            yield child
+
+
+# Batched sync.
+rig = buildBob()
+scene = Scene.getInstance()
+print "nodes:" + str(len(list(scene.iterNodes())))
+moveNodes(scene)
+
+synchronizer = Synchronizer()
+synchronizer.setTarget(rig)
+print "mapped:" + str(len([x for x in synchronizer.getHierarchyMap().itervalues() if x['dccItem'] is not None]))
+neckItem = synchronizer.getHierarchyMapItem('char_bob.controls.neck:M.neck', decorated=True)
+print "pathMapped:" + neckItem[0].getPath() + " " + neckItem[1]['dccItem'].getName()
+print "pathMissing:" + str(synchronizer.getHierarchyMapItem('char_bob.controls.neck:M.missing', decorated=True))
+print "batched:" + str(synchronizer.syncXfos())
+synchronizer.sync()
+batchXfos = getXfos(rig)
+
+# Per-object sync.
+rig = buildBob()
+moveNodes(Scene.getInstance())
+
+synchronizer = Synchronizer()
+synchronizer.setTarget(rig)
+synchronizer.synchronize(rig)
+xfos = getXfos(rig)
+
+print "objects:" + str(len(xfos))
+print "match:" + str(batchXfos == xfos)
+for path, xfo in xfos:
+    if path in ('char_bob', 'char_bob.controls.neck.neck', 'char_bob.controls.head.head'):
+        print path + ": " + xfo
+
+# The headless plug-in is used when KRAKEN_DCC is set to 'Headless'.
+prevDCC = os.environ.get('KRAKEN_DCC')
+os.environ['KRAKEN_DCC'] = 'Headless'
+try:
+    print "builder:" + type(plugins.getBuilder()).__module__
+finally:
+    if prevDCC is None:
+        del os.environ['KRAKEN_DCC']
+    else:
+        os.environ['KRAKEN_DCC'] = prevDCC
+
+Scene.clearInstance()
@@ -0,0 +1,95 @@
+import time
+
+from kraken.core.builder import Builder
+from kraken.core.build_plan import BuildPlan
+
+
+# Builds the Bob rig, falling back to the Bob guide rig when the KL solvers of
+# the rig can't be constructed (no Fabric Engine).
+try:
+    from kraken_examples.bob_rig import BobRig
+    rig = BobRig("char_bob")
+except Exception as e:
+    print "BobRig unavailable (" + str(e) + "), using BobGuide."
+    from kraken_examples.bob_guide import BobGuide
+    rig = BobGuide("char_bob_guide")
+
+
+def legacyIsTypeOf(kObject, typeName):
+    for cls in type.mro(type(kObject)):
+        if cls.__name__ == typeName:
+            return True
+
+    return False
+
+
+legacyHierarchyTypes = ['Container', 'Layer', 'Component', 'ComponentGroup',
+                        'HierarchyGroup', 'CtrlSpace', 'Transform', 'Locator',
+                        'Joint', 'Control', 'Curve', 'SceneItem']
+
+legacyConstraintTypes = ['OrientationConstraint', 'PoseConstraint',
+                         'PositionConstraint', 'ScaleConstraint']
+
+
+def collect(kObject, objects, constraints):
+    objects.append(kObject)
+    for i in xrange(kObject.getNumConstraints()):
+        constraints.append(kObject.getConstraintByIndex(i))
+
+    for i in xrange(kObject.getNumChildren()):
+        collect(kObject.getChildByIndex(i), objects, constraints)
+
+
+objects = []
+constraints = []
+collect(rig, objects, constraints)
+
+
+def legacyDispatch():
+    for kObject in objects:
+        for typeName in legacyHierarchyTypes:
+            if legacyIsTypeOf(kObject, typeName):
+                break
+        # Traversals also tested Component on every object.
+        legacyIsTypeOf(kObject, 'Component')
+
+    for constraint in constraints:
+        for typeName in legacyConstraintTypes:
+            if legacyIsTypeOf(constraint, typeName):
+                break
+
+
+def tableDispatch():
+    for kObject in objects:
+        BuildPlan.hierarchyDispatcher.resolve(type(kObject))
+        kObject.isTypeOf('Component')
+
+    for constraint in constraints:
+        BuildPlan.constraintDispatcher.resolve(type(constraint))
+
+
+def timeIt(fn, iterations):
+    start = time.time()
+    for i in xrange(iterations):
+        fn()
+
+    return (time.time() - start) / iterations
+
+
+iterations = 200
+legacyTime = timeIt(legacyDispatch, iterations)
+tableTime = timeIt(tableDispatch, iterations)
+
+builder = Builder()
+buildTime = timeIt(lambda: builder._build(rig), 20)
+planTime = timeIt(lambda: builder.createBuildPlan(rig), 20)
+buildPlan = builder.createBuildPlan(rig)
+cachedPlanTime = timeIt(lambda: builder._build(rig, buildPlan=buildPlan), 20)
+
+print "objects:" + str(len(objects)) + " constraints:" + str(len(constraints))
+print "isTypeOf chains:  %.3f ms" % (legacyTime * 1000.0)
+print "dispatch tables:  %.3f ms" % (tableTime * 1000.0)
+print "speedup:          %.1fx" % (legacyTime / tableTime)
+print "build traversal:  %.3f ms" % (buildTime * 1000.0)
+print "build plan:       %.3f ms" % (planTime * 1000.0)
+print "cached plan:      %.3f ms" % (cachedPlanTime * 1000.0)
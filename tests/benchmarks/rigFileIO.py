@@ -0,0 +1,36 @@
+import json
+import os
+import time
+
+from kraken.core.io import json_codec
+from kraken.helpers.utility_methods import prepareToSave, prepareToLoad
+
+
+# Times saving and loading the largest example guide with the JSON codec and
+# with the prepareToSave / prepareToLoad passes of previous versions.
+krgFile = os.path.join(os.environ['KRAKEN_PATH'], 'Python', 'kraken_examples', 'performanceTest', 'arms.krg')
+with open(krgFile) as f:
+    jsonString = f.read()
+
+guideData = json_codec.loads(jsonString)
+compactString = json_codec.dumps(guideData)
+
+
+def timeIt(fn, iterations):
+    start = time.time()
+    for i in xrange(iterations):
+        fn()
+
+    return (time.time() - start) / iterations
+
+
+iterations = 20
+legacySaveTime = timeIt(lambda: json.dumps(prepareToSave(guideData), indent=2), iterations)
+codecSaveTime = timeIt(lambda: json_codec.dumps(guideData), iterations)
+legacyLoadTime = timeIt(lambda: prepareToLoad(json.loads(jsonString)), iterations)
+codecLoadTime = timeIt(lambda: json_codec.loads(compactString), iterations)
+rawLoadTime = timeIt(lambda: json.loads(compactString), iterations)
+
+print "size legacy:" + str(len(jsonString)) + " compact:" + str(len(compactString))
+print "save legacy:%.2fms codec:%.2fms" % (legacySaveTime * 1000.0, codecSaveTime * 1000.0)
+print "load legacy:%.2fms codec:%.2fms json only:%.2fms" % (legacyLoadTime * 1000.0, codecLoadTime * 1000.0, rawLoadTime * 1000.0)
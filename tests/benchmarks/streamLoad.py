@@ -0,0 +1,46 @@
+import os
+import tempfile
+import time
+
+from kraken.core.objects.container import Container
+from kraken.core.objects.hierarchy_group import HierarchyGroup
+from kraken.core.objects.locator import Locator
+from kraken.core.io import json_codec
+from kraken.core.io.kraken_saver import KrakenSaver
+from kraken.core.io.kraken_loader import KrakenLoader
+
+
+# Times constructing a large hierarchy from a nested JSON document and from a
+# stream of records read line by line.
+root = Container('root')
+for i in xrange(100):
+    grp = HierarchyGroup('grp' + str(i), parent=root)
+    for j in xrange(50):
+        Locator('loc' + str(j), parent=grp)
+
+streamPath = os.path.join(tempfile.mkdtemp(), 'root.jsonl')
+nestedPath = streamPath[:-1]
+try:
+    with open(nestedPath, 'w') as f:
+        json_codec.dump(KrakenSaver().encode(root), f)
+
+    with open(streamPath, 'w') as f:
+        records = KrakenSaver().writeStream(root, f)
+
+    start = time.time()
+    with open(nestedPath) as f:
+        KrakenLoader().construct(json_codec.load(f))
+    nestedTime = time.time() - start
+
+    start = time.time()
+    with open(streamPath) as f:
+        KrakenLoader().constructFromStream(f)
+    streamTime = time.time() - start
+
+    print "records:" + str(records)
+    print "nested:%.3fs stream:%.3fs" % (nestedTime, streamTime)
+
+finally:
+    os.remove(nestedPath)
+    os.remove(streamPath)
+    os.rmdir(os.path.dirname(streamPath))
@@ -0,0 +1,66 @@
+import sys
+import time
+
+from kraken.core.objects.rig import Rig
+from kraken.plugins.headless_plugin.builder import Builder
+from kraken.plugins.headless_plugin.scene import Scene
+from kraken.plugins.headless_plugin.synchronizer import Synchronizer
+from kraken_examples.bob_guide_data import bob_guide_data
+
+
+# Builds the Bob guide rig into the headless scene and times the synchronization
+# of the xfos, one object at a time and in one batch.
+Scene.clearInstance()
+
+rig = Rig("char_bob")
+rig.loadRigDefinition(bob_guide_data)
+
+builder = Builder()
+builder.build(rig)
+
+synchronizer = Synchronizer()
+synchronizer.setTarget(rig)
+scene = Scene.getInstance()
+
+
+class NullStream(object):
+    def write(self, text):
+        pass
+
+
+def perObjectSync():
+    scene._clearWorldMatrixCache()
+    synchronizer.synchronize(rig)
+
+
+def batchSync():
+    scene._clearWorldMatrixCache()
+    synchronizer.sync()
+
+
+def timeIt(fn, iterations):
+    # Silence the warnings of the unmapped attributes.
+    stdout = sys.stdout
+    sys.stdout = NullStream()
+    try:
+        start = time.time()
+        for i in xrange(iterations):
+            fn()
+    finally:
+        sys.stdout = stdout
+
+    return (time.time() - start) / iterations
+
+
+iterations = 20
+perObjectTime = timeIt(perObjectSync, iterations)
+batchTime = timeIt(batchSync, iterations)
+mapTime = timeIt(lambda: synchronizer.setTarget(rig), iterations)
+
+print "mapped:" + str(len(synchronizer.getHierarchyMap()))
+print "per-object sync:  %.3f ms" % (perObjectTime * 1000.0)
+print "batched sync:     %.3f ms" % (batchTime * 1000.0)
+print "speedup:          %.1fx" % (perObjectTime / batchTime)
+print "hierarchy map:    %.3f ms" % (mapTime * 1000.0)
+
+Scene.clearInstance()
@@ -0,0 +1,51 @@
+from kraken.core.configs.config import Config
+from kraken.core.objects.layer import Layer
+from kraken.core.objects.locator import Locator
+from kraken.core.objects.components.base_example_component import BaseExampleComponent
+from kraken_examples.custom_config import CustomConfig
+
+
+Config.clearInstance()
+config = Config.getInstance()
+defaultHash = config.getHash()
+nameTemplate = config.getNameTemplate()
+
+# Configs of the same class share their data and hash.
+Config.clearInstance()
+config = Config.getInstance()
+print "sameHash:" + str(config.getHash() == defaultHash)
+print "sharedData:" + str(config.getNameTemplate() is nameTemplate)
+print "sharedShapes:" + str(config.getControlShapeLibrary().getShape("circle") is
+                            Config.makeCurrent().getControlShapeLibrary().getShape("circle"))
+
+# The explicit naming setting is part of the hash.
+config = Config.getInstance()
+config.setExplicitNaming(True)
+print "explicitHash:" + str(config.getHash() != defaultHash)
+config.setExplicitNaming(False)
+print "restoredHash:" + str(config.getHash() == defaultHash)
+
+# The data is frozen.
+try:
+    config.getNameTemplate()['separator'] = '-'
+except TypeError as e:
+    print "frozen:" + str(e)
+
+try:
+    config.getColors()['red'][1][0] = 0.5
+except TypeError as e:
+    print "frozenList:" + str(e)
+
+# Switching configs switches the hash and the build names.
+layer = Layer('controls')
+component = BaseExampleComponent('arm', parent=layer)
+component.setLocation('L')
+locator = Locator('elbow', parent=component)
+
+print "default:" + locator.getBuildName()
+customConfig = CustomConfig.makeCurrent()
+print "customHash:" + str(customConfig.getHash() != defaultHash)
+print "custom:" + locator.getBuildName()
+Config.makeCurrent()
+print "default:" + locator.getBuildName()
+print "switchedBack:" + str(Config.getInstance().getHash() == defaultHash)
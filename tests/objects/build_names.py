@@ -0,0 +1,50 @@
+from kraken.core.configs.config import Config
+from kraken.core.objects.container import Container
+from kraken.core.objects.layer import Layer
+from kraken.core.objects.components.base_example_component import BaseExampleComponent
+from kraken.core.objects.control import Control
+from kraken.core.objects.locator import Locator
+from kraken.core.objects.object_3d import resolveBuildNames
+
+
+container = Container("myRig")
+layer = Layer("rig", parent=container)
+component = BaseExampleComponent("arm", parent=layer)
+component.setLocation("L")
+ctrl = Control("hand", parent=component, shape="circle")
+loc = Locator("handSpace", parent=ctrl)
+
+buildNames = resolveBuildNames(container)
+for kObject in [container, layer, component, ctrl, loc]:
+    print kObject.getPath() + ":" + buildNames[kObject]
+
+print "cached:" + str(loc.getBuildName() is loc.getBuildName())
+
+# Renaming and reparenting other objects keeps the cached build name.
+buildName = loc.getBuildName()
+other = Locator("other", parent=layer)
+other.setName("other2")
+ctrl.removeChild(loc)
+ctrl.addChild(loc)
+print "unrelatedEdits:" + str(loc.getBuildName() is buildName)
+
+ctrl.setName("wrist")
+print "setName:" + ctrl.getBuildName()
+
+component.setLocation("R")
+print "setLocation:" + loc.getBuildName()
+
+otherContainer = Container("otherRig")
+container.removeChild(layer)
+otherContainer.addChild(layer)
+print "setParent:" + layer.getBuildName()
+
+loc.setFlag("EXPLICIT_NAME")
+print "setFlag:" + loc.getBuildName()
+loc.clearFlag("EXPLICIT_NAME")
+
+Config.getInstance().setExplicitNaming(True)
+print "explicitNaming:" + loc.getBuildName()
+
+Config.clearInstance()
+print "clearInstance:" + loc.getBuildName()
@@ -0,0 +1,46 @@
+from kraken.core.objects.container import Container
+from kraken.core.objects.layer import Layer
+from kraken.core.objects.locator import Locator
+from kraken.core.objects.components.base_example_component import BaseExampleComponent
+
+
+container = Container("myRig")
+
+# Name collisions get the next free suffix.
+locators = [Locator("loc", parent=container) for i in xrange(4)]
+print "names:" + str([x.getName() for x in locators])
+
+locators[1].setName("loc")
+print "setName:" + locators[1].getName()
+
+locators[2].setName("loc03")
+print "setName with suffix:" + locators[2].getName()
+
+print "getChildByName:" + container.getChildByName("loc04").getPath()
+print "old name:" + str(container.getChildByName("loc02"))
+
+container.removeChild(locators[0])
+print "removed:" + str(container.getChildByName("loc"))
+print "reuse:" + Locator("loc", parent=container).getName()
+
+# Components with the same name are told apart by their location.
+leftArm = BaseExampleComponent("arm", parent=container)
+leftArm.setLocation("L")
+rightArm = BaseExampleComponent("arm", parent=container)
+rightArm.setLocation("R")
+print "decorated:" + container.getChildByDecoratedName("arm:L").getDecoratedName()
+print "decorated:" + container.getChildByDecoratedName("arm:R").getDecoratedName()
+print "getChildByName:" + container.getChildByName("arm").getDecoratedName()
+
+rightArm.setLocation("L")
+print "setLocation:" + rightArm.getDecoratedName()
+print "decorated:" + container.getChildByDecoratedName("arm01:L").getDecoratedName()
+
+# Moving a child updates the index of both parents.
+layer = Layer("rig", parent=container)
+layer.addChild(leftArm)
+print "moved:" + str(container.getChildByDecoratedName("arm:L"))
+print "moved:" + layer.getChildByDecoratedName("arm:L").getPath()
+
+container.removeChildByName("loc03")
+print "children:" + str([x.getDecoratedName() for x in container.getChildren()])
@@ -0,0 +1,46 @@
+import pickle
+
+from kraken.core.maths import *
+from kraken.core.configs.config import Config
+from kraken.core.objects.control import Control
+
+
+def formatPoints(curveData):
+    return " ".join(["(%.3f, %.3f, %.3f)" % tuple([x + 0.0 for x in point])
+                     for subCurve in curveData for point in subCurve["points"]])
+
+
+# Controls of the same shape share it until their points are requested.
+controls = [Control("control" + str(i), shape="square") for i in xrange(3)]
+shape = controls[0].getCurveShape()
+print "shared:" + str(all([x.getCurveShape() is shape for x in controls]))
+print "library:" + str(Config.getInstance().getControlShapeLibrary().getShape("square") is shape)
+print "subCurves:" + str(controls[0].getNumSubCurves()) + " closed:" + str(controls[0].getSubCurveClosed(0))
+print "points:" + str(shape.getNumPoints())
+
+# Edits are combined with the shared shape and applied when the points are
+# requested.
+controls[1].scalePoints(Vec3(2.0, 1.0, 1.0))
+controls[1].rotatePoints(0.0, 90.0, 0.0)
+controls[1].translatePoints(Vec3(0.0, 1.0, 0.0))
+print "stillShared:" + str(controls[1].getCurveShape() is shape)
+print "bounds:" + str([["%.3f" % (x + 0.0) for x in values] for values in controls[1].getPointBounds()])
+print "edited:" + formatPoints(controls[1].getCurveData())
+print "copied:" + str(controls[1].getCurveShape() is None)
+
+# The shared shape isn't modified by the edits, even after the data is copied.
+controls[1].getCurveData()[0]["points"][0][0] = 100.0
+print "original:" + formatPoints(controls[0].getCurveData())
+print "unchanged:" + str(formatPoints(shape.getCurveData()) == formatPoints(controls[2].getCurveData()))
+
+# Aligning works on shared and copied data alike.
+controls[2].alignOnYAxis()
+controls[1].alignOnXAxis(negative=True)
+print "alignedY:" + formatPoints(controls[2].getCurveData())
+print "alignedX:" + "%.3f" % controls[1].getPointBounds()[1][0]
+
+# Controls holding a shape are pickled with it.
+control = Control("pickled", shape="circle")
+control.scalePoints(Vec3(0.5, 0.5, 0.5))
+restored = pickle.loads(pickle.dumps(control, pickle.HIGHEST_PROTOCOL))
+print "pickled:" + str(formatPoints(restored.getCurveData()) == formatPoints(control.getCurveData()))
@@ -0,0 +1,37 @@
+from kraken.core.objects.container import Container
+from kraken.core.objects.locator import Locator
+from kraken.core.objects.attributes.attribute_group import AttributeGroup
+from kraken.core.objects.attributes.scalar_attribute import ScalarAttribute
+
+
+# Chains deeper than the recursion limit.
+depth = 5000
+
+container = Container("root")
+parent = container
+for i in xrange(depth):
+    parent = Locator("loc" + str(i), parent=parent)
+
+leaf = parent
+settings = AttributeGroup("settings", parent=leaf)
+blend = ScalarAttribute("blend", value=0.5, parent=settings)
+
+leafPath = leaf.getPath()
+print "depth:" + str(len(leafPath.split('.')) - 1)
+print "leaf:" + leafPath[-20:]
+print "found:" + str(container.findByPath(leafPath) is leaf)
+print "decorated:" + str(container.findByPath(leaf.getDecoratedPath(), decorated=True) is leaf)
+print "attribute:" + blend.getPath()[-25:]
+
+# Renaming an object near the root updates the paths below it.
+container.getChildByName("loc0").setName("first")
+print "renamed:" + leaf.getPath()[:20]
+print "attribute renamed:" + blend.getPath()[:20]
+print "old path:" + str(container.findByPath(leafPath))
+print "found renamed:" + str(container.findByPath(leaf.getPath()) is leaf)
+
+# Moving the lower half of the chain under the container.
+middle = container.findByPath(leaf.getPath().rsplit('.', depth / 2)[0])
+container.addChild(middle)
+print "moved:" + str(len(leaf.getPath().split('.')) - 1)
+print "found moved:" + str(container.findByPath(leaf.getPath()) is leaf)
@@ -0,0 +1,78 @@
+
+from kraken.core.maths.vec3 import Vec3
+from kraken.core.maths.xfo import Xfo
+from kraken.core.objects.rig import Rig
+from kraken.core.objects.locator import Locator
+from kraken.core.objects.components.base_example_component import BaseExampleComponent
+from kraken.core.objects.constraints.position_constraint import PositionConstraint
+
+
+def constrain(name, constrainee, constrainer):
+    constraint = PositionConstraint(name)
+    constraint.setConstrainee(constrainee)
+    constraint.addConstrainer(constrainer)
+    constrainee.addConstraint(constraint)
+
+    return constraint
+
+
+def printEvaluated(nodes):
+    print "evaluated:" + str([x.getName() for x in nodes])
+
+
+rig = Rig("myRig")
+
+arm = BaseExampleComponent("arm", parent=rig)
+armCtrl = Locator("armCtrl", parent=arm.ctrlCmpGrp)
+wristOutput = arm.createOutput('wrist', dataType='Xfo', parent=arm.outputHrcGrp).getTarget()
+constrain("wristOutputConstraint", wristOutput, armCtrl)
+blendOutput = arm.createOutput('blend', dataType='Float', value=0.0, parent=arm.cmpOutputAttrGrp).getTarget()
+
+hand = BaseExampleComponent("hand", parent=rig)
+wristInput = hand.createInput('wrist', dataType='Xfo', parent=hand.inputHrcGrp).getTarget()
+blendInput = hand.createInput('blend', dataType='Float', value=0.0, parent=hand.cmpInputAttrGrp).getTarget()
+palm = Locator("palm", parent=hand.ctrlCmpGrp)
+constrain("palmConstraint", palm, wristInput)
+
+hand.getInputByName('wrist').setConnection(arm.getOutputByName('wrist'))
+hand.getInputByName('blend').setConnection(arm.getOutputByName('blend'))
+
+leg = BaseExampleComponent("leg", parent=rig)
+legCtrl = Locator("legCtrl", parent=leg.ctrlCmpGrp)
+foot = Locator("foot", parent=leg.ctrlCmpGrp)
+constrain("footConstraint", foot, legCtrl)
+
+rig.evaluate()
+printEvaluated(rig.evaluateDirty())
+
+# Only the nodes downstream of the edit are evaluated.
+armCtrl.xfo = Xfo(Vec3(1.0, 2.0, 3.0))
+print "dirty:" + str(armCtrl.isDirty())
+printEvaluated(rig.evaluateDirty())
+print "palm:" + str(palm.xfo.tr)
+print "dirty:" + str(armCtrl.isDirty())
+
+legCtrl.xfo = Xfo(Vec3(0.0, -1.0, 0.0))
+printEvaluated(rig.evaluateDirty())
+print "foot:" + str(foot.xfo.tr)
+
+# Attribute values propagate through the component connections.
+blendOutput.setValue(0.5)
+printEvaluated(rig.evaluateDirty())
+print "blend:" + str(blendInput.getValue())
+
+# In place edits must be marked explicitly.
+legCtrl.xfo.tr = Vec3(0.0, -2.0, 0.0)
+printEvaluated(rig.evaluateDirty())
+legCtrl.markDirty()
+printEvaluated(rig.evaluateDirty())
+print "foot:" + str(foot.xfo.tr)
+
+# Rewiring the rig rebuilds the graph.
+graph = rig.getEvaluationGraph()
+print "cached:" + str(rig.getEvaluationGraph() is graph)
+constrain("handConstraint", legCtrl, palm)
+print "cached:" + str(rig.getEvaluationGraph() is graph)
+armCtrl.xfo = Xfo(Vec3(4.0, 5.0, 6.0))
+printEvaluated(rig.evaluateDirty())
+print "foot:" + str(foot.xfo.tr)
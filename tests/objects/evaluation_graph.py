@@ -0,0 +1,57 @@
+
+from kraken.core.maths.vec3 import Vec3
+from kraken.core.objects.rig import Rig
+from kraken.core.objects.locator import Locator
+from kraken.core.objects.components.base_example_component import BaseExampleComponent
+from kraken.core.objects.constraints.position_constraint import PositionConstraint
+
+
+def constrain(name, constrainee, constrainer):
+    constraint = PositionConstraint(name)
+    constraint.setConstrainee(constrainee)
+    constraint.addConstrainer(constrainer)
+    constrainee.addConstraint(constraint)
+
+    return constraint
+
+
+rig = Rig("myRig")
+
+# The downstream component is added first, so its nodes are gathered before
+# the nodes driving it.
+hand = BaseExampleComponent("hand", parent=rig)
+wristInput = hand.createInput('wrist', dataType='Xfo', parent=hand.inputHrcGrp).getTarget()
+palm = Locator("palm", parent=hand.ctrlCmpGrp)
+finger = Locator("finger", parent=hand.ctrlCmpGrp)
+constrain("fingerConstraint", finger, palm)
+constrain("palmConstraint", palm, wristInput)
+
+arm = BaseExampleComponent("arm", parent=rig)
+armCtrl = Locator("armCtrl", parent=arm.ctrlCmpGrp)
+armCtrl.xfo.tr = Vec3(1.0, 2.0, 3.0)
+wristOutput = arm.createOutput('wrist', dataType='Xfo', parent=arm.outputHrcGrp).getTarget()
+constrain("wristOutputConstraint", wristOutput, armCtrl)
+
+hand.getInputByName('wrist').setConnection(arm.getOutputByName('wrist'))
+
+graph = rig.createEvaluationGraph()
+print "cycle:" + str(graph.hasCycle())
+for path, dependencies in graph.getDescription():
+    print path + " <- " + str(dependencies)
+
+graph.evaluate()
+print "finger:" + str(finger.xfo.tr)
+
+# Evaluating the rig resolves the new pose in a single pass.
+armCtrl.xfo.tr = Vec3(4.0, 5.0, 6.0)
+rig.evaluate()
+print "finger:" + str(finger.xfo.tr)
+
+# Cycles are reported with the nodes involved.
+constrain("armCtrlConstraint", armCtrl, finger)
+graph = rig.createEvaluationGraph()
+print "cycle:" + str([x.getName() for x in graph.getCycle()])
+try:
+    graph.evaluate()
+except Exception as e:
+    print "error:" + str(e)
@@ -0,0 +1,106 @@
+from StringIO import StringIO
+
+from kraken.core.maths import *
+from kraken.core.objects.container import Container
+from kraken.core.objects.layer import Layer
+from kraken.core.objects.hierarchy_group import HierarchyGroup
+from kraken.core.objects.control import Control
+from kraken.core.objects.joint import Joint
+from kraken.core.objects.locator import Locator
+from kraken.core.objects.attributes.attribute_group import AttributeGroup
+from kraken.core.objects.attributes.scalar_attribute import ScalarAttribute
+from kraken.core.objects.constraints.pose_constraint import PoseConstraint
+from kraken.core.io import json_codec
+from kraken.core.io.kraken_saver import KrakenSaver
+from kraken.core.io.kraken_loader import KrakenLoader
+from kraken.helpers.utility_methods import logHierarchy
+
+
+def printItems(root):
+    logHierarchy(root)
+
+    layer = root.getChildByName('layer')
+    ctrl = layer.getChildByName('grp').getChildByName('ctrl')
+    print "ctrl:" + str(ctrl.getTypeName()) + " " + str(ctrl.xfo.tr)
+    print "blend:" + str(ctrl.getAttributeGroupByName('settings').getAttributeByName('blend').getValue())
+
+    constraint = layer.getChildByName('jnt').getConstraintByIndex(0)
+    print "constraint:" + str(constraint.getName()) + " " + str(constraint.getConstrainee().getPath()) + " <- " + \
+        str([str(x.getPath()) for x in constraint.getConstrainers()])
+
+
+root = Container('root')
+layer = Layer('layer', parent=root)
+grp = HierarchyGroup('grp', parent=layer)
+ctrl = Control('ctrl', parent=grp)
+ctrl.xfo.tr = Vec3(1.0, 2.0, 3.0)
+settings = AttributeGroup('settings', parent=ctrl)
+ScalarAttribute('blend', value=0.5, parent=settings)
+
+# The joint is constrained to an item written after it.
+jnt = Joint('jnt', parent=layer)
+Locator('loc', parent=layer)
+constraint = PoseConstraint('jntCns')
+constraint.setConstrainee(jnt)
+constraint.addConstrainer(layer.getChildByName('loc'))
+constraint.addConstrainer(ctrl)
+jnt.addConstraint(constraint)
+
+print "==nested=="
+jsonData = json_codec.loads(json_codec.dumps(KrakenSaver().encode(root)))
+printItems(KrakenLoader().construct(jsonData))
+
+print "==stream=="
+stream = StringIO()
+print "records:" + str(KrakenSaver().writeStream(root, stream))
+stream.seek(0)
+printItems(KrakenLoader().constructFromStream(stream))
+
+# Records can be supplied already decoded.
+loader = KrakenLoader()
+printItems(loader.constructFromStream(KrakenSaver().iterRecords(root)))
+print "pending:" + str(len(loader.callbacks))
+
+# Records whose parent isn't found are errors, not dropped.
+records = list(KrakenSaver().iterRecords(root))
+records[2]['parent'] = -1
+try:
+    KrakenLoader().constructFromStream(records)
+except Exception as e:
+    print "error:" + str(e)
+
+records = list(KrakenSaver().iterRecords(root))
+del records[2]['parent']
+try:
+    KrakenLoader().constructFromStream(records)
+except Exception as e:
+    print "error:" + str(e)
+
+print "==paths=="
+# Data without ids references items by path.
+jsonData = KrakenSaver().encode(root)
+
+def removeIds(data):
+    if type(data) is dict:
+        data.pop('__id__', None)
+        for value in data.values():
+            removeIds(value)
+    elif type(data) is list:
+        for value in data:
+            removeIds(value)
+
+removeIds(jsonData)
+jntData = jsonData['children'][0]['children'][1]
+jntData['constraints'][0]['constrainee'] = 'root.layer.jnt'
+jntData['constraints'][0]['constrainers'] = ['root.layer.loc', 'root.layer.grp.ctrl']
+loader = KrakenLoader()
+printItems(loader.construct(jsonData))
+print "resolved:" + loader.resolveSceneItem('root.layer.grp').getPath()
+print "pending:" + str(len(loader.pathCallbacks))
+
+print "==types=="
+loader = KrakenLoader()
+print "Joint:" + loader.getTypeClass(['MyJoint', 'Joint', 'Object3D', 'SceneItem']).__name__
+loader.registerType(Locator, 'MyJoint')
+print "MyJoint:" + loader.getTypeClass(['MyJoint', 'Joint', 'Object3D', 'SceneItem']).__name__
+print "unknown:" + str(loader.getTypeClass(['Unknown']))
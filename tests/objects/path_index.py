@@ -0,0 +1,69 @@
+from kraken.core.objects.container import Container
+from kraken.core.objects.layer import Layer
+from kraken.core.objects.locator import Locator
+from kraken.core.objects.component_group import ComponentGroup
+from kraken.core.objects.components.base_example_component import BaseExampleComponent
+
+
+container = Container("myRig")
+layer = Layer("rig", parent=container)
+arm = BaseExampleComponent("arm", parent=layer)
+arm.setLocation("L")
+hand = Locator("hand", parent=arm)
+palm = Locator("palm", parent=hand)
+
+print "path:" + container.findByPath("myRig.rig.arm.hand.palm").getPath()
+print "decorated:" + container.findByPath("myRig.rig.arm:L.hand.palm", decorated=True).getDecoratedPath()
+print "missing:" + str(container.findByPath("myRig.rig.leg"))
+
+# Renaming an object updates the paths of its descendants.
+hand.setName("wrist")
+print "renamed:" + container.findByPath("myRig.rig.arm.wrist.palm").getPath()
+print "old path:" + str(container.findByPath("myRig.rig.arm.hand.palm"))
+
+arm.setLocation("R")
+print "location:" + container.findByPath("myRig.rig.arm:R.wrist", decorated=True).getDecoratedPath()
+print "old location:" + str(container.findByPath("myRig.rig.arm:L.wrist", decorated=True))
+
+# Moving and removing objects.
+layer.addChild(hand)
+print "moved:" + container.findByPath("myRig.rig.wrist.palm").getPath()
+layer.removeChild(hand)
+print "removed:" + str(container.findByPath("myRig.rig.wrist.palm"))
+
+# Nested containers.
+outer = Container("outer")
+outer.addChild(container)
+print "nested:" + outer.findByPath("outer.myRig.rig.arm").getPath()
+print "inner:" + container.findByPath("outer.myRig.rig").getPath()
+
+# Objects removed by index.
+wrist = Locator("wrist", parent=layer)
+layer.removeChildByIndex(layer.getChildren().index(wrist))
+print "removed by index:" + str(container.findByPath("outer.myRig.rig.wrist"))
+
+# Component groups are named after their component.
+deformers = Layer("deformers", parent=container)
+group = ComponentGroup("arm", arm, parent=deformers)
+print "group:" + container.findByPath("outer.myRig.deformers.arm:R", decorated=True).getTypeName()
+arm.setName("leg")
+arm.setLocation("L")
+print "renamed group:" + group.getDecoratedPath()
+
+# Edits re-index the objects they change instead of the whole hierarchy.
+rebuilds = []
+rebuildPathIndex = Container._rebuildPathIndex
+
+def countRebuilds(self):
+    rebuilds.append(self.getName())
+    return rebuildPathIndex(self)
+
+Container._rebuildPathIndex = countRebuilds
+container.findByPath("outer.myRig.rig")
+finger = Locator("finger", parent=layer)
+print "added:" + container.findByPath("outer.myRig.rig.finger").getPath()
+finger.setName("thumb")
+print "renamed:" + container.findByPath("outer.myRig.rig.thumb").getPath() + " " + str(container.findByPath("outer.myRig.rig.finger"))
+print "outer:" + outer.findByPath("outer.myRig.rig.thumb").getPath()
+print "rebuilds:" + str(rebuilds)
+Container._rebuildPathIndex = rebuildPathIndex
@@ -0,0 +1,46 @@
+from kraken.core.kraken_system import ks
+from kraken.core.maths import *
+from kraken.core.objects.rig import Rig
+from kraken.core.objects.locator import Locator
+
+
+prevBackend = ks.getMathBackend()
+ks.setMathBackend('python')
+
+rig = Rig('rig')
+loc1 = Locator('loc1', parent=rig)
+loc2 = Locator('loc2', parent=loc1)
+loc3 = Locator('loc3', parent=rig)
+
+store = rig.getTransformStore()
+print "numObjects:" + str(len(store))
+print "indices:" + str([store.getIndex(x) for x in [rig, loc1, loc2, loc3]])
+
+xfo = loc2.xfo
+loc2.xfo = Xfo(tr=Vec3(1.0, 2.0, 3.0))
+print "sameXfo:" + str(xfo is loc2.xfo) + " held:" + str(xfo.tr)
+print "loc2:" + str(loc2.xfo)
+loc1.xfo.tr.y = 5.0
+print "buffer:" + str(list(store.getBuffer()[10:20]))
+
+values = store.getXfoValues()
+values[30] = 7.0
+store.setXfoValues(values)
+print "loc3:" + str(loc3.xfo)
+
+mat44Values = store.getMat44Values()
+store.setMat44Values(mat44Values)
+print "loc2:" + str(loc2.xfo)
+
+# Xfos and member views held across a removal keep the values of their object.
+heldXfo = loc1.xfo
+heldTr = loc2.xfo.tr
+rig.removeChild(loc1)
+loc3.xfo.tr = Vec3(4.0, 4.0, 4.0)
+print "held:" + str(heldXfo is loc1.xfo) + " " + str(heldXfo.tr) + " " + str(heldTr)
+print "numObjects:" + str(len(store))
+print "loc3Index:" + str(store.getIndex(loc3))
+print "loc3:" + str(loc3.xfo)
+print "loc1:" + str(loc1.xfo) + " store:" + str(loc1.getTransformStore())
+
+ks.setMathBackend(prevBackend)
@@ -0,0 +1,40 @@
+import json
+
+from kraken.core.profiler import Profiler
+
+
+profiler = Profiler()
+
+@profiler.scope('construct')
+def construct(count):
+    for i in xrange(count):
+        with profiler.scope('addChild'):
+            pass
+
+with profiler.scope('build'):
+    construct(2)
+    construct(1)
+
+profiler.push('sync')
+profiler.pop()
+
+stats = profiler.getStats()
+for label in sorted(stats.keys()):
+    labelStats = stats[label]
+    print label + " calls:" + str(labelStats['count']) + " selfLessThanTotal:" + str(labelStats['self'] <= labelStats['total']) + " minLessThanMax:" + str(labelStats['min'] <= labelStats['max'])
+
+trace = profiler.exportChromeTrace()
+print "events:" + str([x['name'] for x in trace['traceEvents']])
+print "json:" + str(len(json.loads(json.dumps(trace))['traceEvents']))
+
+for line in profiler.exportCollapsedStacks().split('\n'):
+    print "stack:" + line.split(' ')[0]
+
+# A disabled profiler doesn't record anything.
+profiler.reset()
+profiler.setEnabled(False)
+profiler.push('ignored')
+profiler.pop()
+profiler.pop()
+profiler.setEnabled(True)
+print "disabled:" + str(profiler.getStats())
@@ -120,6 +120,11 @@ def runPytonTest(filepath, update, printoutput):
 
     output = '\n'.join(strippedlines)
 
+    # Tests print a skip line when an optional dependency is missing.
+    if output.startswith('Test Skipped:'):
+        print "Test Skipped:" + filepath + " (" + output.split('\n')[0][len('Test Skipped:'):].strip() + ")"
+        return
+
     checkTestOutput(filepath, output, update, printoutput=printoutput)
 
 
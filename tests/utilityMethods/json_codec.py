@@ -0,0 +1,34 @@
+import json
+
+from kraken_examples.bob_guide_data import bob_guide_data
+from kraken.core.io import json_codec
+from kraken.core.maths import *
+from kraken.helpers.utility_methods import prepareToSave, prepareToLoad
+
+
+xfo = Xfo(tr=Vec3(32, 35, 234), ori=Quat(Vec3(0.0, 0.0, 0.0), 1.0), sc=Vec3(2.0, 2.0, 2.0))
+print "Xfo:" + json_codec.dumps(xfo)
+print "Xfo decoded:" + str(json_codec.loads(json_codec.dumps(xfo)))
+
+values = [Vec2(1, 2), Vec4(1, 2, 3, 4), Euler(0.5, 0.25, 0.125, ro=RotationOrder(3)),
+          Mat33(Vec3(1, 2, 3), Vec3(4, 5, 6), Vec3(7, 8, 9))]
+
+for value in values:
+    compact = json_codec.loads(json_codec.dumps(value))
+    legacy = json_codec.loads(json.dumps(value.jsonEncode()))
+    print value.__class__.__name__ + ":" + str(compact) + " legacy:" + str(str(legacy) == str(compact))
+
+print "Color:" + json_codec.dumps(Color(0.5, 0.25, 1.0, 1.0))
+
+# Round trip of the guide data.
+str1 = json_codec.dumps(bob_guide_data)
+guideData = json_codec.loads(str1)
+str2 = json_codec.dumps(guideData)
+print "Round trip:" + str(json.loads(str1) == json.loads(str2))
+
+# Files written by previous versions decode to the same data.
+legacyStr = json.dumps(prepareToSave(bob_guide_data), indent=2)
+legacyData = json_codec.loads(legacyStr)
+print "Legacy:" + str(json.loads(json_codec.dumps(legacyData)) == json.loads(str1))
+print "Legacy prepareToLoad:" + str(json.loads(json_codec.dumps(prepareToLoad(json.loads(str1)))) == json.loads(str1))
+print "Compact:" + str(len(str1) * 2 < len(legacyStr))